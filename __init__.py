@@ -93,6 +93,7 @@ def register():
 
 
 def unregister():
+    sverchok.core.node_manifest.stop_background_loading()
     sverchok.utils.clear_node_classes()
     sv_registration_utils.unregister_all(imported_modules + node_list)
 
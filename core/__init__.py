@@ -52,6 +52,12 @@ def reload_all(imported_modules, node_list, old_nodes):
 
 
 def make_node_list(nodes):
+    from sverchok.core import node_manifest
+    if node_manifest.is_lazy_loading_enabled():
+        try:
+            return node_manifest.make_lazy_node_list(nodes)
+        except Exception as e:
+            exception(e)
     node_list = []
     base_name = "sverchok.nodes"
     for category, names in nodes.nodes_dict.items():
@@ -113,13 +119,14 @@ def init_architecture(sv_name, utils_modules, ui_modules):
 
 def init_bookkeeping(sv_name):
 
-    from sverchok.core import node_defaults
+    from sverchok.core import node_defaults, node_manifest
     from sverchok.utils import ascii_print, auto_gather_node_classes
 
     sverchok.data_structure.SVERCHOK_NAME = sv_name
     ascii_print.show_welcome()
     node_defaults.register_defaults()
     auto_gather_node_classes()
+    node_manifest.start_background_loading()
 
 
 
@@ -5,8 +5,8 @@ from bpy.app.handlers import persistent
 
 from sverchok import old_nodes
 from sverchok import data_structure
-from sverchok.core import upgrade_nodes, undo_handler_node_count
-from sverchok.core.update_system import set_first_run, clear_system_cache
+from sverchok.core import upgrade_nodes, undo_handler_node_count, node_manifest
+from sverchok.core.update_system import set_first_run, clear_system_cache, subscribe_to_tree_changes
 from sverchok.core.events import CurrentEvents, BlenderEventsTypes
 from sverchok.ui import color_def, bgl_callback_nodeview, bgl_callback_3dview
 from sverchok.utils import app_handler_ops
@@ -176,6 +176,11 @@ def sv_post_load(scene):
     """
 
     set_first_run(False)
+    subscribe_to_tree_changes()
+
+    # with lazy node loading, node modules used in the file are not imported yet
+    sv_types = {'SverchCustomTreeType', 'SverchGroupTreeType'}
+    node_manifest.load_tree_nodes(ng for ng in bpy.data.node_groups if ng.bl_idname in sv_types)
 
     # ensure current nodeview view scale / location parameters reflect users' system settings
     from sverchok import node_tree
@@ -186,7 +191,6 @@ def sv_post_load(scene):
         if monad.input_node and monad.output_node:
             monad.update_cls()
 
-    sv_types = {'SverchCustomTreeType', 'SverchGroupTreeType'}
     sv_trees = list(ng for ng in bpy.data.node_groups if ng.bl_idname in sv_types and ng.nodes)
 
     for ng in sv_trees:
@@ -155,6 +155,20 @@ class SvLinks:
     def links_have_changed(self, node_tree):
         return self.sv_links_new[node_tree.tree_id] != self.sv_links_cache[node_tree.tree_id]
 
+    def get_links_difference(self, node_tree):
+        """
+        Return lists of links added and removed since links cache was stored,
+        or (None, None) if there is no links memory for the tree.
+        """
+        tree_id = node_tree.tree_id
+        if not self.sv_links_cache.get(tree_id):
+            return None, None
+        new_links = collections.Counter(self.sv_links_new[tree_id])
+        before_links = collections.Counter(self.sv_links_cache[tree_id])
+        added_links = list((new_links - before_links).elements())
+        removed_links = list((before_links - new_links).elements())
+        return added_links, removed_links
+
     def store_links_cache(self, node_tree):
         tree_id = node_tree.tree_id
         self.sv_links_cache[node_tree.tree_id] = self.sv_links_new[node_tree.tree_id]
@@ -30,7 +30,10 @@ from sverchok.utils.sv_IO_panel_tools import create_dict_of_tree, import_tree
 from sverchok.utils.logging import info, error
 from sverchok.node_tree import SverchCustomTreeNode, SvNodeTreeCommon
 from sverchok.data_structure import get_other_socket, updateNode, match_long_repeat
-from sverchok.core.update_system import make_tree_from_nodes, do_update
+from sverchok.core.update_system import (make_tree_from_nodes, do_update, do_update_general, get_dependency_graph,
+                                         reset_error_nodes)
+from sverchok.core.sv_custom_exceptions import SvProcessingError
+from sverchok.core.socket_data import SvSetSocket, SvGetSocket
 from sverchok.core.monad_properties import SvIntPropertySettingsGroup, SvFloatPropertySettingsGroup, ensure_unique
 from sverchok.core.events import CurrentEvents, BlenderEventsTypes
 
@@ -151,6 +154,60 @@ def generate_name(prop_name, cls_dict):
         return prop_name
 
 
+class SvMonadPlan:
+    """
+    Execution plan of a monad tree: the list of nodes to process. It is used
+    to process the monad many times (vectorize and loop modes) without
+    building the update list on each iteration. The plan is valid while the
+    dependency graph of the monad tree does not change; the graph is rebuilt
+    when links are changed or nodes are renamed.
+    Data is passed into and out of the monad with SvSetSocket and
+    SvGetSocket, so socket cache limits apply to monad data as well.
+    """
+    # monad tree_id: SvMonadPlan
+    plans = dict()
+
+    def __init__(self, monad, endpoint_nodes):
+        self.graph = get_dependency_graph(monad)
+        self.graph_version = self.graph.version
+        self.endpoint_nodes = tuple(endpoint_nodes)
+        self.update_list = make_tree_from_nodes(list(endpoint_nodes), monad, down=False)
+        self.n_inputs = len(monad.input_node.outputs)
+        self.n_outputs = len(monad.output_node.inputs)
+
+    def is_valid(self, monad, endpoint_nodes):
+        return (get_dependency_graph(monad) is self.graph
+                and self.graph.version == self.graph_version
+                and self.endpoint_nodes == tuple(endpoint_nodes)
+                and len(monad.input_node.outputs) == self.n_inputs
+                and len(monad.output_node.inputs) == self.n_outputs)
+
+    @classmethod
+    def get(cls, monad, endpoint_nodes):
+        plan = cls.plans.get(monad.tree_id)
+        if plan is None or not plan.is_valid(monad, endpoint_nodes):
+            plan = cls(monad, endpoint_nodes)
+            cls.plans[monad.tree_id] = plan
+        return plan
+
+    def set_input(self, in_node, index, data):
+        SvSetSocket(in_node.outputs[index], data)
+
+    def get_output(self, out_node, index):
+        return SvGetSocket(out_node.inputs[index], deepcopy=False)
+
+    def run(self, monad):
+        """
+        Process nodes of the plan by do_update_general, the same way as nodes
+        of a tree are processed: exceptions of the nodes are logged and the
+        nodes are colored, telemetry and profiling samples are collected.
+        Raises SvProcessingError if a node failed, so the monad is not
+        processed further with incomplete data.
+        """
+        if do_update_general(self.update_list, monad.nodes) is None:
+            raise SvProcessingError("Node of monad {} had exception, see the log".format(monad.name))
+
+
 class SverchGroupTree(NodeTree, SvNodeTreeCommon):
     ''' Sverchok - groups '''
     bl_idname = 'SverchGroupTreeType'
@@ -633,6 +690,7 @@ class SvGroupNodeExp:
             return
         if not self.monad:
             return
+        reset_error_nodes(self.monad)
         if self.vectorize:
             self.process_vectorize()
             return
@@ -660,13 +718,17 @@ class SvGroupNodeExp:
                 data = out_node.inputs[index].sv_get(deepcopy=False)
                 socket.sv_set(data)
 
+    def get_plan(self, monad):
+        return SvMonadPlan.get(monad, self.get_nodes_to_process(monad.output_node.name))
+
     def process_vectorize(self):
         monad = self.monad
         in_node = monad.input_node
         out_node = monad.output_node
 
-        node_names = self.get_nodes_to_process(out_node.name)
-        ul = make_tree_from_nodes(node_names, monad, down=False)
+        plan = self.get_plan(monad)
+        linked_inputs = [socket.is_linked for socket in in_node.outputs]
+        n_outputs = len(out_node.inputs) - 1
 
         data_out = [[] for s in self.outputs]
 
@@ -682,13 +744,12 @@ class SvGroupNodeExp:
 
         for master_idx, data in enumerate(zip(*data_in)):
             for idx, d in enumerate(data):
-                socket = in_node.outputs[idx]
-                if socket.is_linked:
-                    socket.sv_set([d])
+                if linked_inputs[idx]:
+                    plan.set_input(in_node, idx, [d])
             monad["current_index"] = master_idx
-            do_update(ul, monad.nodes)
-            for idx, s in enumerate(out_node.inputs[:-1]):
-                data_out[idx].extend(s.sv_get(deepcopy=False))
+            plan.run(monad)
+            for idx in range(n_outputs):
+                data_out[idx].extend(plan.get_output(out_node, idx))
 
         for idx, socket in enumerate(self.outputs):
             if socket.is_linked:
@@ -697,24 +758,25 @@ class SvGroupNodeExp:
 
     # ----------- loop (iterate 2)
 
-    def do_process(self, sockets_data_in):
+    def do_process(self, sockets_data_in, monad=None, plan=None):
 
-        monad = self.monad
+        if monad is None:
+            monad = self.monad
         in_node = monad.input_node
         out_node = monad.output_node
+        if plan is None:
+            plan = self.get_plan(monad)
 
         for index, data in enumerate(sockets_data_in):
-            in_node.outputs[index].sv_set(data)        
+            plan.set_input(in_node, index, data)
 
-        node_names = self.get_nodes_to_process(out_node.name)
-        ul = make_tree_from_nodes(node_names, monad, down=False)
-        do_update(ul, monad.nodes)
+        plan.run(monad)
 
         # set output sockets correctly
         socket_data_out = []
         for index, socket in enumerate(self.outputs):
             if socket.is_linked:
-                data = out_node.inputs[index].sv_get(deepcopy=False)
+                data = plan.get_output(out_node, index)
                 socket_data_out.append(data)
 
         return socket_data_out
@@ -732,15 +794,14 @@ class SvGroupNodeExp:
         monad['current_total'] = iterations_remaining
         monad['current_index'] = 0
 
-        in_node = monad.input_node
-        out_node = monad.output_node
+        plan = self.get_plan(monad)
 
         for iteration in range(iterations_remaining):
             # if 'Monad Info' in monad.nodes:
             #     info_node = monad.nodes['Monad Info']
             #     info_node.outputs[0].sv_set([[iteration]])
             monad["current_index"] = iteration
-            sockets_in = self.do_process(sockets_in)
+            sockets_in = self.do_process(sockets_in, monad, plan)
         self.apply_output(sockets_in)
 
 
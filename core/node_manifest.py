@@ -0,0 +1,452 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Manifest of node classes, which allows to start Sverchok without importing
+all node modules.
+
+The manifest is built by static analysis (ast) of node module sources, so
+building it does not require importing node modules either. It contains, for
+each node class, its bl_idname, label, icon, docstring, category and module,
+and names of dependencies (from sverchok.dependencies) that the node requires.
+The manifest is cached in Sverchok's datafiles directory; only modules which
+were changed since the last run are re-scanned.
+
+When lazy node loading is enabled:
+
+* Node menus are built from the manifest.
+* A node module is imported when the node is added, when a blend file which
+  uses the node is loaded, or when the node class is requested via
+  sverchok.utils.get_node_class_reference().
+* All remaining node modules are imported in background (by small batches,
+  from a timer), so that code which creates nodes by bl_idname directly keeps
+  working shortly after startup.
+
+The "Lazy node loading" preference is stored in a flag file rather than in
+Blender's preferences, because it must be read before Sverchok's preferences
+class is registered.
+"""
+
+import os
+import ast
+import json
+import time
+import importlib
+
+import bpy
+
+import sverchok
+from sverchok.utils.logging import debug, info, exception
+from sverchok.utils.docstring import SvDocstring
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE_NAME = "node_manifest.json"
+LAZY_FLAG_FILE_NAME = "lazy_node_loading"
+
+# Constant class attributes to be stored in the manifest
+NODE_CLASS_ATTRIBUTES = ['bl_idname', 'bl_label', 'bl_icon', 'sv_icon', 'solid_catergory']
+NOT_NODE_BASES = ('Operator', 'Panel', 'Menu', 'UIList', 'Socket', 'PropertyGroup', 'Header')
+
+# Time budget of one step of background loading, in seconds
+BACKGROUND_STEP_TIME = 0.02
+
+_manifest = None
+_node_entries = {}
+_node_stubs = {}
+_loaded_modules = set()
+_stale_modules = set()
+_pending_modules = []
+_node_list = None
+_lazy_loading = False
+
+def get_datafiles_path():
+    return bpy.utils.user_resource('DATAFILES', path='sverchok', create=True)
+
+def get_manifest_path():
+    return os.path.join(get_datafiles_path(), MANIFEST_FILE_NAME)
+
+def is_lazy_loading_enabled():
+    """
+    Whether lazy node loading is enabled in preferences.
+    """
+    try:
+        return os.path.exists(os.path.join(get_datafiles_path(), LAZY_FLAG_FILE_NAME))
+    except Exception as e:
+        exception(e)
+        return False
+
+def set_lazy_loading_enabled(enabled):
+    path = os.path.join(get_datafiles_path(), LAZY_FLAG_FILE_NAME)
+    if enabled:
+        with open(path, 'w') as f:
+            f.write("Lazy node loading is enabled; remove this file to disable it.\n")
+    elif os.path.exists(path):
+        os.remove(path)
+
+def is_lazy_loading():
+    """
+    Whether current session was started with lazy node loading.
+    """
+    return _lazy_loading
+
+##########################
+#                        #
+#  Building the manifest #
+#                        #
+##########################
+
+def _dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return _dotted_name(node.value) + "." + node.attr
+    else:
+        return ""
+
+def _constant_string(node):
+    # Python 3.7 parses string literals as ast.Str
+    if isinstance(node, ast.Constant):
+        value = node.value
+    elif type(node).__name__ == 'Str':
+        value = node.s
+    else:
+        return None
+    return value if isinstance(value, str) else None
+
+def _class_attributes(class_def):
+    attributes = dict()
+    for statement in class_def.body:
+        if isinstance(statement, ast.Assign):
+            targets = [t.id for t in statement.targets if isinstance(t, ast.Name)]
+            value = statement.value
+        elif isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+            targets = [statement.target.id]
+            value = statement.value
+        else:
+            continue
+        string = _constant_string(value)
+        if string is None:
+            continue
+        for target in targets:
+            if target in NODE_CLASS_ATTRIBUTES:
+                attributes[target] = string
+    return attributes
+
+def _is_node_class(class_def, bl_idname):
+    if '.' in bl_idname:
+        return False
+    for base in class_def.bases:
+        if _dotted_name(base).endswith(NOT_NODE_BASES):
+            return False
+    return True
+
+def _dummy_requirements(tree):
+    """
+    Find add_dummy() calls, and names used in conditions of `if` statements
+    which contain these calls.
+    output: dict: bl_idname -> list of names.
+    """
+    requirements = dict()
+
+    def visit(statements, condition_names):
+        for statement in statements:
+            if isinstance(statement, ast.If):
+                names = sorted(set(n.id for n in ast.walk(statement.test) if isinstance(n, ast.Name)))
+                visit(statement.body, names)
+                visit(statement.orelse, condition_names)
+            elif isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call):
+                call = statement.value
+                if _dotted_name(call.func).endswith('add_dummy') and call.args:
+                    bl_idname = _constant_string(call.args[0])
+                    if bl_idname is not None:
+                        requirements[bl_idname] = condition_names
+
+    visit(tree.body, [])
+    return requirements
+
+def scan_node_module(path):
+    """
+    Statically analyze node module source.
+    output: dict: bl_idname -> entry, where entry is a dict with the following keys:
+        * class: class name
+        * doc: class docstring
+        * requires: names from sverchok.dependencies which must be not None
+          for this node to be available
+        * keys from NODE_CLASS_ATTRIBUTES, when defined as string constants.
+    """
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source, filename=path)
+
+    dependencies = set()
+    for statement in ast.walk(tree):
+        if isinstance(statement, ast.ImportFrom) and statement.module == 'sverchok.dependencies':
+            dependencies.update(alias.asname or alias.name for alias in statement.names)
+
+    requirements = _dummy_requirements(tree)
+
+    entries = dict()
+    for class_def in ast.walk(tree):
+        if not isinstance(class_def, ast.ClassDef):
+            continue
+        attributes = _class_attributes(class_def)
+        bl_idname = attributes.get('bl_idname')
+        if bl_idname is None or not _is_node_class(class_def, bl_idname):
+            continue
+        entry = dict(attributes)
+        entry['class'] = class_def.name
+        entry['doc'] = ast.get_docstring(class_def, clean=False)
+        entry['requires'] = [name for name in requirements.get(bl_idname, []) if name in dependencies]
+        entries[bl_idname] = entry
+    return entries
+
+def _module_file(category, name):
+    return os.path.join(os.path.dirname(sverchok.nodes.__file__), category, name + ".py")
+
+def build_manifest(nodes_dict, cached=None):
+    """
+    Build the manifest for all modules in nodes_dict.
+    Modules whose files did not change since `cached` manifest was built
+    are not re-scanned.
+    output: tuple (manifest, number of re-scanned modules).
+    """
+    root = os.path.dirname(sverchok.__file__)
+    if cached is None or cached.get('version') != MANIFEST_VERSION or cached.get('root') != root:
+        cached_modules = dict()
+    else:
+        cached_modules = cached.get('modules', dict())
+
+    modules = dict()
+    n_scanned = 0
+    for category, names in nodes_dict.items():
+        for name in names:
+            module_name = "sverchok.nodes.{}.{}".format(category, name)
+            path = _module_file(category, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            record = cached_modules.get(module_name)
+            if record is not None and record['mtime'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+                modules[module_name] = record
+                continue
+            try:
+                nodes = scan_node_module(path)
+            except Exception as e:
+                # Such module will be imported at startup
+                info("Can't scan node module %s: %s", module_name, e)
+                nodes = None
+            n_scanned += 1
+            modules[module_name] = dict(category = category,
+                                        mtime = stat.st_mtime_ns,
+                                        size = stat.st_size,
+                                        nodes = nodes)
+    manifest = dict(version = MANIFEST_VERSION, root = root, modules = modules)
+    return manifest, n_scanned
+
+def load_manifest(nodes_dict):
+    """
+    Load cached manifest, update it if node modules were changed, and save it back.
+    """
+    path = get_manifest_path()
+    cached = None
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except Exception as e:
+            info("Can't read node manifest %s: %s", path, e)
+
+    manifest, n_scanned = build_manifest(nodes_dict, cached)
+    if n_scanned or cached is None:
+        debug("Node manifest: %s modules re-scanned", n_scanned)
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+        except Exception as e:
+            info("Can't write node manifest %s: %s", path, e)
+    return manifest
+
+##################
+#                #
+#  Lazy loading  #
+#                #
+##################
+
+def make_lazy_node_list(nodes):
+    """
+    Lazy replacement of sverchok.core.make_node_list.
+    Imports only node category packages, and node modules which
+    could not be scanned statically.
+    The returned list is extended as node modules are loaded later.
+    """
+    global _manifest, _node_list, _lazy_loading
+
+    start = time.perf_counter()
+    _manifest = load_manifest(nodes.nodes_dict)
+    _node_list = []
+    _node_entries.clear()
+    _node_stubs.clear()
+    # After F8 reload, modules loaded in previous session must be reloaded too
+    _stale_modules.update(_loaded_modules)
+    _loaded_modules.clear()
+    _pending_modules.clear()
+
+    for category in nodes.nodes_dict:
+        importlib.import_module('.{}'.format(category), "sverchok.nodes")
+
+    for module_name, record in _manifest['modules'].items():
+        if record['nodes'] is None:
+            _import_module(module_name)
+            continue
+        _pending_modules.append(module_name)
+        for bl_idname, entry in record['nodes'].items():
+            _node_entries[bl_idname] = dict(entry, module = module_name, category = record['category'])
+
+    _lazy_loading = True
+    info("sv: node manifest loaded in %.3fs: %s node classes in %s modules",
+            time.perf_counter() - start, len(_node_entries), len(_manifest['modules']))
+    return _node_list
+
+def _import_module(module_name):
+    # Before the add-on is registered, only import the module;
+    # sverchok.register() will register everything in node_list.
+    _loaded_modules.add(module_name)
+    module = importlib.import_module(module_name)
+    if module_name in _stale_modules:
+        _stale_modules.discard(module_name)
+        module = importlib.reload(module)
+    _node_list.append(module)
+    return module
+
+def load_node_module(module_name):
+    """
+    Import and register node module, if it was not loaded yet.
+    """
+    if module_name in _loaded_modules:
+        return
+    if module_name in _pending_modules:
+        _pending_modules.remove(module_name)
+    try:
+        module = _import_module(module_name)
+        if hasattr(module, "register"):
+            module.register()
+        from sverchok.utils import gather_module_node_classes
+        gather_module_node_classes(module)
+        debug("Loaded node module %s", module_name)
+    except Exception as e:
+        exception(e)
+
+def load_node_class(bl_idname):
+    """
+    Make sure the node class is loaded and registered.
+    output: node class, or None if it is not known.
+    """
+    if not _lazy_loading:
+        return None
+    entry = _node_entries.get(bl_idname)
+    if entry is None:
+        return None
+    load_node_module(entry['module'])
+    from sverchok.utils import node_classes
+    return node_classes.get(bl_idname)
+
+def load_tree_nodes(trees):
+    """
+    Load node classes used in given node trees.
+    """
+    if not _lazy_loading:
+        return
+    bl_idnames = set()
+    for tree in trees:
+        for node in tree.nodes:
+            if not node.is_registered_node_type():
+                bl_idnames.add(node.bl_idname)
+    for bl_idname in bl_idnames:
+        load_node_class(bl_idname)
+
+def _background_step():
+    start = time.perf_counter()
+    while _pending_modules:
+        load_node_module(_pending_modules[0])
+        if time.perf_counter() - start > BACKGROUND_STEP_TIME:
+            return 0.0
+    info("sv: all node modules are loaded")
+    return None
+
+def start_background_loading():
+    if _lazy_loading and _pending_modules:
+        if not bpy.app.timers.is_registered(_background_step):
+            bpy.app.timers.register(_background_step, first_interval=1.0, persistent=True)
+
+def stop_background_loading():
+    if bpy.app.timers.is_registered(_background_step):
+        bpy.app.timers.unregister(_background_step)
+
+##################
+#                #
+#  Node stubs    #
+#                #
+##################
+
+class SvNodeStub(object):
+    """
+    Stand-in for node class which is not loaded yet.
+    Provides only what is needed to draw menus: label, icon, tooltip.
+    """
+    is_stub = True
+
+    @classmethod
+    def get_docstring(cls):
+        return SvDocstring(cls.__doc__)
+
+    @classmethod
+    def get_tooltip(cls):
+        return cls.get_docstring().get_tooltip()
+
+    @classmethod
+    def get_shorthand(cls):
+        return cls.get_docstring().get_shorthand()
+
+def is_node_available(bl_idname):
+    """
+    Whether the node is known and its dependencies are installed.
+    """
+    entry = _node_entries.get(bl_idname)
+    if entry is None:
+        return False
+    from sverchok import dependencies
+    return all(getattr(dependencies, name, None) is not None for name in entry['requires'])
+
+def get_node_stub(bl_idname):
+    stub = _node_stubs.get(bl_idname)
+    if stub is not None:
+        return stub
+    if not is_node_available(bl_idname):
+        return None
+    entry = _node_entries[bl_idname]
+    attributes = {key: entry[key] for key in NODE_CLASS_ATTRIBUTES if key in entry}
+    attributes['__doc__'] = entry['doc']
+    attributes['name'] = entry.get('bl_label', entry['class'])
+    stub = type(entry['class'], (SvNodeStub,), attributes)
+    # Menu code reads some attributes via bl_rna
+    stub.bl_rna = stub
+    _node_stubs[bl_idname] = stub
+    return stub
+
+def get_node_class_or_stub(bl_idname):
+    """
+    Get node class if it is loaded, otherwise a stub built from the
+    manifest. This never imports node modules.
+    """
+    from sverchok.utils import node_classes, get_node_class_reference
+    if not _lazy_loading or bl_idname == "NodeReroute":
+        return get_node_class_reference(bl_idname)
+    cls = node_classes.get(bl_idname)
+    if cls is not None:
+        return cls
+    return get_node_stub(bl_idname)
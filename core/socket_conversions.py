@@ -23,6 +23,7 @@ from sverchok.utils.curve import SvCurve
 from sverchok.utils.surface import SvSurface
 
 from mathutils import Matrix, Quaternion
+import numpy as np
 from numpy import ndarray
 
 # conversion tests, to be used in sv_get!
@@ -66,6 +67,56 @@ def is_ultimately(data, data_type):
         return is_ultimately(data[0], data_type)
     return isinstance(data, data_type)
 
+# Packed matrices.
+# Matrix socket data is a list of mathutils.Matrix, or a list of such lists.
+# Any such list of matrices can be replaced with an (N, 4, 4) numpy array
+# ("packed" matrices). Nodes which can process packed matrices ask for them
+# with SvMatrixSocket.sv_get(packed=True); all other consumers get lists of
+# Matrix, as before.
+
+def is_packed_matrices(data):
+    return isinstance(data, ndarray) and data.ndim == 3 and data.shape[1:] == (4, 4)
+
+def has_packed_matrices(data):
+    """
+    Check if data contains packed matrices.
+    Only the first item of each nesting level is checked.
+    """
+    while isinstance(data, (list, tuple)) and len(data):
+        data = data[0]
+    return is_packed_matrices(data) or (isinstance(data, ndarray) and data.shape == (4, 4))
+
+def pack_matrices(data):
+    """
+    Replace lists of matrices in data by (N, 4, 4) arrays.
+    [Matrix, Matrix, ...] -> array
+    [[Matrix, ...], [Matrix, ...]] -> [array, array]
+    """
+    if isinstance(data, ndarray):
+        if data.ndim == 2:
+            return data[np.newaxis]
+        return data
+    if not isinstance(data, (list, tuple)):
+        return data
+    if not len(data):
+        return np.empty((0, 4, 4))
+    first = data[0]
+    if isinstance(first, Matrix) or (isinstance(first, ndarray) and first.ndim == 2):
+        return np.array(data, dtype=np.float64)
+    return [pack_matrices(item) for item in data]
+
+def unpack_matrices(data):
+    """
+    Replace (N, 4, 4) arrays in data by lists of mathutils.Matrix.
+    """
+    if isinstance(data, ndarray):
+        if data.ndim == 2:
+            return Matrix(data.tolist())
+        return [Matrix(m) for m in data.tolist()]
+    if isinstance(data, (list, tuple)) and len(data) and isinstance(data[0], (list, tuple, ndarray)):
+        return [unpack_matrices(item) for item in data]
+    return data
+
 # ---
 
 
@@ -130,6 +181,8 @@ def is_matrix(mat):  # doesnt work with Mathutils.Matrix ?
 
 
 def get_locs_from_matrices(data):
+    if is_packed_matrices(data):
+        return [list(map(tuple, data[:, :3, 3].tolist()))]
     locations = []
     collect_vector = locations.append
 
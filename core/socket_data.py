@@ -16,6 +16,12 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import sys
+import threading
+from collections import OrderedDict, defaultdict, Counter
+
+import numpy as np
+
 from sverchok import data_structure
 from sverchok.utils.logging import warning, info, debug
 
@@ -28,6 +34,19 @@ sentinel = object()
 # socket cache
 socket_data_cache = {}
 
+# Memory accounting of socket_data_cache; only maintained when a cache limit
+# is set in preferences (data_structure.SOCKET_CACHE_TREE_LIMIT / _TOTAL_LIMIT).
+# (tree_id, socket_id) -> estimated size in bytes, in order of last access
+socket_data_sizes = OrderedDict()
+# tree_id -> total estimated size of the tree data in bytes
+tree_data_sizes = defaultdict(int)
+# (tree_id, socket_id) of data that was evicted from the cache
+evicted_sockets = set()
+# (tree_id, socket_id): number of nodes of running updates, which are yet
+# to read the socket data; such data is not evicted
+pending_reads = Counter()
+socket_cache_lock = threading.RLock()
+
 # faster than builtin deep copy for us.
 # useful for our limited case
 # we should be able to specify vectors here to get them create
@@ -35,13 +54,241 @@ socket_data_cache = {}
 
 
 def sv_deep_copy(lst):
-    """return deep copied data of list/tuple structure"""
+    """return deep copied data of list/tuple structure, including numpy arrays"""
     if isinstance(lst, (list, tuple)):
-        if lst and not isinstance(lst[0], (list, tuple)):
+        if lst and not isinstance(lst[0], (list, tuple, np.ndarray)):
             return lst[:]
-        return [sv_deep_copy(l) for l in lst]
+        # the innermost lists (f.e. faces) are copied here directly,
+        # without a recursive call per item
+        return [l[:] if isinstance(l, (list, tuple)) and not (l and isinstance(l[0], (list, tuple, np.ndarray)))
+                else sv_deep_copy(l) for l in lst]
+    if isinstance(lst, np.ndarray):
+        return lst.copy()
     return lst
 
+def sv_snapshot(data):
+    """
+    Return a full copy of socket data, including numpy arrays.
+    Unlike sv_deep_copy, this keeps tuples as tuples, so that
+    the result can be compared with the original by sv_data_equal.
+    """
+    if isinstance(data, np.ndarray):
+        return data.copy()
+    if isinstance(data, list):
+        return [sv_snapshot(item) for item in data]
+    if isinstance(data, tuple):
+        return tuple(sv_snapshot(item) for item in data)
+    return data
+
+def freeze_socket_data(data):
+    """
+    Replace numpy arrays in socket data by read-only views of them,
+    so that a node which tries to modify its input in place fails
+    immediately. Lists are rebuilt only down to the level of arrays;
+    lists which do not contain arrays (f.e. lists of faces) are returned
+    as they are, without looking into each item.
+    """
+    if isinstance(data, np.ndarray):
+        view = data.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(data, list) and data:
+        first = data[0]
+        if isinstance(first, np.ndarray) or (isinstance(first, list) and first and isinstance(first[0], (list, np.ndarray))):
+            frozen = [freeze_socket_data(item) for item in data]
+            if any(f is not item for f, item in zip(frozen, data)):
+                return frozen
+    return data
+
+
+def sv_data_equal(old, new):
+    """
+    Compare two socket data structures by value.
+    Nested lists and tuples are compared item by item, numpy arrays are
+    compared by shape, dtype and content. Other objects (curves, surfaces,
+    fields, ...) are compared by their == operator, which for most of them
+    means identity. If a mutable container is compared with itself, it is
+    considered changed, because it could be modified in place.
+    """
+    if old is new:
+        return not isinstance(old, (list, dict, np.ndarray))
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        if not (isinstance(old, np.ndarray) and isinstance(new, np.ndarray)):
+            return False
+        return old.shape == new.shape and old.dtype == new.dtype and np.array_equal(old, new)
+    if isinstance(old, (list, tuple)):
+        if type(old) is not type(new) or len(old) != len(new):
+            return False
+    try:
+        return bool(old == new)
+    except ValueError:
+        # numpy arrays nested into lists can not be compared with ==
+        if isinstance(old, (list, tuple)):
+            return all(sv_data_equal(o, n) for o, n in zip(old, new))
+        return False
+
+def get_node_outputs_data(node):
+    """
+    Return references to data currently stored in socket_data_cache
+    for all output sockets of the node (sentinel for sockets without data).
+    Used as a fingerprint of node outputs by the incremental update.
+    """
+    cache = socket_data_cache.get(node.id_data.tree_id, {})
+    return [cache.get(socket.socket_id, sentinel) for socket in node.outputs]
+
+def node_outputs_changed(node, old_outputs):
+    """
+    Check if data of node output sockets differs from old_outputs,
+    which was previously obtained by get_node_outputs_data().
+    """
+    new_outputs = get_node_outputs_data(node)
+    if len(old_outputs) != len(new_outputs):
+        return True
+    return not all(sv_data_equal(old, new) for old, new in zip(old_outputs, new_outputs))
+
+def get_node_inputs_snapshot(node):
+    """
+    Return copies of data of all linked input sockets of the node.
+    Used by data mutation check, see check_node_inputs_snapshot.
+    """
+    snapshot = []
+    for socket in node.inputs:
+        if not socket.is_linked:
+            continue
+        other = socket.other
+        if other is None or not hasattr(other, 'socket_id'):
+            continue
+        data = socket_data_cache.get(other.id_data.tree_id, {}).get(other.socket_id, sentinel)
+        if data is not sentinel:
+            snapshot.append((socket.name, data, sv_snapshot(data)))
+    return snapshot
+
+def check_node_inputs_snapshot(node, snapshot):
+    """
+    Warn about input sockets of the node, whose data in socket_data_cache
+    was modified in place by the node (so the node should have asked
+    for a deep copy of them).
+    Returns list of names of such sockets.
+    """
+    mutated = []
+    for socket_name, data, copy in snapshot:
+        if not sv_data_equal(copy, data):
+            warning("Node %s modified data of input socket %s in place", node.name, socket_name)
+            mutated.append(socket_name)
+    return mutated
+
+def sv_data_size(data, sample=16):
+    """
+    Estimate memory used by socket data, in bytes.
+    Numpy arrays are measured exactly. For lists longer than `sample`
+    items only the first `sample` items are measured and the result
+    is extrapolated, so the estimation is cheap for big meshes.
+    """
+    if isinstance(data, np.ndarray):
+        return sys.getsizeof(data) if data.base is None else data.nbytes + sys.getsizeof(data)
+    if isinstance(data, (list, tuple)):
+        size = sys.getsizeof(data)
+        n = len(data)
+        if n > sample:
+            size += sum(sv_data_size(item, sample) for item in data[:sample]) * n // sample
+        else:
+            size += sum(sv_data_size(item, sample) for item in data)
+        return size
+    if isinstance(data, dict):
+        return sys.getsizeof(data) + sum(sv_data_size(item, sample) for item in data.values())
+    return sys.getsizeof(data)
+
+def socket_cache_limits_enabled():
+    return bool(data_structure.SOCKET_CACHE_TREE_LIMIT or data_structure.SOCKET_CACHE_TOTAL_LIMIT)
+
+def get_socket_cache_size(tree_id=None):
+    """
+    Return estimated size of data in socket cache for the tree,
+    or for all trees, in bytes. Only data set since a cache limit was
+    enabled in preferences is accounted.
+    """
+    if tree_id is None:
+        return sum(tree_data_sizes.values())
+    return tree_data_sizes.get(tree_id, 0)
+
+def _evict_socket_data(key):
+    tree_id, s_id = key
+    size = socket_data_sizes.pop(key)
+    tree_data_sizes[tree_id] -= size
+    socket_data_cache.get(tree_id, {}).pop(s_id, None)
+    evicted_sockets.add(key)
+    if data_structure.DEBUG_MODE:
+        debug("Evicted %s bytes of socket %s data from cache", size, s_id)
+
+def _enforce_socket_cache_limits(tree_id, keep):
+    """
+    Evict least recently used data until the tree and the whole cache
+    fit into limits set in preferences. The `keep` entry is not evicted.
+    """
+    tree_limit = data_structure.SOCKET_CACHE_TREE_LIMIT
+    if tree_limit and tree_data_sizes[tree_id] > tree_limit:
+        for key in [key for key in socket_data_sizes if key[0] == tree_id and key != keep and key not in pending_reads]:
+            if tree_data_sizes[tree_id] <= tree_limit:
+                break
+            _evict_socket_data(key)
+
+    total_limit = data_structure.SOCKET_CACHE_TOTAL_LIMIT
+    if total_limit and get_socket_cache_size() > total_limit:
+        for key in [key for key in socket_data_sizes if key != keep and key not in pending_reads]:
+            if get_socket_cache_size() <= total_limit:
+                break
+            _evict_socket_data(key)
+
+def account_socket_data(tree_id, s_id, data):
+    """
+    Register new data of the socket in memory accounting,
+    and evict other data if the cache does not fit into limits.
+    """
+    key = (tree_id, s_id)
+    size = sv_data_size(data)
+    with socket_cache_lock:
+        tree_data_sizes[tree_id] += size - socket_data_sizes.pop(key, 0)
+        socket_data_sizes[key] = size
+        evicted_sockets.discard(key)
+        _enforce_socket_cache_limits(tree_id, key)
+
+def forget_socket_data_size(tree_id, s_id=None):
+    """
+    Remove socket (or all sockets of the tree, if s_id is None)
+    from memory accounting.
+    """
+    with socket_cache_lock:
+        if s_id is not None:
+            key = (tree_id, s_id)
+            tree_data_sizes[tree_id] -= socket_data_sizes.pop(key, 0)
+            evicted_sockets.discard(key)
+        else:
+            for key in [key for key in socket_data_sizes if key[0] == tree_id]:
+                del socket_data_sizes[key]
+            tree_data_sizes.pop(tree_id, None)
+            evicted_sockets.difference_update({key for key in evicted_sockets if key[0] == tree_id})
+
+def touch_socket_data(tree_id, s_id):
+    """Mark socket data as recently used"""
+    with socket_cache_lock:
+        key = (tree_id, s_id)
+        if key in socket_data_sizes:
+            socket_data_sizes.move_to_end(key)
+
+def pin_socket_data(keys):
+    """
+    Protect data of sockets (list of (tree_id, socket_id), one item per
+    reading node) from eviction, until unpin_socket_data is called for them.
+    """
+    with socket_cache_lock:
+        pending_reads.update(keys)
+
+def unpin_socket_data(keys):
+    with socket_cache_lock:
+        pending_reads.subtract(keys)
+        for key in keys:
+            if pending_reads[key] <= 0:
+                del pending_reads[key]
 
 # Build string for showing in socket label
 def SvGetSocketInfo(socket):
@@ -62,7 +309,8 @@ def SvGetSocketInfo(socket):
     if ng in socket_data_cache:
         if s_id in socket_data_cache[ng]:
             data = socket_data_cache[ng][s_id]
-            if data:
+            # data can be a numpy array (packed matrices)
+            if data is not None and len(data):
                 return str(len(data))
     return ''
 
@@ -80,6 +328,8 @@ def SvForgetSocket(socket):
         socket_data_cache[s_ng].pop(s_id, None)
     except KeyError:
         debug("it was never there")
+    if socket_data_sizes:
+        forget_socket_data_size(s_ng, s_id)
 
 def SvSetSocket(socket, out):
     """sets socket data for socket"""
@@ -93,7 +343,11 @@ def SvSetSocket(socket, out):
     s_ng = socket.id_data.tree_id
     if s_ng not in socket_data_cache:
         socket_data_cache[s_ng] = {}
+    if data_structure.CHECK_DATA_MUTATION:
+        out = freeze_socket_data(out)
     socket_data_cache[s_ng][s_id] = out
+    if socket_cache_limits_enabled():
+        account_socket_data(s_ng, s_id, out)
 
 
 def SvGetSocket(socket, deepcopy=True):
@@ -109,8 +363,15 @@ def SvGetSocket(socket, deepcopy=True):
         s_ng = other.id_data.tree_id
         if s_ng not in socket_data_cache:
             raise LookupError
+        if s_id not in socket_data_cache[s_ng] and (s_ng, s_id) in evicted_sockets:
+            # The update system processes nodes with evicted outputs again
+            # before their consumers; this happens only if the node is
+            # processed outside of the update system.
+            raise SvNoDataError(socket, msg="was evicted from socket cache, the tree has to be updated")
         if s_id in socket_data_cache[s_ng]:
             out = socket_data_cache[s_ng][s_id]
+            if socket_data_sizes:
+                touch_socket_data(s_ng, s_id)
             if deepcopy:
                 return sv_deep_copy(out)
             else:
@@ -179,6 +440,7 @@ def reset_socket_cache(ng):
     """
     global socket_data_cache
     socket_data_cache[ng.tree_id] = {}
+    forget_socket_data_size(ng.tree_id)
 
 def clear_all_socket_cache():
     """
@@ -186,3 +448,8 @@ def clear_all_socket_cache():
     """
     global socket_data_cache
     socket_data_cache.clear()
+    with socket_cache_lock:
+        socket_data_sizes.clear()
+        tree_data_sizes.clear()
+        evicted_sockets.clear()
+        pending_reads.clear()
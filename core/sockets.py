@@ -26,7 +26,11 @@ from bpy.types import NodeTree, NodeSocket
 from sverchok.core.socket_conversions import (
         DefaultImplicitConversionPolicy,
         FieldImplicitConversionPolicy,
-        is_vector_to_matrix
+        is_vector_to_matrix,
+        is_matrix_to_vector,
+        has_packed_matrices,
+        pack_matrices,
+        unpack_matrices
     )
 
 from sverchok.core.socket_data import (
@@ -267,6 +271,9 @@ class SvSocketCommon:
         if not self.needs_data_conversion():
             return source_data
         else:
+            if self.other.bl_idname == 'SvMatrixSocket' and not is_matrix_to_vector(self):
+                if has_packed_matrices(source_data):
+                    source_data = unpack_matrices(source_data)
             policy = self.node.get_implicit_conversions(self.name, implicit_conversions)
             self.node.debug(f"Trying to convert data for input socket {self.name} by {policy}")
             return policy.convert(self, source_data)
@@ -395,16 +402,26 @@ class SvMatrixSocket(NodeSocket, SvSocketCommon):
     def get_prop_data(self):
         return {}
 
-    def sv_get(self, default=sentinel, deepcopy=True, implicit_conversions=None):
+    def sv_get(self, default=sentinel, deepcopy=True, implicit_conversions=None, packed=False):
+        """
+        If packed is True, lists of matrices are returned as (N, 4, 4) numpy
+        arrays, otherwise as lists of mathutils.Matrix.
+        """
         self.num_matrices = 0
         if self.is_linked and not self.is_output:
             source_data = SvGetSocket(self, deepcopy = True if self.needs_data_conversion() else deepcopy)
-            return self.convert_data(source_data, implicit_conversions)
-
+            data = self.convert_data(source_data, implicit_conversions)
         elif default is sentinel:
             raise SvNoDataError(self)
         else:
-            return default
+            data = default
+
+        if packed:
+            return pack_matrices(data)
+        elif has_packed_matrices(data):
+            return unpack_matrices(data)
+        else:
+            return data
 
 
 class SvVerticesSocket(NodeSocket, SvSocketCommon):
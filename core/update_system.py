@@ -17,19 +17,31 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import heapq
+import itertools
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import bpy
 from mathutils import Vector
 
 from sverchok import data_structure
-from sverchok.core.socket_data import SvNoDataError, reset_socket_cache
+from sverchok.core.socket_data import (
+    SvNoDataError, reset_socket_cache,
+    get_node_outputs_data, node_outputs_changed,
+    get_node_inputs_snapshot, check_node_inputs_snapshot,
+    socket_cache_limits_enabled, evicted_sockets,
+    pin_socket_data, unpin_socket_data)
 from sverchok.utils.logging import debug, info, warning, error, exception
-from sverchok.utils.profile import profile
+from sverchok.utils.profile import profile, get_active_sampler
+from sverchok.utils import telemetry
 from sverchok.utils.exception_drawing_with_bgl import clear_exception_drawing_with_bgl, start_exception_drawing_with_bgl
 from sverchok.core.socket_data import clear_all_socket_cache
 from sverchok.core.node_id_dict import clear_nodes_id_dict
-from sverchok.core.links import clear_link_memory
+from sverchok.core.links import clear_link_memory, SvLink
+from sverchok.utils.frame_cache import clear_frame_caches
 import sverchok
 
 import traceback
@@ -55,6 +67,9 @@ def clear_system_cache():
     clear_all_socket_cache()
     clear_nodes_id_dict()
     clear_link_memory()
+    dependency_graphs.clear()
+    animation_cache.clear()
+    clear_frame_caches()
 
 def update_error_colors(self, context):
     global no_data_color
@@ -66,6 +81,11 @@ def update_error_colors(self, context):
 update_cache = {}
 # cache for partial update lists
 partial_update_cache = {}
+# cache of dependency graphs, tree_id: SvDependencyGraph
+dependency_graphs = {}
+graph_versions = itertools.count()
+# cache of animation update lists, tree name: SvAnimationClosure
+animation_cache = {}
 
 
 def make_dep_dict(node_tree, down=False):
@@ -116,6 +136,217 @@ def make_dep_dict(node_tree, down=False):
     return deps
 
 
+def find_wifi_links(node_tree):
+    """
+    Return list of (wifi in node name, wifi out node name) pairs of the tree.
+    """
+    ng = node_tree
+    wifi_out_nodes = [(name, node.var_name)
+                  for name, node in ng.nodes.items()
+                  if node.bl_idname == 'WifiOutNode' and node.outputs]
+    if not wifi_out_nodes:
+        return []
+    wifi_dict = {node.var_name: name
+                 for name, node in ng.nodes.items()
+                 if node.bl_idname == 'WifiInNode'}
+    links = []
+    for name, var_name in wifi_out_nodes:
+        other = wifi_dict.get(var_name)
+        if not other:
+            warning("Unsatisifed Wifi dependency: node, %s var,%s", name, var_name)
+            continue
+        links.append((other, name))
+    return links
+
+
+class SvDependencyGraph:
+    """
+    Persistent index of dependencies between nodes of a tree,
+    an alternative to calling make_dep_dict on each update.
+    Links between each pair of nodes are counted, so the index can be
+    patched when links are added or removed, instead of being rebuilt.
+    Links via reroutes are stored as links between the real nodes,
+    the same way as SvLinks stores them. Hidden links are tracked
+    separately and are not counted as dependencies.
+    The index is not checked against the tree when it is used; it is
+    patched or forgotten on tree update events, see update_dependency_graph.
+    """
+    def __init__(self):
+        # (from node name, to node name): number of links
+        self.link_counts = collections.Counter()
+        # node name: names of nodes it depends on
+        self.up = collections.defaultdict(set)
+        # node name: names of nodes depending on it
+        self.down = collections.defaultdict(set)
+        # node_id: node name, for nodes of the tree
+        self.node_names = dict()
+        # SvLink: number of such hidden links
+        self.hidden_links = collections.Counter()
+        self.wifi_links = []
+        # number of links in the tree the index corresponds to
+        self.n_links = 0
+        # changed each time the index is built or patched,
+        # unique among all graphs
+        self.version = next(graph_versions)
+
+    @staticmethod
+    def get_hidden_links(node_tree):
+        return collections.Counter(SvLink.init_from_links([link for link in node_tree.links if link.is_hidden]))
+
+    @classmethod
+    def build(cls, node_tree):
+        ng = node_tree
+        graph = cls()
+        for node in ng.nodes:
+            if hasattr(node, 'node_id'):
+                graph.node_names[node.node_id] = node.name
+        graph.hidden_links = cls.get_hidden_links(ng)
+        # hidden links are skipped, as in make_dep_dict
+        links = collections.Counter(SvLink.init_from_links(ng.links)) - graph.hidden_links
+        for link in links.elements():
+            graph.add_link(graph.node_names[link.from_node_id], graph.node_names[link.to_node_id])
+        graph.set_wifi_links(find_wifi_links(ng))
+        graph.n_links = len(ng.links)
+        return graph
+
+    def add_link(self, from_name, to_name):
+        self.link_counts[(from_name, to_name)] += 1
+        self.up[to_name].add(from_name)
+        self.down[from_name].add(to_name)
+
+    def remove_link(self, from_name, to_name):
+        key = (from_name, to_name)
+        count = self.link_counts[key] - 1
+        if count > 0:
+            self.link_counts[key] = count
+        else:
+            self.link_counts.pop(key, None)
+            self.up[to_name].discard(from_name)
+            self.down[from_name].discard(to_name)
+
+    def set_wifi_links(self, wifi_links):
+        for from_name, to_name in self.wifi_links:
+            self.remove_link(from_name, to_name)
+        for from_name, to_name in wifi_links:
+            self.add_link(from_name, to_name)
+        self.wifi_links = wifi_links
+
+    def node_names_changed(self, node_tree):
+        """Check if any node of the index was renamed"""
+        node_names = self.node_names
+        return any(node_names.get(getattr(node, 'node_id', None), node.name) != node.name
+                   for node in node_tree.nodes)
+
+    def patch(self, node_tree, added_links, removed_links):
+        """
+        Apply changes of tree links (lists of SvLink) to the index,
+        including links which were hidden or shown since the index was
+        built or patched last time.
+        Returns False if the index can not be patched and must be rebuilt.
+        """
+        ng = node_tree
+        hidden_links = self.get_hidden_links(ng)
+        wifi_links = find_wifi_links(ng)
+        if not added_links and not removed_links and hidden_links == self.hidden_links and wifi_links == self.wifi_links:
+            return True
+        nodes = ng.nodes_dict.get(ng)
+        for link in itertools.chain(added_links, hidden_links):
+            for node_id in (link.from_node_id, link.to_node_id):
+                if node_id not in self.node_names:
+                    node = nodes.get(node_id)
+                    if node is None:
+                        return False
+                    self.node_names[node_id] = node.name
+        for link in removed_links:
+            if link.from_node_id not in self.node_names or link.to_node_id not in self.node_names:
+                return False
+
+        # all links of the tree are counted first, then the hidden ones are subtracted
+        node_names = self.node_names
+        for link in itertools.chain(added_links, self.hidden_links.elements()):
+            self.add_link(node_names[link.from_node_id], node_names[link.to_node_id])
+        for link in itertools.chain(removed_links, hidden_links.elements()):
+            self.remove_link(node_names[link.from_node_id], node_names[link.to_node_id])
+        self.hidden_links = hidden_links
+        self.set_wifi_links(wifi_links)
+        self.n_links = len(ng.links)
+        self.version = next(graph_versions)
+        return True
+
+
+def get_dependency_graph(node_tree):
+    """
+    Return cached dependency graph of the tree, building it if necessary.
+    """
+    ng = node_tree
+    graph = dependency_graphs.get(ng.tree_id)
+    if graph is None:
+        graph = SvDependencyGraph.build(ng)
+        dependency_graphs[ng.tree_id] = graph
+    return graph
+
+def get_dep_dict(node_tree, down=False):
+    """
+    Cached version of make_dep_dict.
+    The returned dictionary is shared and must not be modified.
+    """
+    graph = get_dependency_graph(node_tree)
+    return graph.down if down else graph.up
+
+def update_dependency_graph(node_tree, links_changed=False):
+    """
+    Bring cached dependency graph of the tree in line with the tree;
+    called on tree update events. The graph is patched with links, which
+    were added and removed since the last update, as detected by SvLinks,
+    and with links which were hidden or shown. It is forgotten if nodes
+    were renamed.
+    If links_changed is True, must be called before the links cache is stored.
+    """
+    ng = node_tree
+    graph = dependency_graphs.get(ng.tree_id)
+    if graph is None:
+        return
+    if graph.node_names_changed(ng):
+        del dependency_graphs[ng.tree_id]
+        return
+    if links_changed:
+        added_links, removed_links = ng.sv_links.get_links_difference(ng)
+        if added_links is None:
+            del dependency_graphs[ng.tree_id]
+            return
+    else:
+        added_links = removed_links = []
+    if not graph.patch(ng, added_links, removed_links):
+        del dependency_graphs[ng.tree_id]
+
+def invalidate_dependency_graph(node_tree):
+    """
+    Forget dependency graph of the tree; it will be rebuilt when needed.
+    """
+    dependency_graphs.pop(node_tree.tree_id, None)
+
+def invalidate_all_dependency_graphs():
+    """
+    Forget dependency graphs of all trees. Called when a node is renamed
+    or a socket is hidden: such changes do not always cause tree update.
+    """
+    dependency_graphs.clear()
+
+# owner of message bus subscriptions of the update system
+msgbus_owner = object()
+
+def subscribe_to_tree_changes():
+    """
+    Subscribe to changes of nodes and sockets which affect dependency
+    graphs. Subscriptions are dropped when a file is loaded, so this
+    is called again after loading.
+    """
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    for key in [(bpy.types.Node, "name"), (bpy.types.NodeSocket, "hide")]:
+        bpy.msgbus.subscribe_rna(key=key, owner=msgbus_owner, args=(),
+                                 notify=invalidate_all_dependency_graphs)
+
+
 def make_update_list(node_tree, node_set=None, dependencies=None):
     """
     Makes a update list from a node_group
@@ -135,7 +366,7 @@ def make_update_list(node_tree, node_set=None, dependencies=None):
     else:
         return []
     if not dependencies:
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
     else:
         deps = dependencies
 
@@ -181,10 +412,10 @@ def separate_nodes(ng, links=None):
     nodes = set(ng.nodes.keys())
     if not nodes:
         return []
-    node_links = make_dep_dict(ng)
-    down = make_dep_dict(ng, down=True)
-    for name, links in down.items():
-        node_links[name].update(links)
+    graph = get_dependency_graph(ng)
+    node_links = collections.defaultdict(set)
+    for name in set(graph.up) | set(graph.down):
+        node_links[name] = graph.up[name] | graph.down[name]
     n = nodes.pop()
     node_set_list = [set([n])]
     node_stack = collections.deque()
@@ -233,8 +464,7 @@ def make_tree_from_nodes(node_names, tree, down=True):
     out_stack = collections.deque(node_names)
     current_node = out_stack.pop()
 
-    # build downwards links, this should be cached perhaps
-    node_links = make_dep_dict(ng, down)
+    node_links = get_dep_dict(ng, down)
     while current_node:
         for node in node_links[current_node]:
             if node not in out_set:
@@ -251,6 +481,114 @@ def make_tree_from_nodes(node_names, tree, down=True):
         return make_update_list(ng, out_set)
 
 
+class SvAnimationClosure:
+    """
+    Update list of nodes which can change on frame change: animatable
+    nodes of the tree (nodes with is_animatable property turned on, such as
+    Frame Info, Timer or Objects In) and all nodes downstream of them.
+    Other nodes keep their outputs in the socket cache during playback.
+    Nodes which define sv_frame_replay(frame) method (like Cache node) can
+    replay stored frames; nodes which feed only them are skipped then.
+    """
+    def __init__(self, sources, update_list, key):
+        self.sources = sources
+        self.update_list = update_list
+        self.key = key
+        # nodes which can output stored data instead of processing their inputs
+        self.replay_nodes = []
+        # frozenset of replaying node names: pruned update list
+        self.pruned_lists = dict()
+
+    @staticmethod
+    def make_key(node_tree, graph):
+        # the closure is valid until links or the set of nodes are changed;
+        # the graph is rebuilt when nodes are renamed
+        return (graph.version, graph.n_links, len(node_tree.nodes))
+
+    @classmethod
+    def build(cls, node_tree):
+        ng = node_tree
+        graph = get_dependency_graph(ng)
+        sources = [node.name for node in ng.nodes if getattr(node, 'is_animatable', False)]
+        if sources:
+            update_list = make_tree_from_nodes(sources, ng)
+        else:
+            update_list = []
+        closure = cls(sources, update_list, cls.make_key(ng, graph))
+        nodes = ng.nodes
+        closure.replay_nodes = [name for name in update_list if hasattr(nodes[name], 'sv_frame_replay')]
+        return closure
+
+    def get_pruned_list(self, node_tree, replaying):
+        """
+        Update list without nodes whose outputs go only to replaying nodes,
+        i.e. nodes which output stored data for the current frame and do
+        not read their inputs.
+        """
+        replaying = frozenset(replaying)
+        pruned = self.pruned_lists.get(replaying)
+        if pruned is None:
+            down = get_dep_dict(node_tree, down=True)
+            needed = set()
+            for name in reversed(self.update_list):
+                if name in replaying or not down[name]:
+                    needed.add(name)
+                elif any(dep in needed and dep not in replaying for dep in down[name]):
+                    needed.add(name)
+            pruned = [name for name in self.update_list if name in needed]
+            self.pruned_lists[replaying] = pruned
+        return pruned
+
+    def is_valid(self, node_tree):
+        ng = node_tree
+        if self.key != self.make_key(ng, get_dependency_graph(ng)):
+            return False
+        # animatable nodes can be renamed
+        nodes = ng.nodes
+        return all(name in nodes for name in self.sources)
+
+
+def get_animation_closure(node_tree):
+    """
+    Return cached animation update list of the tree, building it if necessary.
+    """
+    ng = node_tree
+    closure = animation_cache.get(ng.name)
+    if closure is None or not closure.is_valid(ng):
+        closure = SvAnimationClosure.build(ng)
+        animation_cache[ng.name] = closure
+    return closure
+
+def invalidate_animation_closure(node_tree):
+    """
+    Forget animation update list of the tree; it will be rebuilt on next frame change.
+    """
+    animation_cache.pop(node_tree.name, None)
+
+def process_animation(node_tree):
+    """
+    Process nodes which depend on animatable nodes of the tree,
+    on frame change.
+    """
+    global graphs
+    graphs = []
+    ng = node_tree
+    closure = get_animation_closure(ng)
+    if not closure.sources:
+        return
+    nodes = ng.nodes
+    update_list = closure.update_list
+    changed_nodes = closure.sources
+    if closure.replay_nodes:
+        frame = bpy.context.scene.frame_current
+        replaying = [name for name in closure.replay_nodes if nodes[name].sv_frame_replay(frame)]
+        if replaying:
+            update_list = closure.get_pruned_list(ng, replaying)
+            changed_nodes = closure.sources + replaying
+    reset_error_some_nodes(ng, update_list)
+    do_update(update_list, nodes, changed_nodes=changed_nodes)
+
+
 # to make update tree based on node types and node names bases
 # no used yet
 # should add a check do find animated or driven nodes.
@@ -282,7 +620,9 @@ def do_update_heat_map(node_list, nodes):
     times = do_update_general(node_list, nodes)
     if not times:
         return
-    t_max = max(times)
+    # the update can process more nodes than node_list, see SvUpdateInputs
+    times = {item["name"]: item["duration"] for item in graphs[-1]}
+    t_max = max(times.values())
     addon_name = data_structure.SVERCHOK_NAME
     addon = bpy.context.preferences.addons.get(addon_name)
     if addon:
@@ -293,20 +633,17 @@ def do_update_heat_map(node_list, nodes):
         error("Cannot find preferences")
         cold = Vector((1, 1, 1))
         hot = (.8, 0, 0)
-    for name, t in zip(node_list, times):
+    for name, t in times.items():
         nodes[name].use_custom_color = True
         # linear scale.
         nodes[name].color = cold.lerp(hot, t / t_max)
 
 def update_error_nodes(ng, name, err=Exception):
-    if ng.bl_idname == "SverchGroupTreeType":
-        return # ignore error color inside of monad
+    # nodes of monads are colored as well, monad resets their colors before processing
     if "error nodes" in ng:
         error_nodes = ast.literal_eval(ng["error nodes"])
     else:
         error_nodes = {}
-    if ng.bl_idname == "SverchGroupTreeType":
-        return
     node = ng.nodes.get(name)
     if not node:
         return
@@ -357,10 +694,67 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
+class SvUpdateInputs:
+    """
+    Keeps socket data, needed by nodes of one update, in socket cache,
+    when the cache has memory limits.
+    Nodes, whose outputs were evicted from the cache and are read by nodes
+    of the update, are added to the update list (and to `rescheduled`),
+    so that they are processed again before their consumers. Data read by
+    nodes of the update is protected from eviction until these nodes are
+    done. Without cache limits this does nothing.
+    """
+    def __init__(self, node_list, nodes):
+        self.node_list = node_list
+        self.rescheduled = set()
+        # node name: keys of input data pinned for the node
+        self.pending = dict()
+        if not (socket_cache_limits_enabled() or evicted_sockets):
+            return
+
+        ng = nodes.id_data
+        names = set(node_list)
+        stack = list(node_list)
+        while stack:
+            name = stack.pop()
+            keys = []
+            for socket in nodes[name].inputs:
+                if not socket.is_linked:
+                    continue
+                other = socket.other
+                if other is None or not hasattr(other, 'socket_id'):
+                    continue
+                key = (other.id_data.tree_id, other.socket_id)
+                keys.append(key)
+                other_node = other.node
+                if key in evicted_sockets and other.id_data == ng and other_node.name not in names:
+                    names.add(other_node.name)
+                    stack.append(other_node.name)
+                    self.rescheduled.add(other_node.name)
+            self.pending[name] = keys
+        if self.rescheduled:
+            debug("Nodes %s are processed again, their outputs were evicted from socket cache", self.rescheduled)
+            self.node_list = make_update_list(ng, names)
+        for keys in self.pending.values():
+            pin_socket_data(keys)
+
+    def node_done(self, name):
+        keys = self.pending.pop(name, None)
+        if keys:
+            unpin_socket_data(keys)
+
+    def finish(self):
+        for keys in self.pending.values():
+            unpin_socket_data(keys)
+        self.pending.clear()
+
 @profile(section="UPDATE")
-def do_update_general(node_list, nodes, procesed_nodes=set()):
+def do_update_general(node_list, nodes, procesed_nodes=set(), changed_nodes=None):
     """
-    General update function for node set
+    General update function for node set.
+    If changed_nodes is passed, the update is incremental: a node is
+    processed only if it is one of changed_nodes, or if output data of
+    any of its dependencies has changed during this update.
     """
     global graphs
     timings = []
@@ -373,16 +767,62 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     # this is a no-op if no bgl being drawn.
     clear_exception_drawing_with_bgl(nodes)
 
+    incremental = changed_nodes is not None
+    if incremental:
+        deps = get_dep_dict(nodes.id_data)
+        dirty_nodes = set()
+
+    sampler = get_active_sampler()
+
+    inputs = SvUpdateInputs(node_list, nodes)
+    node_list = inputs.node_list
+    if incremental and inputs.rescheduled:
+        changed_nodes = set(changed_nodes) | inputs.rescheduled
+
     for node_name in node_list:
         if node_name in done_nodes:
             continue
         try:
             node = nodes[node_name]
+            can_process = hasattr(node, "process")
+            if incremental:
+                if node_name not in changed_nodes and dirty_nodes.isdisjoint(deps[node_name]):
+                    if data_structure.DEBUG_MODE:
+                        debug("Skipped %s: inputs did not change", node_name)
+                    continue
+                if can_process:
+                    outputs_before = get_node_outputs_data(node)
+
+            check_mutation = can_process and data_structure.CHECK_DATA_MUTATION
+            if check_mutation:
+                inputs_snapshot = get_node_inputs_snapshot(node)
+            collect_telemetry = can_process and telemetry.is_currently_enabled
+            if collect_telemetry:
+                telemetry_data = telemetry.start_node(node)
+
+            if sampler:
+                sampler.set_current_node(node)
+
             start = time.perf_counter()
-            if hasattr(node, "process"):
+            if can_process:
                 node.process()
 
             delta = time.perf_counter() - start
+
+            if sampler:
+                sampler.set_current_node(None)
+
+            if collect_telemetry:
+                telemetry.finish_node(node, start, delta, telemetry_data)
+
+            if check_mutation:
+                check_node_inputs_snapshot(node, inputs_snapshot)
+
+            if incremental:
+                # nodes without process (reroutes) just pass the change through
+                if not can_process or node_outputs_changed(node, outputs_before):
+                    dirty_nodes.add(node_name)
+
             total_time += delta
 
             if data_structure.DEBUG_MODE:
@@ -392,6 +832,8 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             gather({"name" : node_name, "bl_idname": node.bl_idname, "start": start, "duration": delta})
 
         except Exception as err:
+            if sampler:
+                sampler.set_current_node(None)
             ng = nodes.id_data
             update_error_nodes(ng, node_name, err)
             #traceback.print_tb(err.__traceback__)
@@ -403,8 +845,13 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
                     error_text = traceback.format_exc()
                     start_exception_drawing_with_bgl(ng, node_name, error_text, err)
             
+            inputs.finish()
             return None
 
+        finally:
+            inputs.node_done(node_name)
+
+    inputs.finish()
     graphs.append(graph)
     if data_structure.DEBUG_MODE:
         debug("Node set updated in: %.4f seconds", total_time)
@@ -412,9 +859,228 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     return timings
 
 
-def do_update(node_list, nodes):
+# thread pool used by parallel update
+update_executor = None
+
+def get_update_executor():
+    """
+    Return thread pool for parallel update, (re)creating it
+    if the number of threads was changed in preferences.
+    """
+    global update_executor
+    n_threads = data_structure.PARALLEL_UPDATE_THREADS or os.cpu_count() or 1
+    if update_executor is None or update_executor._max_workers != n_threads:
+        if update_executor is not None:
+            update_executor.shutdown(wait=True)
+        update_executor = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="sverchok_update")
+    return update_executor
+
+def is_threaded_node(node):
+    """
+    Check if the node can do its computations in a worker thread.
+    Such nodes define prepare_threaded_process() method, see SverchCustomTreeNode.
+    All other nodes are processed in the main thread.
+    """
+    return hasattr(node, 'prepare_threaded_process')
+
+@profile(section="UPDATE")
+def do_update_parallel(node_list, nodes, changed_nodes=None):
+    """
+    Update function for node set, which processes nodes on a thread pool.
+    A node is started as soon as all its dependencies from node_list are
+    processed, so independent subtrees and independent branches of one
+    subtree are evaluated concurrently.
+    Blender data (sockets, node properties, scene) is accessed only from
+    the main thread: for nodes which define prepare_threaded_process(),
+    inputs are read and outputs are stored in the main thread, and only
+    the computation between them is done by a worker thread. Other nodes
+    are processed in the main thread, in the order of node_list, while
+    workers are busy with their computations.
+    If a node fails, nodes downstream of it are not processed, while
+    other branches are.
+    changed_nodes has the same meaning as for do_update_general.
+    """
+    global graphs
+    graph = []
+    timings = {}
+
+    clear_exception_drawing_with_bgl(nodes)
+
+    ng = nodes.id_data
+    deps = get_dep_dict(ng)
+    inputs = SvUpdateInputs(node_list, nodes)
+    node_list = inputs.node_list
+    if changed_nodes is not None and inputs.rescheduled:
+        changed_nodes = set(changed_nodes) | inputs.rescheduled
+    node_set = set(node_list)
+    order = {name: i for i, name in enumerate(node_list)}
+    waiting = {}
+    dependents = collections.defaultdict(list)
+    for name in node_list:
+        node_deps = deps[name] & node_set
+        waiting[name] = len(node_deps)
+        for dep in node_deps:
+            dependents[dep].append(name)
+
+    incremental = changed_nodes is not None
+    dirty_nodes = set()
+    errors = []
+    sampler = get_active_sampler()
+
+    class NodeState:
+        # everything recorded about a node between start_node and finish_node
+        pass
+
+    def start_node(node):
+        state = NodeState()
+        if incremental:
+            state.outputs_before = get_node_outputs_data(node)
+        state.inputs_snapshot = get_node_inputs_snapshot(node) if data_structure.CHECK_DATA_MUTATION else None
+        state.collect_telemetry = telemetry.is_currently_enabled
+        if state.collect_telemetry:
+            state.telemetry_data = telemetry.start_node(node)
+        state.label = f"{ng.name}: {node.name}"
+        state.thread = None
+        state.start = time.perf_counter()
+        state.duration = 0.0
+        return state
+
+    def run_main(state, function, *args):
+        if sampler:
+            sampler.set_current_label(state.label)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            state.duration += time.perf_counter() - start
+            if sampler:
+                sampler.set_current_label(None)
+
+    def run_worker(label, compute):
+        # runs in a worker thread; must not touch Blender data
+        if sampler:
+            sampler.set_current_label(label)
+        start = time.perf_counter()
+        try:
+            return compute(), time.perf_counter() - start, threading.get_ident()
+        finally:
+            if sampler:
+                sampler.set_current_label(None)
+
+    def finish_node(name, node, state):
+        if state.collect_telemetry:
+            telemetry.finish_node(node, state.start, state.duration, state.telemetry_data, thread=state.thread)
+        if state.inputs_snapshot is not None:
+            check_node_inputs_snapshot(node, state.inputs_snapshot)
+        changed = not incremental or node_outputs_changed(node, state.outputs_before)
+        timings[name] = state.duration
+        graph.append({"name" : name, "bl_idname": node.bl_idname, "start": state.start, "duration": state.duration})
+        if data_structure.DEBUG_MODE:
+            debug("Processed  %s in: %.4f", name, state.duration)
+        finish(name, changed)
+
+    def finish(name, changed):
+        inputs.node_done(name)
+        if changed:
+            dirty_nodes.add(name)
+        for other in dependents[name]:
+            waiting[other] -= 1
+            if not waiting[other]:
+                ready.append(other)
+
+    executor = get_update_executor()
+    ready = collections.deque(name for name in node_list if not waiting[name])
+    ready_main = []
+    # future: (node name, store function, NodeState)
+    running = {}
+
+    while ready or ready_main or running:
+        while ready:
+            name = ready.popleft()
+            node = nodes[name]
+            if not hasattr(node, "process"):
+                finish(name, True)
+            elif incremental and name not in changed_nodes and dirty_nodes.isdisjoint(deps[name]):
+                finish(name, False)
+            elif is_threaded_node(node):
+                try:
+                    state = start_node(node)
+                    prepared = run_main(state, node.prepare_threaded_process)
+                    if prepared is None:
+                        finish_node(name, node, state)
+                    else:
+                        compute, store = prepared
+                        future = executor.submit(run_worker, state.label, compute)
+                        running[future] = (name, store, state)
+                except Exception as err:
+                    errors.append((name, err))
+            else:
+                heapq.heappush(ready_main, (order[name], name))
+
+        if running:
+            # do not wait for workers while there are nodes for the main thread
+            timeout = 0 if ready_main else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, store, state = running.pop(future)
+                try:
+                    result, duration, state.thread = future.result()
+                    state.duration += duration
+                    node = nodes[name]
+                    run_main(state, store, result)
+                    finish_node(name, node, state)
+                except Exception as err:
+                    errors.append((name, err))
+            if done:
+                continue
+
+        if ready_main:
+            _, name = heapq.heappop(ready_main)
+            node = nodes[name]
+            try:
+                state = start_node(node)
+                run_main(state, node.process)
+                finish_node(name, node, state)
+            except Exception as err:
+                errors.append((name, err))
+
+    inputs.finish()
+    graphs.append(graph)
+
+    for node_name, err in errors:
+        update_error_nodes(ng, node_name, err)
+        error_text = "".join(traceback.format_exception(type(err), err, err.__traceback__))
+        error("Node %s had exception: %s\n%s", node_name, err, error_text)
+
+    if errors:
+        if getattr(ng, "sv_show_error_in_tree", False):
+            node_name, err = errors[0]
+            error_text = "".join(traceback.format_exception(type(err), err, err.__traceback__))
+            start_exception_drawing_with_bgl(ng, node_name, error_text, err)
+        return None
+
+    if data_structure.DEBUG_MODE:
+        debug("Node set updated in: %.4f seconds", sum(timings.values()))
+
+    return [timings.get(name, 0.0) for name in node_list]
+
+def do_update(node_list, nodes, changed_nodes=None):
+    """
+    Process nodes from node_list.
+    changed_nodes are the nodes which initiated the update; if incremental
+    update is enabled, nodes whose inputs did not change are skipped.
+    """
+    if changed_nodes is not None and data_structure.INCREMENTAL_UPDATE:
+        changed_nodes = set(changed_nodes)
+    else:
+        changed_nodes = None
+
     if data_structure.HEAT_MAP:
         do_update_heat_map(node_list, nodes)
+    elif data_structure.PARALLEL_UPDATE:
+        do_update_parallel(node_list, nodes, changed_nodes=changed_nodes)
+    elif changed_nodes is not None:
+        do_update_general(node_list, nodes, changed_nodes=changed_nodes)
     else:
         do_update_general(node_list, nodes)
 
@@ -433,10 +1099,11 @@ def build_update_list(ng=None):
             build_update_list(ng)
     else:
         node_sets = separate_nodes(ng)
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
         out = [make_update_list(ng, s, deps) for s in node_sets]
         update_cache[ng.name] = out
         partial_update_cache[ng.name] = {}
+        invalidate_animation_closure(ng)
         # reset_socket_cache(ng)
 
 
@@ -473,7 +1140,7 @@ def process_from_nodes(nodes):
     ng = nodes[0].id_data
     update_list = make_tree_from_nodes(node_names, ng)
     reset_error_some_nodes(ng, update_list)
-    do_update(update_list, ng.nodes)
+    do_update(update_list, ng.nodes, changed_nodes=node_names)
 
 
 def process_from_node(node):
@@ -501,7 +1168,7 @@ def process_from_node(node):
         nodes = ng.nodes
         if not ng.sv_process:
             return
-        do_update(update_list, nodes)
+        do_update(update_list, nodes, changed_nodes=[node.name])
     else:
         process_tree(ng)
 
@@ -528,8 +1195,12 @@ def process_tree(ng=None):
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
-        for l in update_list:
-            do_update(l, ng.nodes)
+        if data_structure.PARALLEL_UPDATE and not data_structure.HEAT_MAP:
+            # independent subtrees are processed concurrently
+            do_update_parallel(list(itertools.chain.from_iterable(update_list)), ng.nodes)
+        else:
+            for l in update_list:
+                do_update(l, ng.nodes)
     else:
         pass
 
@@ -555,3 +1226,11 @@ def register():
     addon = bpy.context.preferences.addons.get(addon_name)
     if addon:
         update_error_colors(addon.preferences, [])
+    subscribe_to_tree_changes()
+
+def unregister():
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    global update_executor
+    if update_executor is not None:
+        update_executor.shutdown(wait=True)
+        update_executor = None
@@ -37,6 +37,13 @@ from sverchok.core.events import CurrentEvents, BlenderEventsTypes
 
 DEBUG_MODE = False
 HEAT_MAP = False
+CHECK_DATA_MUTATION = False
+INCREMENTAL_UPDATE = False
+PARALLEL_UPDATE = False
+PARALLEL_UPDATE_THREADS = 0
+# socket data cache limits, in bytes; 0 means no limit
+SOCKET_CACHE_TREE_LIMIT = 0
+SOCKET_CACHE_TOTAL_LIMIT = 0
 RELOAD_EVENT = False
 
 # this is set correctly later.
@@ -853,6 +860,12 @@ def setup_init():
     """
     global DEBUG_MODE
     global HEAT_MAP
+    global CHECK_DATA_MUTATION
+    global INCREMENTAL_UPDATE
+    global PARALLEL_UPDATE
+    global PARALLEL_UPDATE_THREADS
+    global SOCKET_CACHE_TREE_LIMIT
+    global SOCKET_CACHE_TOTAL_LIMIT
     global SVERCHOK_NAME
     import sverchok
     SVERCHOK_NAME = sverchok.__name__
@@ -860,6 +873,12 @@ def setup_init():
     if addon:
         DEBUG_MODE = addon.preferences.show_debug
         HEAT_MAP = addon.preferences.heat_map
+        CHECK_DATA_MUTATION = addon.preferences.check_data_mutation
+        INCREMENTAL_UPDATE = addon.preferences.incremental_update
+        PARALLEL_UPDATE = addon.preferences.parallel_update
+        PARALLEL_UPDATE_THREADS = addon.preferences.parallel_update_threads
+        SOCKET_CACHE_TREE_LIMIT = addon.preferences.socket_cache_tree_limit * 1024 * 1024
+        SOCKET_CACHE_TOTAL_LIMIT = addon.preferences.socket_cache_total_limit * 1024 * 1024
     else:
         print("Setup of preferences failed")
 
@@ -28,6 +28,7 @@ import bl_operators
 
 import sverchok
 from sverchok.utils import get_node_class_reference
+from sverchok.core.node_manifest import get_node_class_or_stub, load_node_class
 from sverchok.utils.logging import info, error, exception
 from sverchok.utils.sv_help import build_help_remap
 from sverchok.ui.sv_icons import node_icon, icon
@@ -161,7 +162,7 @@ class SverchNodeItem(object):
             return self.get_node_class().bl_rna.name
 
     def get_node_class(self):
-        return get_node_class_reference(self.nodetype)
+        return get_node_class_or_stub(self.nodetype)
 
     def get_node_strings(self):
         node_class = self.get_node_class()
@@ -213,6 +214,7 @@ class SverchNodeItem(object):
                 # SverchNodeItem instance.
                 operator.use_transform = True
                 operator.type = self.nodetype
+                load_node_class(self.nodetype)
                 operator.create_node(context)
                 return {'FINISHED'}
 
@@ -326,7 +328,7 @@ class SvNamedButtonsLayout(SvOperatorLayout):
 
 def get_node_idname_for_operator(nodetype):
     """Select valid bl_idname for node to create node adding operator bl_idname."""
-    rna = get_node_class_reference(nodetype)
+    rna = get_node_class_or_stub(nodetype)
     if not rna:
         raise Exception("Can't find registered node {}".format(nodetype))
     if hasattr(rna, 'bl_idname'):
@@ -343,7 +345,7 @@ def draw_add_node_operator(layout, nodetype, label=None, icon_name=None, params=
     """
 
     default_context = bpy.app.translations.contexts.default
-    node_class = get_node_class_reference(nodetype)
+    node_class = get_node_class_or_stub(nodetype)
     if node_class is None:
         info("cannot locate node class: %s", nodetype)
         return
@@ -435,7 +437,7 @@ def make_categories():
         node_items = []
         for item in nodes:
             nodetype = item[0]
-            rna = get_node_class_reference(nodetype)
+            rna = get_node_class_or_stub(nodetype)
             if not rna and not nodetype == 'separator':
                 info("Node `%s' is not available (probably due to missing dependencies).", nodetype)
             else:
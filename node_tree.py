@@ -32,8 +32,9 @@ from sverchok.data_structure import get_other_socket
 
 from sverchok.core.update_system import (
     build_update_list,
+    update_dependency_graph, invalidate_dependency_graph,
     process_from_node, process_from_nodes,
-    process_tree,
+    process_tree, process_animation,
     get_update_lists, update_error_nodes,
     get_original_node_color,
     is_first_run,
@@ -231,7 +232,9 @@ class SvNodeTreeCommon(object):
 
     def sv_update(self):
         self.update_sv_links()
-        if self.links_have_changed():
+        links_changed = self.links_have_changed()
+        update_dependency_graph(self, links_changed)
+        if links_changed:
             self.has_changed = True
             build_update_list(self)
             process_from_nodes(self.get_nodes())
@@ -240,12 +243,7 @@ class SvNodeTreeCommon(object):
             process_from_nodes(self.get_groups())
 
     def animation_update(self):
-        animated_nodes = []
-        for node in self.nodes:
-            if hasattr(node, 'is_animatable'):
-                if node.is_animatable:
-                    animated_nodes.append(node)
-        process_from_nodes(animated_nodes)
+        process_animation(self)
 
 class SvGenericUITooltipOperator(bpy.types.Operator):
     arg: StringProperty()
@@ -359,8 +357,11 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
             return
         if self.skip_tree_update:
             # print('throttled update from context manager')
+            invalidate_dependency_graph(self)
             return
         if self.configuring_new_node or self.is_frozen() or not self.sv_process:
+            # the dependency graph is not patched by sv_update() now
+            invalidate_dependency_graph(self)
             return
 
         self.sv_update()
@@ -421,6 +422,16 @@ class SverchCustomTreeNode:
     # E.g., draft_properties_mapping = dict(count = 'count_draft').
     draft_properties_mapping = dict()
 
+    # Nodes which can do their computations in a worker thread of parallel
+    # update define prepare_threaded_process(self) method. It is called in
+    # the main thread instead of process(); it reads inputs and properties
+    # and returns None if there is nothing to do, or a pair of functions
+    # (compute, store). compute() is called without arguments in a worker
+    # thread, and must not access any Blender data, including sockets and
+    # properties of the node; store(result) is then called in the main
+    # thread with the value returned by compute(), to set outputs.
+    # process() of such nodes usually just calls these three in turn.
+
     n_id : StringProperty(default="")
     
     def update(self):
@@ -78,26 +78,38 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         so.new('SvStringsSocket', 'index')
         so.new('SvStringsSocket', 'distance')
 
-    def process(self):
-        '''main node function called every update'''
+    def prepare_threaded_process(self):
         si = self.inputs
         so = self.outputs
         if not (any(s.is_linked for s in so) and si[0].is_linked):
-            return
+            return None
         V1, V2, N, R = mlr([i.sv_get() for i in si])
-        out = []
         Co, ind, dist = so
         find_n = self.mode == "find_n"
         func = self.func_dict[self.mode]
-        for v, v2, k in zip(V1, V2, (N if find_n else R)):
-            func(v, v2, k, out)
-
-        if Co.is_linked:
-            Co.sv_set([[i[0][:] for i in i2] for i2 in out])
-        if ind.is_linked:
-            ind.sv_set([[i[1] for i in i2] for i2 in out])
-        if dist.is_linked:
-            dist.sv_set([[i[2] for i in i2] for i2 in out])
+
+        def compute():
+            out = []
+            for v, v2, k in zip(V1, V2, (N if find_n else R)):
+                func(v, v2, k, out)
+            return out
+
+        def store(out):
+            if Co.is_linked:
+                Co.sv_set([[i[0][:] for i in i2] for i2 in out])
+            if ind.is_linked:
+                ind.sv_set([[i[1] for i in i2] for i2 in out])
+            if dist.is_linked:
+                dist.sv_set([[i[2] for i in i2] for i2 in out])
+
+        return compute, store
+
+    def process(self):
+        '''main node function called every update'''
+        prepared = self.prepare_threaded_process()
+        if prepared is not None:
+            compute, store = prepared
+            store(compute())
 
 
 def register():
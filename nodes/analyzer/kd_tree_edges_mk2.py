@@ -22,7 +22,7 @@ import mathutils
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.sv_KDT_utils import kdt_closest_edges
+from sverchok.utils.sv_KDT_utils import kdt_closest_edges_data
 
 class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     '''
@@ -59,17 +59,17 @@ class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
 
         self.outputs.new('SvStringsSocket', 'Edges')
 
-    def process(self):
+    def prepare_threaded_process(self):
         inputs = self.inputs
         outputs = self.outputs
 
         try:
             linked = outputs['Edges'].is_linked
             if not linked:
-                return
+                return None
             verts = inputs['Verts'].sv_get(deepcopy=False)[0]
         except (IndexError, KeyError) as e:
-            return
+            return None
 
         optional_sockets = [
             ['mindist', self.mindist, float],
@@ -85,8 +85,19 @@ class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                 sock_input = s_default_value
             socket_inputs.append(sock_input)
 
-        kdt_closest_edges(verts, socket_inputs, outputs['Edges'])
+        def compute():
+            return kdt_closest_edges_data(verts, socket_inputs)
+
+        def store(edges):
+            outputs['Edges'].sv_set(edges)
 
+        return compute, store
+
+    def process(self):
+        prepared = self.prepare_threaded_process()
+        if prepared is not None:
+            compute, store = prepared
+            store(compute())
 
 def register():
     bpy.utils.register_class(SvKDTreeEdgesNodeMK2)
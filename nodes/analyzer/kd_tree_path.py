@@ -94,26 +94,35 @@ class SvKDTreePathNode(bpy.types.Node, SverchCustomTreeNode):
         si = self.inputs
         return list_match_func[self.list_match_global]([s.sv_get(default=[[]]) for s in si])
 
-    def process(self):
-
-        inputs = self.inputs
-        outputs = self.outputs
+    def prepare_threaded_process(self):
         so = self.outputs
         si = self.inputs
         if not so[0].is_linked and si[0].is_linked:
-            return
+            return None
 
-        result = []
         group = self.get_data()
 
         match_func = list_match_func[self.list_match_local]
+        cycle = self.cycle
+
+        def compute():
+            result = []
+            for verts, radius, start_indexes in zip(*group):
+                verts, radius = match_func([verts, radius])
+                for st in start_indexes:
+                    kdt_closest_path(verts, radius, st%len(verts), result, cycle)
+            return result
 
-        for verts, radius, start_indexes in zip(*group):
-            verts, radius = match_func([verts, radius])
-            for st in start_indexes:
-                kdt_closest_path(verts, radius, st%len(verts), result, self.cycle)
+        def store(result):
+            so[0].sv_set(result)
 
-        so[0].sv_set(result)
+        return compute, store
+
+    def process(self):
+        prepared = self.prepare_threaded_process()
+        if prepared is not None:
+            compute, store = prepared
+            store(compute())
 
 
 def register():
@@ -103,10 +103,7 @@ else:
                     u_range = np.linspace(u_min, u_max, num=samples_u)
                     v_range = np.linspace(v_min, v_max, num=samples_v)
 
-                    us, vs = np.meshgrid(u_range, v_range, indexing='ij')
-                    us, vs = us.flatten(), vs.flatten()
-
-                    surface_points = surface.evaluate_array(us, vs)
+                    surface_points = surface.evaluate_grid(u_range, v_range).reshape((-1, 3))
                     xs = surface_points[:,0]
                     ys = surface_points[:,1]
                     zs = surface_points[:,2]
@@ -3,7 +3,6 @@ import numpy as np
 
 import bpy
 from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, StringProperty
-from mathutils import kdtree
 from mathutils import bvhtree
 
 from sverchok.node_tree import SverchCustomTreeNode, throttled
@@ -132,12 +131,8 @@ class SvAttractorFieldNodeMk2(bpy.types.Node, SverchCustomTreeNode):
             vfields = [SvVectorFieldPointDistance(center, falloff=falloff) for center in centers]
             vfield = SvAverageVectorField(vfields)
         elif self.merge_mode == 'MIN':
-            kdt = kdtree.KDTree(len(centers))
-            for i, v in enumerate(centers):
-                kdt.insert(v, i)
-            kdt.balance()
-            vfield = SvKdtVectorField(kdt=kdt, falloff=falloff)
-            sfield = SvKdtScalarField(kdt=kdt, falloff=falloff)
+            vfield = SvKdtVectorField(vertices=centers, falloff=falloff)
+            sfield = SvKdtScalarField(vertices=centers, falloff=falloff)
         else: # SEP
             sfield = [SvScalarFieldPointDistance(center, falloff=falloff) for center in centers]
             vfield = [SvVectorFieldPointDistance(center, falloff=falloff) for center in centers]
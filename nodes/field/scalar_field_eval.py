@@ -30,33 +30,44 @@ class SvScalarFieldEvaluateNode(bpy.types.Node, SverchCustomTreeNode):
         d.prop = (0.0, 0.0, 0.0)
         self.outputs.new('SvStringsSocket', 'Value')
 
-    def process(self):
+    def prepare_threaded_process(self):
         if not any(socket.is_linked for socket in self.outputs):
-            return
+            return None
 
         vertices_s = self.inputs['Vertices'].sv_get()
         vertices_s = ensure_nesting_level(vertices_s, 4)
         fields_s = self.inputs['Field'].sv_get()
         fields_s = ensure_nesting_level(fields_s, 2, data_types=(SvScalarField,))
 
-        values_out = []
-        for fields, vertices_i in zip_long_repeat(fields_s, vertices_s):
-            for field, vertices in zip_long_repeat(fields, vertices_i):
-                if len(vertices) == 0:
-                    new_values = []
-                elif len(vertices) == 1:
-                    vertex = vertices[0]
-                    value = field.evaluate(*vertex)
-                    new_values = [value]
-                else:
-                    XYZ = np.array(vertices)
-                    xs = XYZ[:,0]
-                    ys = XYZ[:,1]
-                    zs = XYZ[:,2]
-                    new_values = field.evaluate_grid(xs, ys, zs).tolist()
-                values_out.append(new_values)
+        def compute():
+            values_out = []
+            for fields, vertices_i in zip_long_repeat(fields_s, vertices_s):
+                for field, vertices in zip_long_repeat(fields, vertices_i):
+                    if len(vertices) == 0:
+                        new_values = []
+                    elif len(vertices) == 1:
+                        vertex = vertices[0]
+                        value = field.evaluate(*vertex)
+                        new_values = [value]
+                    else:
+                        XYZ = np.array(vertices)
+                        xs = XYZ[:,0]
+                        ys = XYZ[:,1]
+                        zs = XYZ[:,2]
+                        new_values = field.evaluate_grid(xs, ys, zs).tolist()
+                    values_out.append(new_values)
+            return values_out
+
+        def store(values_out):
+            self.outputs['Value'].sv_set(values_out)
 
-        self.outputs['Value'].sv_set(values_out)
+        return compute, store
+
+    def process(self):
+        prepared = self.prepare_threaded_process()
+        if prepared is not None:
+            compute, store = prepared
+            store(compute())
 
 def register():
     bpy.utils.register_class(SvScalarFieldEvaluateNode)
@@ -12,17 +12,17 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.field.scalar import SvScalarFieldBinOp, SvScalarField, SvNegatedScalarField, SvAbsScalarField, SvScalarFieldVectorizedFunction
 
 operations = [
-    ('ADD', "Add", lambda x, y : x+y),
-    ('SUB', "Sub", lambda x, y : x-y),
-    ('MUL', "Multiply", lambda x, y : x * y),
-    ('MIN', "Minimum", lambda x, y : np.min([x,y],axis=0)),
-    ('MAX', "Maximum", lambda x, y : np.max([x,y],axis=0)),
+    ('ADD', "Add", np.add),
+    ('SUB', "Sub", np.subtract),
+    ('MUL', "Multiply", np.multiply),
+    ('MIN', "Minimum", np.minimum),
+    ('MAX', "Maximum", np.maximum),
     ('AVG', "Average", lambda x, y : (x+y)/2),
-    ('DIV', "Divide", lambda x, y: x / y),
+    ('DIV', "Divide", np.true_divide),
     ('POW', "Power - x**y", np.power),
     ('NEG', "Negate", lambda x : -x),
     ('ABS', "Absolute value", np.abs),
-    ('SQR', "Square - x*x", lambda x: x*x),
+    ('SQR', "Square - x*x", np.square),
     ('SQRT', "Square Root", np.sqrt),
     ('INV', "Inverse - 1/x", np.reciprocal),
     ('SIN', "Sine", np.sin),
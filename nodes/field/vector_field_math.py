@@ -35,8 +35,8 @@ V_FIELD_C, S_FIELD_C, V_FIELD_D = sockets_handler.register_outputs(
     )
 
 operations = [
-    ('ADD', "Add", lambda x,y : x+y, [("VFieldA", "A"), ("VFieldB", "B")], [("VFieldC", "Sum")]),
-    ('SUB', "Sub", lambda x, y : x-y, [("VFieldA", "A"), ('VFieldB', "B")], [("VFieldC", "Difference")]),
+    ('ADD', "Add", np.add, [("VFieldA", "A"), ("VFieldB", "B")], [("VFieldC", "Sum")]),
+    ('SUB', "Sub", np.subtract, [("VFieldA", "A"), ('VFieldB', "B")], [("VFieldC", "Difference")]),
     ('AVG', "Average", lambda x, y : (x+y)/2, [("VFieldA", "A"), ("VFieldB", "B")], [("VFieldC", "Average")]),
     ('DOT', "Scalar Product", None, [("VFieldA", "A"), ("VFieldB", "B")], [("SFieldC", "Product")]),
     ('CROSS', "Vector Product", None, [("VFieldA", "A"), ("VFieldB","B")], [("VFieldC", "Product")]),
@@ -21,6 +21,7 @@ from bpy.props import StringProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from sverchok.core.update_system import invalidate_dependency_graph
 
 OLD_OP = "node.sverchok_generic_callback_old"
 
@@ -50,6 +51,7 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     def set_var_name(self):
         self.var_name = self.var_names
         ng = self.id_data
+        invalidate_dependency_graph(ng)
         wifi_dict = {node.var_name: node
                      for node in ng.nodes
                      if node.bl_idname == 'WifiInNode'}
@@ -63,6 +65,7 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
 
     def reset_var_name(self):
         self.var_name = ""
+        invalidate_dependency_graph(self.id_data)
         self.outputs.clear()
 
     def draw_buttons(self, context, layout):
@@ -29,7 +29,8 @@ from mathutils import Vector, Matrix
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_mesh_utils import mesh_join
-from sverchok.utils.modules.matrix_utils import matrix_apply_np
+from sverchok.utils.modules.matrix_utils import matrix_apply_np, apply_matrices_np
+from sverchok.core.socket_conversions import is_packed_matrices
 from sverchok.data_structure import repeat_last
 
 
@@ -86,6 +87,10 @@ def apply_matrix_to_vectors(vertices, matrices, out_verts):
 
 def apply_matrix_to_vectors_np(vertices, matrices, out_verts):
     r_vertices = [np.array(v) for v in vertices]
+    if len(r_vertices) == 1:
+        # all matrices are applied to the same object at once
+        out_verts.extend(apply_matrices_np(r_vertices[0].reshape(-1, 3), matrices))
+        return
     max_v = len(vertices) - 1
     for i, mat in enumerate(matrices):
         vert_id = min(i, max_v)
@@ -189,7 +194,7 @@ def apply_nested_matrices_np(
         vertices: np.ndarray,
         edges: np.ndarray,
         faces: List[PyFaces],
-        matrices: List[List[Matrix]],
+        matrices: List[np.ndarray],
         do_join: bool) -> Tuple[List[np.ndarray], List[np.ndarray], List[PyFaces]]:
     # Get list of Sverchok meshes and list of list of matrices
     # List of matrices applies to a mesh, each matrices copy the mesh inside an object
@@ -216,13 +221,12 @@ def copy_object_and_transform_np(
         vertices: np.ndarray,
         edges: np.ndarray,
         faces: PyFaces,
-        matrices: List[Matrix]) -> Tuple[np.ndarray, np.ndarray, PyFaces]:
-    # Get mesh and list of matrices
+        matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, PyFaces]:
+    # Get mesh and packed matrices
     # Each matrices create copy of given mesh and transform it
 
     meshes: List[Tuple[np.ndarray, np.ndarray, PyFaces]] = []
-    for matrix in matrices:
-        new_verts = matrix_apply_np(vertices, matrix)
+    for new_verts in apply_matrices_np(vertices.reshape(-1, 3), matrices):
         meshes.append((new_verts, edges, faces))
 
     return mesh_join_np(*list(zip(*meshes)), False)
@@ -300,25 +304,24 @@ class SvMatrixApplyJoinNode(bpy.types.Node, SverchCustomTreeNode):
         vertices = self.inputs['Vertices'].sv_get(deepcopy=False)
         edges = self.inputs['Edges'].sv_get(default=[[]], deepcopy=False)
         faces = self.inputs['Faces'].sv_get(default=[[]], deepcopy=False)
-        matrices = self.inputs['Matrices'].sv_get(default=None, deepcopy=False)
+        if self.implementation == 'NumPy':
+            matrices = self.inputs['Matrices'].sv_get(default=None, deepcopy=False, packed=True)
+        else:
+            matrices = self.inputs['Matrices'].sv_get(default=None, deepcopy=False)
 
-        if not matrices:
+        if matrices is None or not len(matrices):
             out_verts = vertices
             out_edges = edges
             out_faces = faces
 
-        elif not isinstance(matrices[0], (list, tuple)):
-            # most likely it is List[Matrix] or List[np.ndarray]
-            if self.implementation == 'NumPy':
+        elif self.implementation == 'NumPy':
+            if is_packed_matrices(matrices):
+                # List[Matrix]
                 out_verts, out_edges, out_faces = apply_and_join_numpy(
                     vertices, edges, faces, matrices, self.do_join, self.out_np)
 
-            else:
-                out_verts, out_edges, out_faces = apply_and_join_python(vertices, edges, faces, matrices, self.do_join)
-
-        elif not isinstance(matrices[0][0], (list, tuple)):
-            # most likely it is List[List[Matrix]] or List[List[np.ndarray]]
-            if self.implementation == 'NumPy':
+            elif all(is_packed_matrices(m) for m in matrices):
+                # List[List[Matrix]]
                 vertices = [np.array(verts, dtype=np.float32) for verts in vertices]  # float 32 is faster
                 edges = [np.array(es, dtype=np.int) for es in edges]
 
@@ -326,8 +329,17 @@ class SvMatrixApplyJoinNode(bpy.types.Node, SverchCustomTreeNode):
                     vertices, edges, faces, matrices, self.do_join
                 )
             else:
-                out_verts, out_edges, out_faces = apply_nested_matrices_py(
-                    vertices, edges, faces, matrices, self.do_join)
+                # it looks inputs matrices are too nested in lists
+                raise TypeError("Unsupported matrix format")  # will make our errors more clear
+
+        elif not isinstance(matrices[0], (list, tuple)):
+            # most likely it is List[Matrix] or List[np.ndarray]
+            out_verts, out_edges, out_faces = apply_and_join_python(vertices, edges, faces, matrices, self.do_join)
+
+        elif not isinstance(matrices[0][0], (list, tuple)):
+            # most likely it is List[List[Matrix]] or List[List[np.ndarray]]
+            out_verts, out_edges, out_faces = apply_nested_matrices_py(
+                vertices, edges, faces, matrices, self.do_join)
 
         else:
             # it looks inputs matrices are too nested in lists
@@ -16,11 +16,14 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import numpy as np
+
 import bpy
 from mathutils import Matrix
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import (updateNode, fullList)
+from sverchok.data_structure import (updateNode, fullList, numpy_match_long_repeat)
+from sverchok.utils.modules.matrix_utils import interpolate_matrices_np
 
 
 # Matrix are assumed to be in format
@@ -51,23 +54,34 @@ class MatrixInterpolationNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.outputs['C'].is_linked:
             return
         id_mat = [Matrix.Identity(4)]
-        A = self.inputs['A'].sv_get(default=id_mat)
-        B = self.inputs['B'].sv_get(default=id_mat)
+        A = self.inputs['A'].sv_get(default=id_mat, packed=True)
+        B = self.inputs['B'].sv_get(default=id_mat, packed=True)
         factor = self.inputs['Factor'].sv_get()
 
-
-        matrixes_ = []
-        # match inputs, first matrix A and B using fullList
+        # match inputs, first matrix A and B by repeating the last matrix
         # then extend the factor list if necessary,
         # A and B should control length of list, not interpolation lists
-        max_l = max(len(A), len(B))
-        fullList(A, max_l)
-        fullList(B, max_l)
+        if not len(A) or not len(B):
+            self.outputs['C'].sv_set(np.empty((0, 4, 4)))
+            return
+        A, B = numpy_match_long_repeat([A, B])
+        max_l = len(A)
         if len(factor) < max_l:
             fullList(factor, max_l)
-        for i in range(max_l):
-            for k in range(len(factor[i])):
-                matrixes_.append(A[i].lerp(B[i], factor[i][k]))
+        factor = factor[:max_l]
+
+        # each pair of A and B is interpolated with all its factors
+        index = np.repeat(np.arange(max_l), [len(f) for f in factor])
+        factors = np.fromiter((f for fs in factor for f in fs), dtype=np.float64, count=len(index))
+        A, B = A[index], B[index]
+
+        matrixes_ = interpolate_matrices_np(A, B, factors)
+
+        # Matrices with negative determinant can not be decomposed into
+        # rotation and scale in a unique way; leave them to mathutils
+        negative = (np.linalg.det(A[:, :3, :3]) <= 0) | (np.linalg.det(B[:, :3, :3]) <= 0)
+        for i in np.flatnonzero(negative):
+            matrixes_[i] = Matrix(A[i].tolist()).lerp(Matrix(B[i].tolist()), factors[i])
 
         self.outputs['C'].sv_set(matrixes_)
 
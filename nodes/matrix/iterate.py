@@ -16,15 +16,17 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from mathutils import Vector, Matrix
 from operator import iadd
 from functools import reduce
 
+import numpy as np
+
 import bpy
 from bpy.props import IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, match_long_repeat, Matrix_generate, Vector_generate, Vector_degenerate
+from sverchok.data_structure import updateNode, match_long_repeat
+from sverchok.utils.modules.matrix_utils import apply_matrices_np
 
 
 def concat(lists):
@@ -35,45 +37,22 @@ def Matrix_degenerate(ms):
     return [[j[:] for j in M] for M in ms]
 
 
-def iterate_matrices(matrices, vertices, edges, faces, count, offset, r=0):
-    result_vertices = []
-    result_edges = []
-    result_faces = []
-
-    x = 0
-    for matrix in matrices:
-        new_vertices, new_edges, new_faces = iterate(matrices, matrix, vertices, edges, faces, count, offset+x, r)
-        x += len(new_vertices)
-        result_vertices.extend(new_vertices)
-        result_edges.extend(new_edges)
-        result_faces.extend(new_faces)
-
-    return result_vertices, result_edges, result_faces
-
-
-def iterate(matrices, matrix, vertices, edges, faces, count, offset, r=0):
-    result_vertices = []
-    result_edges = []
-    result_faces = []
+def iteration_matrices(matrices, count):
+    """
+    Matrices of all copies made by iterations, each one being a product of
+    matrices applied to the original object one after another.
+    For each matrix M, the copy transformed by M is followed by copies
+    of the next iterations applied to that copy.
+    matrices: array (n, 4, 4)
+    returns: array (n + n^2 + ... + n^count, 4, 4)
+    """
     if count == 0:
-        return result_vertices, result_edges, result_faces
-
-    new_vertices = [matrix @ v for v in vertices]
-    new_edges = [(v1+offset+r, v2+offset+r) for v1, v2 in edges]
-    new_faces = [[v+offset+r for v in face] for face in faces]
-
-    result_vertices.extend(new_vertices)
-    result_edges.extend(new_edges)
-    result_faces.extend(new_faces)
-
-    n = len(new_vertices)
-    rest_vertices, rest_edges, rest_faces = iterate_matrices(matrices, new_vertices, edges, faces, count-1, offset, r+n)
-
-    result_vertices.extend(rest_vertices)
-    result_edges.extend(rest_edges)
-    result_faces.extend(rest_faces)
-
-    return result_vertices, result_edges, result_faces
+        return np.empty((0, 4, 4))
+    rest = iteration_matrices(matrices, count-1)
+    result = np.empty((len(matrices), len(rest)+1, 4, 4))
+    result[:, 0] = matrices
+    result[:, 1:] = rest[np.newaxis] @ matrices[:, np.newaxis]
+    return result.reshape(-1, 4, 4)
 
 
 def shift_edges(edges, offset):
@@ -86,16 +65,13 @@ def shift_faces(faces, offset):
 
 def calc_matrix_powers(matrices, count):
     if count == 0:
-        return []
+        return np.empty((0, 4, 4))
     if count == 1:
         return matrices
 
-    result = []
-    result.extend(matrices)
-    for m in matrices:
-        result.extend([m @ n for n in calc_matrix_powers(matrices, count-1)])
-
-    return result
+    powers = calc_matrix_powers(matrices, count-1)
+    products = matrices[:, np.newaxis] @ powers[np.newaxis]
+    return np.concatenate((matrices, products.reshape(-1, 4, 4)))
 
 
 class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
@@ -126,11 +102,9 @@ class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.inputs['Matrix'].is_linked:
             return
 
-        matrices = self.inputs['Matrix'].sv_get()
-        matrices = Matrix_generate(matrices)
+        matrices = self.inputs['Matrix'].sv_get(packed=True)
         counts = self.inputs['Iterations'].sv_get()[0]
         vertices_s = self.inputs['Vertices'].sv_get(default=[[]])
-        vertices_s = Vector_generate(vertices_s)
         edges_s = self.inputs['Edges'].sv_get(default=[[]])
         faces_s = self.inputs['Polygons'].sv_get(default=[[]])
 
@@ -157,24 +131,22 @@ class SvIterateNode(bpy.types.Node, SverchCustomTreeNode):
 
             offset = 0
             for vertices, edges, faces, count in zip(*meshes):
-                result_vertices.extend(vertices)
-
-                result_edges.extend(shift_edges(edges, offset))
-                result_faces.extend(shift_faces(faces, offset))
-                #result_matrices.extend([Matrix()] * len(matrices))
-                result_matrices.append(Matrix())
-                offset += len(vertices)
-
-                new_vertices, new_edges, new_faces = iterate_matrices(matrices, vertices, edges, faces, count, offset)
-                offset += len(new_vertices)
-                new_matrices = calc_matrix_powers(matrices, count)
-
-                result_vertices.extend(new_vertices)
-                result_edges.extend(new_edges)
-                result_faces.extend(new_faces)
-                result_matrices.extend(new_matrices)
-
-            result_vertices = Vector_degenerate([result_vertices])
+                vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+                n = len(vertices)
+                copies = iteration_matrices(matrices, count)
+
+                result_vertices.append(vertices)
+                result_vertices.append(apply_matrices_np(vertices, copies).reshape(-1, 3))
+                for i in range(len(copies) + 1):
+                    result_edges.extend(shift_edges(edges, offset + i*n))
+                    result_faces.extend(shift_faces(faces, offset + i*n))
+                offset += n * (len(copies) + 1)
+
+                result_matrices.append(np.identity(4)[np.newaxis])
+                result_matrices.append(calc_matrix_powers(matrices, count))
+
+            result_vertices = [list(map(tuple, np.concatenate(result_vertices).tolist()))]
+            result_matrices = np.concatenate(result_matrices)
             if self.outputs['Vertices'].is_linked:
                 self.outputs['Vertices'].sv_set(result_vertices)
             if self.outputs['Edges'].is_linked:
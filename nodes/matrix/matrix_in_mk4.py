@@ -16,12 +16,17 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import numpy as np
+
 import bpy
 from bpy.props import EnumProperty, FloatProperty, BoolProperty, StringProperty, FloatVectorProperty
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, match_long_repeat
+from sverchok.data_structure import updateNode, match_long_repeat, numpy_match_long_repeat
 from sverchok.utils.sv_transform_helper import AngleUnits, SvAngleHelper
-from mathutils import Quaternion, Matrix, Euler
+from sverchok.utils.modules.matrix_utils import (
+    matrices_from_components_np, quaternions_to_rotations_np,
+    euler_to_rotations_np, axis_angle_to_rotations_np)
+from mathutils import Quaternion
 
 rotation_mode_items = [
     ("QUATERNION", "Quaternion",   "Rotation given as a Quaternion", 0),
@@ -35,8 +40,16 @@ input_sockets = {
     "AXISANGLE":  ["Axis", "Angle"],
 }
 
-mat_t = Matrix().Identity(4)  # pre-allocate once for performance (translation)
-mat_s = Matrix().Identity(4)  # pre-allocate once for performance (scale)
+
+def match_components(*components):
+    """
+    Convert lists of matrix components of one object to numpy arrays
+    of the same length, repeating the last items of shorter lists.
+    Returns None if some of lists are empty.
+    """
+    if not all(len(component) for component in components):
+        return None
+    return numpy_match_long_repeat([np.asarray(component, dtype=np.float64) for component in components])
 
 
 class SvMatrixInNodeMK4(bpy.types.Node, SverchCustomTreeNode, SvAngleHelper):
@@ -160,7 +173,6 @@ class SvMatrixInNodeMK4(bpy.types.Node, SverchCustomTreeNode, SvAngleHelper):
         inputs = self.inputs
 
         matrix_list = []
-        add_matrix = matrix_list.extend if self.flat_output else matrix_list.append
 
         if self.rotation_mode == "QUATERNION":
             input_l = inputs["Location"].sv_get(deepcopy=False)
@@ -173,23 +185,13 @@ class SvMatrixInNodeMK4(bpy.types.Node, SverchCustomTreeNode, SvAngleHelper):
             I = [input_l, input_q, input_s]
             params1 = match_long_repeat(I)
             for ll, ql, sl in zip(*params1):
-                params2 = match_long_repeat([ll, ql, sl])
-                matrices = []
-                for location, quaternion, scale in zip(*params2):
-                    # translation
-                    mat_t[0][3] = location[0]
-                    mat_t[1][3] = location[1]
-                    mat_t[2][3] = location[2]
-                    # rotation
-                    mat_r = quaternion.to_matrix().to_4x4()
-                    # scale
-                    mat_s[0][0] = scale[0]
-                    mat_s[1][1] = scale[1]
-                    mat_s[2][2] = scale[2]
-                    # composite matrix
-                    m = mat_t @ mat_r @ mat_s
-                    matrices.append(m)
-                add_matrix(matrices)
+                params2 = match_components(ll, ql, sl)
+                if params2 is None:
+                    matrix_list.append(np.empty((0, 4, 4)))
+                    continue
+                locations, quaternions, scales = params2
+                rotations = quaternions_to_rotations_np(quaternions)
+                matrix_list.append(matrices_from_components_np(locations, rotations, scales))
 
         elif self.rotation_mode == "EULER":
             socket_names = ["Location", "Angle X", "Angle Y", "Angle Z", "Scale"]
@@ -198,25 +200,14 @@ class SvMatrixInNodeMK4(bpy.types.Node, SverchCustomTreeNode, SvAngleHelper):
             # conversion factor from the current angle units to radians
             au = self.radians_conversion_factor()
             for ll, axl, ayl, azl, sl in zip(*params1):
-                params2 = match_long_repeat([ll, axl, ayl, azl, sl])
-                matrices = []
-                for location, angleX, angleY, angleZ, scale in zip(*params2):
-                    # translation
-                    mat_t[0][3] = location[0]
-                    mat_t[1][3] = location[1]
-                    mat_t[2][3] = location[2]
-                    # rotation
-                    angles = (angleX * au, angleY * au, angleZ * au)
-                    euler = Euler(angles, self.euler_order)
-                    mat_r = euler.to_quaternion().to_matrix().to_4x4()
-                    # scale
-                    mat_s[0][0] = scale[0]
-                    mat_s[1][1] = scale[1]
-                    mat_s[2][2] = scale[2]
-                    # composite matrix
-                    m = mat_t @ mat_r @ mat_s
-                    matrices.append(m)
-                add_matrix(matrices)
+                params2 = match_components(ll, axl, ayl, azl, sl)
+                if params2 is None:
+                    matrix_list.append(np.empty((0, 4, 4)))
+                    continue
+                locations, angles_x, angles_y, angles_z, scales = params2
+                angles = np.stack((angles_x, angles_y, angles_z), axis=1) * au
+                rotations = euler_to_rotations_np(angles, self.euler_order)
+                matrix_list.append(matrices_from_components_np(locations, rotations, scales))
 
         elif self.rotation_mode == "AXISANGLE":
             socket_names = ["Location", "Axis", "Angle", "Scale"]
@@ -225,23 +216,17 @@ class SvMatrixInNodeMK4(bpy.types.Node, SverchCustomTreeNode, SvAngleHelper):
             # conversion factor from the current angle units to radians
             au = self.radians_conversion_factor()
             for ll, xl, al, sl in zip(*params1):
-                params2 = match_long_repeat([ll, xl, al, sl])
-                matrices = []
-                for location, axis, angle, scale in zip(*params2):
-                    # translation
-                    mat_t[0][3] = location[0]
-                    mat_t[1][3] = location[1]
-                    mat_t[2][3] = location[2]
-                    # rotation
-                    mat_r = Quaternion(axis, angle * au).to_matrix().to_4x4()
-                    # scale
-                    mat_s[0][0] = scale[0]
-                    mat_s[1][1] = scale[1]
-                    mat_s[2][2] = scale[2]
-                    # composite matrix
-                    m = mat_t @ mat_r @ mat_s
-                    matrices.append(m)
-                add_matrix(matrices)
+                params2 = match_components(ll, xl, al, sl)
+                if params2 is None:
+                    matrix_list.append(np.empty((0, 4, 4)))
+                    continue
+                locations, axes, angles, scales = params2
+                rotations = axis_angle_to_rotations_np(axes, angles * au)
+                matrix_list.append(matrices_from_components_np(locations, rotations, scales))
+
+        # matrices are output packed, see SvMatrixSocket.sv_get
+        if self.flat_output:
+            matrix_list = np.concatenate(matrix_list) if matrix_list else np.empty((0, 4, 4))
 
         self.outputs['Matrices'].sv_set(matrix_list)
 
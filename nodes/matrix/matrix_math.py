@@ -16,6 +16,8 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import numpy as np
+
 import bpy
 from bpy.props import IntProperty, FloatProperty, BoolProperty, EnumProperty
 
@@ -23,7 +25,8 @@ from mathutils import Matrix
 from functools import reduce
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import (updateNode, match_long_repeat)
+from sverchok.data_structure import (updateNode, numpy_match_long_repeat)
+from sverchok.utils.modules.matrix_utils import decompose_matrices_np, matrices_from_components_np
 
 operationItems = [
     ("MULTIPLY", "Multiply", "Multiply two matrices", 0),
@@ -124,50 +127,42 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
             row.prop(self, "filter_s", toggle=True, text="S")
 
     def operation_filter(self, a):
-        T, R, S = a.decompose()
+        T, R, S = decompose_matrices_np(a)
 
         if self.filter_t:
-            mat_t = Matrix().Identity(4)
-        else:
-            mat_t = Matrix().Translation(T)
-
+            T[:] = 0.0
         if self.filter_r:
-            mat_r = Matrix().Identity(4)
-        else:
-            mat_r = R.to_matrix().to_4x4()
-
+            R[:] = np.identity(3)
         if self.filter_s:
-            mat_s = Matrix().Identity(4)
-        else:
-            mat_s = Matrix().Identity(4)
-            mat_s[0][0] = S[0]
-            mat_s[1][1] = S[1]
-            mat_s[2][2] = S[2]
+            S[:] = 1.0
 
-        m = mat_t @ mat_r @ mat_s
-
-        return m
+        return matrices_from_components_np(T, R, S)
 
     def operation_basis(self, a):
-        T, R, S = a.decompose()
+        T, R, S = decompose_matrices_np(a)
 
-        rot = R.to_matrix().to_4x4()
-        Rx = (rot[0][0], rot[1][0], rot[2][0])
-        Ry = (rot[0][1], rot[1][1], rot[2][1])
-        Rz = (rot[0][2], rot[1][2], rot[2][2])
+        Rx = R[:, :, 0]
+        Ry = R[:, :, 1]
+        Rz = R[:, :, 2]
 
         return Rx, Ry, Rz
 
     def get_operation(self):
         if self.operation == "MULTIPLY":
-            return lambda l: reduce((lambda a, b: a @ b), l)
+            return lambda l: reduce(np.matmul, l)
         elif self.operation == "FILTER":
             return self.operation_filter
         elif self.operation == "INVERT":
-            return lambda a: a.inverted()
+            return self.operation_invert
         elif self.operation == "BASIS":
             return self.operation_basis
 
+    def operation_invert(self, a):
+        try:
+            return np.linalg.inv(a)
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix.invert(ed): matrix does not have an inverse")
+
     def sv_update(self):
         # sigle input operation ? => no need to update sockets
         if self.operation not in {"MULTIPLY"}:
@@ -189,17 +184,20 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
 
         I = []  # collect the inputs from the connected sockets
         for s in filter(lambda s: s.is_linked, self.inputs):
-            I.append(s.sv_get(default=id_mat))
+            I.append(s.sv_get(default=id_mat, packed=True))
 
         operation = self.get_operation()
 
         if self.operation in {"MULTIPLY"}:  # multiple input operations
+            if not all(len(matrices) for matrices in I):
+                outputs['C'].sv_set(np.empty((0, 4, 4)))
+                return
             if self.prePost == "PRE":  # A op B : keep input order
-                parameters = match_long_repeat(I)
+                parameters = numpy_match_long_repeat(I)
             else:  # B op A : reverse input order
-                parameters = match_long_repeat(I[::-1])
+                parameters = numpy_match_long_repeat(I[::-1])
 
-            matrixList = [operation(params) for params in zip(*parameters)]
+            matrixList = operation(parameters)
 
             outputs['C'].sv_set(matrixList)
 
@@ -208,14 +206,7 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
           #  print("parameters=", parameters)
 
             if self.operation == "BASIS":
-                xList = []
-                yList = []
-                zList = []
-                for a in parameters:
-                    Rx, Ry, Rz = operation(a)
-                    xList.append(Rx)
-                    yList.append(Ry)
-                    zList.append(Rz)
+                xList, yList, zList = [[tuple(v) for v in vs.tolist()] for vs in operation(parameters)]
                 outputs['X'].sv_set(xList)
                 outputs['Y'].sv_set(yList)
                 outputs['Z'].sv_set(zList)
@@ -223,7 +214,7 @@ class SvMatrixMathNode(bpy.types.Node, SverchCustomTreeNode):
                 outputs['C'].sv_set(parameters)
 
             else:  # INVERSE / FILTER
-                matrixList = [operation(a) for a in parameters]
+                matrixList = operation(parameters)
 
                 outputs['C'].sv_set(matrixList)
 
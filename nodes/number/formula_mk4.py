@@ -17,7 +17,7 @@ import io
 from sverchok.node_tree import SverchCustomTreeNode, throttled
 from sverchok.data_structure import updateNode, match_long_repeat, zip_long_repeat
 from sverchok.utils import logging
-from sverchok.utils.modules.eval_formula import get_variables, safe_eval
+from sverchok.utils.modules.eval_formula import get_variables, safe_eval, safe_eval_formulas_vectorized
 
 class SvFormulaNodeMk4(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -210,7 +210,18 @@ class SvFormulaNodeMk4(bpy.types.Node, SverchCustomTreeNode):
             input_values = [inputs.get(name) for name in var_names]
             parameters = match_long_repeat(input_values)
 
+            formulas = [formula for formula in self.formulas() if formula]
+
             for objects in zip(*parameters):
+                vectorized = safe_eval_formulas_vectorized(formulas, var_names, objects)
+                if vectorized is not None:
+                    if self.separate:
+                        object_results = [list(vector) for vector in zip(*vectorized)]
+                    else:
+                        object_results = [value for vector in zip(*vectorized) for value in vector]
+                    results.append(object_results)
+                    continue
+
                 object_results = []
                 for values in zip_long_repeat(*objects):
                     variables = dict(zip(var_names, values))
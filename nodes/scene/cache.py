@@ -16,17 +16,27 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-from ast import literal_eval
-
 import bpy
 from bpy.props import BoolProperty, StringProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, node_id, changable_sockets
+from sverchok.utils.sv_operator_mixins import SvGenericCallbackWithParams
+from sverchok.utils.nodes_mixins.sv_animatable_nodes import SvAnimatableNode
+from sverchok.utils.frame_cache import get_frame_cache, remove_frame_cache, MB
+
+
+class SvCacheNodeCallback(bpy.types.Operator, SvGenericCallbackWithParams):
+    bl_idname = "node.sv_cache_node_callback"
+    bl_label = "Callback for cache node"
+    bl_options = {'INTERNAL'}
 
 
-class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
-    '''Cache data Node'''
+class SvCacheNode(bpy.types.Node, SverchCustomTreeNode, SvAnimatableNode):
+    '''
+    Triggers: Cache / Bake frames
+    Tooltip: Store data per frame and output data of previous frames or replay baked frames
+    '''
     bl_idname = 'SvCacheNode'
     bl_label = 'Cache'
     bl_icon = 'OUTLINER_OB_EMPTY'
@@ -37,34 +47,90 @@ class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
     
     cache_amount: IntProperty(default=1, min=0)
     cache_offset: IntProperty(default=1, min=0)
-    node_dict = {}
-    
+
+    memory_limit: IntProperty(
+        name="Memory limit",
+        description="Amount of memory (in MB) for stored frames; least recently used frames are evicted when it is exceeded",
+        default=256, min=1,
+        update=updateNode)
+
+    use_disk: BoolProperty(
+        name="Spill to disk",
+        description="Write frames evicted from memory to temporary files instead of forgetting them",
+        default=True,
+        update=updateNode)
+
+    replay: BoolProperty(
+        name="Replay",
+        description="Output stored data for frames which are already recorded; nodes which only feed this node are not processed on frame change for such frames",
+        default=False,
+        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new("SvStringsSocket", "Data")
         self.outputs.new("SvStringsSocket", "Data")
 
     def draw_buttons(self, context, layout):
         layout.prop(self, "cache_offset")
+        layout.prop(self, "replay", toggle=True)
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        self.draw_animatable_buttons(layout)
+        layout.prop(self, "memory_limit")
+        layout.prop(self, "use_disk")
+        cache = self.get_cache()
+        layout.label(text="Stored frames: {}".format(len(cache)))
+        callback = "node.sv_cache_node_callback"
+        row = layout.row(align=True)
+        row.operator(callback, text="Bake frame range").fn_name = "bake_frame_range"
+        row.operator(callback, text="Clear").fn_name = "clear_cache"
 
     def sv_update(self):
         changable_sockets(self, "Data", ["Data"])
-        
+
+    def get_cache(self):
+        return get_frame_cache(node_id(self), self.memory_limit * MB, self.use_disk)
+
+    def sv_free(self):
+        # stored frames are not needed any more
+        remove_frame_cache(node_id(self))
+
+    def sv_frame_replay(self, frame):
+        """
+        Whether the node will output stored data at this frame without reading its input.
+        """
+        return self.replay and frame in self.get_cache()
+
+    def bake_frame_range(self, operator):
+        scene = bpy.context.scene
+        frame_current = scene.frame_current
+        try:
+            for frame in range(scene.frame_start, scene.frame_end + 1):
+                # frame change handler processes the tree
+                scene.frame_set(frame)
+        finally:
+            scene.frame_set(frame_current)
+
+    def clear_cache(self, operator):
+        self.get_cache().clear()
+        updateNode(self, bpy.context)
+
     def process(self):
-        n_id = node_id(self)
-        data = self.node_dict.get(n_id)
-        if not data:
-            self.node_dict[n_id] = {}
-            data = self.node_dict.get(n_id)
-            
+        cache = self.get_cache()
         frame_current = bpy.context.scene.frame_current
         out_frame = frame_current - self.cache_offset
-        data[frame_current] = self.inputs[0].sv_get()
-        out_data = data.get(out_frame, [])
+        if not (self.replay and frame_current in cache):
+            cache.put(frame_current, {"Data": self.inputs[0].sv_get()})
+        out_data = cache.get(out_frame, {}).get("Data", [])
         self.outputs[0].sv_set(out_data)
 
+classes = [SvCacheNodeCallback, SvCacheNode]
+
 def register():
-    bpy.utils.register_class(SvCacheNode)
+    for cls in classes:
+        bpy.utils.register_class(cls)
 
 def unregister():
-    bpy.utils.unregister_class(SvCacheNode)
-
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
@@ -7,7 +7,8 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, St
 from sverchok.node_tree import SverchCustomTreeNode, throttled
 from sverchok.data_structure import updateNode, zip_long_repeat, match_long_repeat
 from sverchok.utils.logging import info, exception
-from sverchok.utils.marching_cubes import isosurface_np
+from sverchok.utils.marching_cubes import isosurface_np, isosurface_vectorized, sample_field_adaptive
+from sverchok.utils.field.fusion import fuse_field
 from sverchok.dependencies import mcubes, skimage
 
 if skimage is not None:
@@ -78,6 +79,32 @@ class SvExMarchingCubesNode(bpy.types.Node, SverchCustomTreeNode):
             min = 4,
             update = updateNode)
 
+    fuse_field : BoolProperty(
+            name = "Fuse field",
+            description = "Compile composed field into one flat program before evaluation; this usually makes evaluation of complex fields faster and takes less memory",
+            default = False,
+            update = updateNode)
+
+    adaptive : BoolProperty(
+            name = "Adaptive",
+            description = "Evaluate the field on a coarse grid first, and then evaluate it with full resolution only in cells which cross the isosurface and next to them. Without Lipschitz bound, thin features which are far from the rest of the surface can be lost",
+            default = False,
+            update = updateNode)
+
+    coarse_step : IntProperty(
+            name = "Coarse step",
+            description = "Size of initial cells in adaptive mode, in samples",
+            default = 8,
+            min = 2,
+            update = updateNode)
+
+    lipschitz : FloatProperty(
+            name = "Lipschitz bound",
+            description = "Maximum rate of change of the field, used in adaptive mode to find cells which can contain surface parts missed by coarse samples; zero means use only values at cell corners, which can lose thin features",
+            default = 0.0,
+            min = 0.0,
+            update = updateNode)
+
     @throttled
     def update_sockets(self, context):
         self.outputs['VertexNormals'].hide_safe = self.implementation != 'skimage'
@@ -110,6 +137,7 @@ class SvExMarchingCubesNode(bpy.types.Node, SverchCustomTreeNode):
             modes.append(("skimage", "SciKit-Image", "SciKit-Image", 0))
         if mcubes is not None:
             modes.append(("mcubes", "PyMCubes", "PyMCubes", 1))
+        modes.append(('numpy', "NumPy", "Vectorized NumPy implementation", 3))
         modes.append(('python', "Pure Python", "Pure Python implementation", 2))
         return modes
 
@@ -134,6 +162,14 @@ class SvExMarchingCubesNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.prop(self, "implementation", text="")
         layout.prop(self, "sample_mode")
+        layout.prop(self, "adaptive")
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        if self.adaptive:
+            layout.prop(self, "coarse_step")
+            layout.prop(self, "lipschitz")
+        layout.prop(self, "fuse_field")
     
     def draw_label(self):
         label = self.label or self.name
@@ -156,9 +192,9 @@ class SvExMarchingCubesNode(bpy.types.Node, SverchCustomTreeNode):
         verts[:,2] = verts[:,2] * scale_z + b1n[2]
         return verts
 
-    def process(self):
+    def prepare_threaded_process(self):
         if not any(socket.is_linked for socket in self.outputs):
-            return
+            return None
 
         fields_s = self.inputs['Field'].sv_get()
         vertices_s = self.inputs['Bounds'].sv_get()
@@ -171,83 +207,127 @@ class SvExMarchingCubesNode(bpy.types.Node, SverchCustomTreeNode):
         if isinstance(value_s[0], (list, tuple)):
             value_s = value_s[0]
 
-        parameters = match_long_repeat([fields_s, vertices_s, value_s, samples_s, samples_x_s, samples_y_s, samples_z_s])
-        single_bounds = len(vertices_s) == 1
-
-        verts_out = []
-        faces_out = []
-        normals_out = []
-
-        func_values = None
-        prev_field = None
-        prev_samples = (None, None, None)
-
-        for field, vertices, value, samples, samples_x, samples_y, samples_z in zip(*parameters):
-            if isinstance(value, (list, tuple)):
-                value = value[0]
-
-            if isinstance(samples, (list, tuple)):
-                samples = samples[0]
-            if self.sample_mode == 'UNI':
-                samples_x = samples_y = samples_z = samples
-            else:
-                if isinstance(samples_x, (list, tuple)):
-                    samples_x = samples_x[0]
-                if isinstance(samples_y, (list, tuple)):
-                    samples_y = samples_y[0]
-                if isinstance(samples_z, (list, tuple)):
-                    samples_z = samples_z[0]
-
-            b1, b2 = self.get_bounds(vertices)
-            b1n, b2n = np.array(b1), np.array(b2)
-            self.debug("Bounds: %s - %s", b1, b2)
-
-            self.debug("Eval for value = %s", value)
-
-            same_field = (prev_field is field)
-            same_samples = prev_samples == (samples_x, samples_y, samples_z)
-
-            need_eval = func_values is None or not same_field or not same_samples or not single_bounds
-
-            if not same_field or func_values is None:
-                x_range = np.linspace(b1[0], b2[0], num=samples_x)
-                y_range = np.linspace(b1[1], b2[1], num=samples_y)
-                z_range = np.linspace(b1[2], b2[2], num=samples_z)
-                xs, ys, zs = np.meshgrid(x_range, y_range, z_range, indexing='ij')
-                func_values = field.evaluate_grid(xs.flatten(), ys.flatten(), zs.flatten())
-                func_values = func_values.reshape((samples_x, samples_y, samples_z))
-
-            if self.implementation == 'mcubes':
-                new_verts, new_faces = mcubes.marching_cubes(
-                        func_values,
-                        value)                         # Isosurface value
-
-                new_verts = self.scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
-                new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
-                new_normals = []
-            elif self.implementation == 'skimage':
-                new_verts, new_faces, normals, values = skimage.measure.marching_cubes_lewiner(
-                        func_values, level = value,
-                        step_size = 1)
-                new_verts = self.scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
-                new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
-                new_normals = normals.tolist()
-            else: # python
-                new_verts, new_faces = isosurface_np(func_values, value)
-                new_verts = self.scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
-                new_verts = new_verts.tolist()
-                new_normals = []
-
-            prev_field = field
-            prev_samples = (samples_x, samples_y, samples_z)
-
-            verts_out.append(new_verts)
-            faces_out.append(new_faces)
-            normals_out.append(new_normals)
-
-        self.outputs['Vertices'].sv_set(verts_out)
-        self.outputs['Faces'].sv_set(faces_out)
-        self.outputs['VertexNormals'].sv_set(normals_out)
+        # node properties are read here, compute() must not access the node
+        sample_mode = self.sample_mode
+        adaptive = self.adaptive
+        coarse_step = self.coarse_step
+        lipschitz = self.lipschitz
+        use_fusion = self.fuse_field
+        implementation = self.implementation
+        get_bounds, scale_back = self.get_bounds, self.scale_back
+        logger = self.getLogger()
+
+        def compute():
+            parameters = match_long_repeat([fields_s, vertices_s, value_s, samples_s, samples_x_s, samples_y_s, samples_z_s])
+            single_bounds = len(vertices_s) == 1
+
+            verts_out = []
+            faces_out = []
+            normals_out = []
+
+            func_values = None
+            prev_field = None
+            prev_samples = (None, None, None)
+            prev_value = None
+
+            for field, vertices, value, samples, samples_x, samples_y, samples_z in zip(*parameters):
+                if isinstance(value, (list, tuple)):
+                    value = value[0]
+
+                if isinstance(samples, (list, tuple)):
+                    samples = samples[0]
+                if sample_mode == 'UNI':
+                    samples_x = samples_y = samples_z = samples
+                else:
+                    if isinstance(samples_x, (list, tuple)):
+                        samples_x = samples_x[0]
+                    if isinstance(samples_y, (list, tuple)):
+                        samples_y = samples_y[0]
+                    if isinstance(samples_z, (list, tuple)):
+                        samples_z = samples_z[0]
+
+                b1, b2 = get_bounds(vertices)
+                b1n, b2n = np.array(b1), np.array(b2)
+                logger.debug("Bounds: %s - %s", b1, b2)
+
+                logger.debug("Eval for value = %s", value)
+
+                same_field = (prev_field is field)
+                same_samples = prev_samples == (samples_x, samples_y, samples_z)
+
+                need_eval = func_values is None or not same_field or not same_samples or not single_bounds
+                if adaptive:
+                    # Adaptively sampled values are only valid near one isosurface
+                    need_eval = need_eval or value != prev_value
+
+                if need_eval:
+                    x_range = np.linspace(b1[0], b2[0], num=samples_x)
+                    y_range = np.linspace(b1[1], b2[1], num=samples_y)
+                    z_range = np.linspace(b1[2], b2[2], num=samples_z)
+                    if use_fusion:
+                        eval_field = fuse_field(field)
+                    else:
+                        eval_field = field
+                    if adaptive:
+                        func_values, n_evaluated = sample_field_adaptive(eval_field,
+                                x_range, y_range, z_range, value,
+                                coarse_step = coarse_step,
+                                lipschitz = lipschitz)
+                        logger.debug("Adaptive sampling: %s of %s points evaluated", n_evaluated, func_values.size)
+                    else:
+                        xs, ys, zs = np.meshgrid(x_range, y_range, z_range, indexing='ij')
+                        func_values = eval_field.evaluate_grid(xs.flatten(), ys.flatten(), zs.flatten())
+                        func_values = func_values.reshape((samples_x, samples_y, samples_z))
+
+                if implementation == 'mcubes':
+                    new_verts, new_faces = mcubes.marching_cubes(
+                            func_values,
+                            value)                         # Isosurface value
+
+                    new_verts = scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
+                    new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
+                    new_normals = []
+                elif implementation == 'skimage':
+                    new_verts, new_faces, normals, values = skimage.measure.marching_cubes_lewiner(
+                            func_values, level = value,
+                            step_size = 1)
+                    new_verts = scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
+                    new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
+                    new_normals = normals.tolist()
+                elif implementation == 'numpy':
+                    new_verts, new_faces = isosurface_vectorized(func_values, value)
+                    new_verts = scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
+                    new_verts, new_faces = new_verts.tolist(), new_faces.tolist()
+                    new_normals = []
+                else: # python
+                    new_verts, new_faces = isosurface_np(func_values, value)
+                    new_verts = scale_back(b1n, b2n, samples_x, samples_y, samples_z, new_verts)
+                    new_verts = new_verts.tolist()
+                    new_normals = []
+
+                prev_field = field
+                prev_samples = (samples_x, samples_y, samples_z)
+                prev_value = value
+
+                verts_out.append(new_verts)
+                faces_out.append(new_faces)
+                normals_out.append(new_normals)
+
+            return verts_out, faces_out, normals_out
+
+        def store(result):
+            verts_out, faces_out, normals_out = result
+            self.outputs['Vertices'].sv_set(verts_out)
+            self.outputs['Faces'].sv_set(faces_out)
+            self.outputs['VertexNormals'].sv_set(normals_out)
+
+        return compute, store
+
+    def process(self):
+        prepared = self.prepare_threaded_process()
+        if prepared is not None:
+            compute, store = prepared
+            store(compute())
 
     def does_support_draft_mode(self):
         return True
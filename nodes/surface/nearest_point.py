@@ -25,12 +25,11 @@ else:
         v_max = surface.get_v_max()
         us = np.linspace(u_min, u_max, num=samples)
         vs = np.linspace(v_min, v_max, num=samples)
+        points = surface.evaluate_grid(us, vs).transpose((1,0,2)).reshape((-1,3)).tolist()
         us, vs = np.meshgrid(us, vs)
         us = us.flatten()
         vs = vs.flatten()
 
-        points = surface.evaluate_array(us, vs).tolist()
-
         kdt = KDTree(len(us))
         for i, v in enumerate(points):
             kdt.insert(v, i)
@@ -6,11 +6,12 @@
 # License-Filename: LICENSE
 
 from math import pi
+from itertools import chain
 
+import numpy as np
 import bgl
 import bpy
 import gpu
-from gpu_extras.batch import batch_for_shader
 
 from bpy.props import (
     StringProperty, BoolProperty, FloatVectorProperty, EnumProperty, FloatProperty, IntProperty)
@@ -24,9 +25,7 @@ from sverchok.data_structure import node_id, updateNode, enum_item_5, match_long
 from sverchok.ui.bgl_callback_3dview import callback_disable, callback_enable
 from sverchok.utils.sv_shader_sources import dashed_vertex_shader, dashed_fragment_shader
 from sverchok.utils.sv_batch_primitives import MatrixDraw28
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.geom import multiply_vectors_deep
-from sverchok.utils.modules.geom_utils import obtain_normal3 as normal
 from sverchok.utils.context_managers import hard_freeze
 from sverchok.utils.sv_mesh_utils import mesh_join
 
@@ -55,75 +54,231 @@ default_fragment_shader = '''
     }
 '''
 
-def edges_from_faces(indices):
+def face_loops(indices):
+    """
+    input: faces, as a list of lists or 2D array of vertex indexes
+    output: flat array of vertex indexes of all faces, array of numbers of vertices in each face
+    """
+    if isinstance(indices, ndarray) and indices.ndim == 2:
+        return indices.ravel().astype(np.int64), np.full(len(indices), indices.shape[1], dtype=np.int64)
+    totals = np.fromiter(map(len, indices), dtype=np.int64, count=len(indices))
+    loops = np.fromiter(chain.from_iterable(indices), dtype=np.int64, count=totals.sum())
+    return loops, totals
+
+
+def edges_from_loops(loops, totals):
     """ we don't want repeat edges, ever.."""
-    out = set()
-    concat = out.add
-    for face in indices:
-        for edge in zip(face, list(face[1:]) + list([face[0]])):
-            concat(tuple(sorted(edge)))
-    return list(out)
+    starts = np.cumsum(totals) - totals
+    next_loop = np.arange(1, len(loops) + 1)
+    non_empty = totals > 0
+    next_loop[(starts + totals - 1)[non_empty]] = starts[non_empty]
+    v1 = np.minimum(loops, loops[next_loop])
+    v2 = np.maximum(loops, loops[next_loop])
+    n_verts = v2.max() + 1 if len(loops) else 1
+    keys = np.sort(v1 * n_verts + v2)
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))[:len(keys)]]
+    return np.stack((keys // n_verts, keys % n_verts), axis=1).astype(np.int32)
+
+
+def edges_from_faces(indices):
+    return edges_from_loops(*face_loops(indices))
+
+
+def tessellated_faces(totals, handle_concave_quads):
+    """ mask of faces which have to be tessellated with geometry.tessellate_polygon """
+    if handle_concave_quads:
+        return totals >= 4
+    return totals > 4
+
+
+def triangulate_loops(coords, loops, totals, tessellated):
+    """
+    tris are used as is, quads (unless tessellated) are split along their first diagonal,
+    the tessellated faces are passed to tessellate_polygon one by one.
+    output: array of triangles, in order of faces
+    """
+    starts = np.cumsum(totals) - totals
+    triangles = []
+    face_index = []
+
+    tris = np.flatnonzero(totals == 3)
+    triangles.append(loops[starts[tris, np.newaxis] + np.arange(3)])
+    face_index.append(tris)
+
+    # a b c d  ->  [a, b, c], [a, c, d]
+    quads = np.flatnonzero((totals == 4) & ~tessellated)
+    a, b, c, d = (loops[starts[quads] + i] for i in range(4))
+    triangles.append(np.stack((a, b, c, a, c, d), axis=1).reshape(-1, 3))
+    face_index.append(np.repeat(quads, 2))
+
+    for i in np.flatnonzero(tessellated):
+        idxset = loops[starts[i]: starts[i] + totals[i]]
+        subcoords = [Vector(coords[idx]) for idx in idxset]
+        polygons = tessellate([subcoords])
+        if polygons:
+            triangles.append(idxset[np.array(polygons)])
+            face_index.append(np.full(len(polygons), i))
+
+    order = np.argsort(np.concatenate(face_index), kind='stable')
+    return np.ascontiguousarray(np.concatenate(triangles)[order], dtype=np.int32)
 
 
 def ensure_triangles(coords, indices, handle_concave_quads):
     """
     this fully tesselates the incoming topology into tris,
-    not optimized for meshes that don't contain ngons
+    only ngons (and quads, if handle_concave_quads) are tessellated face by face
     """
-    new_indices = []
-    concat = new_indices.append
-    concat2 = new_indices.extend
-    for idxset in indices:
-        num_verts = len(idxset)
-        if num_verts == 3:
-            concat(tuple(idxset))
-        elif num_verts == 4 and not handle_concave_quads:
-            # a b c d  ->  [a, b, c], [a, c, d]
-            concat2([(idxset[0], idxset[1], idxset[2]), (idxset[0], idxset[2], idxset[3])])
-        else:
-            subcoords = [Vector(coords[idx]) for idx in idxset]
-            for pol in tessellate([subcoords]):
-                concat([idxset[i] for i in pol])
-    return new_indices
+    loops, totals = face_loops(indices)
+    tessellated = tessellated_faces(totals, handle_concave_quads)
+    return triangulate_loops(coords, loops, totals, tessellated)
 
 
-def generate_facet_data(verts, faces, face_color, vector_light):
-    out_verts = []
-    out_vcols = []
-    concat_verts = out_verts.extend
-    concat_vcols = out_vcols.extend
-    for face in faces:
-        vecs = [verts[j] for j in face]
-        concat_verts(vecs)
+def light_colors(normals, face_color, vector_light):
+    """
+    shade by the angle between normals and the light;
+    zero normals get the color of the zero angle, as with Vector.angle(light, 0)
+    """
+    light = np.array(vector_light, dtype=np.float64)
+    lengths = np.linalg.norm(normals, axis=1) * np.linalg.norm(light)
+    valid = lengths > 0
+    cosines = np.zeros(len(normals))
+    cosines[valid] = (normals[valid] @ light) / lengths[valid]
+    normal_no = np.arccos(np.clip(cosines, -1.0, 1.0)) / pi
+    normal_no[~valid] = 0.0
+
+    vcols = np.ones((len(normals), 4), dtype=np.float32)
+    vcols[:, :3] = normal_no[:, np.newaxis] * np.array(face_color[:3]) + 0.1
+    return vcols
+
 
-        normal_no = Vector(normal(*vecs))
-        normal_no = (normal_no.angle(vector_light, 0)) / pi
+def triangle_normals(verts, faces):
+    v0, v1, v2 = (verts[faces[:, i]] for i in range(3))
+    return np.cross(v1 - v0, v2 - v0)
+
+
+def generate_facet_data(verts, faces, face_color, vector_light):
+    verts = np.asarray(verts, dtype=np.float64)
+    faces = np.asarray(faces).reshape(-1, 3)
+    out_verts = verts[faces].reshape(-1, 3).astype(np.float32)
+    vcols = light_colors(triangle_normals(verts, faces), face_color, vector_light)
+    return out_verts, np.repeat(vcols, 3, axis=0)
 
-        r = (normal_no * face_color[0]) - 0.1
-        g = (normal_no * face_color[1]) - 0.1
-        b = (normal_no * face_color[2]) - 0.1
-        vcol = (r+0.2, g+0.2, b+0.2, 1.0)
-        concat_vcols([vcol, vcol, vcol])
 
-    return out_verts, out_vcols
+def normalized(vectors):
+    lengths = np.linalg.norm(vectors, axis=1)[:, np.newaxis]
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
 
 
 def generate_smooth_data(verts, faces, face_color, vector_light):
-    """ this piggy backs off bmesh's automated normal calculation... """
-    out_vcols = []
-    concat_vcols = out_vcols.append
+    """
+    vertex normals are calculated the same way as bmesh does:
+    face normals weighted by the angles of face corners
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    faces = np.asarray(faces).reshape(-1, 3)
+    face_normals = normalized(triangle_normals(verts, faces))
+
+    vert_normals = np.zeros((len(verts), 3))
+    for corner in range(3):
+        prev_verts = verts[faces[:, corner - 1]]
+        corner_verts = verts[faces[:, corner]]
+        next_verts = verts[faces[:, (corner + 1) % 3]]
+        e1 = normalized(next_verts - corner_verts)
+        e2 = normalized(prev_verts - corner_verts)
+        angles = np.arccos(np.clip(np.einsum('ij,ij->i', e1, e2), -1.0, 1.0))
+        for axis in range(3):
+            vert_normals[:, axis] += np.bincount(
+                faces[:, corner], weights=face_normals[:, axis] * angles, minlength=len(verts))
+
+    # vertices without faces get normals pointing from the origin
+    no_normal = ~(np.linalg.norm(vert_normals, axis=1) > 0)
+    vert_normals[no_normal] = verts[no_normal]
+
+    return light_colors(vert_normals, face_color, vector_light)
+
+
+class MeshTopology(object):
+    """
+    Triangles and edges drawn by a node, and their GPU index buffers.
+    They are kept between updates of the node, and rebuilt only when faces
+    or edges change (or vertices of tessellated faces move), so that an
+    update which only moves vertices rebuilds only the vertex buffers.
+    """
+    def __init__(self):
+        self.faces_key = None
+        self.triangles = None
+        self.face_edges_key = None
+        self.face_edges = None
+        self.edges = None
+        self.index_buffers = {}
 
-    bm = bmesh_from_pydata(verts, [], faces, normal_update=True)
+    @staticmethod
+    def same_key(key, old_key):
+        if old_key is None or len(key) != len(old_key):
+            return False
+        return all(np.array_equal(a, b) for a, b in zip(key, old_key))
+
+    def set_faces(self, coords, indices, handle_concave_quads):
+        """ output: triangles of the faces """
+        loops, totals = face_loops(indices)
+        tessellated = tessellated_faces(totals, handle_concave_quads)
+        tessellated_coords = coords[loops[np.repeat(tessellated, totals)]]
+        key = (loops, totals, tessellated, tessellated_coords)
+        if not self.same_key(key, self.faces_key):
+            self.faces_key = key
+            self.triangles = triangulate_loops(coords, loops, totals, tessellated)
+            self.index_buffers.pop('TRIS', None)
+        return self.triangles
+
+    def set_face_edges(self, indices):
+        """ output: edges of the faces """
+        key = face_loops(indices)
+        if not self.same_key(key, self.face_edges_key):
+            self.face_edges_key = key
+            self.face_edges = edges_from_loops(*key)
+        return self.set_edges(self.face_edges)
+
+    def set_edges(self, edges):
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        if self.edges is None or not np.array_equal(edges, self.edges):
+            self.edges = edges
+            self.index_buffers.pop('LINES', None)
+        return self.edges
+
+    def index_buffer(self, GL_KIND):
+        """ output: index buffer of triangles ('TRIS') or edges ('LINES'), None if there are none """
+        if GL_KIND not in self.index_buffers:
+            indices = self.triangles if GL_KIND == 'TRIS' else self.edges
+            if indices is None or not len(indices):
+                self.index_buffers[GL_KIND] = None
+            else:
+                self.index_buffers[GL_KIND] = gpu.types.GPUIndexBuf(type=GL_KIND, seq=indices)
+        return self.index_buffers[GL_KIND]
+
+
+# node_id: MeshTopology
+mesh_topologies = {}
+
+
+def make_batch(shader, GL_KIND, content, index_buffer=None):
+    """ the same as batch_for_shader, but the index buffer can be shared by several batches """
+    vbo = gpu.types.GPUVertBuf(shader.format_calc(), len(next(iter(content.values()))))
+    for name, data in content.items():
+        vbo.attr_fill(name, data)
+    return gpu.types.GPUBatch(type=GL_KIND, buf=vbo, elem=index_buffer)
 
-    for vert in bm.verts:
-        normal_no = (vert.normal.angle(vector_light, 0)) / pi
-        r = (normal_no * face_color[0]) - 0.1
-        g = (normal_no * face_color[1]) - 0.1
-        b = (normal_no * face_color[2]) - 0.1
-        vcol = (r+0.2, g+0.2, b+0.2, 1.0)
-        concat_vcols(vcol)
 
-    return out_vcols
+def get_batch(geom, key, shader, GL_KIND, content, indexed=True):
+    """
+    batches are built at the first redraw after an update of the node,
+    and reused by following redraws
+    """
+    batch = geom.batches.get(key)
+    if batch is None:
+        index_buffer = geom.topology.index_buffer(GL_KIND) if indexed else None
+        batch = make_batch(shader, GL_KIND, content, index_buffer)
+        geom.batches[key] = batch
+    return batch
 
 
 def draw_matrix(context, args):
@@ -133,18 +288,16 @@ def draw_matrix(context, args):
         mdraw.draw_matrix(matrix)
 
 
-def draw_uniform(GL_KIND, coords, indices, color, width=1, dashed_data=None):
+def draw_uniform(geom, GL_KIND, color, width=1, dashed_data=None):
     if GL_KIND == 'LINES':
         bgl.glLineWidth(width)
     elif GL_KIND == 'POINTS':
         bgl.glPointSize(width)
 
-    params = dict(indices=indices) if indices else {}
-
     if GL_KIND == 'LINES' and dashed_data:
 
         shader = dashed_data.dashed_shader
-        batch = batch_for_shader(shader, 'LINES', {"inPos" : coords}, **params)
+        batch = get_batch(geom, 'dashed', shader, 'LINES', {"inPos" : geom.verts})
         shader.bind()
         shader.uniform_float("u_mvp", dashed_data.matrix)
         shader.uniform_float("u_resolution", dashed_data.u_resolution)
@@ -156,7 +309,8 @@ def draw_uniform(GL_KIND, coords, indices, color, width=1, dashed_data=None):
     else:
 
         shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        batch = batch_for_shader(shader, GL_KIND, {"pos" : coords}, **params)
+        indexed = GL_KIND != 'POINTS'
+        batch = get_batch(geom, 'uniform ' + GL_KIND, shader, GL_KIND, {"pos" : geom.verts}, indexed)
         shader.bind()
         shader.uniform_float("color", color)
 
@@ -168,16 +322,15 @@ def draw_uniform(GL_KIND, coords, indices, color, width=1, dashed_data=None):
         bgl.glPointSize(1)
 
 
-def draw_smooth(coords, vcols, indices=None):
+def draw_smooth(geom, key, coords, vcols, indexed=False):
     shader = gpu.shader.from_builtin('3D_SMOOTH_COLOR')
-    params = dict(indices=indices) if indices else {}
-    batch = batch_for_shader(shader, 'TRIS', {"pos" : coords, "color": vcols}, **params)
+    batch = get_batch(geom, key, shader, 'TRIS', {"pos" : coords, "color": vcols}, indexed)
     batch.draw(shader)
 
 
 def draw_verts(context, args):
     geom, config = args
-    draw_uniform('POINTS', geom.verts, None, config.vcol, config.point_size)
+    draw_uniform(geom, 'POINTS', config.vcol, config.point_size)
 
 def pack_dashed_config(config):
     dashed_config = lambda: None
@@ -189,20 +342,19 @@ def pack_dashed_config(config):
     dashed_config.dashed_shader = config.dashed_shader
     return dashed_config
 
-def draw_lines_uniform(context, config, coords, indices, line_color, line_width):
+def draw_lines_uniform(context, geom, config):
     if config.draw_dashed:
         config.matrix = context.region_data.perspective_matrix
         dashed_config = pack_dashed_config(config)
 
     params = dict(dashed_data=dashed_config) if config.draw_dashed else {}
-    draw_uniform('LINES', coords, indices, config.line4f, config.line_width, **params)
+    draw_uniform(geom, 'LINES', config.line4f, config.line_width, **params)
 
 def draw_edges(context, args):
     geom, config = args
-    coords, indices = geom.verts, geom.edges
 
     if config.display_edges:
-        draw_lines_uniform(context, config, coords, indices, config.line4f, config.line_width)
+        draw_lines_uniform(context, geom, config)
     if config.display_verts:
         draw_verts(context, args)
 
@@ -228,11 +380,11 @@ def draw_faces_uniform(context, args):
         bgl.glPolygonOffset(1.0, 1.0)
 
     if config.shade == "flat":
-        draw_uniform('TRIS', geom.verts, geom.faces, config.face4f)
+        draw_uniform(geom, 'TRIS', config.face4f)
     elif config.shade == "facet":
-        draw_smooth(geom.facet_verts, geom.facet_verts_vcols)
+        draw_smooth(geom, 'facet', geom.facet_verts, geom.facet_verts_vcols)
     elif config.shade == "smooth":
-        draw_smooth(geom.verts, geom.smooth_vcols, indices=geom.faces)
+        draw_smooth(geom, 'smooth', geom.verts, geom.smooth_vcols, indexed=True)
     elif config.shade == 'fragment':
         if config.draw_fragment_function:
             config.draw_fragment_function(context, args)
@@ -249,11 +401,11 @@ def draw_complex(context, args):
         bgl.glDisable(bgl.GL_POLYGON_OFFSET_FILL)
 
     if config.display_edges:
-        draw_lines_uniform(context, config, geom.verts, geom.edges, config.line4f, config.line_width)
+        draw_lines_uniform(context, geom, config)
     if config.display_faces:
         draw_faces_uniform(context, args)
     if config.display_verts:
-        draw_uniform('POINTS', geom.verts, None, config.vcol, config.point_size)
+        draw_uniform(geom, 'POINTS', config.vcol, config.point_size)
 
     if config.draw_gl_polygonoffset:
         # or restore to the state found when entering this function. TODO!
@@ -519,7 +671,8 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
             else:
                 config.shader = gpu.types.GPUShader(default_vertex_shader, default_fragment_shader)
 
-            config.batch = batch_for_shader(config.shader, 'TRIS', {"position": geom.verts}, indices=geom.faces)
+            index_buffer = geom.topology.index_buffer('TRIS')
+            config.batch = make_batch(config.shader, 'TRIS', {"position": geom.verts}, index_buffer)
 
     def handle_attr_socket(self):
         """
@@ -574,10 +727,12 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
             if len(data[0]) > 1:
                 coords, edge_indices, face_indices = mesh_join(data[0], data[1], data[2])
             else:
-                coords, edge_indices, face_indices = [d[0].tolist() if type(d[0]) == ndarray else d[0] for d in data[:3]]
+                coords, edge_indices, face_indices = [d[0] for d in data[:3]]
 
             geom = lambda: None
-            geom.verts = coords
+            geom.verts = np.asarray(coords, dtype=np.float32).reshape(-1, 3)
+            geom.batches = {}
+            geom.topology = None
 
             if self.display_verts and not any([display_edges, display_faces]):
                 gl_instructions = self.format_draw_data(func=draw_verts, args=(geom, config))
@@ -588,16 +743,18 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
                 if self.use_dashed:
                     self.add_gl_stuff_to_config(config)
 
-                geom.edges = edge_indices
+                geom.topology = self.get_topology()
+                geom.edges = geom.topology.set_edges(edge_indices)
                 gl_instructions = self.format_draw_data(func=draw_edges, args=(geom, config))
                 callback_enable(n_id, gl_instructions)
                 return
 
             if faces_socket.is_linked:
+                geom.topology = self.get_topology()
 
                 #  expecting mixed bag of tris/quads/ngons
                 if self.display_faces:
-                    geom.faces = ensure_triangles(coords, face_indices, self.handle_concave_quads)
+                    geom.faces = geom.topology.set_faces(geom.verts, face_indices, self.handle_concave_quads)
 
                 if self.display_edges:
                     if self.use_dashed:
@@ -605,7 +762,10 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
 
                     # we don't want to draw the inner edges of triangulated faces; use original face_indices.
                     # pass edges from socket if we can, else we manually compute them from faces
-                    geom.edges = edge_indices if edges_socket.is_linked else edges_from_faces(face_indices)
+                    if edges_socket.is_linked:
+                        geom.edges = geom.topology.set_edges(edge_indices)
+                    else:
+                        geom.edges = geom.topology.set_face_edges(face_indices)
 
                 if self.display_faces:
                     self.faces_diplay(geom, config)
@@ -621,6 +781,13 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
             gl_instructions = self.format_draw_data(func=draw_matrix, args=(matrices, ))
             callback_enable(n_id, gl_instructions)
 
+    def get_topology(self):
+        n_id = node_id(self)
+        topology = mesh_topologies.get(n_id)
+        if topology is None:
+            topology = mesh_topologies[n_id] = MeshTopology()
+        return topology
+
     def sv_copy(self, node):
         self.n_id = ''
 
@@ -643,6 +810,7 @@ class SvVDExperimental(bpy.types.Node, SverchCustomTreeNode):
 
     def sv_free(self):
         callback_disable(node_id(self))
+        mesh_topologies.pop(node_id(self), None)
 
 
 classes = [SvVDExperimental]
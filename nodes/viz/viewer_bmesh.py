@@ -18,18 +18,17 @@
 
 # MK2
 import numpy as np
-import itertools
 import collections
 import random
 from random import random as rnd_float
 
 import bpy
 from bpy.props import BoolProperty, StringProperty, BoolVectorProperty
-from mathutils import Matrix, Vector
+from mathutils import Matrix
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import dataCorrect, fullList, updateNode
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, write_mesh_from_pydata
 from sverchok.utils.sv_viewer_utils import natural_plus_one, greek_alphabet
 from sverchok.utils.sv_obj_helper import SvObjHelper, CALLBACK_OP, get_random_init_v3
 from sverchok.utils.modules.sv_bmesh_ops import find_islands_treemap
@@ -92,21 +91,56 @@ def default_mesh(name):
     return bpy.data.meshes.new(name)
 
 
-def make_bmesh_geometry(node, obj_index, context, verts, *topology):
+def get_or_create_object(collection, name, objects_by_name=None):
+    """
+    objects_by_name: optional dict {name: object} of bpy.data.objects; when
+    many objects are written in one update, it is cheaper to build it once
+    than to look each name up in bpy.data.objects.
+    """
+    if objects_by_name is None:
+        sv_object = bpy.data.objects.get(name)
+    else:
+        sv_object = objects_by_name.get(name)
+    if sv_object is None:
+        temp_mesh = default_mesh(name)
+        sv_object = bpy.data.objects.new(name, temp_mesh)
+        collection.objects.link(sv_object)
+        if objects_by_name is not None:
+            objects_by_name[name] = sv_object
+    return sv_object
+
+
+def write_geometry(node, mesh, verts, edges, faces, materials):
+    """
+    Write geometry directly into the mesh; fall back to bmesh when
+    islands have to be found, or the data can not be written directly.
+    output: islands, if node.randomize_vcol_islands is set, otherwise None.
+    """
+    if not node.randomize_vcol_islands:
+        if write_mesh_from_pydata(mesh, verts, edges, faces, materials):
+            return None
+
+    bm = bmesh_from_pydata(verts, edges, faces, normal_update=node.calc_normals)
+    if materials:
+        for face, material in zip(bm.faces[:], materials):
+            if material is not None:
+                face.material_index = material
+    bm.to_mesh(mesh)
+    islands = None
+    if node.randomize_vcol_islands:
+        islands = find_islands_treemap(bm)
+    bm.free()
+    return islands
+
+
+def make_bmesh_geometry(node, obj_index, context, verts, *topology, objects_by_name=None):
     collection = context.scene.collection
-    meshes = bpy.data.meshes
-    objects = bpy.data.objects
     islands = None
 
     edges, faces, materials, matrix = topology
     name = f'{node.basedata_name}.{obj_index:04d}'
 
-    if name in objects:
-        sv_object = objects[name]
-    else:
-        temp_mesh = default_mesh(name)
-        sv_object = objects.new(name, temp_mesh)
-        collection.objects.link(sv_object)
+    sv_object = get_or_create_object(collection, name, objects_by_name)
 
     # book-keeping via ID-props!? even this is can be broken by renames
     sv_object['idx'] = obj_index
@@ -127,22 +161,11 @@ def make_bmesh_geometry(node, obj_index, context, verts, *topology):
         vertices, this mode can be switched to to increase efficiency
     '''
     if node.fixed_verts and difference == 0:
-        f_v = list(itertools.chain.from_iterable(verts))
+        f_v = np.asarray(verts, dtype=np.float32).ravel()
         mesh.vertices.foreach_set('co', f_v)
         mesh.update()
     else:
-
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(verts, edges, faces, normal_update=node.calc_normals)
-        if materials:
-            for face, material in zip(bm.faces[:], materials):
-                if material is not None:
-                    face.material_index = material
-        bm.to_mesh(sv_object.data)
-        if node.randomize_vcol_islands:
-            islands = find_islands_treemap(bm)
-        bm.free()
-
+        islands = write_geometry(node, mesh, verts, edges, faces, materials)
         sv_object.hide_select = False
 
     if node.randomize_vcol_islands:
@@ -160,18 +183,10 @@ def make_bmesh_geometry(node, obj_index, context, verts, *topology):
 
 
 def make_bmesh_geometry_merged(node, obj_index, context, yielder_object):
-    scene = context.scene
-    collection = scene.collection
-    meshes = bpy.data.meshes
-    objects = bpy.data.objects
+    collection = context.scene.collection
     name = f'{node.basedata_name}.{obj_index:04d}'
 
-    if name in objects:
-        sv_object = objects[name]
-    else:
-        temp_mesh = default_mesh(name)
-        sv_object = objects.new(name, temp_mesh)
-        collection.objects.link(sv_object)
+    sv_object = get_or_create_object(collection, name)
 
     # book-keeping via ID-props!
     sv_object['idx'] = obj_index
@@ -189,11 +204,13 @@ def make_bmesh_geometry_merged(node, obj_index, context, yielder_object):
         verts, topology = result
         edges, faces, materials, matrix = topology
 
+        verts = np.asarray(verts, dtype=np.float64)
         if matrix:
             # matrix = matrix_sanitizer(matrix)
-            verts = [matrix @ Vector(v) for v in verts]
+            matrix = np.array(matrix)
+            verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
 
-        big_verts.extend(verts)
+        big_verts.append(verts)
         big_edges.extend([[a + vert_count, b + vert_count] for a, b in edges])
         big_faces.extend([[j + vert_count for j in f] for f in faces])
         big_materials.extend(materials)
@@ -201,20 +218,22 @@ def make_bmesh_geometry_merged(node, obj_index, context, yielder_object):
         vert_count += len(verts)
 
 
-    if node.fixed_verts and len(sv_object.data.vertices) == len(big_verts):
-        mesh = sv_object.data
-        f_v = list(itertools.chain.from_iterable(big_verts))
+    big_verts = np.concatenate(big_verts) if big_verts else np.empty((0, 3))
+    mesh = sv_object.data
+    if node.fixed_verts and len(mesh.vertices) == len(big_verts):
+        f_v = big_verts.astype(np.float32).ravel()
         mesh.vertices.foreach_set('co', f_v)
         mesh.update()
     else:
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(big_verts, big_edges, big_faces, normal_update=node.calc_normals)
-        if materials:
-            for face, material in zip(bm.faces[:], big_materials):
-                if material is not None:
-                    face.material_index = material
-        bm.to_mesh(sv_object.data)
-        bm.free()
+        if not write_mesh_from_pydata(mesh, big_verts, big_edges, big_faces, big_materials):
+            ''' get bmesh, write bmesh to obj, free bmesh'''
+            bm = bmesh_from_pydata(big_verts.tolist(), big_edges, big_faces, normal_update=node.calc_normals)
+            if big_materials:
+                for face, material in zip(bm.faces[:], big_materials):
+                    if material is not None:
+                        face.material_index = material
+            bm.to_mesh(mesh)
+            bm.free()
 
     sv_object.hide_select = False
     sv_object.matrix_local = Matrix.Identity(4)
@@ -372,12 +391,14 @@ class SvBmeshViewerNodeV28(bpy.types.Node, SverchCustomTreeNode, SvObjHelper):
                 make_bmesh_geometry_merged(self, obj_index, bpy.context, yielder_object)
 
             else:
+                objects_by_name = {obj.name: obj for obj in bpy.data.objects}
                 for obj_index, Verts in enumerate(mverts):
                     if not len(Verts) > 0:
                         continue
 
                     data = get_edges_faces_matrices(obj_index)
-                    make_bmesh_geometry(self, obj_index, bpy.context, Verts, *data)
+                    make_bmesh_geometry(self, obj_index, bpy.context, Verts, *data,
+                                        objects_by_name=objects_by_name)
 
             last_index = (len(mverts) - 1) if not self.merge else 0
             self.remove_non_updated_objects(last_index)
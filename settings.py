@@ -8,6 +8,7 @@ from sverchok.dependencies import sv_dependencies, pip, ensurepip, draw_message,
 from sverchok import data_structure
 from sverchok.core import handlers
 from sverchok.core import update_system
+from sverchok.core import node_manifest
 from sverchok.utils import sv_panels_tools, logging
 from sverchok.utils.sv_gist_tools import TOKEN_HELP_URL
 from sverchok.ui import color_def
@@ -116,9 +117,23 @@ class SverchokPreferences(AddonPreferences):
     def update_debug_mode(self, context):
         data_structure.DEBUG_MODE = self.show_debug
 
+    def update_check_data_mutation(self, context):
+        data_structure.CHECK_DATA_MUTATION = self.check_data_mutation
+
     def update_heat_map(self, context):
         data_structure.heat_map_state(self.heat_map)
 
+    def update_incremental_update(self, context):
+        data_structure.INCREMENTAL_UPDATE = self.incremental_update
+
+    def update_parallel_update(self, context):
+        data_structure.PARALLEL_UPDATE = self.parallel_update
+        data_structure.PARALLEL_UPDATE_THREADS = self.parallel_update_threads
+
+    def update_socket_cache_limits(self, context):
+        data_structure.SOCKET_CACHE_TREE_LIMIT = self.socket_cache_tree_limit * 1024 * 1024
+        data_structure.SOCKET_CACHE_TOTAL_LIMIT = self.socket_cache_total_limit * 1024 * 1024
+
     def set_frame_change(self, context):
         handlers.set_frame_change(self.frame_change_mode)
 
@@ -142,6 +157,12 @@ class SverchokPreferences(AddonPreferences):
         default=False, subtype='NONE',
         update=update_debug_mode)
 
+    check_data_mutation: BoolProperty(
+        name="Check data mutation",
+        description="Warn about nodes which modify their input data in place (slow)",
+        default=False,
+        update=update_check_data_mutation)
+
     no_data_color: FloatVectorProperty(
         name="No data", description='When a node can not get data',
         size=3, min=0.0, max=1.0,
@@ -161,6 +182,37 @@ class SverchokPreferences(AddonPreferences):
         default=False, subtype='NONE',
         update=update_heat_map)
 
+    #  update system settings
+    incremental_update: BoolProperty(
+        name="Incremental update",
+        description="Do not process nodes downstream of a changed node if output data of their dependencies did not change",
+        default=False,
+        update=update_incremental_update)
+
+    parallel_update: BoolProperty(
+        name="Parallel update (experimental)",
+        description="Process independent nodes concurrently in several threads. Only computations of nodes which support it are done in worker threads; all access to Blender data stays in the main thread",
+        default=False,
+        update=update_parallel_update)
+
+    parallel_update_threads: IntProperty(
+        name="Threads",
+        description="Number of threads used by parallel update; 0 means the number of CPU cores",
+        default=0, min=0,
+        update=update_parallel_update)
+
+    socket_cache_tree_limit: IntProperty(
+        name="Tree data limit, MB",
+        description="Maximum size of data kept in sockets of one node tree; least recently used data is evicted and recomputed when needed. 0 means no limit",
+        default=0, min=0,
+        update=update_socket_cache_limits)
+
+    socket_cache_total_limit: IntProperty(
+        name="Total data limit, MB",
+        description="Maximum size of data kept in sockets of all node trees; least recently used data is evicted and recomputed when needed. 0 means no limit",
+        default=0, min=0,
+        update=update_socket_cache_limits)
+
     heat_map_hot: FloatVectorProperty(
         name="Heat map hot", description='',
         size=3, min=0.0, max=1.0,
@@ -183,6 +235,29 @@ class SverchokPreferences(AddonPreferences):
             default = "NONE",
             description = "Performance profiling mode")
 
+    profiling_backends = [
+        ("CPROFILE", "cProfile", "Deterministic profiling of each function call with cProfile; precise, but slows down the profiled code several times", 0),
+        ("SAMPLING", "Sampling", "Record call stacks of the profiled code at fixed interval; low overhead, results are saved as collapsed stacks for flame graphs", 1)
+    ]
+
+    profile_backend: EnumProperty(name = "Profiler",
+            items = profiling_backends,
+            default = "CPROFILE",
+            description = "Profiler implementation")
+
+    profile_sampling_interval: FloatProperty(name = "Sampling interval, ms",
+            description = "Interval between samples of sampling profiler, in milliseconds; takes effect after profiling data reset",
+            default = 1.0, min = 0.1, max = 100.0)
+
+    # Telemetry settings
+    telemetry_trace_memory: BoolProperty(name = "Trace memory in telemetry",
+            description = "Record memory allocated by each node with tracemalloc when telemetry is enabled (slows down processing)",
+            default = False)
+
+    telemetry_history_size: IntProperty(name = "Telemetry history",
+            description = "Number of samples of telemetry kept for each node",
+            default = 100, min = 1)
+
     developer_mode: BoolProperty(name = "Developer mode",
             description = "Show some additional panels or features useful for Sverchok developers only",
             default = False)
@@ -286,6 +361,18 @@ class SverchokPreferences(AddonPreferences):
     enable_live_objin: BoolProperty(
         description="Objects in edit mode will be updated in object-in Node")
 
+    def get_lazy_node_loading(self):
+        return node_manifest.is_lazy_loading_enabled()
+
+    def set_lazy_node_loading(self, value):
+        node_manifest.set_lazy_loading_enabled(value)
+
+    lazy_node_loading: BoolProperty(
+        name = "Lazy node loading",
+        description = "Start faster by importing node modules only when they are used; remaining nodes are loaded in background after startup. Requires restart",
+        get = get_lazy_node_loading,
+        set = set_lazy_node_loading)
+
     ##  BLF/BGL/GPU  scale and location props
 
     render_scale: FloatProperty(
@@ -387,6 +474,7 @@ class SverchokPreferences(AddonPreferences):
 
         col1.prop(self, "over_sized_buttons")
         col1.prop(self, "enable_live_objin", text='Enable Live Object-In')
+        col1.prop(self, "lazy_node_loading")
         col1.prop(self, "external_editor", text="Ext Editor")
         col1.prop(self, "real_sverchok_path", text="Src Directory")
 
@@ -402,12 +490,29 @@ class SverchokPreferences(AddonPreferences):
         col2.row().prop(self, "frame_change_mode", expand=True)
         col2.separator()
 
+        update_box = col2.box()
+        update_box.label(text="Update system:")
+        update_box.prop(self, "incremental_update")
+        update_box.prop(self, "parallel_update")
+        if self.parallel_update:
+            update_box.prop(self, "parallel_update_threads")
+        update_box.prop(self, "socket_cache_tree_limit")
+        update_box.prop(self, "socket_cache_total_limit")
+
         col2box = col2.box()
         col2box.label(text="Debug:")
         col2box.prop(self, "profile_mode")
+        if self.profile_mode != "NONE":
+            col2box.prop(self, "profile_backend")
+            if self.profile_backend == "SAMPLING":
+                col2box.prop(self, "profile_sampling_interval")
         col2box.prop(self, "show_debug")
+        col2box.prop(self, "check_data_mutation")
         col2box.prop(self, "heat_map")
         col2box.prop(self, "developer_mode")
+        if self.developer_mode:
+            col2box.prop(self, "telemetry_trace_memory")
+            col2box.prop(self, "telemetry_history_size")
 
         log_box = col2.box()
         log_box.label(text="Logging:")
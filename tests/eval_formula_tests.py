@@ -0,0 +1,53 @@
+from sverchok.utils.testing import *
+from sverchok.utils.modules.eval_formula import safe_eval, safe_eval_formulas_vectorized
+
+class VectorizedFormulaTests(SverchokTestCase):
+    def evaluate(self, formula, var_names, values):
+        vectorized = safe_eval_formulas_vectorized([formula], var_names, values)
+        expected = [safe_eval(formula, dict(zip(var_names, vs))) for vs in zip(*values)]
+        return vectorized, expected
+
+    def assert_vectorized(self, formula, var_names, values):
+        vectorized, expected = self.evaluate(formula, var_names, values)
+        self.assertIsNotNone(vectorized)
+        self.assertEqual(vectorized[0], expected)
+        self.assertEqual([type(v) for v in vectorized[0]], [type(v) for v in expected])
+
+    def assert_not_vectorized(self, formula, var_names, values):
+        vectorized, _ = self.evaluate(formula, var_names, values)
+        self.assertIsNone(vectorized)
+
+    def test_floats(self):
+        xs = [0.1 * i for i in range(10)]
+        self.assert_vectorized("x/2 + sin(x) - 3*x**2", ['x'], [xs])
+
+    def test_integers(self):
+        xs = list(range(-5, 5))
+        self.assert_vectorized("x*x - x // 3 % 4 + abs(x)", ['x'], [xs])
+        self.assert_vectorized("x**2", ['x'], [xs])
+
+    def test_mixed(self):
+        self.assert_vectorized("x*y", ['x', 'y'], [[1.5] * 10, list(range(10))])
+
+    def test_integer_overflow(self):
+        xs = list(range(3000000, 3000010))
+        self.assert_vectorized("x*x", ['x'], [xs])
+        self.assert_not_vectorized("x*x*x*x*x", ['x'], [xs])
+        self.assert_not_vectorized("x**3", ['x'], [xs])
+
+    def test_booleans(self):
+        xs = list(range(10))
+        self.assert_vectorized("(x > 3) * 5", ['x'], [xs])
+        # numpy adds booleans as logical or
+        self.assert_not_vectorized("(x > 3) + (x > 5)", ['x'], [xs])
+
+    def test_ragged_values(self):
+        xs = [[1, 2], [3], [4, 5, 6]] * 4
+        self.assert_not_vectorized("x[0]", ['x'], [xs])
+        self.assert_not_vectorized("x", ['x'], [xs])
+
+    def test_mixed_int_float_values(self):
+        xs = [1, 2.5] * 5
+        vectorized, expected = self.evaluate("x*2", ['x'], [xs])
+        self.assertIsNone(vectorized)
+        self.assertEqual(type(expected[0]), int)
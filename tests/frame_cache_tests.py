@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+from mathutils import Matrix, Vector
+
+from sverchok.utils.testing import *
+from sverchok.utils.frame_cache import SvFrameCache, pack_frame_data, get_frame_cache, remove_frame_cache, frame_caches
+
+class FrameCacheTests(SverchokTestCase):
+    def spill_and_load(self, data):
+        cache = SvFrameCache(memory_limit=0, use_disk=True)
+        try:
+            cache.put(1, data)
+            cache.put(2, dict())
+            self.assertIn(1, cache.on_disk)
+            self.assertNotIn(1, cache.memory)
+            return cache.get(1)
+        finally:
+            cache.clear()
+
+    def test_numeric_roundtrip(self):
+        data = {'Floats': [[1.0, 2.5]], 'Ints': [[1, 2, 3]], 'Array': [np.array([[0.0, 1.0, 2.0]])]}
+        self.assertIsNotNone(pack_frame_data(data))
+        result = self.spill_and_load(data)
+        self.assertEqual(result['Floats'], [[1.0, 2.5]])
+        self.assertEqual(type(result['Floats'][0][0]), float)
+        self.assertEqual(result['Ints'], [[1, 2, 3]])
+        self.assertEqual(type(result['Ints'][0][0]), int)
+        self.assertIsInstance(result['Array'][0], np.ndarray)
+        self.assert_numpy_arrays_equal(result['Array'][0], data['Array'][0])
+
+    def test_vertices_roundtrip(self):
+        data = {'Vertices': [[(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)]]}
+        self.assertIsNone(pack_frame_data(data))
+        result = self.spill_and_load(data)
+        self.assertEqual(result, data)
+        self.assertEqual(type(result['Vertices'][0][0]), tuple)
+
+    def test_matrices_roundtrip(self):
+        data = {'Matrix': [Matrix.Translation(Vector((1, 2, 3)))]}
+        self.assertIsNone(pack_frame_data(data))
+        result = self.spill_and_load(data)
+        self.assertIsInstance(result['Matrix'][0], Matrix)
+        self.assertEqual(result['Matrix'][0], data['Matrix'][0])
+
+    def test_mixed_numbers_roundtrip(self):
+        data = {'Numbers': [[1, 2.5]]}
+        self.assertIsNone(pack_frame_data(data))
+        result = self.spill_and_load(data)
+        self.assertEqual(type(result['Numbers'][0][0]), int)
+
+    def test_remove_frame_cache(self):
+        cache = get_frame_cache("frame_cache_tests", memory_limit=0, use_disk=True)
+        try:
+            cache.put(1, {'Floats': [[1.0]]})
+            cache.put(2, dict())
+            directory = cache.directory
+            self.assertTrue(os.path.isdir(directory))
+        finally:
+            remove_frame_cache("frame_cache_tests")
+        self.assertNotIn("frame_cache_tests", frame_caches)
+        self.assertFalse(os.path.exists(directory))
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.field.scalar import SvScalarField
+from sverchok.utils.marching_cubes import sample_field_adaptive
+
+class FunctionField(SvScalarField):
+    def __init__(self, function):
+        self.function = function
+
+    def evaluate_grid(self, xs, ys, zs):
+        return self.function(xs, ys, zs)
+
+def sphere_with_disk(xs, ys, zs):
+    # Sphere of radius 0.5 with a thin disk around it,
+    # thinner than a coarse cell
+    sphere = np.sqrt(xs*xs + ys*ys + zs*zs) - 0.5
+    disk = np.maximum(np.abs(zs) - 0.05, np.sqrt(xs*xs + ys*ys) - 0.65)
+    return np.minimum(sphere, disk)
+
+def thin_slab(xs, ys, zs):
+    return np.abs(xs - 0.3) - 0.05
+
+class AdaptiveSamplingTests(SverchokTestCase):
+    def sample_full(self, function, grid):
+        xs, ys, zs = np.meshgrid(grid, grid, grid, indexing='ij')
+        return function(xs.flatten(), ys.flatten(), zs.flatten()).reshape(xs.shape)
+
+    def assert_same_signs(self, values, expected):
+        self.assertTrue(((values >= 0) == (expected >= 0)).all())
+
+    def test_thin_feature_near_surface(self):
+        grid = np.linspace(-1, 1, 60)
+        field = FunctionField(sphere_with_disk)
+        values, n_evaluated = sample_field_adaptive(field, grid, grid, grid, 0.0, coarse_step=8)
+        self.assert_same_signs(values, self.sample_full(sphere_with_disk, grid))
+        self.assertTrue(n_evaluated < values.size)
+
+    def test_isolated_thin_feature(self):
+        grid = np.linspace(-1, 1, 60)
+        field = FunctionField(thin_slab)
+        expected = self.sample_full(thin_slab, grid)
+        self.assertTrue((expected < 0).any())
+        # Without a Lipschitz bound, the slab is lost
+        values, _ = sample_field_adaptive(field, grid, grid, grid, 0.0, coarse_step=7)
+        self.assertFalse((values < 0).any())
+        values, _ = sample_field_adaptive(field, grid, grid, grid, 0.0, coarse_step=7, lipschitz=1.0)
+        self.assert_same_signs(values, expected)
@@ -4,7 +4,7 @@ import unittest
 from sverchok.utils.testing import SverchokTestCase, requires
 from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.curve.nurbs import SvGeomdlCurve, SvNativeNurbsCurve, SvNurbsBasisFunctions, SvNurbsCurve
-from sverchok.utils.nurbs_common import elevate_bezier_degree, from_homogenous
+from sverchok.utils.nurbs_common import elevate_bezier_degree, from_homogenous, find_knot_spans, nurbs_basis_derivatives
 from sverchok.utils.surface.nurbs import SvGeomdlSurface, SvNativeNurbsSurface
 from sverchok.utils.surface.algorithms import SvCurveLerpSurface
 from sverchok.dependencies import geomdl
@@ -55,6 +55,29 @@ class NurbsCurveTests(SverchokTestCase):
 
         self.assert_numpy_arrays_equal(expected, d2s, precision=8)
 
+    def test_find_knot_spans(self):
+        knotvector = np.array([0, 0, 0, 0, 0.5, 0.5, 1, 1, 1, 1])
+        ts = np.array([0, 0.25, 0.5, 0.75, 1.0])
+        spans = find_knot_spans(knotvector, 3, ts)
+        expected = np.array([3, 3, 5, 5, 5])
+        self.assert_numpy_arrays_equal(spans, expected)
+
+    def test_basis_derivatives_block(self):
+        "Test non-zero basis functions and their derivatives"
+        knotvector = np.array([0, 0, 0, 0, 0.2, 0.5, 0.7, 1, 1, 1, 1])
+        degree = 3
+        ts = np.linspace(0, 1.0, num=23)
+        k = len(knotvector) - degree - 1
+        functions = SvNurbsBasisFunctions(knotvector)
+        spans = find_knot_spans(knotvector, degree, ts)
+        block = nurbs_basis_derivatives(knotvector, degree, spans, ts, order=3)
+        for order in range(4):
+            expected = np.array([functions.derivative(i, degree, order)(ts) for i in range(k)]).T
+            result = np.zeros_like(expected)
+            for j, span in enumerate(spans):
+                result[j, span-degree : span+1] = block[order, j]
+            self.assert_numpy_arrays_equal(result, expected, precision=8)
+
     #@unittest.skip
     @requires(geomdl)
     def test_curve_eval(self):
@@ -240,6 +263,16 @@ class NurbsSurfaceTests(SverchokTestCase):
         vs2 = native_surface.evaluate_array(self.us, self.vs)
         self.assert_numpy_arrays_equal(vs1, vs2, precision=8, fail_fast=False)
 
+    def test_eval_grid(self):
+        weights = [[1,1,1,1], [1,2,3,1], [1,3,4,1], [1,4,5,1], [1,1,1,1]]
+        native_surface = SvNativeNurbsSurface(self.degree_u, self.degree_v, self.knotvector_u, self.knotvector_v, self.control_points, weights)
+        us = np.linspace(0.0, 1.0, num=5)
+        vs = np.linspace(0.0, 1.0, num=7)
+        grid = native_surface.evaluate_grid(us, vs)
+        us, vs = np.meshgrid(us, vs, indexing='ij')
+        expected = native_surface.evaluate_array(us.flatten(), vs.flatten()).reshape((5, 7, 3))
+        self.assert_numpy_arrays_equal(grid, expected, precision=8)
+
     @requires(geomdl)
     #@unittest.skip
     def test_normal(self):
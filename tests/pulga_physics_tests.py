@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.pulga_physics_core import cross_indices3, cell_indices, fit_force
+
+class PulgaCellIndicesTests(SverchokTestCase):
+    def close_pairs(self, verts, indexes, max_dist):
+        dist = np.linalg.norm(verts[indexes[:, 0]] - verts[indexes[:, 1]], axis=1)
+        return {tuple(pair) for pair in indexes[dist < max_dist].tolist()}
+
+    def assert_same_close_pairs(self, verts, cell_size):
+        expected = self.close_pairs(verts, cross_indices3(len(verts)), cell_size)
+        indexes = cell_indices(verts, cell_size)
+        self.assertEqual(self.close_pairs(verts, indexes, cell_size), expected)
+        # every pair is reported once, as (i, j) with i < j
+        self.assertTrue(np.all(indexes[:, 0] < indexes[:, 1]))
+        self.assertEqual(len({tuple(pair) for pair in indexes.tolist()}), len(indexes))
+
+    def test_random_cloud(self):
+        np.random.seed(1)
+        verts = np.random.uniform(-1, 1, size=(300, 3))
+        for cell_size in [0.05, 0.2, 0.7, 3.0]:
+            with self.subTest(cell_size = cell_size):
+                self.assert_same_close_pairs(verts, cell_size)
+
+    def test_flat_cloud(self):
+        np.random.seed(2)
+        verts = np.random.uniform(0, 5, size=(200, 3))
+        verts[:, 2] = 0.0
+        self.assert_same_close_pairs(verts, 0.5)
+
+    def test_coincident_particles(self):
+        verts = np.array([[0.0, 0.0, 0.0]] * 4 + [[10.0, 0.0, 0.0]])
+        self.assert_same_close_pairs(verts, 1.0)
+
+    def test_no_pairs(self):
+        self.assertEqual(cell_indices(np.zeros((1, 3)), 1.0).shape, (0, 2))
+
+class PulgaFitForceTests(SverchokTestCase):
+    def test_many_particles(self):
+        v_len = 40000
+        ps = SimpleNamespace(v_len = v_len, rads = np.ones(v_len))
+        touch = np.array([[0, 1], [v_len - 2, v_len - 1]])
+        fit_force(ps, touch, (np.array([1.0]), 0.5, 2.0))
+        self.assertTrue(np.all(ps.rads[[0, 1, v_len - 2, v_len - 1]] < 1.0))
+        self.assertTrue(np.all(ps.rads[2:v_len - 2] > 1.0))
@@ -44,6 +44,25 @@ class SocketConversionTests(EmptyTreeTestCase):
 
         self.assert_sverchok_data_equal(data, expected_data, precision=8)
 
+    def test_packed_matrices(self):
+        """
+        Test that packed matrices are seen as lists of Matrix
+        by nodes which do not ask for packed data.
+        """
+        matrix_in = create_node("SvMatrixInNodeMK4")
+        matrix_in.location_ = (1, 2, 3)
+        matrix_math = create_node("SvMatrixMathNode")
+
+        self.tree.links.new(matrix_in.outputs['Matrices'], matrix_math.inputs['A'])
+        matrix_in.process()
+
+        packed = matrix_math.inputs['A'].sv_get(packed=True)
+        self.assertEqual(packed.shape, (1, 4, 4))
+
+        matrices = matrix_math.inputs['A'].sv_get()
+        self.assertIsInstance(matrices[0], Matrix)
+        self.assert_sverchok_data_equal(matrices[0].to_translation()[:], (1.0, 2.0, 3.0), precision=6)
+
     # def test_no_edges_to_verts(self):
     #     """
     #     Test that edges -> vertices conversion raises an exception.
@@ -0,0 +1,111 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok import data_structure
+from sverchok.core.socket_data import (
+    sv_data_equal, sv_deep_copy, sv_snapshot, freeze_socket_data, sv_data_size,
+    socket_data_cache, evicted_sockets, account_socket_data, forget_socket_data_size,
+    pin_socket_data, unpin_socket_data)
+
+class SocketDataEqualTests(SverchokTestCase):
+    def test_nested_lists(self):
+        self.assertTrue(sv_data_equal([[(0, 0, 0), (1, 0, 0)]], [[(0, 0, 0), (1, 0, 0)]]))
+        self.assertFalse(sv_data_equal([[(0, 0, 0), (1, 0, 0)]], [[(0, 0, 0), (2, 0, 0)]]))
+        self.assertFalse(sv_data_equal([[1, 2]], [[1, 2, 3]]))
+
+    def test_numpy_arrays(self):
+        self.assertTrue(sv_data_equal([np.array([1.0, 2.0])], [np.array([1.0, 2.0])]))
+        self.assertFalse(sv_data_equal([np.array([1.0, 2.0])], [np.array([1.0, 3.0])]))
+        self.assertFalse(sv_data_equal([np.array([1.0, 2.0])], [np.array([1.0, 2.0, 3.0])]))
+        self.assertFalse(sv_data_equal(np.array([1.0, 2.0]), [1.0, 2.0]))
+
+    def test_same_mutable_object(self):
+        data = [[1, 2, 3]]
+        self.assertFalse(sv_data_equal(data, data))
+
+class SocketDataCopyTests(SverchokTestCase):
+    def test_deep_copy(self):
+        data = [[[0, 1, 2], [1, 2, 3]], [[[4]]]]
+        copy = sv_deep_copy(data)
+        self.assertEqual(copy, data)
+        copy[0][0].append(5)
+        copy[1][0][0].append(6)
+        self.assertEqual(data, [[[0, 1, 2], [1, 2, 3]], [[[4]]]])
+
+    def test_snapshot(self):
+        data = [[np.array([1.0, 2.0])], [(0, 0, 0)]]
+        copy = sv_snapshot(data)
+        self.assertTrue(sv_data_equal(copy, data))
+        data[0][0][0] = 3.0
+        self.assertFalse(sv_data_equal(copy, data))
+
+    def test_freeze(self):
+        data = freeze_socket_data([np.array([1.0, 2.0])])
+        with self.assertRaises(ValueError):
+            data[0][0] = 3.0
+
+    def test_deep_copy_arrays(self):
+        data = freeze_socket_data([np.array([1.0, 2.0]), np.array([3.0])])
+        for copy in [sv_deep_copy(data), sv_deep_copy([data])[0]]:
+            self.assertIsNot(copy[0], data[0])
+            self.assertTrue(copy[0].flags.writeable)
+            copy[0][0] = 3.0
+        self.assertEqual(data[0][0], 1.0)
+
+    def test_freeze_keeps_lists_without_arrays(self):
+        faces = [[[0, 1, 2, 3], [1, 2, 3]]]
+        self.assertIs(freeze_socket_data(faces), faces)
+        data = [[np.array([1.0])], [[0, 1, 2]]]
+        frozen = freeze_socket_data(data)
+        self.assertIsNot(frozen, data)
+        self.assertIs(frozen[1], data[1])
+        self.assertFalse(frozen[0][0].flags.writeable)
+
+class SocketDataSizeTests(SverchokTestCase):
+    def test_numpy_size(self):
+        array = np.zeros((1000, 3))
+        self.assertTrue(sv_data_size([array]) >= array.nbytes)
+        self.assertTrue(sv_data_size([array[::2]]) >= array[::2].nbytes)
+
+    def test_list_size_extrapolation(self):
+        small = [[(0.0, 0.0, 0.0)] * 100]
+        big = [[(0.0, 0.0, 0.0)] * 10000]
+        self.assertTrue(sv_data_size(big) > 50 * sv_data_size(small))
+
+class SocketCacheLimitTests(SverchokTestCase):
+    tree_id = "socket_cache_limit_test"
+
+    def setUp(self):
+        super().setUp()
+        self.tree_limit = data_structure.SOCKET_CACHE_TREE_LIMIT
+        data_structure.SOCKET_CACHE_TREE_LIMIT = 3 * np.zeros(1000).nbytes
+
+    def tearDown(self):
+        data_structure.SOCKET_CACHE_TREE_LIMIT = self.tree_limit
+        socket_data_cache.pop(self.tree_id, None)
+        forget_socket_data_size(self.tree_id)
+        super().tearDown()
+
+    def put(self, s_id):
+        data = [np.zeros(1000)]
+        socket_data_cache.setdefault(self.tree_id, {})[s_id] = data
+        account_socket_data(self.tree_id, s_id, data)
+
+    def test_evict_least_recently_used(self):
+        for s_id in ["a", "b", "c", "d"]:
+            self.put(s_id)
+        self.assertNotIn("a", socket_data_cache[self.tree_id])
+        self.assertIn((self.tree_id, "a"), evicted_sockets)
+        self.assertIn("d", socket_data_cache[self.tree_id])
+
+    def test_pinned_data_is_not_evicted(self):
+        key = (self.tree_id, "a")
+        self.put("a")
+        pin_socket_data([key])
+        try:
+            for s_id in ["b", "c", "d"]:
+                self.put(s_id)
+            self.assertIn("a", socket_data_cache[self.tree_id])
+            self.assertNotIn("b", socket_data_cache[self.tree_id])
+        finally:
+            unpin_socket_data([key])
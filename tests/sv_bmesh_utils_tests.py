@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils import sv_bmesh_utils
+from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh, numpy_data_from_bmesh
+
+@contextmanager
+def bulk_threshold(value):
+    old_value = sv_bmesh_utils.BULK_THRESHOLD
+    sv_bmesh_utils.BULK_THRESHOLD = value
+    try:
+        yield
+    finally:
+        sv_bmesh_utils.BULK_THRESHOLD = old_value
+
+BULK = 0
+PER_ELEMENT = 10**9
+
+class BmeshBulkTests(SverchokTestCase):
+    """
+    Meshes are converted to and from bmesh both in bulk (via a temporary Mesh)
+    and element by element; both ways should give exactly the same bmesh.
+    """
+
+    # 3x2 grid of quads, a triangle and a pentagon sharing edges with the grid
+    verts = [(0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0),
+             (0, 1, 0), (1, 1, 0), (2, 1, 0), (3, 1, 0),
+             (0, 2, 0), (1, 2, 0), (2, 2, 0), (3, 2, 0),
+             (4, 0.5, 0), (4, 2, 0), (3.5, 3, 0), (2, 3, 0),
+             (5, 5, 0), (6, 5, 0)]
+    faces = [[0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6],
+             [4, 5, 9, 8], [5, 6, 10, 9], [6, 7, 11, 10],
+             [3, 12, 7], [7, 12, 13, 14, 11], [11, 14, 15, 10]]
+    # edges of faces in both directions, repeated edges and loose edges
+    edges = [[0, 1], [16, 17], [5, 1], [17, 16], [12, 13], [8, 15], [16, 17], [15, 8]]
+
+    def bmesh(self, threshold, **kwargs):
+        with bulk_threshold(threshold):
+            return bmesh_from_pydata(self.verts, self.edges, self.faces, **kwargs)
+
+    def element_data(self, bm):
+        # read bmesh element by element
+        with bulk_threshold(PER_ELEMENT):
+            return pydata_from_bmesh(bm)
+
+    def test_bulk_input_is_accepted(self):
+        bulk = sv_bmesh_utils._bulk_bmesh_from_pydata(self.verts, self.edges, self.faces)
+        self.assertIsNotNone(bulk)
+        bm, input_edges = bulk
+        try:
+            self.assertEqual(len(input_edges), len(self.edges))
+        finally:
+            bm.free()
+
+    def test_bmesh_from_pydata(self):
+        bulk_bm = self.bmesh(BULK)
+        element_bm = self.bmesh(PER_ELEMENT)
+        try:
+            bulk_verts, bulk_edges, bulk_faces = self.element_data(bulk_bm)
+            verts, edges, faces = self.element_data(element_bm)
+            self.assert_sverchok_data_equal(bulk_verts, verts, precision=6)
+            self.assertEqual(bulk_edges, edges)
+            self.assertEqual(bulk_faces, faces)
+        finally:
+            bulk_bm.free()
+            element_bm.free()
+
+    def test_bmesh_from_numpy(self):
+        # faces given as 2D array are read without building a list of faces
+        quads = self.faces[:6]
+        with bulk_threshold(BULK):
+            numpy_bm = bmesh_from_pydata(np.array(self.verts), np.array(self.edges), np.array(quads))
+        with bulk_threshold(PER_ELEMENT):
+            quads_bm = bmesh_from_pydata(self.verts, self.edges, quads)
+        try:
+            self.assertEqual(self.element_data(numpy_bm)[1:], self.element_data(quads_bm)[1:])
+        finally:
+            numpy_bm.free()
+            quads_bm.free()
+
+    def test_markup_edge_data(self):
+        bulk_bm = self.bmesh(BULK, markup_edge_data=True)
+        element_bm = self.bmesh(PER_ELEMENT, markup_edge_data=True)
+        try:
+            bulk_layer = bulk_bm.edges.layers.int.get("initial_index")
+            element_layer = element_bm.edges.layers.int.get("initial_index")
+            self.assertIsNotNone(bulk_layer)
+            bulk_marks = [edge[bulk_layer] for edge in bulk_bm.edges]
+            element_marks = [edge[element_layer] for edge in element_bm.edges]
+            self.assertEqual(bulk_marks, element_marks)
+        finally:
+            bulk_bm.free()
+            element_bm.free()
+
+    def test_pydata_from_bmesh(self):
+        bm = self.bmesh(PER_ELEMENT)
+        try:
+            with bulk_threshold(BULK):
+                bulk_verts, bulk_edges, bulk_faces = pydata_from_bmesh(bm)
+            verts, edges, faces = self.element_data(bm)
+            self.assert_sverchok_data_equal(bulk_verts, verts, precision=6)
+            self.assertEqual(bulk_edges, edges)
+            self.assertEqual(bulk_faces, faces)
+        finally:
+            bm.free()
+
+    def test_numpy_data_from_bmesh(self):
+        bm = self.bmesh(PER_ELEMENT)
+        out_np = (True, True, False, False)
+        try:
+            with bulk_threshold(BULK):
+                bulk_verts, bulk_edges, bulk_faces, _ = numpy_data_from_bmesh(bm, out_np)
+            with bulk_threshold(PER_ELEMENT):
+                verts, edges, faces, _ = numpy_data_from_bmesh(bm, out_np)
+            self.assert_numpy_arrays_equal(bulk_verts, verts, precision=6)
+            self.assert_numpy_arrays_equal(bulk_edges, edges)
+            self.assertEqual(bulk_faces, faces)
+        finally:
+            bm.free()
+
+    def test_bulk_edges_order(self):
+        # order of edges is the same as bmesh creates them: faces first, then missing explicit edges
+        loop_verts, loop_start, loop_total = sv_bmesh_utils._face_loops(self.faces)
+        edges = np.array(self.edges)
+        edge_verts, loop_edges, input_edges = sv_bmesh_utils._bulk_edges(
+            len(self.verts), loop_verts, loop_start, loop_total, edges)
+        bm = self.bmesh(PER_ELEMENT)
+        try:
+            expected = [sorted(edge) for edge in self.element_data(bm)[1]]
+        finally:
+            bm.free()
+        self.assertEqual([sorted(edge) for edge in edge_verts.tolist()], expected)
+        # each loop refers to the edge from its vertex to the next one of the face
+        for face, start in zip(self.faces, loop_start.tolist()):
+            for i, vert in enumerate(face):
+                edge = sorted(edge_verts[loop_edges[start + i]].tolist())
+                self.assertEqual(edge, sorted([vert, face[(i + 1) % len(face)]]))
+        # repeated input edges refer to the same mesh edge
+        for edge, edge_idx in zip(self.edges, input_edges.tolist()):
+            self.assertEqual(sorted(edge_verts[edge_idx].tolist()), sorted(edge))
+        self.assertEqual(input_edges[1], input_edges[3])
+        self.assertEqual(input_edges[5], input_edges[7])
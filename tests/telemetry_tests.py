@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+
+from sverchok.utils.testing import *
+from sverchok.utils import telemetry
+
+class TelemetryTests(EmptyTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        telemetry.reset()
+        self.first = create_node("SvBoxNodeMk2", self.tree.name)
+        self.second = create_node("SvBoxNodeMk2", self.tree.name)
+        telemetry.finish_node(self.first, 10.0, 0.5, None, thread=1)
+        telemetry.finish_node(self.first, 11.0, 0.25, None, thread=1)
+        telemetry.finish_node(self.second, 12.0, 1.0, None, thread=2)
+
+    def tearDown(self):
+        telemetry.reset()
+        super().tearDown()
+
+    def export(self, method):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            method(path)
+            with open(path) as f:
+                return json.load(f)
+        finally:
+            os.remove(path)
+
+    def test_node_stats(self):
+        stats = telemetry.get_node_stats(self.tree.name, self.first.name)
+        self.assertEqual(stats['count'], 2)
+        self.assertAlmostEqual(stats['mean_duration'], 0.375)
+        self.assertAlmostEqual(stats['max_duration'], 0.5)
+        self.assertIsNone(stats['mean_memory'])
+        slowest = telemetry.get_slowest_nodes(1)
+        self.assertEqual(slowest[0][0], (self.tree.name, self.second.name))
+
+    def test_export_json(self):
+        data = self.export(telemetry.export_json)
+        self.assertEqual(len(data), 3)
+        self.assertEqual([sample['node'] for sample in data],
+                         [self.first.name, self.first.name, self.second.name])
+        self.assertEqual(data[0]['tree'], self.tree.name)
+        self.assertEqual(data[0]['bl_idname'], "SvBoxNodeMk2")
+        self.assertEqual(data[2]['thread'], 2)
+        self.assertAlmostEqual(data[2]['duration'], 1.0)
+        self.assertIsNone(data[0]['memory'])
+
+    def test_export_chrome_trace(self):
+        data = self.export(telemetry.export_chrome_trace)
+        events = data['traceEvents']
+        self.assertEqual(len(events), 3)
+        event = events[2]
+        self.assertEqual(event['name'], self.second.name)
+        self.assertEqual(event['cat'], "SvBoxNodeMk2")
+        self.assertEqual(event['ph'], "X")
+        self.assertAlmostEqual(event['ts'], 12.0e6)
+        self.assertAlmostEqual(event['dur'], 1.0e6)
+        self.assertEqual(event['tid'], 2)
+        self.assertEqual(event['args']['tree'], self.tree.name)
+        self.assertNotIn('memory', event['args'])
@@ -4,7 +4,9 @@ import unittest
 
 from sverchok.utils.testing import *
 from sverchok.utils.logging import debug, info
-from sverchok.core.update_system import make_dep_dict, make_update_list
+from sverchok.core.update_system import (
+    make_dep_dict, make_update_list, get_dep_dict, invalidate_dependency_graph, update_dependency_graph,
+    make_tree_from_nodes, get_animation_closure, invalidate_animation_closure)
 #from sverchok.tests.mocks import *
 
 class UpdateSystemTests(ReferenceTreeTestCase):
@@ -21,6 +23,53 @@ class UpdateSystemTests(ReferenceTreeTestCase):
         #info("Dict: %s", result)
         self.assertEqual(result, expected_result)
 
+    def test_cached_dep_dict(self):
+        tree = get_node_tree()
+        invalidate_dependency_graph(tree)
+        for down in [False, True]:
+            with self.subTest(down = down):
+                cached = {name: deps for name, deps in get_dep_dict(tree, down).items() if deps}
+                self.assertEqual(cached, dict(make_dep_dict(tree, down)))
+
+    def test_cached_dep_dict_rename(self):
+        tree = get_node_tree()
+        get_dep_dict(tree)
+        node = tree.nodes['Bevel']
+        node.name = 'Bevel renamed'
+        # as on tree update event
+        update_dependency_graph(tree)
+        try:
+            for down in [False, True]:
+                with self.subTest(down = down):
+                    cached = {name: deps for name, deps in get_dep_dict(tree, down).items() if deps}
+                    self.assertEqual(cached, dict(make_dep_dict(tree, down)))
+            result = make_update_list(tree)
+            self.assertIn('Bevel renamed', result)
+            self.assertNotIn('Bevel', result)
+            self.assertTrue(result.index('Box') < result.index('Bevel renamed'))
+        finally:
+            node.name = 'Bevel'
+            update_dependency_graph(tree)
+
+    def test_cached_dep_dict_hidden_link(self):
+        tree = get_node_tree()
+        get_dep_dict(tree)
+        link = next(link for link in tree.links if link.to_node.name == 'Bevel')
+        socket = link.to_socket
+        socket.hide = True
+        update_dependency_graph(tree)
+        try:
+            self.assertTrue(link.is_hidden)
+            for down in [False, True]:
+                with self.subTest(down = down):
+                    cached = {name: deps for name, deps in get_dep_dict(tree, down).items() if deps}
+                    self.assertEqual(cached, dict(make_dep_dict(tree, down)))
+        finally:
+            socket.hide = False
+            update_dependency_graph(tree)
+        cached = {name: deps for name, deps in get_dep_dict(tree).items() if deps}
+        self.assertEqual(cached, dict(make_dep_dict(tree)))
+
     def test_make_update_list(self):
         tree = get_node_tree()
         result = make_update_list(tree)
@@ -36,3 +85,14 @@ class UpdateSystemTests(ReferenceTreeTestCase):
                 dep_idx = result.index(dep)
                 self.assertTrue(dep_idx < node_idx)
 
+    def test_animation_closure(self):
+        tree = get_node_tree()
+        invalidate_animation_closure(tree)
+        closure = get_animation_closure(tree)
+        sources = [node.name for node in tree.nodes if getattr(node, 'is_animatable', False)]
+        self.assertEqual(sorted(closure.sources), sorted(sources))
+        if sources:
+            self.assertEqual(set(closure.update_list), set(make_tree_from_nodes(sources, tree)))
+        else:
+            self.assertEqual(closure.update_list, [])
+        self.assertIs(get_animation_closure(tree), closure)
@@ -27,7 +27,7 @@ but massively condensed for sanity.
 import bpy
 
 from sverchok.menu import make_node_cats, draw_add_node_operator
-from sverchok.utils import get_node_class_reference
+from sverchok.core.node_manifest import get_node_class_or_stub
 from sverchok.utils.extra_categories import get_extra_categories
 from sverchok.ui.sv_icons import node_icon, icon, get_icon_switch, custom_icon
 from sverchok.ui import presets
@@ -39,7 +39,7 @@ node_cats = make_node_cats()
 def category_has_nodes(cat_name):
     cat = node_cats[cat_name]
     for item in cat:
-        rna = get_node_class_reference(item[0])
+        rna = get_node_class_or_stub(item[0])
         if rna and not item[0] == 'separator':
             return True
     return False
@@ -64,7 +64,7 @@ def layout_draw_categories(layout, node_details):
         if bl_idname == 'ScalarMathNode':
             continue
 
-        node_ref = get_node_class_reference(bl_idname)
+        node_ref = get_node_class_or_stub(bl_idname)
 
         if hasattr(node_ref, "bl_label"):
             layout_params = dict(text=node_ref.bl_label, **node_icon(node_ref))
@@ -93,7 +93,7 @@ def layout_draw_solid_categories(layout, node_details, sub_category):
         if bl_idname == 'ScalarMathNode':
             continue
 
-        node_ref = get_node_class_reference(bl_idname)
+        node_ref = get_node_class_or_stub(bl_idname)
 
         if hasattr(node_ref, "bl_label"):
             layout_params = dict(text=node_ref.bl_label, **node_icon(node_ref))
@@ -32,7 +32,7 @@ from sverchok.utils.sv_IO_panel_tools import write_json, create_dict_of_tree, im
 from sverchok.utils.logging import debug, info, error, exception
 from sverchok.utils import sv_gist_tools
 from sverchok.utils import sv_IO_panel_tools
-from sverchok.utils import get_node_class_reference
+from sverchok.core.node_manifest import get_node_class_or_stub
 import sverchok
 
 # To be moved somewhere under core/
@@ -78,7 +78,7 @@ def get_category_items(self, context):
     category_items = [(GENERAL, "General", "Uncategorized presets", 0)]
     node_category_items = []
     for idx, category in enumerate(get_category_names()):
-        node_class = get_node_class_reference(category)
+        node_class = get_node_class_or_stub(category)
         if node_class:
             title = "/Node/ {}".format(node_class.bl_label)
             node_category_items.append((category, title, category, idx+1))
@@ -876,7 +876,7 @@ class SV_PT_UserPresetsPanel(bpy.types.Panel):
 
         selected_nodes = [node for node in ntree.nodes if node.select]
         can_save_preset = len(selected_nodes) > 0
-        category_node_class = get_node_class_reference(op.category)
+        category_node_class = get_node_class_or_stub(op.category)
         if category_node_class is not None:
             if len(selected_nodes) == 1:
                 selected_node = selected_nodes[0]
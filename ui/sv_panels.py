@@ -22,7 +22,7 @@ from bpy.props import StringProperty, BoolProperty, FloatProperty
 
 import sverchok
 from sverchok.core.update_system import process_from_nodes, process_tree, build_update_list
-from sverchok.utils import profile
+from sverchok.utils import profile, telemetry
 from sverchok.utils.sv_update_utils import version_and_sha
 from sverchok.ui.development import displaying_sverchok_nodes
 
@@ -309,6 +309,24 @@ class SV_PT_ToolsMenu(bpy.types.Panel):
                 row.operator("node.sverchok_profile_save", text="Save data", icon="FILE_TICK")
                 profile_col.operator("node.sverchok_profile_reset", text="Reset data", icon="X")
 
+    def draw_telemetry_info_if_needed(self, layout, addon):
+        if addon.preferences.developer_mode:
+            telemetry_col = layout.column(align=True)
+
+            if telemetry.is_currently_enabled:
+                telemetry_col.operator("node.sverchok_telemetry_toggle", text="Stop telemetry", icon="CANCEL")
+            else:
+                telemetry_col.operator("node.sverchok_telemetry_toggle", text="Start telemetry", icon="TIME")
+
+            if telemetry.samples:
+                row = telemetry_col.row(align=True)
+                row.operator("node.sverchok_telemetry_export", text="Save telemetry", icon="FILE_TICK")
+                row.operator("node.sverchok_telemetry_reset", text="Reset", icon="X")
+
+                for (tree_name, node_name), stats in telemetry.get_slowest_nodes(5):
+                    telemetry_col.label(text="{}: {:.1f} ms ({})".format(
+                        node_name, stats['mean_duration'] * 1000, stats['count']))
+
     def draw_interaction_template(self, layout):
         col = box.column(align=True)
         row = col.row(align=True)
@@ -389,6 +407,7 @@ class SV_PT_ToolsMenu(bpy.types.Panel):
         addon = context.preferences.addons.get(sverchok.__name__)
 
         self.draw_profiling_info_if_needed(layout, addon)
+        self.draw_telemetry_info_if_needed(layout, addon)
 
         row = layout.row(align=True)
         col = row.column(align=True)
@@ -74,13 +74,19 @@ def auto_gather_node_classes(start_module = None):
     for catname, nodecat in node_cats:
         node_files = inspect.getmembers(nodecat, inspect.ismodule)
         for filename, fileref in node_files:
-            classes = inspect.getmembers(fileref, inspect.isclass)
-            for clsname, cls in classes:
-                try:
-                    if cls.bl_rna.base.name == "Node":
-                        node_classes[cls.bl_idname] = cls
-                except:
-                    ...
+            gather_module_node_classes(fileref)
+
+
+def gather_module_node_classes(module):
+    """ add node classes defined in one module to node_classes """
+    import inspect
+    classes = inspect.getmembers(module, inspect.isclass)
+    for clsname, cls in classes:
+        try:
+            if cls.bl_rna.base.name == "Node":
+                node_classes[cls.bl_idname] = cls
+        except:
+            ...
 
 
 def get_node_class_reference(bl_idname):
@@ -90,7 +96,12 @@ def get_node_class_reference(bl_idname):
     if bl_idname == "NodeReroute":
         return getattr(bpy.types, bl_idname)
     # this will also return a Nonetype if the ref isn't found, and the class ref if found
-    return node_classes.get(bl_idname)
+    cls = node_classes.get(bl_idname)
+    if cls is None:
+        # with lazy node loading, the module might be not imported yet
+        from sverchok.core.node_manifest import load_node_class
+        cls = load_node_class(bl_idname)
+    return cls
 
 
 def clear_node_classes():
@@ -129,7 +140,7 @@ utils_modules = [
     "sv_curve_utils", "voronoi", "sv_script", "sv_itertools", "script_importhelper", "sv_oldnodes_parser",
     "csg_core", "csg_geom", "geom", "sv_easing_functions", "sv_text_io_common", "sv_obj_baker",
     "snlite_utils", "snlite_importhelper", "context_managers", "sv_node_utils", "sv_noise_utils",
-    "profile", "logging", "testing", "sv_requests", "sv_examples_utils", "sv_shader_sources",
+    "profile", "telemetry", "logging", "testing", "sv_requests", "sv_examples_utils", "sv_shader_sources",
     "avl_tree", "sv_nodeview_draw_helper", "sv_font_xml_parser", "exception_drawing_with_bgl",
     "wfc_algorithm",
     # UI text editor ui
@@ -143,5 +154,6 @@ utils_modules = [
     "sv_texture_utils", "handling_nodes",
     # geom 2d tools
     "geom_2d.lin_alg", "geom_2d.dcel", "geom_2d.dissolve_mesh", "geom_2d.merge_mesh", "geom_2d.intersections",
-    "geom_2d.make_monotone", "geom_2d.sort_mesh", "geom_2d.dcel_debugger",
+    "geom_2d.make_monotone", "geom_2d.sort_mesh", "geom_2d.dcel_debugger", "geom_2d.dcel_arrays",
+    "geom_2d.intersections_arrays", "geom_2d.make_monotone_arrays",
 ]
@@ -29,13 +29,14 @@ class PopulationData(object):
         self.u_min = self.u_max = None
         self.v_min = self.v_max = None
         self.new_us = self.new_vs = None
+        self.us_range = self.vs_range = None
         self._points = None
         self.samples_u = self.samples_v = None
 
     @property
     def points(self):
         if self._points is None:
-            self._points = self.surface.evaluate_array(self.us, self.vs).reshape((self.samples_u, self.samples_v, 3))
+            self._points = self.surface.evaluate_grid(self.us_range, self.vs_range)
         return self._points
 
 def populate_surface_uv(surface, samples_u, samples_v, by_curvature=True, curvature_type = MAXIMUM, curvature_clip = 100, by_area=True, min_ppf=1, max_ppf=5, seed=1):
@@ -51,6 +52,8 @@ def populate_surface_uv(surface, samples_u, samples_v, by_curvature=True, curvat
     data.surface = surface
     data.us = us
     data.vs = vs
+    data.us_range = us_range
+    data.vs_range = vs_range
     data.u_min = u_min
     data.v_min = v_min
     data.u_max = u_max
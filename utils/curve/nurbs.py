@@ -9,7 +9,10 @@ import numpy as np
 
 from sverchok.utils.curve import SvCurve, UnsupportedCurveTypeException
 from sverchok.utils.curve import knotvector as sv_knotvector
-from sverchok.utils.nurbs_common import nurbs_divide, SvNurbsBasisFunctions, elevate_bezier_degree, from_homogenous
+from sverchok.utils.nurbs_common import (
+        nurbs_divide, SvNurbsBasisFunctions, elevate_bezier_degree, from_homogenous,
+        find_knot_spans, nurbs_basis_derivatives
+    )
 from sverchok.utils.surface.nurbs import SvNativeNurbsSurface, SvGeomdlSurface
 from sverchok.dependencies import geomdl
 
@@ -291,18 +294,31 @@ class SvNativeNurbsCurve(SvNurbsCurve):
     def evaluate(self, t):
         return self.evaluate_array(np.array([t]))[0]
 
-    def fraction(self, deriv_order, ts):
-        n = len(ts)
+    def fractions(self, max_order, ts):
+        """
+        Calculate numerators and denominators of the curve (in homogenous
+        coordinates) and of its derivatives up to max_order, in one pass.
+        Only p+1 non-zero basis functions are evaluated for each t.
+        Returns list of (numerator, denominator) pairs, one per order;
+        numerator is of shape (n, 3), denominator is of shape (n, 1).
+        """
+        ts = np.asarray(ts)
         p = self.degree
-        k = len(self.control_points)
-        ns = np.array([self.basis.derivative(i, p, deriv_order)(ts) for i in range(k)]) # (k, n)
-        coeffs = ns * self.weights[np.newaxis].T # (k, n)
-        coeffs_t = coeffs[np.newaxis].T # (n, k, 1)
-        numerator = (coeffs_t * self.control_points) # (n, k, 3)
-        numerator = numerator.sum(axis=1) # (n, 3)
-        denominator = coeffs.sum(axis=0) # (n,)
+        spans = find_knot_spans(self.knotvector, p, ts)
+        ders = nurbs_basis_derivatives(self.knotvector, p, spans, ts, max_order) # (max_order+1, n, p+1)
+        idxs = spans[np.newaxis].T - p + np.arange(p+1) # (n, p+1)
+        weights = self.weights[idxs] # (n, p+1)
+        points = self.control_points[idxs] # (n, p+1, 3)
+        result = []
+        for deriv_order in range(max_order+1):
+            coeffs = ders[deriv_order] * weights # (n, p+1)
+            numerator = np.einsum('ij,ijk->ik', coeffs, points) # (n, 3)
+            denominator = coeffs.sum(axis=1) # (n,)
+            result.append((numerator, denominator[np.newaxis].T))
+        return result
 
-        return numerator, denominator[np.newaxis].T
+    def fraction(self, deriv_order, ts):
+        return self.fractions(deriv_order, ts)[deriv_order]
 
     def evaluate_array(self, ts):
         numerator, denominator = self.fraction(0, ts)
@@ -315,61 +331,45 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         return self.tangent_array(np.array([t]))[0]
 
     def tangent_array(self, ts):
-        # curve = numerator / denominator
-        # ergo:
-        # numerator = curve * denominator
-        # ergo:
-        # numerator' = curve' * denominator + curve * denominator'
-        # ergo:
-        # curve' = (numerator' - curve*denominator') / denominator
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        return curve1
+        return self.derivatives_array(1, ts)[0]
 
     def second_derivative(self, t):
         return self.second_derivative_array(np.array([t]))[0]
 
     def second_derivative_array(self, ts):
-        # numerator'' = (curve * denominator)'' =
-        #  = curve'' * denominator + 2 * curve' * denominator' + curve * denominator''
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        return curve2
+        return self.derivatives_array(2, ts)[1]
 
     def third_derivative_array(self, ts):
-        # numerator''' = (curve * denominator)''' = 
-        #  = curve''' * denominator + 3 * curve'' * denominator' + 3 * curve' * denominator'' + denominator'''
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        numerator3, denominator3 = self.fraction(3, ts)
-
-        curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
-        return curve3
+        return self.derivatives_array(3, ts)[2]
 
     def derivatives_array(self, n, ts):
+        # curve = numerator / denominator
+        # ergo:
+        # numerator = curve * denominator
+        # ergo:
+        # numerator' = curve' * denominator + curve * denominator'
+        # numerator'' = (curve * denominator)'' =
+        #  = curve'' * denominator + 2 * curve' * denominator' + curve * denominator''
+        # numerator''' = (curve * denominator)''' =
+        #  = curve''' * denominator + 3 * curve'' * denominator' + 3 * curve' * denominator'' + curve * denominator'''
+        # ergo:
+        # curve' = (numerator' - curve*denominator') / denominator
+        # and so on.
         result = []
-        if n >= 1:
-            numerator, denominator = self.fraction(0, ts)
-            curve = numerator / denominator
-            numerator1, denominator1 = self.fraction(1, ts)
-            curve1 = (numerator1 - curve*denominator1) / denominator
-            result.append(curve1)
+        if n < 1:
+            return result
+        fractions = self.fractions(min(n, 3), ts)
+        numerator, denominator = fractions[0]
+        curve = numerator / denominator
+        numerator1, denominator1 = fractions[1]
+        curve1 = (numerator1 - curve*denominator1) / denominator
+        result.append(curve1)
         if n >= 2:
-            numerator2, denominator2 = self.fraction(2, ts)
+            numerator2, denominator2 = fractions[2]
             curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
             result.append(curve2)
         if n >= 3:
-            numerator3, denominator3 = self.fraction(3, ts)
+            numerator3, denominator3 = fractions[3]
             curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
             result.append(curve3)
         return result
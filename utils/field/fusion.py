@@ -0,0 +1,314 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Fusion of composed fields into one flat evaluation program.
+
+Fields built by field math nodes are trees of objects (SvScalarFieldBinOp,
+SvVectorScalarFieldComposition, SvNegatedScalarField and so on), and each of
+them allocates full-size arrays in evaluate_grid. fuse_field() walks such a
+tree once and turns it into a linear list of numpy calls over "registers":
+
+* subfields which are used several times (the same object, evaluated at the
+  same points) are evaluated only once;
+* the points are processed in chunks, so temporary arrays are of chunk size,
+  not of grid size;
+* numpy ufuncs write their results into temporary arrays which are not needed
+  anymore, instead of allocating new ones;
+* temporary arrays are released as soon as they are not needed.
+
+Fields of unknown types are evaluated by their own evaluate_grid method,
+so any field can be fused. The fused field gives the same values as the
+original one, provided that the value of each field at a point does not
+depend on other points being evaluated together with it.
+"""
+
+import numpy as np
+
+from sverchok.utils.field.scalar import (SvScalarField,
+            SvCoordinateScalarField, SvNegatedScalarField, SvAbsScalarField,
+            SvScalarFieldBinOp, SvScalarFieldVectorizedFunction,
+            SvVectorScalarFieldComposition, SvVectorFieldsScalarProduct,
+            SvVectorFieldNorm, SvVectorFieldDecomposed, SvScalarFieldLambda)
+from sverchok.utils.field.vector import (SvVectorField,
+            SvAbsoluteVectorField, SvRelativeVectorField,
+            SvVectorFieldComposition, SvVectorFieldMultipliedByScalar,
+            SvVectorFieldsLerp, SvVectorFieldBinOp, SvVectorFieldCrossProduct,
+            SvVectorFieldLambda)
+
+DEFAULT_CHUNK_SIZE = 65536
+
+def _is_float_ufunc(function, nin):
+    return isinstance(function, np.ufunc) and function.nin == nin and function.nout == 1 \
+            and ('d' * nin + '->d') in function.types
+
+def _lerp(scalars, values1, values2):
+    return (1 - scalars) * values1 + scalars * values2
+
+class SvFieldProgram(object):
+    """
+    Linear program which evaluates a field tree.
+    Registers 0, 1, 2 hold X, Y, Z coordinates of points;
+    each step calls a function on some registers and stores
+    the result(s) into other registers.
+    """
+    def __init__(self, field):
+        self.steps = []
+        self.n_registers = 3
+        self._cache = dict()
+        self._fields = []
+        coords = (0, 1, 2)
+        if isinstance(field, SvScalarField):
+            self.outputs = (self._scalar(field, coords),)
+        elif isinstance(field, SvVectorField):
+            self.outputs = self._vector(field, coords)
+        else:
+            raise Exception("Not a field: {}".format(field))
+        self._cache = None
+        self._fields = None
+        self._calc_liveness()
+
+    def _new_registers(self, n):
+        registers = tuple(range(self.n_registers, self.n_registers + n))
+        self.n_registers += n
+        return registers
+
+    def _emit(self, function, inputs, n_outputs=1, is_ufunc=False):
+        outputs = self._new_registers(n_outputs)
+        self.steps.append((outputs, function, tuple(inputs), is_ufunc))
+        return outputs
+
+    def _ufunc(self, function, *inputs):
+        return self._emit(function, inputs, is_ufunc=True)[0]
+
+    def _call(self, function, *inputs):
+        return self._emit(function, inputs)[0]
+
+    def _call3(self, function, *inputs):
+        return self._emit(function, inputs, n_outputs=3)
+
+    def _unary(self, function, register):
+        if _is_float_ufunc(function, 1):
+            return self._ufunc(function, register)
+        return self._call(function, register)
+
+    def _binary(self, function, register1, register2):
+        if _is_float_ufunc(function, 2):
+            return self._ufunc(function, register1, register2)
+        return self._call(function, register1, register2)
+
+    def _cached(self, field, coords, compile_function):
+        key = (id(field), coords)
+        registers = self._cache.get(key)
+        if registers is None:
+            registers = compile_function(field, coords)
+            self._cache[key] = registers
+            # keep the field alive, so that its id is not reused
+            self._fields.append(field)
+        return registers
+
+    def _scalar(self, field, coords):
+        return self._cached(field, coords, self._compile_scalar)
+
+    def _vector(self, field, coords):
+        return self._cached(field, coords, self._compile_vector)
+
+    def _compile_scalar(self, field, coords):
+        if isinstance(field, SvCoordinateScalarField) and field.coordinate in {'X', 'Y', 'Z'}:
+            return coords['XYZ'.index(field.coordinate)]
+        elif isinstance(field, SvNegatedScalarField):
+            return self._ufunc(np.negative, self._scalar(field.field, coords))
+        elif isinstance(field, SvAbsScalarField):
+            return self._ufunc(np.absolute, self._scalar(field.field, coords))
+        elif isinstance(field, SvScalarFieldVectorizedFunction):
+            return self._unary(field.function, self._scalar(field.field, coords))
+        elif isinstance(field, SvScalarFieldBinOp):
+            value1 = self._scalar(field.field1, coords)
+            value2 = self._scalar(field.field2, coords)
+            return self._binary(field.function, value1, value2)
+        elif isinstance(field, SvVectorScalarFieldComposition):
+            return self._scalar(field.sfield, self._vector(field.vfield, coords))
+        elif isinstance(field, SvVectorFieldsScalarProduct):
+            vx1, vy1, vz1 = self._vector(field.field1, coords)
+            vx2, vy2, vz2 = self._vector(field.field2, coords)
+            result = self._ufunc(np.multiply, vx1, vx2)
+            result = self._ufunc(np.add, result, self._ufunc(np.multiply, vy1, vy2))
+            return self._ufunc(np.add, result, self._ufunc(np.multiply, vz1, vz2))
+        elif isinstance(field, SvVectorFieldNorm):
+            vx, vy, vz = self._vector(field.field, coords)
+            result = self._ufunc(np.square, vx)
+            result = self._ufunc(np.add, result, self._ufunc(np.square, vy))
+            result = self._ufunc(np.add, result, self._ufunc(np.square, vz))
+            return self._ufunc(np.sqrt, result)
+        elif isinstance(field, SvVectorFieldDecomposed) and field.coords == 'XYZ':
+            return self._vector(field.vfield, coords)[field.axis]
+        elif isinstance(field, SvScalarFieldLambda) and field.function_numpy is not None:
+            function = field.function_numpy
+            if field.in_field is None:
+                return self._call(lambda xs, ys, zs: function(xs, ys, zs, np.zeros(xs.shape[0])), *coords)
+            values = self._scalar(field.in_field, coords)
+            return self._call(function, *coords, values)
+        else:
+            return self._call(field.evaluate_grid, *coords)
+
+    def _compile_vector(self, field, coords):
+        if isinstance(field, SvAbsoluteVectorField):
+            values = self._vector(field.field, coords)
+            return tuple(self._ufunc(np.add, v, c) for v, c in zip(values, coords))
+        elif isinstance(field, SvRelativeVectorField):
+            values = self._vector(field.field, coords)
+            return tuple(self._ufunc(np.subtract, v, c) for v, c in zip(values, coords))
+        elif isinstance(field, SvVectorFieldComposition):
+            return self._vector(field.field2, self._vector(field.field1, coords))
+        elif isinstance(field, SvVectorFieldMultipliedByScalar):
+            scalars = self._scalar(field.scalar_field, coords)
+            values = self._vector(field.vector_field, coords)
+            return tuple(self._ufunc(np.multiply, v, scalars) for v in values)
+        elif isinstance(field, SvVectorFieldsLerp):
+            scalars = self._scalar(field.scalar_field, coords)
+            values1 = self._vector(field.vfield1, coords)
+            values2 = self._vector(field.vfield2, coords)
+            return tuple(self._call(_lerp, scalars, v1, v2) for v1, v2 in zip(values1, values2))
+        elif isinstance(field, SvVectorFieldBinOp) and _is_float_ufunc(field.function, 2):
+            values1 = self._vector(field.field1, coords)
+            values2 = self._vector(field.field2, coords)
+            return tuple(self._ufunc(field.function, v1, v2) for v1, v2 in zip(values1, values2))
+        elif isinstance(field, SvVectorFieldCrossProduct):
+            ax, ay, az = self._vector(field.field1, coords)
+            bx, by, bz = self._vector(field.field2, coords)
+            def minor(a1, b2, a2, b1):
+                return self._ufunc(np.subtract, self._ufunc(np.multiply, a1, b2), self._ufunc(np.multiply, a2, b1))
+            return (minor(ay, bz, az, by), minor(az, bx, ax, bz), minor(ax, by, ay, bx))
+        elif isinstance(field, SvVectorFieldLambda) and field.function_numpy is not None:
+            function = field.function_numpy
+            if field.in_field is None:
+                return self._call3(lambda xs, ys, zs: function(xs, ys, zs, np.zeros(xs.shape[0])), *coords)
+            vx, vy, vz = self._vector(field.in_field, coords)
+            return self._call3(lambda xs, ys, zs, vx, vy, vz: function(xs, ys, zs, np.stack((vx, vy, vz)).T), *coords, vx, vy, vz)
+        else:
+            return self._call3(field.evaluate_grid, *coords)
+
+    def _calc_liveness(self):
+        n_steps = len(self.steps)
+        last_use = dict()
+        for i, (outputs, function, inputs, is_ufunc) in enumerate(self.steps):
+            for register in inputs:
+                last_use[register] = i
+        for register in self.outputs:
+            last_use[register] = n_steps
+        self.last_use = last_use
+        self.dead_after = [[] for i in range(n_steps)]
+        for register, i in last_use.items():
+            if i < n_steps:
+                self.dead_after[i].append(register)
+
+    def _is_shared(self, registers, register, i):
+        # Whether the array in the register is also referenced (maybe as a view)
+        # by another register, which is still needed after step i.
+        array = registers[register]
+        for r, value in enumerate(registers):
+            if r != register and value is not None and self.last_use.get(r, -1) > i \
+                    and np.may_share_memory(value, array):
+                return True
+        return False
+
+    def run(self, xs, ys, zs):
+        """
+        Evaluate the program at points given by 1D arrays;
+        returns a tuple of 1D arrays (one for scalar field, three for vector field).
+        """
+        registers = [None] * self.n_registers
+        registers[0], registers[1], registers[2] = xs, ys, zs
+        # registers which hold arrays created by us, and thus can be overwritten
+        owned = [False] * self.n_registers
+        for i, (outputs, function, inputs, is_ufunc) in enumerate(self.steps):
+            args = [registers[r] for r in inputs]
+            if is_ufunc:
+                out = None
+                for r, arg in zip(inputs, args):
+                    if owned[r] and self.last_use[r] == i and arg.dtype == np.float64 \
+                            and all(a.shape == arg.shape and a.dtype == np.float64 for a in args) \
+                            and not self._is_shared(registers, r, i):
+                        out = arg
+                        break
+                if out is None:
+                    result = function(*args)
+                else:
+                    result = function(*args, out=out)
+                registers[outputs[0]] = result
+                owned[outputs[0]] = isinstance(result, np.ndarray)
+            elif len(outputs) == 1:
+                registers[outputs[0]] = function(*args)
+            else:
+                for r, value in zip(outputs, function(*args)):
+                    registers[r] = value
+            for r in self.dead_after[i]:
+                registers[r] = None
+        return tuple(registers[r] for r in self.outputs)
+
+def _evaluate_chunked(program, xs, ys, zs, chunk_size):
+    xs, ys, zs = np.broadcast_arrays(np.asarray(xs, dtype=np.float64),
+                                     np.asarray(ys, dtype=np.float64),
+                                     np.asarray(zs, dtype=np.float64))
+    shape = xs.shape
+    xs, ys, zs = xs.ravel(), ys.ravel(), zs.ravel()
+    n = len(xs)
+    if n <= chunk_size:
+        results = program.run(xs, ys, zs)
+        return tuple(np.broadcast_to(r, (n,)).reshape(shape) for r in results)
+
+    results = None
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        values = program.run(xs[start:end], ys[start:end], zs[start:end])
+        if results is None:
+            results = [np.empty((n,), dtype=np.result_type(v)) for v in values]
+        for result, value in zip(results, values):
+            result[start:end] = value
+    return tuple(r.reshape(shape) for r in results)
+
+class SvFusedScalarField(SvScalarField):
+    def __init__(self, field, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.field = field
+        self.chunk_size = chunk_size
+        self.program = SvFieldProgram(field)
+        self.__description__ = "Fused({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        return _evaluate_chunked(self.program, xs, ys, zs, self.chunk_size)[0]
+
+class SvFusedVectorField(SvVectorField):
+    def __init__(self, field, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.field = field
+        self.chunk_size = chunk_size
+        self.program = SvFieldProgram(field)
+        self.__description__ = "Fused({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        return _evaluate_chunked(self.program, xs, ys, zs, self.chunk_size)
+
+def fuse_field(field, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compile a scalar or vector field (usually a tree of composed fields)
+    into a fused field, which gives the same values, but evaluates them
+    in chunks with less temporary arrays. Returns the field itself if it
+    is already fused.
+    """
+    if isinstance(field, (SvFusedScalarField, SvFusedVectorField)):
+        return field
+    if isinstance(field, SvScalarField):
+        return SvFusedScalarField(field, chunk_size)
+    elif isinstance(field, SvVectorField):
+        return SvFusedVectorField(field, chunk_size)
+    else:
+        raise Exception("Not a field: {}".format(field))
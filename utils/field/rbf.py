@@ -5,6 +5,66 @@ from mathutils import Matrix, Vector
 from sverchok.utils.field.scalar import SvScalarField
 from sverchok.utils.field.vector import SvVectorField
 
+def _rbf_radial_derivatives(function, epsilon, r):
+    """
+    For a radial basis function phi(r), return phi'(r)/r and phi''(r).
+    Both are zero where they are not defined (r == 0 for linear and thin_plate).
+    """
+    e2 = epsilon * epsilon
+    if function == 'multiquadric':
+        s = np.sqrt((r/epsilon)**2 + 1)
+        return 1.0 / (e2 * s), 1.0 / (e2 * s**3)
+    elif function in ('inverse_multiquadric', 'inverse'):
+        # scipy's Rbf replaces 'inverse' by 'inverse_multiquadric' on init
+        s = np.sqrt((r/epsilon)**2 + 1)
+        return -1.0 / (e2 * s**3), -1.0 / (e2 * s**3) + 3 * r*r / (e2 * e2 * s**5)
+    elif function == 'gaussian':
+        phi = np.exp(-(r/epsilon)**2)
+        return -2.0 * phi / e2, (-2.0 / e2 + 4 * r*r / (e2*e2)) * phi
+    elif function == 'linear':
+        good = r > 0
+        return np.where(good, 1.0 / np.where(good, r, 1.0), 0.0), np.zeros_like(r)
+    elif function == 'cubic':
+        return 3 * r, 6 * r
+    elif function == 'quintic':
+        return 5 * r**3, 20 * r**3
+    elif function == 'thin_plate':
+        good = r > 0
+        log_r = np.log(np.where(good, r, 1.0))
+        return np.where(good, 2*log_r + 1, 0.0), np.where(good, 2*log_r + 3, 0.0)
+    else:
+        return None
+
+def _rbf_has_derivatives(rbf):
+    return isinstance(rbf.function, str) and getattr(rbf, 'norm', None) == 'euclidean' \
+            and _rbf_radial_derivatives(rbf.function, rbf.epsilon, np.zeros(1)) is not None
+
+def rbf_derivatives(rbf, xs, ys, zs, hessian=False):
+    """
+    Analytic derivatives of scipy.interpolate.Rbf interpolant.
+    s(x) = sum_i w_i phi(|x - x_i|), so
+    grad s = sum_i w_i phi'(r_i)/r_i (x - x_i), and
+    Hess s = sum_i w_i [ (phi''(r_i) - phi'(r_i)/r_i) u_i u_i^T + phi'(r_i)/r_i I ], u_i = (x - x_i)/r_i.
+    input: xs, ys, zs: arrays of shape (n,).
+    output: gradient of shape (n, k, 3), and Hessian of shape (n, k, 3, 3)
+        if requested; k is number of interpolated values (1 for mode='1-D').
+    """
+    points = np.stack((xs, ys, zs), axis=-1)
+    centers = rbf.xi.T
+    weights = rbf.nodes.reshape((len(centers), -1))
+    diffs = points[:, np.newaxis, :] - centers[np.newaxis, :, :]
+    r = np.linalg.norm(diffs, axis=-1)
+    d1_r, d2 = _rbf_radial_derivatives(rbf.function, rbf.epsilon, r)
+    gradient = np.einsum('nm,mk,nmj->nkj', d1_r, weights, diffs)
+    if not hessian:
+        return gradient
+    good = r > 0
+    r2 = np.where(good, r*r, 1.0)
+    a = np.where(good, (d2 - d1_r) / r2, 0.0)
+    H = np.einsum('nm,mk,nmi,nmj->nkij', a, weights, diffs, diffs, optimize=True)
+    H += np.einsum('nm,mk->nk', d1_r, weights)[:, :, np.newaxis, np.newaxis] * np.eye(3)
+    return gradient, H
+
 ##################
 #                #
 #  Scalar Fields #
@@ -22,6 +82,21 @@ class SvRbfScalarField(SvScalarField):
         value = self.rbf(xs, ys, zs)
         return value
 
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        if not _rbf_has_derivatives(self.rbf):
+            return super().gradient_grid(xs, ys, zs, step=step)
+        gradient = rbf_derivatives(self.rbf, xs, ys, zs)[:, 0, :]
+        return gradient[:,0], gradient[:,1], gradient[:,2]
+
+    def has_analytic_hessian(self):
+        return _rbf_has_derivatives(self.rbf)
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if not _rbf_has_derivatives(self.rbf):
+            return super().hessian_grid(xs, ys, zs, step=step)
+        _, H = rbf_derivatives(self.rbf, xs, ys, zs, hessian=True)
+        return H[:, 0]
+
 ##################
 #                #
 #  Vector Fields #
@@ -50,6 +125,14 @@ class SvRbfVectorField(SvVectorField):
             vz = vz - zs
         return vx, vy, vz
 
+    def jacobian_grid(self, xs, ys, zs, step=0.001):
+        if not _rbf_has_derivatives(self.rbf):
+            return super().jacobian_grid(xs, ys, zs, step=step)
+        J = rbf_derivatives(self.rbf, xs, ys, zs)
+        if self.relative:
+            J = J - np.eye(3)
+        return J
+
 class SvBvhRbfNormalVectorField(SvVectorField):
     def __init__(self, bvh, rbf):
         self.bvh = bvh
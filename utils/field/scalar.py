@@ -9,11 +9,11 @@ import numpy as np
 from math import copysign, sqrt, sin, cos, atan2, acos, pi
 
 from mathutils import Matrix, Vector
-from mathutils import kdtree
 from mathutils import bvhtree
 
 from sverchok.utils.math import from_cylindrical, from_spherical, to_cylindrical, to_spherical
 from sverchok.utils.geom import LineEquation, CircleEquation3D
+from sverchok.utils.sv_KDT_utils import SvKdTree
 
 ##################
 #                #
@@ -51,19 +51,149 @@ class SvScalarField(object):
         return np.array([dv_dx, dv_dy, dv_dz])
 
     def gradient_grid(self, xs, ys, zs, step=0.001):
-        v_dx_plus = self.evaluate_grid(xs+step, ys,zs)
-        v_dx_minus = self.evaluate_grid(xs-step,ys,zs)
-        v_dy_plus = self.evaluate_grid(xs, ys+step, zs)
-        v_dy_minus = self.evaluate_grid(xs, ys-step, zs)
-        v_dz_plus = self.evaluate_grid(xs, ys, zs+step)
-        v_dz_minus = self.evaluate_grid(xs, ys, zs-step)
-
-        dv_dx = (v_dx_plus - v_dx_minus) / (2*step)
-        dv_dy = (v_dy_plus - v_dy_minus) / (2*step)
-        dv_dz = (v_dz_plus - v_dz_minus) / (2*step)
-
-        R = np.stack((dv_dx, dv_dy, dv_dz))
-        return R[0], R[1], R[2]
+        """
+        Gradient of the field at given points.
+        Default implementation uses central finite differences; all six
+        probes are evaluated by one call of evaluate_grid.
+        output: tuple of three arrays of the same shape as xs.
+        """
+        values = evaluate_probes(self, xs, ys, zs, GRADIENT_PROBES[1:], step)
+        dv_dx = (values[0] - values[1]) / (2*step)
+        dv_dy = (values[2] - values[3]) / (2*step)
+        dv_dz = (values[4] - values[5]) / (2*step)
+        return dv_dx, dv_dy, dv_dz
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Hessian matrix of the field at given points.
+        Default implementation uses finite differences over one stacked
+        evaluation of ten probes.
+        output: array of shape xs.shape + (3, 3).
+        """
+        return probes_hessian(evaluate_probes(self, xs, ys, zs, HESSIAN_PROBES, step), step)
+
+    def gradient_hessian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Gradient and Hessian matrix at the same time.
+        For fields without analytic derivatives both are calculated
+        from the same set of probes.
+        output: tuple (array of shape xs.shape + (3,), array of shape xs.shape + (3, 3)).
+        """
+        if self.has_analytic_hessian():
+            gradient = np.stack(self.gradient_grid(xs, ys, zs, step=step), axis=-1)
+            return gradient, self.hessian_grid(xs, ys, zs, step=step)
+        values = evaluate_probes(self, xs, ys, zs, HESSIAN_PROBES, step)
+        return probes_gradient(values, step), probes_hessian(values, step)
+
+    def laplacian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Laplacian of the field at given points.
+        """
+        if self.has_analytic_hessian():
+            hessian = self.hessian_grid(xs, ys, zs, step=step)
+            return np.trace(hessian, axis1=-2, axis2=-1)
+        values = evaluate_probes(self, xs, ys, zs, GRADIENT_PROBES, step)
+        sides = values[1] + values[2] + values[3] + values[4] + values[5] + values[6]
+        return (sides - 6*values[0]) / (step * step)
+
+    def has_analytic_hessian(self):
+        """
+        Whether hessian_grid (and gradient_grid) of this field are calculated
+        without finite differences. Fields which provide analytic derivatives
+        only in some configurations (f.e., without falloff) override this.
+        """
+        return False
+
+# Offsets of finite difference probes, in units of step.
+# Probe 0 is always the point itself.
+GRADIENT_PROBES = np.array([
+        (0, 0, 0),
+        (1, 0, 0), (-1, 0, 0),
+        (0, 1, 0), (0, -1, 0),
+        (0, 0, 1), (0, 0, -1)
+    ])
+
+HESSIAN_PROBES = np.array([
+        (0, 0, 0),
+        (1, 0, 0), (-1, 0, 0),
+        (0, 1, 0), (0, -1, 0),
+        (0, 0, 1), (0, 0, -1),
+        (1, 1, 0), (0, 1, 1), (1, 0, 1)
+    ])
+
+def evaluate_probes(field, xs, ys, zs, offsets, step):
+    """
+    Evaluate the field at points shifted by each of offsets*step,
+    in one call of field.evaluate_grid.
+    input:
+        * field: SvScalarField or SvVectorField
+        * xs, ys, zs: arrays of the same shape
+        * offsets: array of shape (k, 3)
+    output: array of shape (k,) + xs.shape for scalar fields;
+        (k, 3) + xs.shape for vector fields.
+    """
+    xs, ys, zs = np.asarray(xs), np.asarray(ys), np.asarray(zs)
+    shape = xs.shape
+    n_probes = len(offsets)
+    deltas = offsets * step
+    pxs = (xs.reshape((1, -1)) + deltas[:,0][np.newaxis].T).flatten()
+    pys = (ys.reshape((1, -1)) + deltas[:,1][np.newaxis].T).flatten()
+    pzs = (zs.reshape((1, -1)) + deltas[:,2][np.newaxis].T).flatten()
+    values = field.evaluate_grid(pxs, pys, pzs)
+    if isinstance(values, tuple):
+        return np.stack([np.asarray(v).reshape((n_probes,) + shape) for v in values], axis=1)
+    return np.asarray(values).reshape((n_probes,) + shape)
+
+def probes_gradient(values, step):
+    """
+    Central differences gradient from values at GRADIENT_PROBES or HESSIAN_PROBES.
+    output: array of shape values.shape[1:] + (3,).
+    """
+    dv_dx = (values[1] - values[2]) / (2*step)
+    dv_dy = (values[3] - values[4]) / (2*step)
+    dv_dz = (values[5] - values[6]) / (2*step)
+    return np.stack((dv_dx, dv_dy, dv_dz), axis=-1)
+
+def probes_hessian(values, step):
+    """
+    Finite differences Hessian from values at HESSIAN_PROBES.
+    output: array of shape values.shape[1:] + (3, 3).
+    """
+    step2 = step*step
+    v0 = values[0]
+    v_dx_plus, v_dx_minus = values[1], values[2]
+    v_dy_plus, v_dy_minus = values[3], values[4]
+    v_dz_plus, v_dz_minus = values[5], values[6]
+    v_dxy_plus, v_dyz_plus, v_dxz_plus = values[7], values[8], values[9]
+
+    H = np.empty(v0.shape + (3, 3))
+    H[..., 0, 0] = (v_dx_plus - 2*v0 + v_dx_minus) / step2
+    H[..., 1, 1] = (v_dy_plus - 2*v0 + v_dy_minus) / step2
+    H[..., 2, 2] = (v_dz_plus - 2*v0 + v_dz_minus) / step2
+    H[..., 0, 1] = H[..., 1, 0] = (v_dxy_plus - v_dx_plus - v_dy_plus + v0) / step2
+    H[..., 1, 2] = H[..., 2, 1] = (v_dyz_plus - v_dy_plus - v_dz_plus + v0) / step2
+    H[..., 0, 2] = H[..., 2, 0] = (v_dxz_plus - v_dx_plus - v_dz_plus + v0) / step2
+    return H
+
+def distance_hessian(vectors, projector=None):
+    """
+    Hessian matrix of |P v|, where v are vectors from the attractor
+    and P is an orthogonal projector (identity by default).
+    Zero where the distance is zero.
+    input: vectors: array of shape (..., 3); projector: 3x3 matrix.
+    output: array of shape (..., 3, 3).
+    """
+    if projector is None:
+        projector = np.eye(3)
+    else:
+        vectors = vectors @ projector
+    norms = np.linalg.norm(vectors, axis=-1)
+    good = norms > 0
+    safe_norms = np.where(good, norms, 1.0)[..., np.newaxis]
+    units = vectors / safe_norms
+    H = (projector - units[..., np.newaxis] * units[..., np.newaxis, :]) / safe_norms[..., np.newaxis]
+    H[~good] = 0
+    return H
 
 class SvConstantScalarField(SvScalarField):
     def __init__(self, value):
@@ -176,6 +306,39 @@ class SvScalarFieldPointDistance(SvScalarField):
         else:
             return norm
 
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().gradient_grid(xs, ys, zs, step=step)
+        x0, y0, z0 = tuple(self.center)
+        points = np.stack((xs - x0, ys - y0, zs - z0))
+        if self.metric == 'EUCLIDEAN':
+            norms = np.linalg.norm(points, axis=0)
+            R = points / np.where(norms == 0, 1.0, norms)
+        elif self.metric == 'CHEBYSHEV':
+            idxs = np.argmax(np.abs(points), axis=0)
+            R = np.zeros_like(points)
+            np.put_along_axis(R, idxs[np.newaxis], 1.0, axis=0)
+            R = R * np.sign(points)
+        elif self.metric == 'MANHATTAN':
+            R = np.sign(points)
+        else:
+            raise Exception('Unknown metric')
+        return R[0], R[1], R[2]
+
+    def has_analytic_hessian(self):
+        return self.falloff is None
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().hessian_grid(xs, ys, zs, step=step)
+        if self.metric == 'EUCLIDEAN':
+            x0, y0, z0 = tuple(self.center)
+            points = np.stack((xs - x0, ys - y0, zs - z0), axis=-1)
+            return distance_hessian(points)
+        else:
+            # Piecewise linear
+            return np.zeros(np.shape(xs) + (3, 3))
+
 class SvScalarFieldBinOp(SvScalarField):
     def __init__(self, field1, field2, function):
         self.function = function
@@ -245,6 +408,58 @@ class SvCoordinateScalarField(SvScalarField):
         else:
             raise Exception("Unknown variable: " + self.coordinate)
 
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        zeros = np.zeros_like(xs, dtype=np.float64)
+        ones = np.ones_like(xs, dtype=np.float64)
+        if self.coordinate == 'X':
+            return ones, zeros, zeros
+        elif self.coordinate == 'Y':
+            return zeros, ones, zeros
+        elif self.coordinate == 'Z':
+            return zeros, zeros, ones
+        elif self.coordinate == 'CYL_RHO':
+            rho = np.sqrt(xs*xs + ys*ys)
+            rho[rho == 0] = 1.0
+            return xs / rho, ys / rho, zeros
+        elif self.coordinate == 'PHI':
+            rho2 = xs*xs + ys*ys
+            rho2[rho2 == 0] = 1.0
+            return -ys / rho2, xs / rho2, zeros
+        elif self.coordinate == 'SPH_RHO':
+            rho = np.sqrt(xs*xs + ys*ys + zs*zs)
+            rho[rho == 0] = 1.0
+            return xs / rho, ys / rho, zs / rho
+        elif self.coordinate == 'SPH_THETA':
+            return super().gradient_grid(xs, ys, zs, step=step)
+        else:
+            raise Exception("Unknown variable: " + self.coordinate)
+
+    def has_analytic_hessian(self):
+        return self.coordinate != 'SPH_THETA'
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if self.coordinate in {'X', 'Y', 'Z'}:
+            return np.zeros(np.shape(xs) + (3, 3))
+        elif self.coordinate == 'CYL_RHO':
+            points = np.stack((xs, ys, zs), axis=-1)
+            return distance_hessian(points, projector=np.diag([1.0, 1.0, 0.0]))
+        elif self.coordinate == 'PHI':
+            rho2 = xs*xs + ys*ys
+            rho2[rho2 == 0] = 1.0
+            rho4 = rho2 * rho2
+            H = np.zeros(np.shape(xs) + (3, 3))
+            H[..., 0, 0] = 2*xs*ys / rho4
+            H[..., 1, 1] = -H[..., 0, 0]
+            H[..., 0, 1] = H[..., 1, 0] = (ys*ys - xs*xs) / rho4
+            return H
+        elif self.coordinate == 'SPH_RHO':
+            points = np.stack((xs, ys, zs), axis=-1)
+            return distance_hessian(points)
+        elif self.coordinate == 'SPH_THETA':
+            return super().hessian_grid(xs, ys, zs, step=step)
+        else:
+            raise Exception("Unknown variable: " + self.coordinate)
+
 class SvNegatedScalarField(SvScalarField):
     def __init__(self, field):
         self.field = field
@@ -350,31 +565,15 @@ class SvKdtScalarField(SvScalarField):
 
     def __init__(self, vertices=None, kdt=None, falloff=None):
         self.falloff = falloff
-        if kdt is not None:
-            self.kdt = kdt
-        elif vertices is not None:
-            self.kdt = kdtree.KDTree(len(vertices))
-            for i, v in enumerate(vertices):
-                self.kdt.insert(v, i)
-            self.kdt.balance()
-        else:
-            raise Exception("Either kdt or vertices must be provided")
+        self.kdt = SvKdTree(vertices=vertices, kdt=kdt)
 
     def evaluate(self, x, y, z):
-        nearest, i, distance = self.kdt.find((x, y, z))
-        if self.falloff is not None:
-            value = self.falloff(np.array([distance]))[0]
-            return value
-        else:
-            return distance
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, i, distance = self.kdt.find(v)
-            return distance
-
-        points = np.stack((xs, ys, zs)).T
-        norms = np.vectorize(find, signature='(3)->()')(points)
+        points = np.stack((xs, ys, zs), axis=-1)
+        norms, _, _ = self.kdt.query(points.reshape((-1, 3)))
+        norms = norms.reshape(points.shape[:-1])
         if self.falloff is not None:
             result = self.falloff(norms)
             return result
@@ -413,6 +612,30 @@ class SvLineAttractorScalarField(SvScalarField):
         else:
             return norms
 
+    def _projector(self):
+        direction = np.asarray(self.direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        return np.eye(3) - np.outer(direction, direction)
+
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().gradient_grid(xs, ys, zs, step=step)
+        points = np.stack((xs, ys, zs), axis=-1)
+        vectors = (points - np.asarray(self.center)) @ self._projector()
+        norms = np.linalg.norm(vectors, axis=-1)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms[..., np.newaxis]
+        return vectors[..., 0], vectors[..., 1], vectors[..., 2]
+
+    def has_analytic_hessian(self):
+        return self.falloff is None
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().hessian_grid(xs, ys, zs, step=step)
+        points = np.stack((xs, ys, zs), axis=-1)
+        return distance_hessian(points - np.asarray(self.center), self._projector())
+
 class SvPlaneAttractorScalarField(SvScalarField):
     __description__ = "Plane Attractor"
 
@@ -445,6 +668,23 @@ class SvPlaneAttractorScalarField(SvScalarField):
         else:
             return norms
 
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().gradient_grid(xs, ys, zs, step=step)
+        direction = np.asarray(self.direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        points = np.stack((xs, ys, zs), axis=-1)
+        signs = np.sign((points - np.asarray(self.center)) @ direction)
+        return signs * direction[0], signs * direction[1], signs * direction[2]
+
+    def has_analytic_hessian(self):
+        return self.falloff is None
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().hessian_grid(xs, ys, zs, step=step)
+        return np.zeros(np.shape(xs) + (3, 3))
+
 class SvCircleAttractorScalarField(SvScalarField):
     __description__ = "Circle Attractor"
 
@@ -547,9 +787,7 @@ class SvEdgeAttractorScalarField(SvScalarField):
         else:
             return distance
     
-    def evaluate_grid(self, xs, ys, zs):
-        n = len(xs)
-        vs = np.stack((xs, ys, zs)).T
+    def _regions(self, vs):
         v1 = np.array(self.v1)
         v2 = np.array(self.v2)    
         dv1s = np.linalg.norm(vs - v1, axis=1)
@@ -571,6 +809,17 @@ class SvEdgeAttractorScalarField(SvScalarField):
         at_vertex = np.logical_not(at_edge)
         at_v1 = np.logical_and(at_vertex, v1_is_nearest)
         at_v2 = np.logical_and(at_vertex, v2_is_nearest)
+        return at_edge, at_v1, at_v2, dv1s, dv2s
+
+    def _edge_projector(self):
+        direction = np.array(self.v2 - self.v1)
+        direction = direction / np.linalg.norm(direction)
+        return np.eye(3) - np.outer(direction, direction)
+
+    def evaluate_grid(self, xs, ys, zs):
+        n = len(xs)
+        vs = np.stack((xs, ys, zs)).T
+        at_edge, at_v1, at_v2, dv1s, dv2s = self._regions(vs)
         
         distances = np.empty((n,))
         distances[at_edge] = LineEquation.from_two_points(self.v1, self.v2).distance_to_points(vs[at_edge])
@@ -583,6 +832,34 @@ class SvEdgeAttractorScalarField(SvScalarField):
         else:
             return distances
 
+    def gradient_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().gradient_grid(xs, ys, zs, step=step)
+        vs = np.stack((xs, ys, zs)).T
+        at_edge, at_v1, at_v2, _, _ = self._regions(vs)
+        vectors = np.empty_like(vs)
+        vectors[at_edge] = (vs[at_edge] - np.array(self.v1)) @ self._edge_projector()
+        vectors[at_v1] = vs[at_v1] - np.array(self.v1)
+        vectors[at_v2] = vs[at_v2] - np.array(self.v2)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        R = (vectors / norms[np.newaxis].T).T
+        return R[0], R[1], R[2]
+
+    def has_analytic_hessian(self):
+        return self.falloff is None
+
+    def hessian_grid(self, xs, ys, zs, step=0.001):
+        if self.falloff is not None:
+            return super().hessian_grid(xs, ys, zs, step=step)
+        vs = np.stack((xs, ys, zs)).T
+        at_edge, at_v1, at_v2, _, _ = self._regions(vs)
+        H = np.empty((len(vs), 3, 3))
+        H[at_edge] = distance_hessian(vs[at_edge] - np.array(self.v1), self._edge_projector())
+        H[at_v1] = distance_hessian(vs[at_v1] - np.array(self.v1))
+        H[at_v2] = distance_hessian(vs[at_v2] - np.array(self.v2))
+        return H
+
 class SvVectorScalarFieldComposition(SvScalarField):
     __description__ = "Composition"
 
@@ -606,34 +883,11 @@ class SvVectorFieldDivergence(SvScalarField):
         self.__description__ = "Div({})".format(field)
 
     def evaluate(self, x, y, z):
-        step = self.step
-        xs_dx_plus, _, _ = self.field.evaluate(x+step,y,z)
-        xs_dx_minus, _, _ = self.field.evaluate(x-step,y,z)
-        _, ys_dy_plus, _ = self.field.evaluate(x, y+step, z)
-        _, ys_dy_minus, _ = self.field.evaluate(x, y-step, z)
-        _, _, zs_dz_plus = self.field.evaluate(x, y, z+step)
-        _, _, zs_dz_minus = self.field.evaluate(x, y, z-step)
-
-        dx_dx = (xs_dx_plus - xs_dx_minus) / (2*step)
-        dy_dy = (ys_dy_plus - ys_dy_minus) / (2*step)
-        dz_dz = (zs_dz_plus - zs_dz_minus) / (2*step)
-
-        return dx_dx + dy_dy + dz_dz
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
     
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        xs_dx_plus, _, _ = self.field.evaluate_grid(xs+step, ys,zs)
-        xs_dx_minus, _, _ = self.field.evaluate_grid(xs-step,ys,zs)
-        _, ys_dy_plus, _ = self.field.evaluate_grid(xs, ys+step, zs)
-        _, ys_dy_minus, _ = self.field.evaluate_grid(xs, ys-step, zs)
-        _, _, zs_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        _, _, zs_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-
-        dx_dx = (xs_dx_plus - xs_dx_minus) / (2*step)
-        dy_dy = (ys_dy_plus - ys_dy_minus) / (2*step)
-        dz_dz = (zs_dz_plus - zs_dz_minus) / (2*step)
-
-        return dx_dx + dy_dy + dz_dz
+        jacobian = self.field.jacobian_grid(xs, ys, zs, step=self.step)
+        return np.trace(jacobian, axis1=-2, axis2=-1)
 
 class SvScalarFieldLaplacian(SvScalarField):
     def __init__(self, field, step):
@@ -642,32 +896,12 @@ class SvScalarFieldLaplacian(SvScalarField):
         self.__description__ = "Laplace({})".format(field)
 
     def evaluate(self, x, y, z):
-        step = self.step
-        v_dx_plus = self.field.evaluate(x+step,y,z)
-        v_dx_minus = self.field.evaluate(x-step,y,z)
-        v_dy_plus = self.field.evaluate(x, y+step, z)
-        v_dy_minus = self.field.evaluate(x, y-step, z)
-        v_dz_plus = self.field.evaluate(x, y, z+step)
-        v_dz_minus = self.field.evaluate(x, y, z-step)
-        v0 = self.field.evaluate(x, y, z)
-
-        sides = v_dx_plus + v_dx_minus + v_dy_plus + v_dy_minus + v_dz_plus + v_dz_minus
-        result = (sides - 6*v0) / (8 * step * step * step)
-        return result
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
     
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        v_dx_plus = self.field.evaluate_grid(xs+step, ys,zs)
-        v_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        v_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        v_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        v_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        v_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-        v0 = self.field.evaluate_grid(xs, ys, zs)
-
-        sides = v_dx_plus + v_dx_minus + v_dy_plus + v_dy_minus + v_dz_plus + v_dz_minus
-        result = (sides - 6*v0) / (8 * step * step * step)
-        return result
+        # The node has always divided the finite differences stencil by
+        # 8*step^3 instead of step^2; the scale is kept for existing files.
+        return self.field.laplacian_grid(xs, ys, zs, step=self.step) / (8 * self.step)
 
 class ScalarFieldCurvatureCalculator(object):
     # Ref.: Curvature formulas for implicit curves and surfaces // Ron Goldman // doi:10.1016/j.cagd.2005.06.005
@@ -683,33 +917,20 @@ class ScalarFieldCurvatureCalculator(object):
         self.prev_ys = ys
         self.prev_zs = zs
 
-        step = self.step
-        step2 = step*step
-        n = self.n = len(xs)
-        v_dx_plus = self.field.evaluate_grid(xs+step, ys,zs)
-        v_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        v_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        v_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        v_dz_plus = self.field.evaluate_grid(xs, ys, zs+step)
-        v_dz_minus = self.field.evaluate_grid(xs, ys, zs-step)
-
-        v_dxy_plus = self.field.evaluate_grid(xs+step, ys+step, zs)
-        v_dyz_plus = self.field.evaluate_grid(xs, ys+step, zs+step)
-        v_dxz_plus = self.field.evaluate_grid(xs+step, ys, zs+step)
+        self.n = len(xs)
+        grad, H = self.field.gradient_hessian_grid(xs, ys, zs, step=self.step)
 
-        v0 = self.v0 = self.field.evaluate_grid(xs, ys, zs)
+        self.dx = grad[..., 0]
+        self.dy = grad[..., 1]
+        self.dz = grad[..., 2]
 
-        self.dx = (v_dx_plus - v0) / step
-        self.dy = (v_dy_plus - v0) / step
-        self.dz = (v_dz_plus - v0) / step
+        self.dxx = H[..., 0, 0]
+        self.dyy = H[..., 1, 1]
+        self.dzz = H[..., 2, 2]
 
-        self.dxx = (v_dx_plus - 2*v0 + v_dx_minus) / step2
-        self.dyy = (v_dy_plus - 2*v0 + v_dy_minus) / step2
-        self.dzz = (v_dz_plus - 2*v0 + v_dz_minus) / step2
-
-        self.dxy = (v_dxy_plus - v_dx_plus - v_dy_plus + v0) / step2
-        self.dyz = (v_dyz_plus - v_dy_plus - v_dz_plus + v0) / step2
-        self.dxz = (v_dxz_plus - v_dx_plus - v_dz_plus + v0) / step2
+        self.dxy = H[..., 0, 1]
+        self.dyz = H[..., 1, 2]
+        self.dxz = H[..., 0, 2]
 
     def gauss(self):
         n = self.n
@@ -813,20 +1034,14 @@ class SvVoronoiScalarField(SvScalarField):
     __description__ = "Voronoi"
 
     def __init__(self, vertices):
-        self.kdt = kdtree.KDTree(len(vertices))
-        for i, v in enumerate(vertices):
-            self.kdt.insert(v, i)
-        self.kdt.balance()
+        self.kdt = SvKdTree(vertices)
 
     def evaluate(self, x, y, z):
-        vs = self.kdt.find_n((x,y,z), 2)
-        if len(vs) != 2:
-            raise Exception("Unexpected kdt result at (%s,%s,%s): %s" % (x, y, z, vs))
-        t1, t2 = vs
-        distance1 = t1[2]
-        distance2 = t2[2]
-        return abs(distance1 - distance2)
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
 
     def evaluate_grid(self, xs, ys, zs):
-        return np.vectorize(self.evaluate, signature='(),(),()->()')(xs,ys,zs)
+        points = np.stack((xs, ys, zs), axis=-1)
+        distances, _, _ = self.kdt.query(points.reshape((-1, 3)), k=2)
+        result = abs(distances[:,0] - distances[:,1])
+        return result.reshape(points.shape[:-1])
 
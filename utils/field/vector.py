@@ -10,11 +10,12 @@ import numpy as np
 
 from mathutils import Vector
 from mathutils import bvhtree
-from mathutils import kdtree
 from mathutils import noise
 from sverchok.utils.curve import SvCurveLengthSolver, SvNormalTrack, MathutilsRotationCalculator
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.math import from_cylindrical, from_spherical
+from sverchok.utils.sv_KDT_utils import SvKdTree
+from sverchok.utils.field.scalar import evaluate_probes, GRADIENT_PROBES
 
 
 ##################
@@ -37,6 +38,19 @@ class SvVectorField(object):
     def evaluate_grid(self, xs, ys, zs):
         raise Exception("not implemented")
 
+    def jacobian_grid(self, xs, ys, zs, step=0.001):
+        """
+        Jacobian matrix of the field at given points: J[..., i, j] = dV_i / dx_j.
+        Default implementation uses central finite differences; all six
+        probes are evaluated by one call of evaluate_grid.
+        output: array of shape xs.shape + (3, 3).
+        """
+        values = evaluate_probes(self, xs, ys, zs, GRADIENT_PROBES[1:], step)
+        dv_dx = (values[0] - values[1]) / (2*step)
+        dv_dy = (values[2] - values[3]) / (2*step)
+        dv_dz = (values[4] - values[5]) / (2*step)
+        return np.moveaxis(np.stack((dv_dx, dv_dy, dv_dz)), (0, 1), (-1, -2))
+
 class SvMatrixVectorField(SvVectorField):
 
     def __init__(self, matrix):
@@ -285,22 +299,14 @@ class SvKdtVectorField(SvVectorField):
     def __init__(self, vertices=None, kdt=None, falloff=None, negate=False):
         self.falloff = falloff
         self.negate = negate
-        if kdt is not None:
-            self.kdt = kdt
-        elif vertices is not None:
-            self.kdt = kdtree.KDTree(len(vertices))
-            for i, v in enumerate(vertices):
-                self.kdt.insert(v, i)
-            self.kdt.balance()
-        else:
-            raise Exception("Either kdt or vertices must be provided")
+        self.kdt = SvKdTree(vertices=vertices, kdt=kdt)
         self.__description__ = "KDT Attractor"
 
     def evaluate(self, x, y, z):
-        nearest, i, distance = self.kdt.find((x, y, z))
-        vector = np.array(nearest) - np.array([x, y, z])
+        distance, _, nearest = self.kdt.query(np.array([[x, y, z]]))
+        vector = nearest[0] - np.array([x, y, z])
         if self.falloff is not None:
-            value = self.falloff(np.array([distance]))[0]
+            value = self.falloff(distance)[0]
             if self.negate:
                 value = - value
             norm = np.linalg.norm(vector)
@@ -312,16 +318,11 @@ class SvKdtVectorField(SvVectorField):
                 return vector
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, i, distance = self.kdt.find(v)
-            dv = np.array(nearest) - np.array(v)
-            if self.negate:
-                return - dv
-            else:
-                return dv
-
         points = np.stack((xs, ys, zs)).T
-        vectors = np.vectorize(find, signature='(3)->(3)')(points)
+        _, _, nearest = self.kdt.query(points)
+        vectors = nearest - points
+        if self.negate:
+            vectors = - vectors
         if self.falloff is not None:
             norms = np.linalg.norm(vectors, axis=1, keepdims=True)
             lens = self.falloff(norms)
@@ -747,6 +748,9 @@ class SvScalarFieldGradient(SvVectorField):
     def evaluate_grid(self, xs, ys, zs):
         return self.field.gradient_grid(xs, ys, zs, step=self.step)
 
+    def jacobian_grid(self, xs, ys, zs, step=0.001):
+        return self.field.hessian_grid(xs, ys, zs, step=self.step)
+
 class SvVectorFieldRotor(SvVectorField):
     def __init__(self, field, step):
         self.field = field
@@ -776,26 +780,11 @@ class SvVectorFieldRotor(SvVectorField):
         return np.array([rx, ry, rz])
 
     def evaluate_grid(self, xs, ys, zs):
-        step = self.step
-        _, y_dx_plus, z_dx_plus = self.field.evaluate_grid(xs+step,ys,zs)
-        _, y_dx_minus, z_dx_minus = self.field.evaluate_grid(xs-step,ys,zs)
-        x_dy_plus, _, z_dy_plus = self.field.evaluate_grid(xs, ys+step, zs)
-        x_dy_minus, _, z_dy_minus = self.field.evaluate_grid(xs, ys-step, zs)
-        x_dz_plus, y_dz_plus, _ = self.field.evaluate_grid(xs, ys, zs+step)
-        x_dz_minus, y_dz_minus, _ = self.field.evaluate_grid(xs, ys, zs-step)
-
-        dy_dx = (y_dx_plus - y_dx_minus) / (2*step)
-        dz_dx = (z_dx_plus - z_dx_minus) / (2*step)
-        dx_dy = (x_dy_plus - x_dy_minus) / (2*step)
-        dz_dy = (z_dy_plus - z_dy_minus) / (2*step)
-        dx_dz = (x_dz_plus - x_dz_minus) / (2*step)
-        dy_dz = (y_dz_plus - y_dz_minus) / (2*step)
-
-        rx = dz_dy - dy_dz
-        ry = - (dz_dx - dx_dz)
-        rz = dy_dx - dx_dy
-        R = np.stack((rx, ry, rz))
-        return R[0], R[1], R[2]
+        J = self.field.jacobian_grid(xs, ys, zs, step=self.step)
+        rx = J[..., 2, 1] - J[..., 1, 2]
+        ry = J[..., 0, 2] - J[..., 2, 0]
+        rz = J[..., 1, 0] - J[..., 0, 1]
+        return rx, ry, rz
 
 class SvBendAlongCurveField(SvVectorField):
 
@@ -1011,25 +1000,23 @@ class SvBendAlongSurfaceField(SvVectorField):
 class SvVoronoiVectorField(SvVectorField):
 
     def __init__(self, vertices):
-        self.kdt = kdtree.KDTree(len(vertices))
-        for i, v in enumerate(vertices):
-            self.kdt.insert(v, i)
-        self.kdt.balance()
+        self.kdt = SvKdTree(vertices)
         self.__description__ = "Voronoi"
 
     def evaluate(self, x, y, z):
-        v = Vector((x,y,z))
-        vs = self.kdt.find_n(v, 2)
-        if len(vs) != 2:
-            raise Exception("Unexpected kdt result at (%s,%s,%s): %s" % (x, y, z, vs))
-        t1, t2 = vs
-        d1 = t1[2]
-        d2 = t2[2]
-        delta = abs(d1 - d2)
-        v1 = (t1[0] - v).normalized()
-        return delta * np.array(v1)
+        xs, ys, zs = self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))
+        return np.array([xs[0], ys[0], zs[0]])
 
     def evaluate_grid(self, xs, ys, zs):
-        points = np.vectorize(self.evaluate, signature='(),(),()->(3)')(xs,ys,zs).T
-        return points[0], points[1], points[2]
+        points = np.stack((xs, ys, zs), axis=-1)
+        shape = points.shape[:-1]
+        points = points.reshape((-1, 3))
+        distances, _, nearest = self.kdt.query(points, k=2)
+        delta = abs(distances[:,0] - distances[:,1])
+        v1 = nearest[:,0] - points
+        norms = np.linalg.norm(v1, axis=1, keepdims=True)
+        nonzero = (norms > 0)[:,0]
+        v1[nonzero] = v1[nonzero] / norms[nonzero]
+        R = (delta[np.newaxis].T * v1).T
+        return R[0].reshape(shape), R[1].reshape(shape), R[2].reshape(shape)
 
@@ -0,0 +1,269 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Storage of node data per animation frame.
+
+SvFrameCache keeps recorded frames in memory up to a memory limit. When the
+limit is exceeded, least recently used frames are evicted from memory; they
+are either dropped, or spilled to a temporary directory on disk and loaded
+back when requested again.
+
+Data of a frame is a dictionary {socket name: socket data}. Socket data,
+where each object is a numeric array or a flat list of floats or of ints,
+is stored as uncompressed .npz file; other data (vertex tuples, matrices,
+ragged lists, curves, surfaces etc) is stored with pickle, so that it is
+loaded back with the same types.
+
+Temporary directories of all caches are removed when Blender exits.
+"""
+
+import atexit
+import copyreg
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+from mathutils import Matrix, Vector, Quaternion, Euler, Color
+
+from sverchok.utils.logging import debug, exception
+
+MB = 1 << 20
+
+# name: SvFrameCache
+frame_caches = {}
+
+def estimate_data_size(data, sample_size=16):
+    """
+    Approximate size of data in bytes.
+    Long lists are estimated by their first items.
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, dict):
+        return sum(estimate_data_size(v, sample_size) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        n = len(data)
+        if n == 0:
+            return 64
+        sample = data[:sample_size]
+        sample_bytes = sum(estimate_data_size(item, sample_size) for item in sample)
+        return 64 + 8 * n + sample_bytes * n // len(sample)
+    return 32
+
+def _as_numeric_array(obj):
+    """
+    Numeric array to store obj in .npz file, or None if obj would not be
+    restored exactly by unpack_frame_data (f.e. tuples, matrices or lists
+    of mixed ints and floats), and thus must be pickled.
+    """
+    if isinstance(obj, np.ndarray):
+        array = obj
+    elif type(obj) is list:
+        if all(type(item) is float for item in obj):
+            array = np.array(obj, dtype=np.float64)
+        elif all(type(item) is int for item in obj):
+            try:
+                array = np.array(obj, dtype=np.int64)
+            except OverflowError:
+                return None
+        else:
+            return None
+    else:
+        return None
+    if array.dtype.kind not in 'biuf':
+        return None
+    return array
+
+def pack_frame_data(data):
+    """
+    Convert frame data into (layout, arrays) suitable for np.savez.
+    Returns None if some of objects are not numeric arrays.
+    """
+    layout = dict()
+    arrays = dict()
+    for name, objects in data.items():
+        if type(objects) is not list:
+            return None
+        items = []
+        for obj in objects:
+            array = _as_numeric_array(obj)
+            if array is None:
+                return None
+            key = "a{}".format(len(arrays))
+            arrays[key] = array
+            items.append((key, isinstance(obj, np.ndarray)))
+        layout[name] = items
+    return layout, arrays
+
+def unpack_frame_data(layout, arrays):
+    data = dict()
+    for name, items in layout.items():
+        data[name] = [arrays[key] if is_array else arrays[key].tolist() for key, is_array in items]
+    return data
+
+# mathutils objects do not support pickle by themselves
+_pickle_dispatch = copyreg.dispatch_table.copy()
+_pickle_dispatch[Matrix] = lambda m: (Matrix, ([tuple(row) for row in m],))
+_pickle_dispatch[Vector] = lambda v: (Vector, (tuple(v),))
+_pickle_dispatch[Quaternion] = lambda q: (Quaternion, (tuple(q),))
+_pickle_dispatch[Euler] = lambda e: (Euler, (tuple(e), e.order))
+_pickle_dispatch[Color] = lambda c: (Color, (tuple(c),))
+
+def _pickle_dump(data, f):
+    pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _pickle_dispatch
+    pickler.dump(data)
+
+class SvFrameCache(object):
+    """
+    Per-frame data store with LRU memory eviction and optional disk spill.
+    """
+    def __init__(self, memory_limit=256*MB, use_disk=True):
+        self.memory_limit = memory_limit
+        self.use_disk = use_disk
+        # frame: (data, size), least recently used first
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        # frame: path
+        self.on_disk = dict()
+        self.directory = None
+
+    def __contains__(self, frame):
+        return frame in self.memory or frame in self.on_disk
+
+    def __len__(self):
+        return len(self.frames())
+
+    def frames(self):
+        return sorted(set(self.memory.keys()) | set(self.on_disk.keys()))
+
+    def set_settings(self, memory_limit, use_disk):
+        self.memory_limit = memory_limit
+        if self.use_disk and not use_disk:
+            self._remove_disk_frames()
+        self.use_disk = use_disk
+        self._evict()
+
+    def put(self, frame, data):
+        self._forget(frame)
+        size = estimate_data_size(data)
+        self.memory[frame] = (data, size)
+        self.memory_size += size
+        self._evict()
+
+    def get(self, frame, default=None):
+        if frame in self.memory:
+            self.memory.move_to_end(frame)
+            return self.memory[frame][0]
+        path = self.on_disk.get(frame)
+        if path is None:
+            return default
+        try:
+            data = self._load(path)
+        except Exception as e:
+            exception(e)
+            self._forget(frame)
+            return default
+        # keep the file, so the frame does not have to be written again
+        size = estimate_data_size(data)
+        self.memory[frame] = (data, size)
+        self.memory_size += size
+        self._evict(keep=frame)
+        return data
+
+    def clear(self):
+        self.memory.clear()
+        self.memory_size = 0
+        self._remove_disk_frames()
+
+    def _forget(self, frame):
+        item = self.memory.pop(frame, None)
+        if item is not None:
+            self.memory_size -= item[1]
+        path = self.on_disk.pop(frame, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def _remove_disk_frames(self):
+        self.on_disk.clear()
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def _evict(self, keep=None):
+        while self.memory_size > self.memory_limit and len(self.memory) > 1:
+            frame = next(iter(self.memory))
+            if frame == keep:
+                self.memory.move_to_end(frame)
+                frame = next(iter(self.memory))
+            data, size = self.memory.pop(frame)
+            self.memory_size -= size
+            if self.use_disk and frame not in self.on_disk:
+                try:
+                    self.on_disk[frame] = self._save(frame, data)
+                except Exception as e:
+                    exception(e)
+
+    def _save(self, frame, data):
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="sverchok_frames_")
+        packed = pack_frame_data(data)
+        if packed is not None:
+            layout, arrays = packed
+            path = os.path.join(self.directory, "{}.npz".format(frame))
+            np.savez(path, __layout__=np.array(json.dumps(layout)), **arrays)
+        else:
+            path = os.path.join(self.directory, "{}.pickle".format(frame))
+            with open(path, 'wb') as f:
+                _pickle_dump(data, f)
+        debug("Frame %s spilled to %s", frame, path)
+        return path
+
+    def _load(self, path):
+        if path.endswith(".npz"):
+            with np.load(path, allow_pickle=False) as npz:
+                layout = json.loads(str(npz['__layout__']))
+                arrays = {key: npz[key] for key in npz.files if key != '__layout__'}
+            return unpack_frame_data(layout, arrays)
+        else:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+def get_frame_cache(name, memory_limit=256*MB, use_disk=True):
+    """
+    Get frame cache by name (node_id of the node, for example),
+    creating it if necessary.
+    """
+    cache = frame_caches.get(name)
+    if cache is None:
+        cache = SvFrameCache(memory_limit, use_disk)
+        frame_caches[name] = cache
+    elif cache.memory_limit != memory_limit or cache.use_disk != use_disk:
+        cache.set_settings(memory_limit, use_disk)
+    return cache
+
+def remove_frame_cache(name):
+    """
+    Forget frame cache by name, removing its frames from disk;
+    to be called when the node owning the cache is deleted.
+    """
+    cache = frame_caches.pop(name, None)
+    if cache is not None:
+        cache.clear()
+
+def clear_frame_caches():
+    for cache in frame_caches.values():
+        cache.clear()
+    frame_caches.clear()
+
+# spilled frames are not needed after exit
+atexit.register(clear_frame_caches)
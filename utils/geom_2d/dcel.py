@@ -76,6 +76,11 @@ class Point:
 
 class HalfEdge:
     accuracy = 1e-5
+    # There can be a lot of half edges in a mesh, so they do not have __dict__
+    # Attributes of half edges of particular algorithms (subclasses) are declared here also
+    # because the subclasses are combined via multiple inheritance
+    __slots__ = ('mesh', 'origin', 'face', 'twin', 'next', 'last', 'left', 'flags', '_slop',
+                 'edge', 'lap_faces', 'in_faces', 'new_next', 'new_last')
 
     def __init__(self, mesh, point, face=None):
         self.mesh = mesh  # can be just None but in this case some method weren't be available
@@ -137,7 +142,7 @@ class HalfEdge:
         yield self
         next_edge = self.next
         counter = 0
-        while id(next_edge) != id(self):
+        while next_edge is not self:
             yield next_edge
             try:
                 next_edge = next_edge.next
@@ -175,6 +180,7 @@ class HalfEdge:
 
 class Face:
     accuracy = 1e-5
+    __slots__ = ('mesh', '_outer', '_inners', 'select', 'flags', 'sv_data')
 
     def __init__(self, mesh):
         self.mesh = mesh
@@ -0,0 +1,548 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+from array import array
+from itertools import cycle
+
+from .lin_alg import almost_equal, is_more, is_ccw_polygon
+from .sort_mesh import SortPointsUpDown
+
+
+"""
+This module is structure of arrays variant of Doubly-Connected Edge List data structure of the dcel module.
+Points, half edges and faces are just indexes here and their attributes are kept in columns,
+typed arrays (array.array) for links and python lists for sets and any other objects.
+So there is no Python object per element of a mesh what makes it possible to handle really big meshes.
+Typed arrays are used instead of numpy arrays because algorithms read them element by element
+what is several times faster with array.array, also they can be wrapped by numpy.frombuffer without coping.
+
+The order of creation of elements and all algorithms are the same to the dcel module,
+so meshes created by both modules are identical.
+-1 index means absence of an element, like None in the dcel module.
+"""
+
+
+x, y, z = 0, 1, 2
+
+UNBOUNDED = 0  # index of boundless super face, it is created first by any mesh
+POINT_ACCURACY = 1e-6  # default accuracy of input points, the same to intersections.Point
+
+
+class EventPoint(SortPointsUpDown):
+    """
+    Stand-in of a point of DCELArrays which can be stored in AVL tree of sweep line algorithms.
+    It sorts points from upward to downward direction the same way as Point classes of the dcel module.
+    """
+    __slots__ = ('index', 'co', 'accuracy', 'up_edges')
+
+    def __init__(self, co, accuracy, index=-1):
+        self.co = co
+        self.accuracy = accuracy
+        self.index = index  # index of the point in a mesh
+        self.up_edges = []  # edges below event point, intersection algorithm user
+
+    @classmethod
+    def from_mesh(cls, mesh, index):
+        return cls(mesh.co[index], mesh.point_accuracy[index], index)
+
+
+class DCELArrays:
+
+    def __init__(self, accuracy=None):
+        # points
+        self.co = []
+        self.point_accuracy = array('d')
+        self.point_hedge = array('i')
+
+        # half edges
+        self.origin = array('i')
+        self.face = array('i')
+        self.twin = array('i')
+        self.next = array('i')
+        self.last = array('i')
+        self.left = array('i')  # nearest left neighbour for hole detection
+        self.slops = array('d')  # 0 if slop is not calculated yet
+        self.tails = bytearray()
+        self.edge = []  # for sweep line algorithms
+        # sets are immutable and shared between half edges of the same face,
+        # operations like in_faces[i] |= other should be used for editing
+        self.lap_faces = []
+        self.in_faces = []
+
+        # faces
+        self.outer = array('i')
+        self.inners = []
+        self.select = bytearray()
+        self.face_flags = []
+        self.sv_data = []
+
+        self.points = array('i')
+        self.hedges = array('i')
+        self.faces = array('i')
+
+        self.accuracy = 1e-5
+        if accuracy:
+            self.set_accuracy(accuracy)
+        self._face_sets = {-1: frozenset()}
+        self.add_face()  # unbounded face
+
+    def set_accuracy(self, accuracy):
+        # This value is using for comparing float figures
+        if isinstance(accuracy, int):
+            accuracy = 1 / 10 ** accuracy
+        if not (1e-1 > accuracy > 1e-15):
+            raise ValueError("Accuracy should between 1^-1 and 1^-15, {} value was given".format(accuracy))
+        self.accuracy = accuracy
+
+    def add_point(self, co, accuracy=POINT_ACCURACY):
+        self.co.append(co)
+        self.point_accuracy.append(accuracy)
+        self.point_hedge.append(-1)
+        return len(self.co) - 1
+
+    def add_hedge(self, point, face=-1):
+        self.origin.append(point)
+        self.face.append(face)
+        self.twin.append(-1)
+        self.next.append(-1)
+        self.last.append(-1)
+        self.left.append(-1)
+        self.slops.append(0)
+        self.tails.append(0)
+        self.edge.append(None)
+        face_set = self._face_sets.get(face)
+        if face_set is None:
+            face_set = self._face_sets[face] = frozenset([face])
+        self.lap_faces.append(face_set)
+        self.in_faces.append(face_set)
+        return len(self.origin) - 1
+
+    def add_face(self):
+        self.outer.append(-1)
+        self.inners.append([])
+        self.select.append(0)
+        self.face_flags.append(set())
+        self.sv_data.append(dict())
+        return len(self.outer) - 1
+
+    def ccw_hedges(self, hedge):
+        # returns hedges originated in one point
+        twin, last = self.twin, self.last
+        yield hedge
+        next_edge = twin[last[hedge]]
+        counter = 0
+        while next_edge != hedge:
+            yield next_edge
+            next_edge = twin[last[next_edge]]
+            counter += 1
+            if counter > len(self.hedges):
+                raise RecursionError('Hedge - {} does not have a loop'.format(hedge))
+
+    def cw_hedges(self, hedge):
+        # returns hedges originated in one point
+        twin, next_ = self.twin, self.next
+        yield hedge
+        next_edge = next_[twin[hedge]]
+        counter = 0
+        while next_edge != hedge:
+            yield next_edge
+            next_edge = next_[twin[next_edge]]
+            counter += 1
+            if counter > len(self.hedges):
+                raise RecursionError('Hedge - {} does not have a loop'.format(hedge))
+
+    def loop_hedges(self, hedge):
+        # returns hedges bounding face
+        next_ = self.next
+        yield hedge
+        next_edge = next_[hedge]
+        counter = 0
+        while next_edge != hedge:
+            yield next_edge
+            next_edge = next_[next_edge]
+            counter += 1
+            if counter > len(self.hedges):
+                raise RecursionError('Hedge - {} does not have a loop'.format(hedge))
+
+    def slop(self, hedge):
+        """
+        Returns dot product of direction of half edges and -X direction in ccw order in such way
+        Angle 90 from -X direction in ccw order returns 1.0
+        Angle 360 or 0 from -X direction in ccw order returns 4.0
+        The value is calculated once, read HalfEdge.slop of dcel module
+        :return: float
+        """
+        slop = self.slops[hedge]
+        if slop:
+            return slop
+        twin_slop = self.slops[self.twin[hedge]]
+        if twin_slop:
+            slop = (twin_slop + 2) % 4 if twin_slop != 2 else 4
+        else:
+            co1 = self.co[self.origin[hedge]]
+            co2 = self.co[self.origin[self.twin[hedge]]]
+            if almost_equal(co1[y], co2[y], self.accuracy):  # is horizontal
+                slop = 4.0 if is_more(co1[x], co2[x], self.accuracy) else 2.0
+            else:
+                direction = [c2 - c1 for c2, c1 in zip(co2, co1)]
+                length = sum([co ** 2 for co in direction]) ** 0.5
+                product = direction[x] / length
+                slop = product + 1 if direction[y] / length < 0 else 3 - product
+        self.slops[hedge] = slop
+        return slop
+
+    def from_sv_faces(self, verts, faces, face_flag=None, face_data=None):
+        # face_data = {name of data: [value 1, val2, .., value n]} - number of values should be equal to number of faces
+        # read generate_dcel_mesh function of dcel module for more information
+        if face_flag and len(face_flag) != len(faces):
+            raise IndexError("Length of face_flag({}) input should be equal to"
+                             " length of input faces({})".format(len(face_flag), len(faces)))
+        if face_data and any([len(val) != len(faces) for val in face_data.values()]):
+            bad_key, length = [(key, len(val)) for key, val in face_data.items() if len(val) != len(faces)][0]
+            raise IndexError("Face data should be a dictionary."
+                             "Each value should be a list with length equal to length of input faces"
+                             "At list with key({}) length of input list({}) is not equal to "
+                             "length of input faces({})".format(bad_key, length, len(faces)))
+        face_col, twin, next_, last = self.face, self.twin, self.next, self.last
+        half_edges_list = dict()
+        len_added_points = len(self.co)
+        self.points.extend([self.add_point(co) for co in verts])
+
+        # Generate outer faces and there hedges
+        face_data_iter = zip(cycle([face_data.keys()]), zip(*face_data.values())) if face_data else cycle([None])
+        for face, ff, fd in zip(faces, face_flag or cycle([None]), face_data_iter):
+            face = face if is_ccw_polygon([verts[i] for i in face]) else face[::-1]
+            f = self.add_face()
+            if ff:
+                self.face_flags[f].add(ff)
+            if fd:
+                for property_name, value in zip(*fd):
+                    self.sv_data[f][property_name] = value
+            loop = []
+            for i in range(len(face)):
+                origin_i = face[i]
+                next_i = face[(i + 1) % len(face)]
+                half_edge = self.add_hedge(origin_i + len_added_points, f)
+                self.point_hedge[origin_i + len_added_points] = half_edge  # this should be overrode several times
+                loop.append(half_edge)
+                half_edges_list[(origin_i, next_i)] = half_edge
+            for i in range(len(face)):
+                last[loop[i]] = loop[(i - 1) % len(face)]
+                next_[loop[i]] = loop[(i + 1) % len(face)]
+            self.outer[f] = loop[0]
+            self.faces.append(f)
+        self.hedges.extend(half_edges_list.values())
+
+        # to twin hedges and create hedges of unbounded face
+        outer_half_edges = dict()
+        for key, half_edge in half_edges_list.items():
+            if key[::-1] in half_edges_list:
+                twin[half_edge] = half_edges_list[key[::-1]]
+                twin[half_edges_list[key[::-1]]] = half_edge
+            else:
+                outer_edge = self.add_hedge(key[1] + len_added_points)
+                face_col[outer_edge] = UNBOUNDED
+                twin[half_edge] = outer_edge
+                twin[outer_edge] = half_edge
+                if key[::-1] in outer_half_edges:
+                    raise Exception("It looks like input mesh has adjacent faces with only one common point"
+                                    "Handle such meshes does not implemented yet.")
+                outer_half_edges[key[::-1]] = outer_edge
+        self.hedges.extend(outer_half_edges.values())
+
+        # link hedges of unbounded face in loops
+        for outer_edge in outer_half_edges.values():
+            next_edge = twin[outer_edge]
+            count = 0
+            while True:
+                next_edge = twin[last[next_edge]]
+                if self.outer[face_col[next_edge]] == -1:
+                    break
+                count += 1
+                if count > len(half_edges_list):
+                    raise RecursionError("The hedge ({}) cant find next neighbour".format(outer_edge))
+            next_[outer_edge] = next_edge
+            last[next_edge] = outer_edge
+
+        # link unbounded face to loops of edges of unbounded face
+        used = set()
+        for outer_hedge in outer_half_edges.values():
+            if outer_hedge in used:
+                continue
+            self.inners[UNBOUNDED].append(outer_hedge)
+            used.update(self.loop_hedges(outer_hedge))
+
+    def from_sv_edges(self, verts, edges):
+        # Interesting that this method makes next attribute of end of an edge linked to a twin
+        edges = [edge for edge in edges if
+                 not all([almost_equal(co1, co2, self.accuracy) for co1, co2 in zip(verts[edge[0]], verts[edge[1]])])]
+        twin, next_, last = self.twin, self.next, self.last
+        len_added_points = len(self.co)
+        self.points.extend([self.add_point(co) for co in verts])
+        coincidence_hedges = [[] for _ in range(len(verts))]  # hedges coincident to points
+
+        # Generate hedges
+        for edge in edges:
+            hedge1 = self.add_hedge(edge[0] + len_added_points)
+            hedge2 = self.add_hedge(edge[1] + len_added_points)
+            self.point_hedge[edge[0] + len_added_points] = hedge1  # this should be overrode several times
+            self.point_hedge[edge[1] + len_added_points] = hedge2
+            twin[hedge1] = hedge2
+            twin[hedge2] = hedge1
+            coincidence_hedges[edge[0]].append(hedge1)
+            coincidence_hedges[edge[1]].append(hedge2)
+            self.hedges.extend([hedge1, hedge2])
+
+        # Link hedges around all points
+        for hedges in coincidence_hedges:
+            hedges.sort(key=self.slop)
+            for i in range(len(hedges)):
+                i_next = (i + 1) % len(hedges)
+                last[hedges[i]] = twin[hedges[i_next]]
+                next_[twin[hedges[i_next]]] = hedges[i]
+
+    def generate_faces_from_hedges(self):
+        # Generate face list from half edge list
+        # Tail edges will be dissolving
+        # Left component of hedges is taken in account
+        # The algorithm is the same to DCELMesh.generate_faces_from_hedges method of dcel module,
+        # read comments there
+        co, origin, face_col, twin, next_, last, left, tails = (self.co, self.origin, self.face, self.twin,
+                                                               self.next, self.last, self.left, self.tails)
+
+        # will detect tails first, every loop is walked once
+        used = set()
+        rebuild = False  # if there are tails some points and half edges can be loosed
+        for hedge in self.hedges:
+            if hedge in used:
+                continue
+            used_in_loop = set()
+            for loop_hedge in self.loop_hedges(hedge):
+                used.add(loop_hedge)
+                if twin[loop_hedge] not in used_in_loop:
+                    used_in_loop.add(loop_hedge)
+                else:
+                    # this is tail, useless, for del method but not only
+                    tails[loop_hedge] = 1
+                    tails[twin[loop_hedge]] = 1
+                    rebuild = True
+
+        faces = array('i')
+        min_hedges = set()  # all detected leftmost half edges of evry loop, not tails
+        inner_hedges = []  # multiple loops can be produced be desolving tails algorithm
+        used.clear()
+        for hedge in self.hedges:
+            if hedge in used:
+                continue
+            if tails[hedge]:
+                # avoid start form tails
+                continue
+
+            # Start handling a loop, links can be changed only when sub loop is left
+            loop_hedges = []
+            loop_hedge = hedge
+            counter = 0
+            while True:
+                loop_hedges.append(loop_hedge)
+                if tails[loop_hedge] and not tails[last[loop_hedge]]:
+                    # this case about when previous step was from sub loop to tail
+                    last_hedge = last[loop_hedge]  # origin of next hedge is in place where tail connects with a face
+                    for cw_hedge in self.cw_hedges(loop_hedge):
+                        # Try to find last normal half edge for next normal half edge
+                        if cw_hedge != loop_hedge and not tails[cw_hedge]:
+                            # check either there are other tails in the point
+                            next_hedge = cw_hedge
+                            break
+                    last[next_hedge] = last_hedge
+                    next_[last_hedge] = next_hedge
+                loop_hedge = next_[loop_hedge]
+                if loop_hedge == hedge:
+                    break
+                counter += 1
+                if counter > len(self.hedges):
+                    raise RecursionError('Hedge - {} does not have a loop'.format(hedge))
+
+            # detect new sub loops, figure out weather loop is ccw or cw
+            new_outer = -1
+            new_inners = []
+            for loop_hedge in loop_hedges:
+                if tails[loop_hedge]:
+                    used.add(loop_hedge)
+                    # just ignore tail
+                    continue
+                elif loop_hedge in used:
+                    # avoid reconsidering sub loop
+                    continue
+                else:
+                    # the start edge for sub loop is found
+                    sub_loop = list(self.loop_hedges(loop_hedge))
+                    used.update(sub_loop)
+                    min_hedge = min(sub_loop, key=lambda he: (co[origin[he]][x], co[origin[he]][y]))
+                    min_hedges.add(min_hedge)  # avoiding extra calculation later
+                    _is_ccw = is_ccw_polygon(most_lefts=[co[origin[last[min_hedge]]], co[origin[min_hedge]],
+                                                         co[origin[next_[min_hedge]]]], accuracy=self.accuracy)
+                    if not _is_ccw:
+                        new_inners.append(min_hedge)
+                    elif _is_ccw and new_outer != -1:
+                        raise ValueError("During dissolving edges algorithm only one ccw face can be created")
+                    else:
+                        new_outer = loop_hedge
+            # handle case when after dissolving tails there are at list one outer face
+            if new_outer != -1:
+                face = self.add_face()
+                self.outer[face] = new_outer
+                faces.append(face)
+                for h in self.loop_hedges(new_outer):
+                    face_col[h] = face
+                for start_hedge in new_inners:
+                    self.inners[face].append(start_hedge)
+                    for h in self.loop_hedges(start_hedge):
+                        face_col[h] = face
+
+            # case when only inners loops was found
+            elif new_inners:
+                belong_to_boundless = any([left[start_hedge] == -1 for start_hedge in new_inners])
+                if belong_to_boundless:
+                    for start_hedge in new_inners:
+                        self.inners[UNBOUNDED].append(start_hedge)
+                        for loop_hedge in self.loop_hedges(start_hedge):
+                            face_col[loop_hedge] = UNBOUNDED
+                else:
+                    # it impossible to say to which face the inner loops belong at this stage
+                    inner_hedges.append(new_inners)
+
+        used.clear()  # only for start half edges which are leftmost half edges
+        # This part about holes detection
+        for start_hedges in inner_hedges:
+
+            # check first probably some of the loops already was assigned to a face
+            assigned_face = -1
+            for start_hedge in start_hedges:
+                if face_col[start_hedge] != -1 and self.outer[face_col[start_hedge]] != -1:
+                    assigned_face = face_col[start_hedge]  # this can be weather boundless face or outer face
+                    break  # this means that hedge loops can belongs only one face
+            if assigned_face != -1:
+                for start_hedge in start_hedges:
+                    if start_hedge not in used:
+                        used.add(start_hedge)
+                        self.inners[assigned_face].append(start_hedge)
+                        for hedge in self.loop_hedges(start_hedge):
+                            face_col[hedge] = assigned_face
+
+            # initialisation of walk to leftward direction
+            left_hedges = [start_hedges[0]]  # list of start hedges of evry inner loop detected
+            count = 0
+            while (left[left_hedges[-1]] == -1 or face_col[left[left_hedges[-1]]] == -1
+                   or self.outer[face_col[left[left_hedges[-1]]]] == -1):
+                # At first check can be next jump done
+                if left[left_hedges[-1]] == -1:
+                    break
+
+                # First of all try to find next loop
+                start_loop = -1
+                # It is necessary to know what is coming next, whether it tail half edge or normal half edge
+                if tails[left[left_hedges[-1]]]:
+                    jump = True  # True if boundary face or next hole in ccw hedges was not found
+                    for ccw_hedge in self.ccw_hedges(left[left_hedges[-1]]):
+                        ccw_face = face_col[ccw_hedge]
+                        if ccw_face != -1 and self.outer[ccw_face] != -1:
+                            # the boundary face is found and should be linked to last left half edge
+                            left[left_hedges[-1]] = ccw_hedge
+                            break
+                        elif ccw_face != -1 and self.inners[ccw_face]:
+                            # new next hole is found
+                            start_loop = ccw_hedge
+                            jump = False
+                            break
+                        elif face_col[twin[ccw_hedge]] != -1:
+                            # this also mean that next hole is found
+                            start_loop = ccw_hedge
+                            jump = False
+                            break
+                    if jump:
+                        left_hedges.append(left[left_hedges[-1]])
+                else:
+                    # we are in a normal loop
+                    start_loop = left[left_hedges[-1]]
+                if start_loop != -1:
+                    # will find leftmost half edge
+                    for hedge in self.loop_hedges(start_loop):
+                        if hedge in min_hedges:
+                            left_hedges.append(hedge)
+                            break
+                count += 1
+                if count > len(self.hedges):
+                    raise RecursionError('Hedge of hole cant find outer face')
+
+            # set boundary face
+            if left[left_hedges[-1]] == -1:
+                face = UNBOUNDED
+            else:
+                face = face_col[left[left_hedges[-1]]]
+            # make links between boundary face and inner loops
+            for start_hedge in left_hedges:
+                if tails[start_hedge]:
+                    continue
+                if start_hedge in used:
+                    continue
+                self.inners[face].append(start_hedge)
+                used.add(start_hedge)
+                for hedge in self.loop_hedges(start_hedge):
+                    face_col[hedge] = face
+            # all sub loops also can be assigned to founded face
+            for start_hedge in start_hedges:
+                if start_hedge in used:
+                    continue
+                self.inners[face].append(start_hedge)
+                used.add(start_hedge)
+                for hedge in self.loop_hedges(start_hedge):
+                    face_col[hedge] = face
+
+        self.faces = faces
+
+        if rebuild:
+            self.del_loose_hedges()
+
+    def del_loose_hedges(self):
+        # tails are deleted, points which are not used any more also
+        tails = self.tails
+        self.hedges = array('i', [hedge for hedge in self.hedges if not tails[hedge]])
+        used = set()
+        points = array('i')
+        for hedge in self.hedges:
+            point = self.origin[hedge]
+            if point not in used:
+                used.add(point)
+                points.append(point)
+                self.point_hedge[point] = hedge  # point can have link to not existing half edge
+        self.points = points
+
+    def to_sv_mesh(self, del_face_flag=None):
+        # returns vertices and faces in Sverchok format
+        # if all hedges around points have faces with del flag the point won't be added to the output list
+        origin, face_col, outer, face_flags = self.origin, self.face, self.outer, self.face_flags
+        used = set()
+        point_index = dict()
+        sv_verts = []
+        for hedge in self.hedges:
+            if hedge in used:
+                continue
+            point_usage = not del_face_flag
+            for h in self.ccw_hedges(hedge):
+                used.add(h)
+                if del_face_flag and outer[face_col[h]] != -1 and del_face_flag not in face_flags[face_col[h]]:
+                    point_usage = True
+            if point_usage:
+                point_index[origin[hedge]] = len(sv_verts)
+                sv_verts.append(self.co[origin[hedge]])
+
+        sv_faces = []
+        for face in self.faces:
+            if outer[face] == -1 or del_face_flag in face_flags[face]:
+                continue
+            sv_faces.append([point_index[origin[hedge]] for hedge in self.loop_hedges(outer[face])])
+        return sv_verts, sv_faces
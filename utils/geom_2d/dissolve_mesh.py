@@ -46,6 +46,7 @@ def dissolve_faces(sv_verts, sv_faces, face_mask, is_mask=False, is_index=False)
 
 
 class HalfEdge(HalfEdge_template):
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
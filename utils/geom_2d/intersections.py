@@ -45,6 +45,8 @@ class Point(Point_template, SortPointsUpDown):
 
 
 class HalfEdge(HalfEdge_template):
+    __slots__ = ()
+
     def __init__(self,  mesh, point, face=None):
         super().__init__(mesh, point, face)
 
@@ -64,6 +66,7 @@ class DCELMesh(DCELMesh_template):
 
 class Edge(SortEdgeSweepingAlgorithm):
     # Special class for storing in status data structure
+    __slots__ = ('low_hedge', 'up_hedge', 'coincidence')
 
     def __init__(self, up_p, low_p):
         super().__init__(up_p, low_p)
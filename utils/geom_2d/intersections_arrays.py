@@ -0,0 +1,384 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+
+from array import array
+
+from .dcel_arrays import EventPoint
+from .lin_alg import almost_equal, is_edges_intersect, intersect_edges
+from .sort_mesh import SortEdgeSweepingAlgorithm
+from .intersections import get_coincidence_edges
+from sverchok.utils.avl_tree import AVLTree
+
+
+"""
+Finding intersections algorithm of the intersections module for DCELArrays data structure.
+All steps are the same, read comments in the intersections module.
+"""
+
+
+x, y, z = 0, 1, 2
+
+
+class Edge(SortEdgeSweepingAlgorithm):
+    # Special class for storing in status data structure, up and low points are EventPoint objects
+    __slots__ = ('low_hedge', 'up_hedge', 'coincidence')
+    mesh = None  # DCELArrays which is handled by the algorithm
+
+    def __init__(self, up_p, low_p):
+        super().__init__(up_p, low_p)
+
+        self.low_hedge = -1  # half edge which origin is lower then origin of twin
+        self.up_hedge = -1  # half edge which origin is upper then origin of twin
+        self.coincidence = []  # just a list of overlapping edges
+
+    @property
+    def is_c(self):
+        # returns True if current event point is intersection point of current edge
+        return self.low_p != self.event_point
+
+    @property
+    def low_dot_length(self):
+        # returns length of edge from event point to low point of the edge
+        return sum([(co1 - co2) ** 2 for co1, co2 in zip(self.low_p.co, self.event_point.co)]) ** 0.5
+
+    @property
+    def inner_hedge(self):
+        # returns half edge with origin in event point
+        return self.low_hedge if self.is_origin_event(self.low_hedge) else self.up_hedge
+
+    @property
+    def outer_hedge(self):
+        # returns half edge pointing to event point
+        return self.low_hedge if not self.is_origin_event(self.low_hedge) else self.up_hedge
+
+    def is_origin_event(self, hedge):
+        # the same to Point.__eq__, accuracy of origin of the half edge is used
+        point = self.mesh.origin[hedge]
+        co, event_co, accuracy = self.mesh.co[point], self.event_point.co, self.mesh.point_accuracy[point]
+        return almost_equal(co[x], event_co[x], accuracy) and almost_equal(co[y], event_co[y], accuracy)
+
+
+def find_intersections(dcel_mesh, accuracy=1e-6, face_overlapping=False):
+    """
+    Initializing of searching intersection algorithm, read Computational Geometry by Mark de Berg
+    Only half edges have correct data after the algorithm.
+    Use build faces from half edges method for updating faces if necessary.
+    :param dcel_mesh: DCELArrays data structure
+    :param accuracy: two floats figures are equal if their difference is lower then accuracy value, float
+    :param face_overlapping: if True detect in which faces new face is inside
+    """
+    status = AVLTree()
+    event_queue = AVLTree()
+    accuracy = accuracy if isinstance(accuracy, float) else 1 / 10 ** accuracy
+    Edge.set_accuracy(accuracy)
+    Edge.mesh = dcel_mesh
+    try:
+        init_event_queue(event_queue, dcel_mesh)
+        while event_queue:
+            event_node = event_queue.find_smallest()
+            handle_event_point(status, event_queue, event_node.key, dcel_mesh, accuracy, face_overlapping)
+            event_queue.remove_node(event_node)
+    finally:
+        Edge.mesh = None
+        Edge.global_event_point = None
+    edges = dcel_mesh.edge
+    dcel_mesh.hedges = array('i', [hedge for hedge in dcel_mesh.hedges if edges[hedge]])
+
+
+def init_event_queue(event_queue, dcel_mesh):
+    # preparation to finding intersection algorithm
+    Edge.global_event_point = None
+    points = dict()  # event points of mesh points
+    used = set()
+    for hedge in dcel_mesh.hedges:
+        twin = dcel_mesh.twin[hedge]
+        if twin in used:
+            continue
+        for point in (dcel_mesh.origin[hedge], dcel_mesh.origin[twin]):
+            if point not in points:
+                points[point] = EventPoint.from_mesh(dcel_mesh, point)
+        origin, twin_origin = points[dcel_mesh.origin[hedge]], points[dcel_mesh.origin[twin]]
+        up_h, low_h = (hedge, twin) if origin < twin_origin else (twin, hedge)
+        up_p, low_p = (origin, twin_origin) if up_h == hedge else (twin_origin, origin)
+        edge = Edge(up_p, low_p)
+        edge.up_hedge, edge.low_hedge = up_h, low_h
+        dcel_mesh.edge[hedge] = dcel_mesh.edge[twin] = edge
+        # The trick here is that AVL tree does not create new node if node with such value already exist
+        # It just returns existing node without any warnings
+        up_node = event_queue.insert(up_p)
+        up_node.key.up_edges.append(edge)
+        event_queue.insert(low_p)
+        used.add(hedge)
+
+
+def handle_event_point(status, event_queue, event_point, dcel_mesh, accuracy=1e-6, face_overlapping=False):
+    # Read Computational Geometry by Mark de Berg
+    Edge.global_event_point = event_point
+    left_l_candidate, coincidence, right_l_candidate = get_coincidence_edges(status, event_point.co[x], accuracy)
+    c = [node for node in coincidence if node.key.is_c]
+    l = [node for node in coincidence if not node.key.is_c]
+    [status.remove_node(node) for node in c]
+    [status.remove_node(node) for node in l]
+
+    lc, uc_edges, is_lapp_1 = split_crossed_edge(coincidence, event_point, dcel_mesh, face_overlapping)
+    up_overlapping, is_lapp_2 = extract_overlapping_edges(coincidence, event_point, dcel_mesh, face_overlapping)
+    u, is_lapp_3 = insert_edges_in_status(status, event_point, uc_edges, up_overlapping, dcel_mesh,
+                                          face_overlapping)
+    is_overlapping = any([is_lapp_1, is_lapp_2, is_lapp_3])
+
+    left_u_candidate, uc, right_u_candidate = get_coincidence_edges(status, event_point.co[x], accuracy)
+    left_neighbor = left_l_candidate if left_l_candidate else left_u_candidate
+    right_neighbor = right_l_candidate if right_l_candidate else right_u_candidate
+
+    relink_half_edges(uc, lc, c, left_neighbor, is_overlapping, dcel_mesh, face_overlapping)
+
+    if not uc:
+        if left_neighbor and right_neighbor:
+            find_new_event(left_neighbor, right_neighbor, event_queue, event_point, dcel_mesh, accuracy)
+    else:
+        leftmost_node = uc[0]
+        rightmost_node = uc[-1]
+        if left_neighbor:
+            find_new_event(leftmost_node.key, left_neighbor, event_queue, event_point, dcel_mesh, accuracy)
+        if right_neighbor:
+            find_new_event(rightmost_node.key, right_neighbor, event_queue, event_point, dcel_mesh, accuracy)
+
+
+def split_crossed_edge(coincidence_nodes, event_point, dcel_mesh, face_overlapping):
+    """
+    Edges which go through event point are splitting in to edges upper and lower of event point
+    Also coincidence of ends of edges are detected
+    :param coincidence_nodes: list of nodes which intersects with event point, [Node1, ..., Node_n]
+    :param event_point: event point of intersection algorithm, EventPoint
+    :param dcel_mesh: for new half edges recording, DCELArrays
+    :param face_overlapping: if True detect in which faces new face is inside
+    :return: list of nodes with edges above event point, list of edges below event point, flag of overlapping detection
+    """
+    mesh = dcel_mesh
+    lc = []  # is ordered in cw direction low edges
+    uc_edges = []
+    is_overlapping = False
+    for node in coincidence_nodes:
+        edge = node.key
+        if edge.is_c:
+            # split edge on low und up sides
+            low_edge = Edge(edge.up_p, event_point)  # above event point
+            up_edge = Edge(event_point, edge.low_p)  # below event point
+            # Add information about overlapping edges
+            up_edge.coincidence = list(edge.coincidence)
+            # assign to new edges existing half edges of initial edge
+            low_edge.up_hedge = edge.up_hedge
+            up_edge.low_hedge = edge.low_hedge
+            mesh.edge[low_edge.up_hedge] = low_edge  # new "user" of half edge should be replace
+            mesh.edge[up_edge.low_hedge] = up_edge  # the same
+            # copy pare of half edges from existing half edges and create appropriate links
+            low_edge.low_hedge = mesh.add_hedge(event_point.index, mesh.face[edge.low_hedge])
+            mesh.hedges.append(low_edge.low_hedge)
+            mesh.next[low_edge.low_hedge] = mesh.next[edge.low_hedge]
+            mesh.last[mesh.next[edge.low_hedge]] = low_edge.low_hedge
+            up_edge.up_hedge = mesh.add_hedge(event_point.index, mesh.face[edge.up_hedge])
+            mesh.hedges.append(up_edge.up_hedge)
+            mesh.next[up_edge.up_hedge] = mesh.next[edge.up_hedge]
+            mesh.last[mesh.next[edge.up_hedge]] = up_edge.up_hedge
+            if mesh.point_hedge[event_point.index] == -1:
+                # assign half edges for new points which was created by edges intersection
+                mesh.point_hedge[event_point.index] = up_edge.up_hedge
+            if face_overlapping:
+                # add information about belonging to other faces only for new half edge of low edge
+                # and delete outdate information about belonging for low half edge of up edge
+                mesh.in_faces[low_edge.low_hedge] = mesh.in_faces[edge.low_hedge]
+                mesh.in_faces[up_edge.low_hedge] = mesh.lap_faces[up_edge.low_hedge]
+                mesh.in_faces[up_edge.up_hedge] = mesh.lap_faces[low_edge.up_hedge]
+                mesh.lap_faces[up_edge.up_hedge] = mesh.lap_faces[low_edge.up_hedge]
+            mesh.left[up_edge.low_hedge] = -1  # for hole detection
+            mesh.edge[low_edge.low_hedge] = low_edge  # "user" of half edge should be set
+            mesh.edge[up_edge.up_hedge] = up_edge  # the same
+            # link half edges to each other
+            mesh.twin[low_edge.up_hedge] = low_edge.low_hedge
+            mesh.twin[low_edge.low_hedge] = low_edge.up_hedge
+            mesh.twin[up_edge.up_hedge] = up_edge.low_hedge
+            mesh.twin[up_edge.low_hedge] = up_edge.up_hedge
+            node.key = low_edge
+            uc_edges.append(up_edge)
+        else:
+            # check overlapping points
+            if edge.low_p is not event_point:
+                edge.low_p = event_point
+                mesh.origin[edge.low_hedge] = event_point.index
+                is_overlapping = True
+        lc.append(node)
+    return lc, uc_edges, is_overlapping
+
+
+def extract_overlapping_edges(coincidence_nodes, event_point, dcel_mesh, face_overlapping):
+    """
+    As sooner low edges keeps overlapping edges inside itself
+    the overlapping edges should be extract before handling up edges
+    :param coincidence_nodes: list of nodes which intersects with event point, [Node1, ..., Node_n]
+    :param event_point: event point of intersection algorithm, EventPoint
+    :param dcel_mesh: DCELArrays
+    :param face_overlapping: if True detect in which faces new face is inside
+    :return: list of extracted edges below event point, flag of overlapping detection
+    """
+    mesh = dcel_mesh
+    up_overlapping = []
+    is_overlapping = False
+    for node in coincidence_nodes:
+        if not node.key.is_c and node.key.coincidence:
+            is_overlapping = True  # just enabled relinking half edges of edges around event point
+            while node.key.coincidence:
+                # only shortest edge (between event point and low end of an edge) should be extracted
+                i_min_edge = min([(edge.low_dot_length, i) for i, edge in enumerate(node.key.coincidence)])[1]
+                min_edge = node.key.coincidence.pop(i_min_edge)
+                if min_edge.low_p == event_point:
+                    # the end point of the overlapping edge coincident with end point of main edge
+                    # half edges of such overlapping edges should be deleted
+                    mesh.edge[min_edge.up_hedge] = None
+                    mesh.edge[min_edge.low_hedge] = None
+                    if face_overlapping:
+                        mesh.lap_faces[node.key.low_hedge] -= {mesh.face[min_edge.low_hedge]}
+                        mesh.lap_faces[node.key.up_hedge] -= {mesh.face[min_edge.up_hedge]}
+                else:
+                    # All part of nested edge upper event point should be removed
+                    up_edge = Edge(event_point, min_edge.low_p)
+                    up_edge.low_hedge = min_edge.low_hedge
+                    up_edge.up_hedge = min_edge.up_hedge
+                    mesh.origin[up_edge.up_hedge] = event_point.index
+                    mesh.edge[up_edge.up_hedge] = up_edge
+                    mesh.edge[up_edge.low_hedge] = up_edge
+                    if face_overlapping:
+                        # faces of half edges of low edge should be remove from in_faces
+                        mesh.lap_faces[up_edge.low_hedge] = (mesh.lap_faces[node.key.low_hedge] -
+                                                             {mesh.face[node.key.low_hedge]})
+                        mesh.lap_faces[up_edge.up_hedge] = (mesh.lap_faces[node.key.up_hedge] -
+                                                            {mesh.face[node.key.up_hedge]})
+                        mesh.in_faces[up_edge.low_hedge] = mesh.lap_faces[up_edge.low_hedge]
+                        mesh.in_faces[up_edge.up_hedge] = mesh.lap_faces[up_edge.up_hedge]
+                    up_edge.coincidence = list(node.key.coincidence)
+                    up_overlapping.append(up_edge)
+                    break
+    return up_overlapping, is_overlapping
+
+
+def insert_edges_in_status(status, event_point, uc_edges, up_overlapping, dcel_mesh, face_overlapping):
+    """
+    Here the edges below of the event point are inserted in status tree
+    Also it detects overlapping of points in case if two edges has two different start points
+    Also it store overlapping edges to each other
+    :param status: list of edges intersection sweep line, AVLTree
+    :param event_point: event point of intersection algorithm, EventPoint
+    :param uc_edges: list of edges below event point which was created by splitting by sweeping line edges
+    :param up_overlapping: list of extracted edges from overlapping list of edges above event point
+    :param dcel_mesh: DCELArrays
+    :param face_overlapping: if True detect in which faces new face is inside
+    :return: list of nodes with edges below an event point, flag of overlapping detection
+    """
+    mesh = dcel_mesh
+    u = []
+    is_overlapping = False
+    for edge in event_point.up_edges + uc_edges + up_overlapping:
+        if edge.up_p is not event_point:
+            # check overlapping points
+            edge.up_p = event_point
+            mesh.origin[edge.up_hedge] = event_point.index
+            is_overlapping = True
+        node = status.insert(edge)
+        # actually it does not insert new edge if status already has edge with the same slap
+        # and returns node with edge which was already insert before
+        if edge is not node.key:
+            # Store overlapping edges
+            if edge.low_dot_length < node.key.low_dot_length:
+                # edge with shortest distance between event point and its end
+                # include other overlapping edges inside itself
+                edge.coincidence.extend(node.key.coincidence)
+                node.key.coincidence.clear()
+                edge.coincidence.append(node.key)
+                node.key, edge = edge, node.key
+            else:
+                node.key.coincidence.extend(edge.coincidence)
+                node.key.coincidence.append(edge)
+            if face_overlapping:
+                # Only current edge can keep actual information about in_faces status
+                mesh.in_faces[node.key.low_hedge] |= mesh.in_faces[edge.low_hedge]
+                mesh.in_faces[node.key.up_hedge] |= mesh.in_faces[edge.up_hedge]
+                mesh.lap_faces[node.key.low_hedge] |= mesh.lap_faces[edge.low_hedge]
+                mesh.lap_faces[node.key.up_hedge] |= mesh.lap_faces[edge.up_hedge]
+        else:
+            # store only unique nodes with upper edges
+            u.append(node)
+    return u, is_overlapping
+
+
+def relink_half_edges(uc, lc, c, left_neighbor, is_overlapping, dcel_mesh, face_overlapping):
+    """
+    Here new connections between intersected edges are creating
+    Also half edges are marked in which faces they located if need
+    :param uc: list of node with edges below event point ordered from left ro right along X coordinate
+    :param lc: list of nodes with edges above event point which was born by splitting edges intersecting sweep line
+    :param c: list of nodes with edges intersection sweep line, just for knowing if such exist for current event point
+    :param left_neighbor: nearest left edge to event point which intersects sweep line
+    :param is_overlapping: flag of overlapping detection
+    :param dcel_mesh: DCELArrays
+    :param face_overlapping: if True detect in which faces new face is inside
+    :return: None
+    """
+    mesh = dcel_mesh
+    rotation_nodes = uc + lc[::-1]
+    if left_neighbor:
+        for node in rotation_nodes:
+            # for hole detection
+            mesh.left[node.key.inner_hedge] = left_neighbor.up_hedge
+    if c or is_overlapping:
+        for i in range(len(rotation_nodes)):
+            edge = rotation_nodes[i].key
+            next_i = (i + 1) % len(rotation_nodes)
+            last_i = (i - 1) % len(rotation_nodes)
+            mesh.next[edge.outer_hedge] = rotation_nodes[last_i].key.inner_hedge
+            mesh.last[edge.inner_hedge] = rotation_nodes[next_i].key.outer_hedge
+
+        if face_overlapping:
+            sub_status = set(mesh.in_faces[rotation_nodes[-1].key.inner_hedge])
+            for node in rotation_nodes:
+                edge = node.key
+                sub_status -= mesh.in_faces[edge.outer_hedge]
+                mesh.in_faces[edge.outer_hedge] |= sub_status
+                sub_status |= mesh.in_faces[edge.inner_hedge]
+                mesh.in_faces[edge.inner_hedge] |= sub_status
+
+    else:
+        if face_overlapping:
+            sub_status = set(mesh.in_faces[left_neighbor.up_hedge]) if left_neighbor else set()
+            for node in uc:
+                edge = node.key
+                sub_status -= mesh.in_faces[edge.outer_hedge]
+                mesh.in_faces[edge.outer_hedge] |= sub_status
+                sub_status |= mesh.in_faces[edge.inner_hedge]
+                mesh.in_faces[edge.inner_hedge] |= sub_status
+
+
+def find_new_event(edge1, edge2, event_queue, event_point, dcel_mesh, accuracy=1e-6):
+    """
+    Tet if there is an intersections and if there is add new event point to event queue
+    :param edge1: Edge data structure
+    :param edge2: Edge data structure
+    :param event_queue: AVLTree
+    :param event_point: event point of intersection algorithm, EventPoint
+    :param dcel_mesh: for new points recording, DCELArrays
+    :param accuracy: two floats figures are equal if their difference is lower then accuracy value, float
+    :return: None
+    """
+    if is_edges_intersect(edge1.up_p.co, edge1.low_p.co, edge2.up_p.co, edge2.low_p.co):
+        intersection = intersect_edges(edge1.up_p.co, edge1.low_p.co, edge2.up_p.co, edge2.low_p.co, to_project=True,
+                                       accuracy=accuracy)
+        if intersection:  # strange checking
+            new_event_point = EventPoint(intersection, accuracy)
+            if new_event_point > event_point:
+                node = event_queue.insert(new_event_point)
+                if node.key is new_event_point:
+                    # the point is recorded in the mesh only if it is new one
+                    new_event_point.index = dcel_mesh.add_point(intersection, accuracy)
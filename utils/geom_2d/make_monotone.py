@@ -109,6 +109,7 @@ class Point(Point_template, SortPointsUpDown):
 
 
 class HalfEdge(HalfEdge_template, SortHalfEdgesCCW):
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -122,6 +123,7 @@ class DCELMesh(DCELMesh_template):
 
 
 class Edge(SortEdgeSweepingAlgorithm):
+    __slots__ = ('helper',)
 
     def __init__(self, up_p, low_p):
         super().__init__(up_p, low_p)
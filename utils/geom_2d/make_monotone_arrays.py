@@ -0,0 +1,288 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+from array import array
+
+from sverchok.utils.avl_tree import AVLTree
+from .dcel_arrays import EventPoint, UNBOUNDED
+from .lin_alg import almost_equal
+from .sort_mesh import SortEdgeSweepingAlgorithm
+
+
+"""
+Partitioning to monotone pieces algorithm of the make_monotone module for DCELArrays data structure.
+All steps are the same, read comments in the make_monotone module.
+"""
+
+
+x, y, z = 0, 1, 2
+
+
+def monotone_faces_with_holes(dcel_mesh, del_flag='del'):
+    """
+    Split polygons with holes into monotone pieces of DCELArrays data structure
+    Faces already should have actual information about inner component
+    :param dcel_mesh: DCELArrays
+    :param del_flag: faces with such flag just are just ignore by the algorithm
+    :return: DCELArrays with split faces
+    """
+    is_inners = False
+    for face in dcel_mesh.faces:
+        if del_flag in dcel_mesh.face_flags[face]:
+            continue
+        elif dcel_mesh.outer[face] != -1 and dcel_mesh.inners[face]:
+            is_inners = True
+            MonotonePartition(dcel_mesh, face).run()
+    if is_inners:
+        rebuild_face_list(dcel_mesh)
+    return dcel_mesh
+
+
+def rebuild_face_list(dcel_mesh):
+    # rebuild face list after partition algorithm
+    face_col = dcel_mesh.face
+    for hedge in dcel_mesh.hedges:
+        if face_col[hedge] != -1:
+            continue
+        face = dcel_mesh.add_face()
+        dcel_mesh.select[face] = True
+        dcel_mesh.outer[face] = hedge
+        for h in dcel_mesh.loop_hedges(hedge):
+            face_col[h] = face
+    used = set()
+    faces = array('i')
+    for hedge in dcel_mesh.hedges:
+        if face_col[hedge] == UNBOUNDED:
+            continue
+        if hedge not in used:
+            faces.append(face_col[hedge])
+            used.update(dcel_mesh.loop_hedges(hedge))
+    dcel_mesh.faces = faces
+
+
+class Edge(SortEdgeSweepingAlgorithm):
+    __slots__ = ('helper',)
+
+    def __init__(self, up_p, low_p):
+        super().__init__(up_p, low_p)
+
+        self.helper = None
+
+
+class MonotonePartition:
+    """
+    Splits polygon of DCELArrays into monotone pieces optionally with holes
+    Read Computational Geometry by Mark de Berg
+    """
+    def __init__(self, mesh, face):
+        self.mesh = mesh
+        self.face = face
+        self.status = AVLTree()
+        self.points = dict()  # event points of the polygon
+        self.types = dict()  # the type is set once before the algorithm for all points
+
+    def run(self):
+        mesh = self.mesh
+        points = []
+        for start_hedge in [mesh.outer[self.face]] + mesh.inners[self.face]:
+            for hedge in mesh.loop_hedges(start_hedge):
+                points.append(self.get_point(mesh.origin[hedge]))
+        q = sorted(points)[::-1]
+        for point in q:
+            if point.index not in self.types:
+                self.types[point.index] = self.get_type(point)
+        handle_functions = {'start': self.handle_start_point, 'end': self.handle_end_point,
+                            'split': self.handle_split_point, 'merge': self.handle_merge_point,
+                            'regular': self.handle_regular_point}
+        try:
+            while q:
+                event_point = q.pop()
+                Edge.global_event_point = event_point
+                handle_functions[self.types[event_point.index]](event_point, self.find_hedge(event_point))
+        finally:
+            Edge.global_event_point = None
+
+    def get_point(self, index):
+        # returns event point of the polygon
+        point = self.points.get(index)
+        if point is None:
+            point = self.points[index] = EventPoint.from_mesh(self.mesh, index)
+        return point
+
+    def get_type(self, point):
+        # the type should be updated each time when polygon is changed in partitioning algorithm
+        # during handle of polygon point does not change type
+        mesh = self.mesh
+        hedge = -1  # is hedge wit origin in the point and belonging to current monotone face
+        for coin_hedge in mesh.ccw_hedges(mesh.point_hedge[point.index]):
+            if mesh.face[coin_hedge] == self.face:
+                hedge = coin_hedge
+                break
+        if hedge == -1:
+            raise LookupError("This mean that either monotone face is marked incorrect or "
+                              "coincidence half edges are marked incorrect or something else")
+        next_point = self.get_point(mesh.origin[mesh.next[hedge]])
+        last_point = self.get_point(mesh.origin[mesh.last[hedge]])
+        is_up_next = next_point < point  # the less point the upper it is
+        is_up_last = last_point < point
+        if not is_up_next and not is_up_last:
+            return 'start' if self.is_hedge_less(hedge, mesh.twin[mesh.last[hedge]]) else 'split'
+        elif is_up_last and is_up_next:
+            return 'merge' if self.is_hedge_more(hedge, mesh.twin[mesh.last[hedge]]) else 'end'
+        else:
+            return 'regular'
+
+    def is_hedge_less(self, hedge1, hedge2):
+        # half edges are sorting in counterclockwise direction from -X direction, read SortHalfEdgesCCW
+        slop1, slop2 = self.mesh.slop(hedge1), self.mesh.slop(hedge2)
+        if almost_equal(slop1, slop2, self.mesh.accuracy):
+            return False
+        else:
+            return slop1 < slop2
+
+    def is_hedge_more(self, hedge1, hedge2):
+        slop1, slop2 = self.mesh.slop(hedge1), self.mesh.slop(hedge2)
+        if almost_equal(slop1, slop2, self.mesh.accuracy):
+            return False
+        else:
+            return slop1 > slop2
+
+    def find_hedge(self, point):
+        # find hedge with origin in current point and with partitioning face
+        for hedge in self.mesh.ccw_hedges(self.mesh.point_hedge[point.index]):
+            if self.mesh.face[hedge] == self.face:
+                break
+        return hedge
+
+    def insert_edge(self, up_p, low_p):
+        # insert new edge into half edge data structure
+        mesh = self.mesh
+        less, more = self.is_hedge_less, self.is_hedge_more
+        up_hedge = mesh.add_hedge(up_p.index)
+        mesh.hedges.append(up_hedge)
+        low_hedge = mesh.add_hedge(low_p.index)
+        mesh.hedges.append(low_hedge)
+        mesh.twin[up_hedge] = low_hedge
+        mesh.twin[low_hedge] = up_hedge
+        up_p_hedge = self.find_hedge(up_p)
+        low_p_hedge = self.find_hedge(low_p)
+
+        up_ccw_hedges = []
+        status = 1
+        for h in mesh.ccw_hedges(up_p_hedge):
+            up_ccw_hedges.append(h)
+            twin_face = mesh.face[mesh.twin[h]]
+            if twin_face != -1 and twin_face == mesh.face[up_p_hedge]:
+                status -= 1
+                break
+        if status != 0:
+            raise Exception('Hedge ({}) does not have neighbour with the same face'.format(up_p_hedge))
+
+        if len(up_ccw_hedges) == 2:
+            up_next = up_ccw_hedges[0]
+        elif 2 < len(up_ccw_hedges) < 5:
+            if more(up_ccw_hedges[0], up_hedge):
+                if ((less(up_ccw_hedges[2], up_hedge) and less(up_ccw_hedges[2], up_ccw_hedges[0])) or
+                        (more(up_ccw_hedges[2], up_hedge) and more(up_ccw_hedges[2], up_ccw_hedges[0]))):
+                    up_next = up_ccw_hedges[2]
+                elif ((less(up_ccw_hedges[1], up_hedge) and less(up_ccw_hedges[1], up_ccw_hedges[0])) or
+                        (more(up_ccw_hedges[1], up_hedge) and more(up_ccw_hedges[1], up_ccw_hedges[0]))):
+                    up_next = up_ccw_hedges[1]
+                else:
+                    up_next = up_ccw_hedges[0]
+            else:
+                up_next = up_ccw_hedges[1] if (less(up_ccw_hedges[0], up_ccw_hedges[1]) and
+                                               less(up_ccw_hedges[1], up_hedge)) else up_ccw_hedges[0]
+        else:
+            raise Exception('Unexpected number of half edges in point {}'.format(up_p.index))
+
+        low_ccw_hedges = []
+        status = 1
+        for h in mesh.ccw_hedges(low_p_hedge):
+            low_ccw_hedges.append(h)
+            twin_face = mesh.face[mesh.twin[h]]
+            if twin_face != -1 and twin_face == mesh.face[low_p_hedge]:
+                status -= 1
+                break
+        if status != 0:
+            raise Exception('Hedge ({}) does not have neighbour with the same face'.format(low_p_hedge))
+
+        if len(low_ccw_hedges) == 2:
+            low_next = low_ccw_hedges[0]
+        elif len(low_ccw_hedges) == 3:
+            if more(low_ccw_hedges[0], low_hedge):
+                if ((more(low_ccw_hedges[0], low_ccw_hedges[1]) and less(low_ccw_hedges[1], low_hedge)) or
+                        (less(low_ccw_hedges[0], low_ccw_hedges[1]) and more(low_ccw_hedges[1], low_hedge))):
+                    low_next = low_ccw_hedges[1]
+                else:
+                    low_next = low_ccw_hedges[0]
+            else:
+                low_next = low_ccw_hedges[1] if (less(low_ccw_hedges[0], low_ccw_hedges[1]) and
+                                                 less(low_ccw_hedges[1], low_hedge)) else low_ccw_hedges[0]
+        else:
+            raise Exception('Unexpected number of half edges in point {}'.format(low_p.index))
+        next_, last = mesh.next, mesh.last
+        last[up_hedge] = last[up_next]
+        next_[up_hedge] = low_next
+        next_[low_hedge] = up_next
+        last[low_hedge] = last[low_next]
+        next_[last[up_next]] = up_hedge
+        last[up_next] = low_hedge
+        next_[last[low_next]] = low_hedge
+        last[low_next] = up_hedge
+        mesh.in_faces[up_hedge] = mesh.in_faces[next_[up_hedge]]
+        mesh.in_faces[low_hedge] = mesh.in_faces[next_[low_hedge]]
+
+    def add_edge(self, point, hedge):
+        # new edge from current point to lower neighbour point
+        edge = Edge(point, self.get_point(self.mesh.origin[self.mesh.twin[hedge]]))
+        self.mesh.edge[hedge] = edge
+        self.mesh.edge[self.mesh.twin[hedge]] = edge
+        edge.helper = point
+        self.status.insert(edge)
+
+    def handle_start_point(self, point, hedge):
+        self.add_edge(point, hedge)
+
+    def handle_end_point(self, point, hedge):
+        last_edge = self.mesh.edge[self.mesh.last[hedge]]
+        self.status.remove(last_edge)
+        if self.types[last_edge.helper.index] == 'merge':
+            self.insert_edge(last_edge.helper, point)
+
+    def handle_split_point(self, point, hedge):
+        left_node = self.status.find_nearest_left(point.co[x])
+        self.insert_edge(left_node.key.helper, point)
+        left_node.key.helper = point
+        self.add_edge(point, hedge)
+
+    def handle_merge_point(self, point, hedge):
+        last_edge = self.mesh.edge[self.mesh.last[hedge]]
+        right_helper = last_edge.helper
+        if self.types[right_helper.index] == 'merge':
+            self.insert_edge(right_helper, point)
+        self.status.remove(last_edge)
+        left_node = self.status.find_nearest_left(point.co[x])
+        left_helper = left_node.key.helper
+        if self.types[left_helper.index] == 'merge':
+            self.insert_edge(left_helper, point)
+        left_node.key.helper = point
+
+    def handle_regular_point(self, point, hedge):
+        if point < self.get_point(self.mesh.origin[self.mesh.twin[hedge]]):
+            last_edge = self.mesh.edge[self.mesh.last[hedge]]
+            right_helper = last_edge.helper
+            self.status.remove(last_edge)
+            self.add_edge(point, hedge)
+            if self.types[right_helper.index] == 'merge':
+                self.insert_edge(right_helper, point)
+        else:
+            left_node = self.status.find_nearest_left(point.co[x])
+            left_helper = left_node.key.helper
+            left_node.key.helper = point
+            if self.types[left_helper.index] == 'merge':
+                self.insert_edge(left_helper, point)
@@ -18,6 +18,10 @@ from .intersections import Point as InterPoint, HalfEdge as InterHalfEdge, DCELM
 from .make_monotone import Point as MonPoint, HalfEdge as MonHalfEdge, DCELMesh as MonDCELMesh, \
                            monotone_faces_with_holes
 
+from .dcel_arrays import DCELArrays, UNBOUNDED
+from .intersections_arrays import find_intersections as find_intersections_arrays
+from .make_monotone_arrays import monotone_faces_with_holes as monotone_faces_with_holes_arrays
+
 from .dcel_debugger import Debugger
 
 from sverchok.utils.geom_2d.lin_alg import is_ccw_polygon
@@ -35,15 +39,15 @@ def edges_to_faces(sv_verts, sv_edges, do_intersect=True, fill_holes=True, accur
     :param accuracy: two floats figures are equal if their difference is lower then accuracy value, float
     :return: list of SV points, list of SV faces
     """
-    mesh = DCELMesh(accuracy=accuracy)
+    mesh = DCELArrays(accuracy=accuracy)
     mesh.from_sv_edges(sv_verts, sv_edges)
     if do_intersect:
-        find_intersections(mesh, accuracy)
+        find_intersections_arrays(mesh, accuracy)
     mesh.generate_faces_from_hedges()
     if not fill_holes:
         del_holes(mesh)
-    monotone_faces_with_holes(mesh)
-    return mesh.to_sv_mesh(edges=False, del_face_flag='del')
+    monotone_faces_with_holes_arrays(mesh)
+    return mesh.to_sv_mesh(del_face_flag='del')
 
 
 def merge_mesh_light(sv_verts, sv_faces, face_overlapping=False, is_overlap_number=False, accuracy=1e-5):
@@ -57,15 +61,15 @@ def merge_mesh_light(sv_verts, sv_faces, face_overlapping=False, is_overlap_numb
     :param accuracy: two floats figures are equal if their difference is lower then accuracy value, float
     :return: list of SV vertices, list of SV faces, index face mask (optionally), list of overlap_number (optionally)
     """
-    mesh = DCELMesh(accuracy=accuracy)
+    mesh = DCELArrays(accuracy=accuracy)
     mesh.from_sv_faces(sv_verts, sv_faces, face_data={'index': list(range(len(sv_faces)))})
-    find_intersections(mesh, accuracy, face_overlapping=True)  # anyway should be true
+    find_intersections_arrays(mesh, accuracy, face_overlapping=True)  # anyway should be true
     mesh.generate_faces_from_hedges()
-    mark_not_in_faces(mesh)
-    monotone_faces_with_holes(mesh)
-    face_indexes = [get_min_face_indexes(mesh, 'index')] if face_overlapping else [[]]
+    mark_not_in_faces_arrays(mesh)
+    monotone_faces_with_holes_arrays(mesh)
+    face_indexes = [get_min_face_indexes_arrays(mesh, 'index')] if face_overlapping else [[]]
     overlap_number = [get_number_of_overlapping_mask(mesh)] if is_overlap_number else [[]]
-    return list(mesh.to_sv_mesh(edges=False, del_face_flag='del')) + face_indexes + overlap_number
+    return list(mesh.to_sv_mesh(del_face_flag='del')) + face_indexes + overlap_number
 
 
 def crop_mesh(sv_verts, sv_faces, sv_verts_crop, sv_faces_crop, mode='inner', accuracy=1e-5):
@@ -80,16 +84,16 @@ def crop_mesh(sv_verts, sv_faces, sv_verts_crop, sv_faces_crop, mode='inner', ac
     :param accuracy: two floats figures are equal if their difference is lower then accuracy value, float
     :return: list of SV vertices, list of SV faces, index face mask (optionally)
     """
-    mesh = DCELMesh(accuracy=accuracy)
+    mesh = DCELArrays(accuracy=accuracy)
     mesh.from_sv_faces(sv_verts, sv_faces, face_flag=['base' for _ in range(len(sv_faces))],
                        face_data={'index': list(range(len(sv_faces)))})
     mesh.from_sv_faces(sv_verts_crop, sv_faces_crop, face_flag=['crop' for _ in range(len(sv_faces_crop))])
-    find_intersections(mesh, accuracy, face_overlapping=True)  # anyway should be true
+    find_intersections_arrays(mesh, accuracy, face_overlapping=True)  # anyway should be true
     mesh.generate_faces_from_hedges()
-    mark_not_in_faces(mesh)
+    mark_not_in_faces_arrays(mesh)
     mark_crop_faces(mesh, mode)
-    monotone_faces_with_holes(mesh)
-    return list(mesh.to_sv_mesh(edges=False, del_face_flag='del')) + [get_min_face_indexes(mesh, 'index')]
+    monotone_faces_with_holes_arrays(mesh)
+    return list(mesh.to_sv_mesh(del_face_flag='del')) + [get_min_face_indexes_arrays(mesh, 'index')]
 
 
 def crop_edges(sv_verts, sv_edges, sv_verts_crop, sv_faces_crop, mode='inner', accuracy=1e-5):
@@ -162,6 +166,7 @@ class Point(InterPoint, MonPoint):
 
 
 class HalfEdge(InterHalfEdge, MonHalfEdge):
+    __slots__ = ()
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -172,41 +177,43 @@ class DCELMesh(InterDCELMesh, MonDCELMesh):
 
 
 def del_holes(dcel_mesh):
+    # works with DCELArrays data structure
 
     del_flag = 'del'
+    face_col, twin = dcel_mesh.face, dcel_mesh.twin
 
     def del_hole(face):
-        used_del = set()  # type: Set['Face']
-        stack_del = [hedge.twin for hedge in face.inners]
+        used_del = set()  # type: Set[int]
+        stack_del = [twin[hedge] for hedge in dcel_mesh.inners[face]]
         while stack_del:
-            next_del_face = stack_del.pop().face
+            next_del_face = face_col[stack_del.pop()]
             if next_del_face in used_del:
                 continue
-            if id(next_del_face) == id(face):
+            if next_del_face == face or next_del_face == UNBOUNDED:
                 continue
             used_del.add(next_del_face)
-            next_del_face.flags.add(del_flag)
-            for loop_del_hedge in next_del_face.outer.loop_hedges:
-                stack_del.append(loop_del_hedge.twin)
-            if next_del_face.inners:
+            dcel_mesh.face_flags[next_del_face].add(del_flag)
+            for loop_del_hedge in dcel_mesh.loop_hedges(dcel_mesh.outer[next_del_face]):
+                stack_del.append(twin[loop_del_hedge])
+            if dcel_mesh.inners[next_del_face]:
                 add_hole(next_del_face)
 
     def add_hole(face):
-        used = set()  # type: Set['Face']
-        stack = [hedge.twin for hedge in face.inners]
+        used = set()  # type: Set[int]
+        stack = [twin[hedge] for hedge in dcel_mesh.inners[face]]
         while stack:
-            next_face = stack.pop().face
+            next_face = face_col[stack.pop()]
             if next_face in used:
                 continue
-            if id(face) == id(next_face):
+            if face == next_face or next_face == UNBOUNDED:
                 continue
             used.add(next_face)
-            for loop_hedge in next_face.outer.loop_hedges:
-                stack.append(loop_hedge.twin)
-            if next_face.inners:
+            for loop_hedge in dcel_mesh.loop_hedges(dcel_mesh.outer[next_face]):
+                stack.append(twin[loop_hedge])
+            if dcel_mesh.inners[next_face]:
                 del_hole(next_face)
 
-    add_hole(dcel_mesh.unbounded)
+    add_hole(UNBOUNDED)
 
 
 def get_min_face_indexes(dcel_mesh, index_flag, filter_flag=None, del_flag='del'):
@@ -243,22 +250,42 @@ def mark_not_in_faces(mesh, del_flag='del'):
             face.flags.add(del_flag)
 
 
+def get_min_face_indexes_arrays(dcel_mesh, index_flag, del_flag='del'):
+    # the same to get_min_face_indexes function but for DCELArrays data structure
+    sv_data, face_flags, in_faces = dcel_mesh.sv_data, dcel_mesh.face_flags, dcel_mesh.in_faces
+    out = []
+    for face in dcel_mesh.faces:
+        if del_flag in face_flags[face]:
+            continue
+        out.append(min([sv_data[in_face][index_flag] for in_face in in_faces[dcel_mesh.outer[face]] if
+                        index_flag in sv_data[in_face]]))
+    return out
+
+
+def mark_not_in_faces_arrays(mesh, del_flag='del'):
+    # the same to mark_not_in_faces function but for DCELArrays data structure
+    for face in mesh.faces:
+        if not mesh.in_faces[mesh.outer[face]]:
+            mesh.face_flags[face].add(del_flag)
+
+
 def mark_crop_faces(mesh, mode, crop_name='crop', del_flag='del'):
     # mark face for deleting if they are in faces with flag crop_name or not
+    # works with DCELArrays data structure
     for face in mesh.faces:
         inside_base = False
         inside_crop = False
-        for in_face in face.outer.in_faces:
-            if crop_name in in_face.flags:
+        for in_face in mesh.in_faces[mesh.outer[face]]:
+            if crop_name in mesh.face_flags[in_face]:
                 inside_crop = True
             else:
                 inside_base = True
         if mode == 'inner':
             if not inside_base or not inside_crop:
-                face.flags.add(del_flag)
+                mesh.face_flags[face].add(del_flag)
         else:
             if inside_crop:
-                face.flags.add(del_flag)
+                mesh.face_flags[face].add(del_flag)
 
 
 def get_face_mask_by_flag(mesh, flag, del_flag='del'):
@@ -275,7 +302,8 @@ def get_face_mask_by_flag(mesh, flag, del_flag='del'):
 
 
 def get_number_of_overlapping_mask(mesh, del_flag='del'):
-    return [len(face.outer.in_faces) - 1 for face in mesh.faces if del_flag not in face.flags]
+    # works with DCELArrays data structure
+    return [len(mesh.in_faces[mesh.outer[face]]) - 1 for face in mesh.faces if del_flag not in mesh.face_flags[face]]
 
 def join_meshes(verts1, faces1, verts2, faces2):
     faces_out = faces1 + [[i + len(verts1) for i in f] for f in faces2]
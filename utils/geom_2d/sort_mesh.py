@@ -22,6 +22,7 @@ class SortPointsUpDown:
 
     Should be used with another class with "co" - (x, y, z) and "accuracy" - (float) attributes
     """
+    __slots__ = ()
 
     def __lt__(self, other):
         # Sorting of points from upper left point to lowest right point
@@ -74,6 +75,8 @@ class SortEdgeSweepingAlgorithm:
     """
     global_event_point = None
     accuracy = 1e-6
+    __slots__ = ('up_p', 'low_p', 'last_event', 'last_intersection', 'last_product', 'cross', 'is_horizontal',
+                 'direction')
 
     def __init__(self, up_p, low_p):
         self.up_p = up_p  # Point object from dcel data structure
@@ -81,11 +84,15 @@ class SortEdgeSweepingAlgorithm:
 
         self.last_event = None
         self.last_intersection = None
-        self.last_product = None
 
         self.cross = cross_product((self.up_p.co[x], self.up_p.co[y], 1), (self.low_p.co[x], self.low_p.co[y], 1))
         self.is_horizontal = almost_equal(self.up_p.co[y], self.low_p.co[y], self.accuracy)
-        self.direction = (self.low_p - self.up_p).normalize()  # set downward direction of edge, Point object
+        # set downward direction of edge, points only should have "co" attribute
+        direction = [co1 - co2 for co1, co2 in zip(self.low_p.co, self.up_p.co)]
+        length = sum([co ** 2 for co in direction]) ** 0.5
+        self.direction = (direction[x] / length, direction[y] / length, direction[z] / length)
+        # angle of the edge does not depend on position of sweep line
+        self.last_product = dot_product(self.direction[:2], (1, 0))
 
     @classmethod
     def set_accuracy(cls, accuracy):
@@ -145,7 +152,8 @@ class SortEdgeSweepingAlgorithm:
         # find intersection current edge with sweeping line
         if self.is_horizontal:
             return self.event_point.co[x]
-        if not self.last_event or self.event_point != self.last_event:
+        # event points are unique, so identity check is enough (and much cheaper than __ne__)
+        if self.last_event is not self.event_point:
             self.update_params()
         return self.last_intersection
 
@@ -155,14 +163,11 @@ class SortEdgeSweepingAlgorithm:
         if self.is_horizontal:
             # if inserting edge is horizontal it always bigger for storing it to the end of sweep line
             return 1
-        if not self.last_event or self.event_point != self.last_event:
-            self.update_params()
         return self.last_product
 
     def update_params(self):
         # when new event point some parameters should be recalculated
         self.last_intersection = (self.event_point.co[y] * self.cross[y] + self.cross[z]) / -self.cross[x]
-        self.last_product = dot_product(self.direction.co[:2], (1, 0))
         self.last_event = self.event_point
 
     @property
@@ -179,6 +184,7 @@ class SortHalfEdgesCCW:
     Half edges are sorting in counterclockwise direction from -X direction.
     Should be used with HalfEdge class from dcel_mesh module
     """
+    __slots__ = ()
 
     def __lt__(self, other):
         # if self < other other it means that direction if closer to (-1, 0) direction
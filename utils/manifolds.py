@@ -180,11 +180,10 @@ class SurfaceRaycaster(object):
 
         us = np.linspace(u_min, u_max, num=samples)
         vs = np.linspace(v_min, v_max, num=samples)
+        points = self.surface.evaluate_grid(us, vs).transpose((1,0,2)).reshape((-1,3)).tolist()
         us, vs = np.meshgrid(us, vs)
         self.us = us.flatten()
         self.vs = vs.flatten()
-
-        points = self.surface.evaluate_array(self.us, self.vs).tolist()
         self.center_us, self.center_vs, faces = self._make_faces()
 
         self.bvh = BVHTree.FromPolygons(points, faces)
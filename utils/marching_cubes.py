@@ -486,3 +486,235 @@ def isosurface_np(data, isolevel):
 
     return np.array(polygoniser.vertices), triangles
 
+
+# Tables for the vectorized implementation.
+# Corner k of a cube is at (i, j, k) + CORNER_OFFSETS[k].
+CORNER_OFFSETS = np.array([
+        (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0),
+        (0, 0, 1), (0, 1, 1), (1, 1, 1), (1, 0, 1)
+    ])
+# Cube edge e goes along axis EDGE_AXES[e] (0 = X, 1 = Y, 2 = Z)
+# from the grid point at (i, j, k) + EDGE_STARTS[e].
+EDGE_AXES = np.array([1, 0, 1, 0, 1, 0, 1, 0, 2, 2, 2, 2])
+EDGE_STARTS = np.array([
+        (0, 0, 0), (0, 1, 0), (1, 0, 0), (0, 0, 0),
+        (0, 0, 1), (0, 1, 1), (1, 0, 1), (0, 0, 1),
+        (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)
+    ])
+tritable_np = np.array(tritable)
+
+def isosurface_vectorized(data, isolevel):
+    """
+    Vectorized numpy version of isosurface_np.
+    All cubes are processed at once: cube indexes are calculated by bit
+    packing, each grid edge gets a unique global index, so that vertices
+    shared by neighbouring cubes are deduplicated by that index, and all
+    intersection points are interpolated in bulk.
+
+    input:
+        * data: array of shape (sx, sy, sz) - field values at grid points
+        * isolevel: field value of the surface
+    output: tuple:
+        * vertices: array of shape (n, 3), in grid index units
+        * faces: array of shape (m, 3) of vertex indices
+    """
+    data = np.asarray(data, dtype=np.float64)
+    sx, sy, sz = data.shape
+    below = data < isolevel
+
+    cube_index = np.zeros((sx-1, sy-1, sz-1), dtype=np.int32)
+    for bit, (dx, dy, dz) in enumerate(CORNER_OFFSETS):
+        corner = below[dx : sx-1+dx, dy : sy-1+dy, dz : sz-1+dz]
+        cube_index |= corner.astype(np.int32) << bit
+
+    # Cubes which are entirely in or out of the surface produce nothing
+    active = np.nonzero((cube_index != 0) & (cube_index != 255))
+    cases = cube_index[active]
+    cubes = np.stack(active, axis=-1)
+
+    # Up to 5 triangles per cube
+    triangles = tritable_np[cases][:, :15].reshape((-1, 5, 3))
+    has_triangle = triangles[:, :, 0] != -1
+    tri_cube = np.broadcast_to(np.arange(len(cases))[:, np.newaxis], has_triangle.shape)[has_triangle]
+    tri_edges = triangles[has_triangle]
+
+    # Global index of grid edge: edges along X, then along Y, then along Z
+    edge_shapes = [(sx-1, sy, sz), (sx, sy-1, sz), (sx, sy, sz-1)]
+    edge_counts = [a*b*c for a, b, c in edge_shapes]
+    edge_offsets = np.array([0, edge_counts[0], edge_counts[0] + edge_counts[1]])
+    edge_dims = np.array(edge_shapes)
+
+    axes = EDGE_AXES[tri_edges]
+    starts = cubes[tri_cube][:, np.newaxis, :] + EDGE_STARTS[tri_edges]
+    dims = edge_dims[axes]
+    global_ids = edge_offsets[axes] + (starts[..., 0] * dims[..., 1] + starts[..., 1]) * dims[..., 2] + starts[..., 2]
+
+    used = np.zeros(sum(edge_counts), dtype=bool)
+    used[global_ids] = True
+    new_index = np.cumsum(used) - 1
+    faces = new_index[global_ids]
+
+    # Decode used edges back into grid points
+    edge_ids = np.flatnonzero(used)
+    edge_axes = np.searchsorted(edge_offsets, edge_ids, side='right') - 1
+    local_ids = edge_ids - edge_offsets[edge_axes]
+    dims = edge_dims[edge_axes]
+    p1 = np.stack((
+            local_ids // (dims[:, 1] * dims[:, 2]),
+            (local_ids // dims[:, 2]) % dims[:, 1],
+            local_ids % dims[:, 2]
+        ), axis=-1)
+    p2 = p1 + np.eye(3, dtype=np.int64)[edge_axes]
+
+    v1 = data[p1[:, 0], p1[:, 1], p1[:, 2]]
+    v2 = data[p2[:, 0], p2[:, 1], p2[:, 2]]
+    dv = v2 - v1
+    # Same special cases as in vertexinterp()
+    at_p1 = (np.abs(isolevel - v1) < 0.00001) | (np.abs(dv) < 0.00001)
+    at_p2 = np.logical_not(at_p1) & (np.abs(isolevel - v2) < 0.00001)
+    mu = (isolevel - v1) / np.where(at_p1, 1.0, dv)
+    mu[at_p1] = 0.0
+    mu[at_p2] = 1.0
+
+    vertices = p1 + mu[:, np.newaxis] * (p2 - p1)
+    return vertices, faces
+
+FILL_CHUNK_SIZE = 1 << 20
+
+def sample_field_adaptive(field, x_range, y_range, z_range, isolevel, coarse_step=8, lipschitz=0.0):
+    """
+    Sample scalar field on a regular grid, evaluating it only near the isosurface.
+
+    The grid is first split into cells of coarse_step x coarse_step x coarse_step
+    samples, and the field is evaluated at cell corners only. Cells whose corner
+    values are on different sides of isolevel, and cells sharing a corner with
+    them, are split into 8 subcells, and so on, until cells of one sample are
+    reached. With lipschitz > 0, a cell is also split when the field could
+    reach isolevel within the cell, provided that
+    |field(p1) - field(p2)| <= lipschitz * |p1 - p2|.
+
+    With lipschitz = 0 the result is lossy: parts of the surface which lie
+    inside of cells whose corners are all on one side of isolevel, and which
+    are not next to a detected part of the surface (for example, thin features
+    thinner than a coarse cell), are missed. Only a valid lipschitz bound
+    gives the same surface as sampling of the whole grid.
+
+    Grid points which were not evaluated are filled by trilinear interpolation
+    between corners of the cell they belong to; such values are all on the
+    same side of isolevel, so they do not produce any surface.
+
+    input:
+        * field: SvScalarField
+        * x_range, y_range, z_range: 1D arrays of grid coordinates along axes
+        * isolevel: field value of the surface
+        * coarse_step: size of initial cells, in samples
+        * lipschitz: Lipschitz bound of the field, 0 to use only signs of corner values
+    output: tuple:
+        * array of shape (len(x_range), len(y_range), len(z_range)) of field values
+        * number of evaluated grid points
+    """
+    ranges = [np.asarray(x_range), np.asarray(y_range), np.asarray(z_range)]
+    shape = tuple(len(r) for r in ranges)
+    last = np.array(shape) - 1
+    spacing = np.array([(r[-1] - r[0]) / (len(r) - 1) for r in ranges])
+    values = np.zeros(shape)
+    evaluated = np.zeros(shape, dtype=bool)
+    corner_offsets = CORNER_OFFSETS
+
+    def cell_corners(los, his):
+        # (n, 8, 3) indexes of cell corners
+        return np.where(corner_offsets[np.newaxis], his[:, np.newaxis, :], los[:, np.newaxis, :])
+
+    def evaluate_corners(corners):
+        flat = np.ravel_multi_index(corners.reshape((-1, 3)).T, shape)
+        flat = np.unique(flat)
+        flat = flat[~evaluated.flat[flat]]
+        if len(flat):
+            i, j, k = np.unravel_index(flat, shape)
+            values.flat[flat] = field.evaluate_grid(ranges[0][i], ranges[1][j], ranges[2][k])
+            evaluated.flat[flat] = True
+        return values[corners[..., 0], corners[..., 1], corners[..., 2]]
+
+    touched = np.zeros(shape, dtype=bool)
+
+    def add_neighbours(corners, crossing):
+        # Cells which share a corner with a crossing cell are refined as well
+        if crossing.all() or not crossing.any():
+            return crossing
+        crossing_flat = np.ravel_multi_index(corners[crossing].reshape((-1, 3)).T, shape)
+        touched.flat[crossing_flat] = True
+        others = np.flatnonzero(~crossing)
+        other_flat = np.ravel_multi_index(corners[others].reshape((-1, 3)).T, shape)
+        near = touched.ravel()[other_flat].reshape((-1, 8)).any(axis=1)
+        touched.flat[crossing_flat] = False
+        crossing = crossing.copy()
+        crossing[others[near]] = True
+        return crossing
+
+    step = max(int(coarse_step), 1)
+    starts = np.meshgrid(*[np.arange(0, n-1, step) for n in shape], indexing='ij')
+    los = np.stack([s.flatten() for s in starts], axis=-1)
+    his = np.minimum(los + step, last)
+
+    skipped = []
+    lattices = None
+    while len(los):
+        corners = cell_corners(los, his)
+        corner_values = evaluate_corners(corners)
+        crossing = (corner_values.min(axis=1) <= isolevel) & (corner_values.max(axis=1) >= isolevel)
+        if lipschitz > 0:
+            diagonals = np.linalg.norm((his - los) * spacing, axis=1)
+            near = np.abs(corner_values - isolevel).min(axis=1) <= lipschitz * diagonals
+            crossing |= near
+        if step == 1:
+            break
+        crossing = add_neighbours(corners, crossing)
+        if lattices is None:
+            # Points of the first level lattice are all evaluated now;
+            # its cells are filled all at once below.
+            lattices = [np.unique(np.append(np.arange(0, n-1, step), n-1)) for n in shape]
+        else:
+            skipped.append((los[~crossing], his[~crossing], corner_values[~crossing]))
+
+        los, his = los[crossing], his[crossing]
+        half = (step + 1) // 2
+        child_los = (los[:, np.newaxis, :] + half * corner_offsets[np.newaxis]).reshape((-1, 3))
+        child_his = np.minimum(child_los + half, np.repeat(his, 8, axis=0))
+        good = (child_los < child_his).all(axis=1)
+        los, his = child_los[good], child_his[good]
+        step = half
+
+    # Fill not evaluated points
+    if lattices is not None:
+        coarse = values[np.ix_(*lattices)]
+        for axis, lattice in enumerate(lattices):
+            fine = np.arange(shape[axis])
+            idxs = np.clip(np.searchsorted(lattice, fine, side='right') - 1, 0, len(lattice) - 2)
+            ts = (fine - lattice[idxs]) / (lattice[idxs + 1] - lattice[idxs])
+            ts = ts.reshape([-1 if a == axis else 1 for a in range(3)])
+            coarse = np.take(coarse, idxs, axis=axis) * (1 - ts) + np.take(coarse, idxs + 1, axis=axis) * ts
+        values[~evaluated] = coarse[~evaluated]
+
+    for los, his, corner_values in skipped:
+        if not len(los):
+            continue
+        sizes = his - los
+        max_size = sizes.max()
+        offsets = np.stack(np.meshgrid(*[np.arange(max_size + 1)] * 3, indexing='ij'), axis=-1).reshape((-1, 3))
+        chunk = max(1, FILL_CHUNK_SIZE // len(offsets))
+        for start in range(0, len(los), chunk):
+            c_los = los[start : start+chunk, np.newaxis, :]
+            c_his = his[start : start+chunk, np.newaxis, :]
+            c_values = corner_values[start : start+chunk]
+            points = np.minimum(c_los + offsets[np.newaxis], c_his)
+            ts = (points - c_los) / np.maximum(c_his - c_los, 1)
+            tx, ty, tz = ts[..., 0], ts[..., 1], ts[..., 2]
+            interpolated = np.zeros(tx.shape)
+            for c, (dx, dy, dz) in enumerate(corner_offsets):
+                weight = (tx if dx else 1 - tx) * (ty if dy else 1 - ty) * (tz if dz else 1 - tz)
+                interpolated += weight * c_values[:, c, np.newaxis]
+            flat = np.ravel_multi_index(points.reshape((-1, 3)).T, shape)
+            good = ~evaluated.flat[flat]
+            values.flat[flat[good]] = interpolated.flatten()[good]
+
+    return values, int(evaluated.sum())
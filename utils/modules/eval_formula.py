@@ -17,10 +17,47 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import ast
+from functools import lru_cache
+
+import numpy as np
 
 from sverchok.utils.script_importhelper import safe_names
 from sverchok.utils import logging
 
+# Number of compiled expressions kept by sv_compile()
+COMPILED_CACHE_SIZE = 1024
+# Objects with fewer elements are evaluated per element
+VECTORIZE_MIN_SIZE = 8
+
+# Functions which can be applied to whole numpy arrays: name -> (function, number of arguments).
+# Only functions which return the same values as their math module counterparts are listed.
+VECTORIZED_FUNCTIONS = {
+    'acos': (np.arccos, 1), 'acosh': (np.arccosh, 1),
+    'asin': (np.arcsin, 1), 'asinh': (np.arcsinh, 1),
+    'atan': (np.arctan, 1), 'atanh': (np.arctanh, 1),
+    'atan2': (np.arctan2, 2), 'copysign': (np.copysign, 2),
+    'cos': (np.cos, 1), 'cosh': (np.cosh, 1),
+    'sin': (np.sin, 1), 'sinh': (np.sinh, 1),
+    'tan': (np.tan, 1), 'tanh': (np.tanh, 1),
+    'degrees': (np.degrees, 1), 'radians': (np.radians, 1),
+    'exp': (np.exp, 1), 'expm1': (np.expm1, 1),
+    'log': (np.log, 1), 'log10': (np.log10, 1),
+    'log1p': (np.log1p, 1), 'log2': (np.log2, 1),
+    'sqrt': (np.sqrt, 1), 'hypot': (np.hypot, 2),
+    'fabs': (np.fabs, 1), 'abs': (np.abs, 1)
+}
+
+VECTORIZED_OPERATORS = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE
+)
+
+_safe_env = dict(safe_names)
+_safe_env["__builtins__"] = {}
+_vectorized_env = dict(_safe_env)
+_vectorized_env.update((name, f) for name, (f, _) in VECTORIZED_FUNCTIONS.items())
+
 class VariableCollector(ast.NodeVisitor):
     """
     Visitor class to collect free variable names from the expression.
@@ -111,7 +148,11 @@ def get_variables(string):
     result = visitor.variables
     return result.difference(safe_names.keys())
 
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
 def sv_compile(string):
+    """
+    Compile expression. Compiled code is cached by the expression text.
+    """
     try:
         root = ast.parse(string, mode='eval')
         return compile(root, "<expression>", 'eval')
@@ -142,14 +183,233 @@ def safe_eval(string, variables):
     Evaluate expression, allowing only functions known to be "safe"
     to be used.
     """
+    env = dict(_safe_env)
+    env.update(variables)
+    env["__builtins__"] = {}
+    return eval(sv_compile(string), env)
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def parse_expression(string):
+    """
+    Parse expression; parsed trees are cached by the expression text.
+    Returns None if the expression has invalid syntax.
+    """
     try:
-        env = dict()
-        env.update(safe_names)
-        env.update(variables)
-        env["__builtins__"] = {}
-        root = ast.parse(string, mode='eval')
-        return eval(compile(root, "<expression>", 'eval'), env)
-    except SyntaxError as e:
-        logging.exception(e)
-        raise Exception("Invalid expression syntax: " + str(e))
+        return ast.parse(string, mode='eval')
+    except SyntaxError:
+        return None
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def is_vectorizable(string):
+    """
+    Check if expression can be evaluated once over numpy arrays of values
+    of variables, instead of evaluating it for each set of values.
+    Only arithmetics, single comparisons and functions from
+    VECTORIZED_FUNCTIONS are allowed. Whether the result is the same as
+    of evaluation for each set of values depends on types and values
+    of variables; this is checked by get_vectorized_type.
+    """
+    root = parse_expression(string)
+    if root is None:
+        return False
+    for node in ast.walk(root):
+        if isinstance(node, (ast.Expression, ast.Load, ast.BinOp, ast.UnaryOp)):
+            continue
+        if isinstance(node, VECTORIZED_OPERATORS):
+            continue
+        if isinstance(node, ast.Name):
+            if node.id in safe_names and node.id not in VECTORIZED_FUNCTIONS and node.id not in ('e', 'pi'):
+                return False
+            continue
+        if isinstance(node, ast.Constant) or type(node).__name__ == 'Num':
+            # Python 3.7 parses numbers as ast.Num
+            value = node.value if isinstance(node, ast.Constant) else node.n
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return False
+            continue
+        if isinstance(node, ast.Compare):
+            if len(node.ops) != 1:
+                return False
+            continue
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.keywords:
+                return False
+            function = VECTORIZED_FUNCTIONS.get(node.func.id)
+            if function is None or function[1] != len(node.args):
+                return False
+            continue
+        return False
+    return True
+
+INT64_MAX = np.iinfo(np.int64).max
+
+def get_vectorized_type(node, int_bounds):
+    """
+    Type of values of expression (accepted by is_vectorizable), when it is
+    evaluated over numpy arrays: 'bool', 'float', or, for integers, an upper
+    bound of absolute values of the result.
+    int_bounds: dictionary {variable name: upper bound of absolute values}
+        for integer variables; other variables are floats.
+    Raises OverflowError if numpy integers can overflow, unlike Python ones,
+    and TypeError if numpy result can differ from Python result otherwise
+    (f.e., True + True is True for numpy booleans).
+    """
+    if isinstance(node, ast.Expression):
+        return get_vectorized_type(node.body, int_bounds)
+    if isinstance(node, ast.Name):
+        return int_bounds.get(node.id, 'float')
+    if isinstance(node, ast.Constant) or type(node).__name__ == 'Num':
+        value = node.value if isinstance(node, ast.Constant) else node.n
+        return abs(value) if isinstance(value, int) else 'float'
+    if isinstance(node, ast.Compare):
+        get_vectorized_type(node.left, int_bounds)
+        get_vectorized_type(node.comparators[0], int_bounds)
+        return 'bool'
+    if isinstance(node, ast.UnaryOp):
+        operand = get_vectorized_type(node.operand, int_bounds)
+        if operand == 'bool':
+            raise TypeError("Unary operator on booleans")
+        return operand
+    if isinstance(node, ast.Call):
+        args = [get_vectorized_type(arg, int_bounds) for arg in node.args]
+        if node.func.id == 'abs':
+            if args[0] == 'bool':
+                raise TypeError("abs() of booleans")
+            return args[0]
+        return 'float'
+
+    left = get_vectorized_type(node.left, int_bounds)
+    right = get_vectorized_type(node.right, int_bounds)
+    if left == 'bool' and right == 'bool':
+        raise TypeError("Arithmetics on two booleans")
+    # Python booleans are integers 0 and 1
+    if left == 'bool':
+        left = 1
+    if right == 'bool':
+        right = 1
+    if left == 'float' or right == 'float' or isinstance(node.op, ast.Div):
+        return 'float'
+    op = node.op
+    if isinstance(op, (ast.Add, ast.Sub)):
+        bound = left + right
+    elif isinstance(op, ast.Mult):
+        bound = left * right
+    elif isinstance(op, ast.FloorDiv):
+        bound = max(left, 1)
+    elif isinstance(op, ast.Mod):
+        bound = right
+    elif isinstance(op, ast.Pow):
+        if left <= 1:
+            bound = 1
+        elif right * left.bit_length() > 64:
+            raise OverflowError("Integer power can overflow")
+        else:
+            bound = left ** right
+    else:
+        raise TypeError("Unsupported operator")
+    if bound > INT64_MAX:
+        raise OverflowError("Integer arithmetics can overflow")
+    return bound
+
+def get_values_dtype(values):
+    """
+    numpy dtype to convert list of values to without changing types of
+    values: int64 if all values are integers, float64 if all values are
+    floats, or None otherwise (mixed or non-numeric values).
+    """
+    if isinstance(values, np.ndarray):
+        return values.dtype if values.ndim == 1 and values.dtype.kind in 'if' else None
+    types = set(map(type, values))
+    if all(issubclass(t, (int, np.integer)) and not issubclass(t, (bool, np.bool_)) for t in types):
+        return np.int64
+    if all(issubclass(t, float) for t in types):
+        return np.float64
+    return None
+
+def vectorize_variables(var_names, values):
+    """
+    Convert lists of values of variables (of one object) into numpy arrays
+    of the same length, repeating last values of shorter lists,
+    as zip_long_repeat does.
+    input: names of variables, list of lists of values.
+    output: tuple (dictionary of arrays, size),
+        or None if values of some variable are not all integers
+        or all floats.
+    """
+    if not len(values):
+        return None
+    arrays = []
+    for vs in values:
+        if not len(vs):
+            return None
+        dtype = get_values_dtype(vs)
+        if dtype is None:
+            return None
+        try:
+            array = np.asarray(vs, dtype=dtype)
+        except (ValueError, TypeError, OverflowError):
+            # f.e. integers which do not fit into int64
+            return None
+        arrays.append(array)
+    size = max(len(array) for array in arrays)
+    variables = dict()
+    for name, array in zip(var_names, arrays):
+        if len(array) < size:
+            array = np.concatenate((array, np.repeat(array[-1:], size - len(array))))
+        variables[name] = array
+    return variables, size
+
+def safe_eval_vectorized(string, variables, size):
+    """
+    Evaluate expression once over numpy arrays of values of variables.
+    output: list of values, or None if the expression can not be evaluated
+        this way; in that case it should be evaluated for each set of values.
+    """
+    if size < VECTORIZE_MIN_SIZE or not is_vectorizable(string):
+        return None
+    int_bounds = dict()
+    for name, array in variables.items():
+        if array.dtype.kind == 'i':
+            int_bounds[name] = max(int(array.max()), -int(array.min()))
+    try:
+        get_vectorized_type(parse_expression(string), int_bounds)
+    except (OverflowError, TypeError):
+        return None
+    env = dict(_vectorized_env)
+    env.update(variables)
+    env["__builtins__"] = {}
+    try:
+        # Errors (division by zero, math domain error) are to be
+        # reported by per-element evaluation, as usual.
+        with np.errstate(all='raise'):
+            result = eval(sv_compile(string), env)
+            result = np.broadcast_to(result, (size,))
+    except (ArithmeticError, ValueError, TypeError):
+        return None
+    if result.dtype.kind not in 'bif':
+        return None
+    return result.tolist()
+
+def safe_eval_formulas_vectorized(formulas, var_names, values):
+    """
+    Evaluate several expressions for one object, once over whole arrays of values.
+    input: expressions, names of variables, list of lists of values of variables.
+    output: list of lists of results (one per expression), or None if some
+        of expressions can not be evaluated this way.
+    """
+    if not all(is_vectorizable(formula) for formula in formulas):
+        return None
+    if max((len(vs) for vs in values), default=0) < VECTORIZE_MIN_SIZE:
+        return None
+    vectorized = vectorize_variables(var_names, values)
+    if vectorized is None:
+        return None
+    variables, size = vectorized
+    results = []
+    for formula in formulas:
+        result = safe_eval_vectorized(formula, variables, size)
+        if result is None:
+            return None
+        results.append(result)
+    return results
 
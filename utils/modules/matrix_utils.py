@@ -55,3 +55,170 @@ def matrix_apply_np(verts, matrix):
     verts_co_4d = np.ones(shape=(verts.shape[0], 4), dtype=np.float)
     verts_co_4d[:, :-1] = verts  # cos v (x,y,z,1) - point,   v(x,y,z,0)- vector
     return np.einsum('ij,aj->ai', matrix, verts_co_4d)[:, :-1]
+
+# Functions below work with packed matrices: numpy arrays of shape (n, 4, 4)
+# (see sverchok.core.socket_conversions.pack_matrices).
+
+def quaternions_to_rotations_np(quaternions):
+    '''
+    quaternions: array (n, 4) in (w, x, y, z) order; they are not normalized,
+    as in mathutils.Quaternion.to_matrix.
+    returns: array (n, 3, 3)'''
+    w, x, y, z = np.asarray(quaternions, dtype=np.float64).T
+    rotations = np.empty((len(w), 3, 3))
+    rotations[:, 0, 0] = 1.0 - 2.0 * (y*y + z*z)
+    rotations[:, 0, 1] = 2.0 * (x*y - w*z)
+    rotations[:, 0, 2] = 2.0 * (x*z + w*y)
+    rotations[:, 1, 0] = 2.0 * (x*y + w*z)
+    rotations[:, 1, 1] = 1.0 - 2.0 * (x*x + z*z)
+    rotations[:, 1, 2] = 2.0 * (y*z - w*x)
+    rotations[:, 2, 0] = 2.0 * (x*z - w*y)
+    rotations[:, 2, 1] = 2.0 * (y*z + w*x)
+    rotations[:, 2, 2] = 1.0 - 2.0 * (x*x + y*y)
+    return rotations
+
+def rotations_to_quaternions_np(rotations):
+    '''
+    rotations: array (n, 3, 3) of orthonormal matrices.
+    returns: array (n, 4) of normalized quaternions in (w, x, y, z) order;
+    the same method as in mathutils.Matrix.to_quaternion is used.'''
+    m = np.asarray(rotations, dtype=np.float64)
+    m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+    trace = 0.25 * (1.0 + m00 + m11 + m22)
+
+    case_w = trace > 1e-4
+    case_x = ~case_w & (m00 > m11) & (m00 > m22)
+    case_y = ~case_w & ~case_x & (m11 > m22)
+    case_z = ~case_w & ~case_x & ~case_y
+
+    # Component which is calculated from the diagonal is 0.25*s,
+    # others are (sums or differences of symmetric elements) / s
+    s = np.ones(len(m))
+    s[case_w] = 4.0 * np.sqrt(trace[case_w])
+    s[case_x] = 2.0 * np.sqrt(np.maximum(1.0 + m00 - m11 - m22, 0.0))[case_x]
+    s[case_y] = 2.0 * np.sqrt(np.maximum(1.0 + m11 - m00 - m22, 0.0))[case_y]
+    s[case_z] = 2.0 * np.sqrt(np.maximum(1.0 + m22 - m00 - m11, 0.0))[case_z]
+
+    sub_x = m[:, 2, 1] - m[:, 1, 2]
+    sub_y = m[:, 0, 2] - m[:, 2, 0]
+    sub_z = m[:, 1, 0] - m[:, 0, 1]
+    add_xy = m[:, 0, 1] + m[:, 1, 0]
+    add_xz = m[:, 0, 2] + m[:, 2, 0]
+    add_yz = m[:, 1, 2] + m[:, 2, 1]
+    diagonal = 0.25 * s * s
+
+    quaternions = np.select(
+        [case_w[:, np.newaxis], case_x[:, np.newaxis], case_y[:, np.newaxis]],
+        [np.stack((diagonal, sub_x, sub_y, sub_z), axis=1),
+         np.stack((sub_x, diagonal, add_xy, add_xz), axis=1),
+         np.stack((sub_y, add_xy, diagonal, add_yz), axis=1)],
+        np.stack((sub_z, add_xz, add_yz, diagonal), axis=1)) / s[:, np.newaxis]
+
+    return quaternions / np.linalg.norm(quaternions, axis=1)[:, np.newaxis]
+
+def euler_to_rotations_np(angles, order='XYZ'):
+    '''
+    angles: array (n, 3) of rotation angles about X, Y and Z axes, in radians.
+    order: order of rotations, as in mathutils.Euler.
+    returns: array (n, 3, 3)'''
+    angles = np.asarray(angles, dtype=np.float64)
+    n = len(angles)
+    rotations = np.empty((n, 3, 3))
+    rotations[:] = np.identity(3)
+    for axis_name in order:
+        axis = 'XYZ'.index(axis_name)
+        i, j = [k for k in range(3) if k != axis]
+        cos, sin = np.cos(angles[:, axis]), np.sin(angles[:, axis])
+        if axis == 1:
+            sin = -sin
+        axis_rotation = np.zeros((n, 3, 3))
+        axis_rotation[:, axis, axis] = 1.0
+        axis_rotation[:, i, i] = cos
+        axis_rotation[:, j, j] = cos
+        axis_rotation[:, i, j] = -sin
+        axis_rotation[:, j, i] = sin
+        rotations = axis_rotation @ rotations
+    return rotations
+
+def axis_angle_to_rotations_np(axes, angles):
+    '''
+    axes: array (n, 3), they are normalized; zero axis means no rotation,
+    as in mathutils.Quaternion(axis, angle).
+    angles: array (n,) in radians.
+    returns: array (n, 3, 3)'''
+    axes = np.asarray(axes, dtype=np.float64)
+    angles = np.asarray(angles, dtype=np.float64)
+    lengths = np.linalg.norm(axes, axis=1)
+    valid = lengths != 0.0
+    axes = np.where(valid[:, np.newaxis], axes / np.where(valid, lengths, 1.0)[:, np.newaxis], 0.0)
+    half = np.where(valid, 0.5 * angles, 0.0)
+    quaternions = np.empty((len(axes), 4))
+    quaternions[:, 0] = np.cos(half)
+    quaternions[:, 1:] = axes * np.sin(half)[:, np.newaxis]
+    return quaternions_to_rotations_np(quaternions)
+
+def matrices_from_components_np(locations, rotations, scales):
+    '''
+    Compose matrices as Translation @ Rotation @ Scale.
+    locations: array (n, 3); rotations: array (n, 3, 3); scales: array (n, 3).
+    returns: array (n, 4, 4)'''
+    matrices = np.zeros((len(rotations), 4, 4))
+    matrices[:, :3, :3] = rotations * np.asarray(scales, dtype=np.float64)[:, np.newaxis, :]
+    matrices[:, :3, 3] = locations
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+def decompose_matrices_np(matrices):
+    '''
+    Split matrices into locations (n, 3), rotations (n, 3, 3) and scales (n, 3),
+    as mathutils.Matrix.decompose does.'''
+    locations = matrices[:, :3, 3].copy()
+    rotations = matrices[:, :3, :3].copy()
+    scales = np.linalg.norm(rotations, axis=1)
+    rotations /= np.where(scales == 0.0, 1.0, scales)[:, np.newaxis, :]
+    negative = np.linalg.det(rotations) < 0
+    rotations[negative] *= -1
+    scales[negative] *= -1
+    # mathutils converts the rotation part to a quaternion,
+    # which drops shear
+    rotations = quaternions_to_rotations_np(rotations_to_quaternions_np(rotations))
+    return locations, rotations, scales
+
+def apply_matrices_np(verts, matrices):
+    '''
+    verts: array (n, 3); matrices: array (m, 4, 4).
+    returns: array (m, n, 3) of vertices transformed by each matrix'''
+    return np.einsum('mij,nj->mni', matrices[:, :3, :3], verts) + matrices[:, np.newaxis, :3, 3]
+
+def interpolate_matrices_np(a, b, factors):
+    '''
+    Interpolate matrices as mathutils.Matrix.lerp does: locations are
+    interpolated linearly, rotation parts of polar decomposition spherically,
+    and scaling parts linearly.
+    a, b: arrays (n, 4, 4); factors: array (n,).
+    returns: array (n, 4, 4)'''
+    factors = np.asarray(factors, dtype=np.float64)
+    u_a, s_a, vh_a = np.linalg.svd(a[:, :3, :3])
+    u_b, s_b, vh_b = np.linalg.svd(b[:, :3, :3])
+    q_a = rotations_to_quaternions_np(u_a @ vh_a)
+    q_b = rotations_to_quaternions_np(u_b @ vh_b)
+    p_a = np.transpose(vh_a, (0, 2, 1)) @ (s_a[:, :, np.newaxis] * vh_a)
+    p_b = np.transpose(vh_b, (0, 2, 1)) @ (s_b[:, :, np.newaxis] * vh_b)
+
+    # slerp, along the shortest path
+    cos = np.einsum('ij,ij->i', q_a, q_b)
+    q_a = np.where((cos < 0)[:, np.newaxis], -q_a, q_a)
+    cos = np.abs(cos)
+    slerp = cos < 1.0 - 1e-4
+    omega = np.arccos(np.where(slerp, cos, 0.0))
+    sin = np.where(slerp, np.sin(omega), 1.0)
+    w_a = np.where(slerp, np.sin((1.0 - factors) * omega) / sin, 1.0 - factors)
+    w_b = np.where(slerp, np.sin(factors * omega) / sin, factors)
+    q = w_a[:, np.newaxis] * q_a + w_b[:, np.newaxis] * q_b
+
+    t = factors[:, np.newaxis, np.newaxis]
+    result = np.zeros((len(a), 4, 4))
+    result[:, :3, :3] = quaternions_to_rotations_np(q) @ ((1.0 - t) * p_a + t * p_b)
+    result[:, :3, 3] = (1.0 - factors)[:, np.newaxis] * a[:, :3, 3] + factors[:, np.newaxis] * b[:, :3, 3]
+    result[:, 3, 3] = 1.0
+    return result
@@ -7,6 +7,7 @@
 
 from bpy.props import BoolProperty
 from sverchok.data_structure import updateNode
+from sverchok.core.update_system import invalidate_animation_closure
 
 # pylint: disable=c0111
 # pylint: disable=c0103
@@ -15,7 +16,8 @@ from sverchok.data_structure import updateNode
 class SvAnimatableNode():
     '''
     This mixin is used to add is_animatable property to the node.
-    This property is used on frame change to determine which nodes should be updated
+    This property is used on frame change to determine which nodes should be updated:
+    animatable nodes and all nodes downstream of them are processed
     The node file will need to have this code line:
 
     from sverchok.utils.nodes_mixins.sv_animatable_nodes import SvAnimatableNode
@@ -28,10 +30,14 @@ class SvAnimatableNode():
         self.draw_animatable_buttons(layout)
 
     '''
+    def update_animatable(self, context):
+        invalidate_animation_closure(self.id_data)
+
     is_animatable: BoolProperty(
         name="Animate Node",
         description="Update Node on frame change",
-        default=True
+        default=True,
+        update=update_animatable
     )
 
     def refresh_node(self, context):
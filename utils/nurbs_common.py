@@ -44,6 +44,96 @@ def from_homogenous(control_points):
     points = weighted / weights[np.newaxis].T
     return points, weights
 
+def find_knot_spans(knotvector, degree, ts):
+    """
+    Find indexes of knot spans, which contain parameter values ts.
+    For each t, return index i, such that knotvector[i] <= t < knotvector[i+1],
+    and degree <= i <= number of control points - 1; the last span is closed,
+    and values out of curve domain are assigned to the first or last span.
+    See "The NURBS book" (2nd edition), p.2.5, algorithm A2.1.
+
+    input: knotvector - np.array of shape (m,); ts - np.array of shape (n,).
+    output: np.array of ints of shape (n,).
+    """
+    knotvector = np.asarray(knotvector)
+    n_points = len(knotvector) - degree - 1
+    spans = np.searchsorted(knotvector, ts, side='right') - 1
+    return np.clip(spans, degree, n_points - 1)
+
+def nurbs_basis_derivatives(knotvector, degree, spans, ts, order=0):
+    """
+    Calculate values and derivatives of non-zero basis functions,
+    for all parameter values at once.
+    For each t, only p+1 basis functions, N[span-p, p] ... N[span, p], are
+    not zero; this returns only these values, instead of values of all
+    basis functions.
+    See "The NURBS book" (2nd edition), p.2.5, algorithm A2.3.
+
+    input:
+        * knotvector - np.array of shape (m,)
+        * spans - result of find_knot_spans(knotvector, degree, ts)
+        * ts - np.array of shape (n,)
+        * order - maximum order of derivatives to calculate
+    output:
+        np.array of shape (order+1, n, degree+1); result[k, j, r] is the k-th
+        derivative of basis function N[spans[j] - degree + r] at ts[j].
+    """
+    u = np.asarray(knotvector)
+    p = degree
+    ts = np.asarray(ts, dtype=np.float64)
+    n = len(ts)
+
+    ndu = np.empty((p+1, p+1, n))
+    ndu[0,0] = 1.0
+    left = np.empty((p+1, n))
+    right = np.empty((p+1, n))
+    for j in range(1, p+1):
+        left[j] = ts - u[spans+1-j]
+        right[j] = u[spans+j] - ts
+        saved = 0.0
+        for r in range(j):
+            # lower triangle: knot differences
+            ndu[j,r] = right[r+1] + left[j-r]
+            temp = ndu[r,j-1] / ndu[j,r]
+            # upper triangle: basis functions
+            ndu[r,j] = saved + right[r+1] * temp
+            saved = left[j-r] * temp
+        ndu[j,j] = saved
+
+    ders = np.zeros((order+1, n, p+1))
+    ders[0] = ndu[:,p].T
+    max_order = min(order, p)
+    if max_order == 0:
+        return ders
+
+    a = np.empty((2, p+1, n))
+    for r in range(p+1):
+        s1, s2 = 0, 1
+        a[0,0] = 1.0
+        for k in range(1, max_order+1):
+            d = np.zeros(n)
+            rk = r - k
+            pk = p - k
+            if r >= k:
+                a[s2,0] = a[s1,0] / ndu[pk+1,rk]
+                d += a[s2,0] * ndu[rk,pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k-1 if r-1 <= pk else p-r
+            for j in range(j1, j2+1):
+                a[s2,j] = (a[s1,j] - a[s1,j-1]) / ndu[pk+1,rk+j]
+                d += a[s2,j] * ndu[rk+j,pk]
+            if r <= pk:
+                a[s2,k] = -a[s1,k-1] / ndu[pk+1,r]
+                d += a[s2,k] * ndu[r,pk]
+            ders[k,:,r] = d
+            s1, s2 = s2, s1
+
+    c = p
+    for k in range(1, max_order+1):
+        ders[k] *= c
+        c *= (p - k)
+    return ders
+
 class SvNurbsBasisFunctions(object):
     def __init__(self, knotvector):
         self.knotvector = np.array(knotvector)
@@ -18,6 +18,10 @@
 
 import cProfile
 import pstats
+import os
+import sys
+import threading
+from collections import Counter
 from io import StringIO
 
 import bpy
@@ -28,6 +32,8 @@ from sverchok.utils.context_managers import sv_preferences
 
 # Global cProfile.Profile singleton
 _global_profile = None
+# Global SvSamplingProfiler singleton
+_sampling_profiler = None
 # Nesting level for @profile decorator
 _profile_nesting = 0
 # Whether the profiling is enabled by "Start profiling" toggle
@@ -42,6 +48,178 @@ def get_global_profile():
         _global_profile = cProfile.Profile()
     return _global_profile
 
+class SvSamplingProfiler(object):
+    """
+    Low-overhead statistical profiler.
+    A background thread wakes up each `interval` seconds and records the
+    call stack of the thread which entered a profiled section, plus stacks
+    of worker threads which are processing nodes at that moment. Each sample
+    is attributed to the node being processed by the sampled thread (see
+    set_current_node), so the results can be shown as a flame graph where
+    the root frames are nodes.
+    Nothing is done in the profiled threads themselves except for setting
+    the current node, so the profiled code runs at nearly normal speed.
+    Note that while the profiled code holds the GIL, the sampling thread
+    can not wake up more often than sys.getswitchinterval() allows.
+    """
+    def __init__(self, interval = 0.001):
+        self.interval = interval
+        # (node label, frame label, frame label, ...): count; frames go from outermost
+        self.stacks = Counter()
+        # node label: count
+        self.node_samples = Counter()
+        self.total_samples = 0
+        # thread id: label of the node processed by the thread
+        self.current_nodes = dict()
+        self._code_labels = dict()
+        self._target_thread = None
+        self._nesting = 0
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="Sverchok sampling profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def enter(self):
+        """Called when the profiled thread enters a profiled section"""
+        if self._nesting == 0:
+            self._target_thread = threading.get_ident()
+        self._nesting += 1
+        self.start()
+
+    def exit(self):
+        self._nesting -= 1
+
+    def set_current_node(self, node):
+        """
+        Set the node being processed by the calling thread;
+        pass None when the processing is finished.
+        """
+        if node is None:
+            self.set_current_label(None)
+        else:
+            self.set_current_label(f"{node.id_data.name}: {node.name}")
+
+    def set_current_label(self, label):
+        """
+        Same as set_current_node, but takes a ready label of the node;
+        to be used by threads which must not access Blender data.
+        """
+        thread_id = threading.get_ident()
+        if label is None:
+            self.current_nodes.pop(thread_id, None)
+        else:
+            self.current_nodes[thread_id] = label
+
+    def _code_label(self, code):
+        label = self._code_labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._code_labels[code] = label
+        return label
+
+    def _sample(self):
+        frames = sys._current_frames()
+        current_nodes = dict(self.current_nodes)
+        thread_ids = set(current_nodes.keys())
+        thread_ids.add(self._target_thread)
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._code_label(frame.f_code))
+                frame = frame.f_back
+            node_label = current_nodes.get(thread_id, "<no node>")
+            stack.append(node_label)
+            stack.reverse()
+            self.stacks[tuple(stack)] += 1
+            self.node_samples[node_label] += 1
+            self.total_samples += 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            if self._nesting > 0:
+                self._sample()
+
+    def have_samples(self):
+        return self.total_samples > 0
+
+    def get_collapsed_stacks(self):
+        """
+        Return samples in "collapsed stacks" format, one line per unique
+        stack: frames separated by semicolons, followed by the count.
+        This format is understood by flamegraph.pl, speedscope and others.
+        """
+        lines = []
+        for stack, count in self.stacks.items():
+            frames = [frame.replace(";", ",") for frame in stack]
+            lines.append(";".join(frames) + " " + str(count))
+        return "\n".join(sorted(lines)) + "\n"
+
+    def get_summary(self, count = 20):
+        """
+        Return text summary: nodes by number of samples,
+        and functions by number of samples where they were on top of stack.
+        """
+        total = self.total_samples
+        own = Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+        lines = [f"{total} samples, interval {self.interval * 1000:.1f} ms", "", "Nodes:"]
+        for label, n in self.node_samples.most_common(count):
+            lines.append(f"{n:8d} {100.0 * n / total:6.2f}%  {label}")
+        lines.extend(["", "Functions (own samples):"])
+        for label, n in own.most_common(count):
+            lines.append(f"{n:8d} {100.0 * n / total:6.2f}%  {label}")
+        return "\n".join(lines)
+
+def get_sampling_profiler():
+    """
+    Get SvSamplingProfiler singleton object
+    """
+    global _sampling_profiler
+    if _sampling_profiler is None:
+        with sv_preferences() as prefs:
+            interval = prefs.profile_sampling_interval / 1000.0
+        _sampling_profiler = SvSamplingProfiler(interval)
+    return _sampling_profiler
+
+def get_active_sampler():
+    """
+    Return SvSamplingProfiler if it is currently collecting samples, or None.
+    Used by the update system to tell the profiler which node is processed.
+    """
+    if _sampling_profiler is not None and _sampling_profiler._nesting > 0:
+        return _sampling_profiler
+    return None
+
+def get_profile_backend():
+    with sv_preferences() as prefs:
+        return prefs.profile_backend
+
+def reset_sampling_profiler():
+    global _sampling_profiler
+    if _sampling_profiler is not None:
+        _sampling_profiler.stop()
+        _sampling_profiler = None
+
 def is_profiling_enabled(section):
     """
     Check if profiling is enabled in general,
@@ -90,6 +268,14 @@ def profile(function = None, section = "MANUAL"):
             if is_profiling_enabled(section):
                 global _profile_nesting
 
+                if get_profile_backend() == "SAMPLING":
+                    sampler = get_sampling_profiler()
+                    sampler.enter()
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        sampler.exit()
+
                 profile = get_global_profile()
                 _profile_nesting += 1
                 if _profile_nesting == 1:
@@ -115,6 +301,14 @@ def dump_stats(sort = "tottime", strip_dirs = False):
     """
     Dump profiling statistics to the log.
     """
+    if get_profile_backend() == "SAMPLING":
+        if _sampling_profiler is None or not _sampling_profiler.have_samples():
+            info("There are no profiling results yet")
+            return
+        info("Profiling results:\n" + _sampling_profiler.get_summary())
+        info("---------------------------")
+        return
+
     profile = get_global_profile()
     if not profile.getstats():
         info("There are no profiling results yet")
@@ -133,7 +327,18 @@ def save_stats(path):
     """
     Dump profiling statistics to file in cProfile's binary format.
     Such file can be parsed, for example, by gprof2dot utility.
+    For sampling profiler, save collapsed stacks, which can be
+    converted to a flame graph by flamegraph.pl or opened in speedscope.
     """
+    if get_profile_backend() == "SAMPLING":
+        if _sampling_profiler is None or not _sampling_profiler.have_samples():
+            info("There are no profiling results yet")
+            return
+        with open(path, 'w') as f:
+            f.write(_sampling_profiler.get_collapsed_stacks())
+        info("Profiling samples saved to %s.", path)
+        return
+
     profile = get_global_profile()
     if not profile.getstats():
         info("There are no profiling results yet")
@@ -144,6 +349,8 @@ def save_stats(path):
 
 def have_gathered_stats():
     global _global_profile
+    if _sampling_profiler is not None and _sampling_profiler.have_samples():
+        return True
     if _global_profile is None:
         return False
     if _global_profile.getstats():
@@ -161,6 +368,8 @@ class SvProfilingToggle(bpy.types.Operator):
         global is_currently_enabled
 
         is_currently_enabled = not is_currently_enabled
+        if not is_currently_enabled and _sampling_profiler is not None:
+            _sampling_profiler.stop()
         info("Profiling is set to %s", is_currently_enabled)
 
         return {'FINISHED'}
@@ -220,6 +429,7 @@ class SvProfileReset(bpy.types.Operator):
     def execute(self, context):
         global _global_profile
         _global_profile = None
+        reset_sampling_profiler()
         info("Profiling statistics data cleared.")
         return {'FINISHED'}
     
@@ -230,5 +440,6 @@ def register():
         bpy.utils.register_class(class_name)
 
 def unregister():
+    reset_sampling_profiler()
     for class_name in reversed(classes):
         bpy.utils.unregister_class(class_name)
@@ -11,7 +11,7 @@ def cross_indices3(n):
     '''create crossed indices'''
 
     nu = np.sum(np.arange(n, dtype=np.int64))
-    ind = np.zeros((nu, 2), dtype=np.int16)
+    ind = np.zeros((nu, 2), dtype=np.int64)
     c = 0
     for i in range(n-1):
         l = n-i-1
@@ -24,6 +24,55 @@ def cross_indices3(n):
     return ind
 
 
+# half of the 26 neighbour cells: each pair of adjacent cells is visited once
+NEIGHBOUR_CELLS = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1) if (i, j, k) > (0, 0, 0)]
+
+
+def expand_pairs(first, second_start, counts):
+    '''pairs (first[n], second_start[n] + m) for every m in range(counts[n])'''
+    starts = np.cumsum(counts) - counts
+    ramp = np.arange(np.sum(counts)) - np.repeat(starts, counts)
+    return np.stack((np.repeat(first, counts), np.repeat(second_start, counts) + ramp), axis=-1)
+
+
+def cell_indices(verts, cell_size):
+    '''
+    pairs of particles (i < j) which can be closer than cell_size, sorted.
+    Particles are sorted into a uniform grid of cells of cell_size, and
+    only particles from the same or adjacent cells are paired.
+    '''
+    v_len = len(verts)
+    if v_len < 2 or not cell_size > 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    # one empty cell on each side, so neighbour keys do not wrap around
+    cells = np.floor((verts - np.min(verts, axis=0)) / cell_size).astype(np.int64) + 1
+    dims = np.max(cells, axis=0) + 2
+    if np.prod(dims.astype(np.float64)) > 2**62:
+        return np.stack(np.triu_indices(v_len, 1), axis=-1)
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind='stable')
+    cell_keys, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    particle_cell = np.repeat(np.arange(len(cell_keys)), cell_count)
+    position = np.arange(v_len)
+
+    # particles of the same cell
+    after = cell_start[particle_cell] + cell_count[particle_cell] - position - 1
+    pairs = [expand_pairs(position, position + 1, after)]
+
+    # particles of adjacent cells
+    for i, j, k in NEIGHBOUR_CELLS:
+        neighbour_keys = cell_keys + (i * dims[1] + j) * dims[2] + k
+        neighbour = np.clip(np.searchsorted(cell_keys, neighbour_keys), 0, len(cell_keys) - 1)
+        found = (cell_keys[neighbour] == neighbour_keys)[particle_cell]
+        neighbour = neighbour[particle_cell[found]]
+        pairs.append(expand_pairs(position[found], cell_start[neighbour], cell_count[neighbour]))
+
+    pairs = np.sort(order[np.concatenate(pairs)], axis=1)
+    return pairs[np.argsort(pairs[:, 0] * v_len + pairs[:, 1])]
+
+
 def numpy_match_long_repeat(p):
     '''match list length by repeating last one'''
     q = []
@@ -71,12 +120,20 @@ def expand_pols_numpy(p, len_max):
 
 
 def self_react(params):
-    '''behaviors between particles: collide, attract and fit'''
+    '''
+    behaviors between particles: collide, attract and fit.
+    Attraction acts between all pairs of particles; without it only
+    pairs from adjacent cells of a grid can touch each other.
+    '''
     ps, collision, sum_rad, gates, att_params, fit_params = params
     use_collide, use_attract, use_grow = gates
-    indexes = ps.params['indexes']
-    if use_grow:
+    if use_attract:
+        indexes = ps.params['indexes']
+    else:
+        indexes = cell_indices(ps.verts, 2 * np.max(ps.rads))
+    if use_grow or not use_attract:
         sum_rad = ps.rads[indexes[:, 0]] + ps.rads[indexes[:, 1]]
+    if use_grow:
         if use_attract:
             att_params[2] = ps.mass[indexes[:, 0]] * ps.mass[indexes[:, 1]]
     dif_v = ps.verts[indexes[:, 0], :] - ps.verts[indexes[:, 1], :]
@@ -88,7 +145,7 @@ def self_react(params):
     some_attractions = use_attract and(len(index_inter) < len(indexes))
 
     if some_collisions or some_attractions:
-        result = np.zeros((ps.v_len, ps.v_len, 3), dtype=np.float64)
+        result = np.zeros((ps.v_len, 3), dtype=np.float64)
         dist_cor = np.clip(dist, 1e-6, 1e4)
         normal_v = dif_v/dist_cor[:, np.newaxis]
 
@@ -98,7 +155,7 @@ def self_react(params):
             antimask = np.invert(mask)
             attract_force(result, dist_cor, antimask, indexes, normal_v, att_params)
 
-        ps.r += np.sum(result, axis=1)
+        ps.r += result
 
     if use_grow:
         fit_force(ps, index_inter, fit_params)
@@ -117,8 +174,8 @@ def self_collision_force(result, dist, sum_rad, index_inter, mask, normal_v, sel
     sf = self_collision[:, np.newaxis]
     len0, len1 = [sf[id1], sf[id0]] if variable_coll else [sf, sf]
 
-    result[id0, id1, :] = -no * le * len0
-    result[id1, id0, :] = no * le * len1
+    np.add.at(result, id0, -no * le * len0)
+    np.add.at(result, id1, no * le * len1)
 
 
 def attract_force(result, dist, mask, index, norm_v, att_params):
@@ -137,15 +194,15 @@ def attract_force(result, dist, mask, index, norm_v, att_params):
     att = attract
     len0, len1 = [att[id1], att[id0]] if variable_att else [att, att]
 
-    result[id0, id1, :] = - direction * len0
-    result[id1, id0, :] = direction * len1
+    np.add.at(result, id0, - direction * len0)
+    np.add.at(result, id1, direction * len1)
 
 
 def fit_force(ps, index_inter, fit_params):
     '''the untouched particles will grow, the ones that collide will shrink'''
     grow, min_rad, max_rad = fit_params
     touch = np.unique(index_inter)
-    free = np.setdiff1d(np.arange(ps.v_len, dtype=np.int16), touch)
+    free = np.setdiff1d(np.arange(ps.v_len), touch)
     v_grow = len(grow) > 1
     grow_un, grow_tou = [grow[free], grow[touch]] if v_grow else [grow, grow]
     ps.rads[free] += grow_un*0.1
@@ -172,8 +229,12 @@ def self_react_setup(ps, dicti, forces_composite):
     if not use_self_react:
         return
 
-    ps.params['indexes'] = cross_indices3(ps.v_len)
-    sum_rad = ps.rads[ps.params['indexes'][:, 0]] + ps.rads[ps.params['indexes'][:, 1]]
+    if use_attract:
+        ps.params['indexes'] = cross_indices3(ps.v_len)
+        sum_rad = ps.rads[ps.params['indexes'][:, 0]] + ps.rads[ps.params['indexes'][:, 1]]
+    else:
+        # pairs and radii sums are found in each step
+        sum_rad = None
 
     att_params = att_setup(use_attract, ps, np_attract, att_decay)
     fit_params = fit_setup(use_grow, np_grow, min_rad, max_rad)
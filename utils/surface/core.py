@@ -26,6 +26,19 @@ class SvSurface(object):
     def evaluate_array(self, us, vs):
         raise Exception("not implemented!")
 
+    def evaluate_grid(self, us, vs):
+        """
+        Evaluate the surface at all combinations of parameter values:
+        us is an array of shape (n,), vs is an array of shape (m,).
+        Returns an array of shape (n, m, 3); result[i, j] = surface(us[i], vs[j]).
+        Subclasses can provide faster implementations which make use
+        of the grid structure.
+        """
+        us, vs = np.meshgrid(us, vs, indexing='ij')
+        n, m = us.shape
+        points = self.evaluate_array(us.flatten(), vs.flatten())
+        return points.reshape((n, m, 3))
+
     def normal(self, u, v):
         h = self.normal_delta
         p = self.evaluate(u, v)
@@ -170,6 +183,9 @@ class SvSurfaceSubdomain(SvSurface):
     def evaluate_array(self, us, vs):
         return self.surface.evaluate_array(us, vs)
 
+    def evaluate_grid(self, us, vs):
+        return self.surface.evaluate_grid(us, vs)
+
     def normal(self, u, v):
         return self.surface.normal(u, v)
 
@@ -229,6 +245,10 @@ class SvFlipSurface(SvSurface):
         us, vs = self.flip(us, vs)
         return self.surface.evaluate_array(us, vs)
 
+    def evaluate_grid(self, us, vs):
+        us, vs = self.flip(np.asarray(us), np.asarray(vs))
+        return self.surface.evaluate_grid(us, vs)
+
     def normal(self, u, v):
         u, v = self.flip(u, v)
         return self.surface.normal(u, v)
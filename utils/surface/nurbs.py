@@ -1,7 +1,7 @@
 
 import numpy as np
 
-from sverchok.utils.nurbs_common import nurbs_divide, SvNurbsBasisFunctions
+from sverchok.utils.nurbs_common import nurbs_divide, SvNurbsBasisFunctions, find_knot_spans, nurbs_basis_derivatives
 from sverchok.utils.curve import knotvector as sv_knotvector
 from sverchok.utils.surface import SvSurface, SurfaceCurvatureCalculator, SurfaceDerivativesData
 from sverchok.dependencies import geomdl
@@ -315,6 +315,25 @@ class SvNativeNurbsSurface(SvNurbsSurface):
         numerator, denominator = self.fraction(0, 0, us, vs)
         return numerator / denominator
 
+    def evaluate_grid(self, us, vs):
+        # Tensor product: basis functions along U and along V are
+        # calculated once for each value of us and vs, and only p+1
+        # non-zero functions are taken into account.
+        us, vs = np.asarray(us), np.asarray(vs)
+        pu, pv = self.degree_u, self.degree_v
+        spans_u = find_knot_spans(self.knotvector_u, pu, us)
+        spans_v = find_knot_spans(self.knotvector_v, pv, vs)
+        nsu = nurbs_basis_derivatives(self.knotvector_u, pu, spans_u, us)[0] # (n, pu+1)
+        nsv = nurbs_basis_derivatives(self.knotvector_v, pv, spans_v, vs)[0] # (m, pv+1)
+        idxs_u = spans_u[np.newaxis].T - pu + np.arange(pu+1) # (n, pu+1)
+        idxs_v = spans_v[np.newaxis].T - pv + np.arange(pv+1) # (m, pv+1)
+
+        weights = self.weights[:,:,np.newaxis] # (ku, kv, 1)
+        homogenous = np.concatenate((self.control_points * weights, weights), axis=2) # (ku, kv, 4)
+        by_u = np.einsum('ia,iakd->ikd', nsu, homogenous[idxs_u]) # (n, kv, 4)
+        points = np.einsum('jb,ijbd->ijd', nsv, by_u[:, idxs_v]) # (n, m, 4)
+        return points[:,:,:3] / points[:,:,3:]
+
     def normal(self, u, v):
         return self.normal_array(np.array([u]), np.array([v]))[0]
 
@@ -29,6 +29,7 @@ import bpy
 
 from sverchok import old_nodes
 from sverchok.utils import dummy_nodes
+from sverchok.core.node_manifest import load_node_class
 from sverchok.utils.sv_IO_monad_helpers import pack_monad, unpack_monad
 from sverchok.utils.logging import debug, info, warning, error, exception
 from sverchok.utils.sv_requests import urlopen
@@ -643,6 +644,7 @@ def add_node_to_tree(nodes, n, nodes_to_import, name_remap, create_texts):
             if not node:
                 raise Exception("It seems no valid node was created for this Monad {0}".format(node_ref))
         else:
+            load_node_class(bl_idname)
             if dummy_nodes.is_dependent(bl_idname):
                 try:
                     node = nodes.new(bl_idname)
@@ -5,8 +5,14 @@
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
 
+import numpy as np
+
 from mathutils import kdtree
 from sverchok.data_structure import match_long_repeat as mlr
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
 
 # documentation/blender_python_api_2_70_release/mathutils.kdtree.html
 def create_kdt(verts):
@@ -20,6 +26,58 @@ def create_kdt(verts):
     return kd
 
 
+class SvKdTree(object):
+    """
+    KD-tree which answers a whole array of nearest-point queries in one call.
+    If SciPy is available, scipy.spatial.cKDTree is used; otherwise
+    the queries are answered one by one by mathutils.kdtree.
+    An existing mathutils KDTree can be wrapped as well, in which case
+    the slow path is always used.
+    """
+    def __init__(self, vertices=None, kdt=None):
+        self.points = None
+        self.tree = None
+        self.kdt = kdt
+        if vertices is not None:
+            self.points = np.asarray(vertices, dtype=np.float64)
+            if scipy is not None:
+                self.tree = cKDTree(self.points)
+            elif kdt is None:
+                self.kdt = create_kdt(vertices)
+        elif kdt is None:
+            raise Exception("Either kdt or vertices must be provided")
+
+    def query(self, points, k=1):
+        """
+        Find k nearest vertices for each of points.
+        input: np.array of shape (n, 3).
+        output: tuple of (distances, indices, nearest vertices);
+        their shapes are (n,), (n,), (n, 3) for k == 1,
+        or (n, k), (n, k), (n, k, 3) for k > 1.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if self.points is not None and k > len(self.points):
+            raise Exception(f"Can not find {k} nearest points among {len(self.points)} vertices")
+
+        if self.tree is not None:
+            distances, indices = self.tree.query(points, k=k)
+            return distances, indices, self.points[indices]
+
+        if k == 1:
+            found = [self.kdt.find(point) for point in points]
+            nearest = np.array([tuple(co) for co, i, d in found]).reshape((-1, 3))
+            indices = np.array([i for co, i, d in found], dtype=np.int64)
+            distances = np.array([d for co, i, d in found])
+        else:
+            found = [self.kdt.find_n(point, k) for point in points]
+            for point, vs in zip(points, found):
+                if len(vs) != k:
+                    raise Exception("Unexpected kdt result at %s: %s" % (tuple(point), vs))
+            nearest = np.array([[tuple(co) for co, i, d in vs] for vs in found]).reshape((-1, k, 3))
+            indices = np.array([[i for co, i, d in vs] for vs in found], dtype=np.int64).reshape((-1, k))
+            distances = np.array([[d for co, i, d in vs] for vs in found]).reshape((-1, k))
+        return distances, indices, nearest
+
 def kdt_closest_verts_range(verts, v_find, dists, out):
     '''Find vertices in desired distance'''
     kd = create_kdt(verts)
@@ -69,6 +127,10 @@ def kdt_closest_path(verts, radius, start_index, result, cycle):
 
 def kdt_closest_edges(verts, socket_inputs, egdes_output):
     '''Join verts pairs by defining distance range and number of connections'''
+    egdes_output.sv_set(kdt_closest_edges_data(verts, socket_inputs))
+
+def kdt_closest_edges_data(verts, socket_inputs):
+    '''Same as kdt_closest_edges, but returns the edges data instead of setting the socket'''
     mindist, maxdist, maxNum, skip = socket_inputs
 
     # make kdtree
@@ -103,4 +165,4 @@ def kdt_closest_edges(verts, socket_inputs, egdes_output):
             if num_edges == maxNum:
                 break
 
-    egdes_output.sv_set([list(e)])
+    return [list(e)]
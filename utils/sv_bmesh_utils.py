@@ -19,10 +19,11 @@
 from contextlib import contextmanager
 import math
 from operator import setitem, getitem
-from itertools import count
+from itertools import count, chain
 
 import numpy as np
 
+import bpy
 import bmesh
 from bmesh.types import BMVert, BMEdge, BMFace
 import mathutils
@@ -51,48 +52,249 @@ def empty_bmesh(use_operators=True):
         raise error
 
 
+# Meshes with at least this number of vertices plus faces are converted
+# to and from bmesh via a temporary Mesh, filled by foreach_set and read by
+# foreach_get, instead of creating or reading elements one by one.
+BULK_THRESHOLD = 1000
+
+
+def _face_loops(faces):
+    """
+    Flat loop arrays of Sverchok faces: (loop vertex indexes, loop starts, loop totals).
+    """
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        n_faces, n_sides = faces.shape
+        loop_verts = faces.ravel().astype(np.int64)
+        loop_total = np.full(n_faces, n_sides, dtype=np.int64)
+    else:
+        loop_total = np.fromiter(map(len, faces), dtype=np.int64, count=len(faces))
+        loop_verts = np.fromiter(chain.from_iterable(faces), dtype=np.int64, count=loop_total.sum())
+    loop_start = np.zeros(len(loop_total), dtype=np.int64)
+    np.cumsum(loop_total[:-1], out=loop_start[1:])
+    return loop_verts, loop_start, loop_total
+
+
+def _is_valid_bulk_input(n_verts, loop_verts, loop_start, loop_total, edges):
+    """
+    Check that bmesh would accept the faces and edges without errors;
+    otherwise they are passed to bmesh one by one, so the errors are the same as usual.
+    """
+    if len(loop_total) and loop_total.min() < 3:
+        return False
+    if len(loop_verts) and (loop_verts.min() < 0 or loop_verts.max() >= n_verts):
+        return False
+    if len(edges) and (edges.min() < 0 or edges.max() >= n_verts or (edges[:, 0] == edges[:, 1]).any()):
+        return False
+    if len(loop_total):
+        # same vertex used twice in a face
+        face_idx = np.repeat(np.arange(len(loop_total)), loop_total)
+        order = np.lexsort((loop_verts, face_idx))
+        sorted_verts = loop_verts[order]
+        same_face = face_idx[order][1:] == face_idx[order][:-1]
+        if (same_face & (sorted_verts[1:] == sorted_verts[:-1])).any():
+            return False
+        # faces with the same vertices
+        for n_sides in np.unique(loop_total):
+            of_size = np.repeat(loop_total == n_sides, loop_total)
+            face_verts = sorted_verts[of_size[order]].reshape(-1, n_sides)
+            if len(np.unique(face_verts, axis=0)) < len(face_verts):
+                return False
+    return True
+
+
+def _bulk_edges(n_verts, loop_verts, loop_start, loop_total, edges):
+    """
+    Edges of the mesh in the order in which bmesh creates them when faces are
+    added one by one and then missing edges are added:
+    returns (edge vertex pairs, edge index of each loop, edge index of each input edge).
+    """
+    n_loops = len(loop_verts)
+    loop_idx = np.arange(n_loops)
+    face_start = np.repeat(loop_start, loop_total)
+    face_total = np.repeat(loop_total, loop_total)
+    position = loop_idx - face_start
+    next_verts = loop_verts[np.where(position == face_total - 1, face_start, loop_idx + 1)]
+    # bmesh creates the edges of a new face starting from the edge of its last loop
+    creation_order = np.empty(n_loops, dtype=np.int64)
+    creation_order[face_start + (position + 1) % face_total] = loop_idx
+
+    v1 = np.concatenate((loop_verts[creation_order], edges[:, 0]))
+    v2 = np.concatenate((next_verts[creation_order], edges[:, 1]))
+    keys = np.minimum(v1, v2) * n_verts + np.maximum(v1, v2)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    by_first = np.argsort(first)
+    new_index = np.empty_like(by_first)
+    new_index[by_first] = np.arange(len(by_first))
+    edge_verts = np.stack((v1[first[by_first]], v2[first[by_first]]), axis=1)
+
+    candidate_edges = new_index[inverse.ravel()]
+    loop_edges = np.empty(n_loops, dtype=np.int64)
+    loop_edges[creation_order] = candidate_edges[:n_loops]
+    return edge_verts, loop_edges, candidate_edges[n_loops:]
+
+
+def _pydata_arrays(verts, edges, faces):
+    """
+    Returns (vertices, edges, loop vertex indexes, loop starts, loop totals) arrays,
+    or None if the data should be added to bmesh element by element.
+    """
+    try:
+        verts = np.asarray(verts, dtype=np.float32)
+        if len(edges) > 0:
+            edges = np.asarray(edges, dtype=np.int64)
+        else:
+            edges = np.empty((0, 2), dtype=np.int64)
+        if len(faces) > 0:
+            loop_verts, loop_start, loop_total = _face_loops(faces)
+        else:
+            loop_verts = loop_start = loop_total = np.empty(0, dtype=np.int64)
+    except (ValueError, TypeError):
+        # ragged or non-numeric data
+        return None
+    if verts.ndim != 2 or verts.shape[1] != 3 or edges.ndim != 2 or edges.shape[1] != 2:
+        return None
+    if not _is_valid_bulk_input(len(verts), loop_verts, loop_start, loop_total, edges):
+        return None
+    return verts, edges, loop_verts, loop_start, loop_total
+
+
+def _bulk_bmesh_from_pydata(verts, edges, faces):
+    """
+    Returns (bmesh, edge index of each input edge), or None if the data should
+    be added to bmesh element by element.
+    """
+    arrays = _pydata_arrays(verts, edges, faces)
+    if arrays is None:
+        return None
+    verts, edges, loop_verts, loop_start, loop_total = arrays
+    n_verts = len(verts)
+    edge_verts, loop_edges, input_edges = _bulk_edges(n_verts, loop_verts, loop_start, loop_total, edges)
+
+    try:
+        mesh = bpy.data.meshes.new("sv_bmesh_from_pydata")
+    except (AttributeError, RuntimeError):
+        # writing to ID data is not allowed in this context
+        return None
+    try:
+        mesh.vertices.add(n_verts)
+        mesh.vertices.foreach_set("co", verts.ravel())
+        mesh.edges.add(len(edge_verts))
+        mesh.edges.foreach_set("vertices", edge_verts.astype(np.int32).ravel())
+        mesh.loops.add(len(loop_verts))
+        mesh.loops.foreach_set("vertex_index", loop_verts.astype(np.int32))
+        mesh.loops.foreach_set("edge_index", loop_edges.astype(np.int32))
+        mesh.polygons.add(len(loop_total))
+        mesh.polygons.foreach_set("loop_start", loop_start.astype(np.int32))
+        mesh.polygons.foreach_set("loop_total", loop_total.astype(np.int32))
+        mesh.update()
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+    finally:
+        bpy.data.meshes.remove(mesh)
+    return bm, input_edges
+
+
+def write_mesh_from_pydata(mesh, verts, edges=[], faces=[], materials=None):
+    """
+    Replace geometry of the mesh by Sverchok mesh data, writing it with
+    foreach_set, without creating a bmesh. Edges of faces are calculated
+    by Blender; so the order of edges can differ from bm.to_mesh(mesh).
+    materials: material index of each face; None items mean index 0.
+    Returns False, without changing the mesh, if the data can not be written
+    this way (for example faces with repeated vertices); such data should be
+    written through bmesh_from_pydata, to get the usual errors.
+    """
+    arrays = _pydata_arrays(verts, edges, faces)
+    if arrays is None:
+        return False
+    verts, edges, loop_verts, loop_start, loop_total = arrays
+    n_verts = len(verts)
+
+    mesh.clear_geometry()
+    mesh.vertices.add(n_verts)
+    mesh.vertices.foreach_set("co", verts.ravel())
+    if len(edges):
+        # bmesh_from_pydata skips repeated edges
+        keys = np.minimum(edges[:, 0], edges[:, 1]) * n_verts + np.maximum(edges[:, 0], edges[:, 1])
+        _, first = np.unique(keys, return_index=True)
+        edges = edges[np.sort(first)]
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.astype(np.int32).ravel())
+    if len(loop_total):
+        mesh.loops.add(len(loop_verts))
+        mesh.loops.foreach_set("vertex_index", loop_verts.astype(np.int32))
+        mesh.polygons.add(len(loop_total))
+        mesh.polygons.foreach_set("loop_start", loop_start.astype(np.int32))
+        mesh.polygons.foreach_set("loop_total", loop_total.astype(np.int32))
+        if materials:
+            material_index = np.zeros(len(loop_total), dtype=np.int32)
+            values = [0 if m is None else m for m in materials[:len(loop_total)]]
+            material_index[:len(values)] = values
+            mesh.polygons.foreach_set("material_index", material_index)
+    mesh.update(calc_edges=bool(len(loop_total)), calc_edges_loose=bool(len(edges)))
+    return True
+
+
 def bmesh_from_pydata(verts=None, edges=[], faces=[], markup_face_data=False, markup_edge_data=False,
                       markup_vert_data=False, normal_update=False):
     ''' verts is necessary, edges/faces are optional
         normal_update, will update verts/edges/faces normals at the end
     '''
 
-    bm = bmesh.new()
-    bm_verts = bm.verts
-    add_vert = bm_verts.new
+    bulk = None
+    if len(verts) + len(faces) >= BULK_THRESHOLD:
+        bulk = _bulk_bmesh_from_pydata(verts, edges, faces)
 
-    py_verts = verts.tolist() if type(verts) == np.ndarray else verts
+    if bulk is not None:
+        bm, input_edges = bulk
+        bm_verts = bm.verts
+        bm_verts.index_update()
+        bm_verts.ensure_lookup_table()
+        bm.faces.index_update()
+        bm.edges.index_update()
+        if markup_edge_data and len(edges) > 0:
+            initial_index_layer = bm.edges.layers.int.new("initial_index")
+            bm.edges.ensure_lookup_table()
+            bm_edges = bm.edges
+            for idx, edge_idx in enumerate(input_edges.tolist()):
+                bm_edges[edge_idx][initial_index_layer] = idx
+    else:
+        bm = bmesh.new()
+        bm_verts = bm.verts
+        add_vert = bm_verts.new
 
-    for co in py_verts:
-        add_vert(co)
+        py_verts = verts.tolist() if type(verts) == np.ndarray else verts
 
-    bm_verts.index_update()
-    bm_verts.ensure_lookup_table()
+        for co in py_verts:
+            add_vert(co)
 
-    if len(faces) > 0:
-        add_face = bm.faces.new
-        py_faces = faces.tolist() if type(faces) == np.ndarray else faces
-        for face in py_faces:
-            add_face(tuple(bm_verts[i] for i in face))
+        bm_verts.index_update()
+        bm_verts.ensure_lookup_table()
 
-        bm.faces.index_update()
+        if len(faces) > 0:
+            add_face = bm.faces.new
+            py_faces = faces.tolist() if type(faces) == np.ndarray else faces
+            for face in py_faces:
+                add_face(tuple(bm_verts[i] for i in face))
 
-    if len(edges) > 0:
-        if markup_edge_data:
-            initial_index_layer = bm.edges.layers.int.new("initial_index")
+            bm.faces.index_update()
 
-        add_edge = bm.edges.new
-        get_edge = bm.edges.get
-        py_faces = edges.tolist() if type(edges) == np.ndarray else edges
-        for idx, edge in enumerate(edges):
-            edge_seq = tuple(bm_verts[i] for i in edge)
-            bm_edge = get_edge(edge_seq)
-            if not bm_edge:
-                bm_edge = add_edge(edge_seq)
+        if len(edges) > 0:
             if markup_edge_data:
-                bm_edge[initial_index_layer] = idx
+                initial_index_layer = bm.edges.layers.int.new("initial_index")
+
+            add_edge = bm.edges.new
+            get_edge = bm.edges.get
+            py_faces = edges.tolist() if type(edges) == np.ndarray else edges
+            for idx, edge in enumerate(edges):
+                edge_seq = tuple(bm_verts[i] for i in edge)
+                bm_edge = get_edge(edge_seq)
+                if not bm_edge:
+                    bm_edge = add_edge(edge_seq)
+                if markup_edge_data:
+                    bm_edge[initial_index_layer] = idx
 
-        bm.edges.index_update()
+            bm.edges.index_update()
 
     if markup_vert_data:
         bm_verts.ensure_lookup_table()
@@ -138,18 +340,34 @@ def add_mesh_to_bmesh(bm, verts, edges=None, faces=None, sv_index_name=None, upd
 
 
 def numpy_data_from_bmesh(bm, out_np, face_data=None):
-    if out_np[0]:
-        verts = np.array([v.co[:] for v in bm.verts])
-    else:
-        verts = [v.co[:] for v in bm.verts]
-    if out_np[1]:
-        edges = np.array([[e.verts[0].index, e.verts[1].index] for e in bm.edges])
-    else:
-        edges = [[e.verts[0].index, e.verts[1].index] for e in bm.edges]
-    if out_np[2]:
-        faces = np.array([[i.index for i in p.verts] for p in bm.faces])
+    bulk = None
+    if len(bm.verts) + len(bm.faces) >= BULK_THRESHOLD:
+        bulk = _bulk_arrays_from_bmesh(bm)
+
+    if bulk is not None:
+        np_verts, np_edges, loop_verts, loop_start, loop_total = bulk
+        verts = np_verts.astype(np.float64) if out_np[0] else list(map(tuple, np_verts.tolist()))
+        edges = np_edges.astype(np.int64) if out_np[1] else np_edges.tolist()
+        if out_np[2] and len(loop_total) and (loop_total == loop_total[0]).all():
+            faces = loop_verts.astype(np.int64).reshape(-1, loop_total[0])
+        else:
+            loop_verts = loop_verts.tolist()
+            faces = [loop_verts[start:start + total] for start, total in zip(loop_start.tolist(), loop_total.tolist())]
+            if out_np[2]:
+                faces = np.array(faces)
     else:
-        faces = [[i.index for i in p.verts] for p in bm.faces]
+        if out_np[0]:
+            verts = np.array([v.co[:] for v in bm.verts])
+        else:
+            verts = [v.co[:] for v in bm.verts]
+        if out_np[1]:
+            edges = np.array([[e.verts[0].index, e.verts[1].index] for e in bm.edges])
+        else:
+            edges = [[e.verts[0].index, e.verts[1].index] for e in bm.edges]
+        if out_np[2]:
+            faces = np.array([[i.index for i in p.verts] for p in bm.faces])
+        else:
+            faces = [[i.index for i in p.verts] for p in bm.faces]
 
     if face_data:
         if out_np[3]:
@@ -160,11 +378,48 @@ def numpy_data_from_bmesh(bm, out_np, face_data=None):
     else:
         return verts, edges, faces, []
 
+def _bulk_arrays_from_bmesh(bm):
+    """
+    Returns (vertices array, edges array, flat loop vertex indexes, loop starts, loop totals)
+    of bmesh, or None if a temporary mesh can not be created in this context.
+    """
+    try:
+        mesh = bpy.data.meshes.new("sv_pydata_from_bmesh")
+    except (AttributeError, RuntimeError):
+        return None
+    try:
+        bm.to_mesh(mesh)
+        verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", verts)
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+    finally:
+        bpy.data.meshes.remove(mesh)
+    return verts.reshape(-1, 3), edges.reshape(-1, 2), loop_verts, loop_start, loop_total
+
+
 def pydata_from_bmesh(bm, face_data=None):
 
-    verts = [v.co[:] for v in bm.verts]
-    edges = [[e.verts[0].index, e.verts[1].index] for e in bm.edges]
-    faces = [[i.index for i in p.verts] for p in bm.faces]
+    bulk = None
+    if len(bm.verts) + len(bm.faces) >= BULK_THRESHOLD:
+        bulk = _bulk_arrays_from_bmesh(bm)
+
+    if bulk is not None:
+        np_verts, np_edges, loop_verts, loop_start, loop_total = bulk
+        verts = list(map(tuple, np_verts.tolist()))
+        edges = np_edges.tolist()
+        loop_verts = loop_verts.tolist()
+        faces = [loop_verts[start:start + total] for start, total in zip(loop_start.tolist(), loop_total.tolist())]
+    else:
+        verts = [v.co[:] for v in bm.verts]
+        edges = [[e.verts[0].index, e.verts[1].index] for e in bm.edges]
+        faces = [[i.index for i in p.verts] for p in bm.faces]
 
     if face_data is None:
         return verts, edges, faces
@@ -23,7 +23,7 @@ import nodeitems_utils
 
 import sverchok
 from sverchok.menu import make_node_cats
-from sverchok.utils import get_node_class_reference
+from sverchok.core.node_manifest import get_node_class_or_stub
 from sverchok.utils.docstring import SvDocstring
 from sverchok.ui.sv_icons import custom_icon
 from sverchok.utils.sv_default_macros import macros, DefaultMacros
@@ -104,7 +104,7 @@ def gather_items():
             if item[0] in {'separator', 'NodeReroute'}:
                 continue
 
-            nodetype = get_node_class_reference(item[0])
+            nodetype = get_node_class_or_stub(item[0])
             if not nodetype:
                 continue
             fx.append((str(idx), ensure_valid_show_string(nodetype), '', idx))
@@ -22,6 +22,7 @@ import bpy
 from bpy.props import StringProperty
 
 import sverchok
+from sverchok.core.node_manifest import load_node_class
 
 
 # pylint: disable=w0141
@@ -59,6 +60,7 @@ class SvMacroInterpretter(bpy.types.Operator):
         for n in tree.nodes:
             n.select = False
 
+        load_node_class(node_type)
         node = tree.nodes.new(type=node_type)
 
         if self.settings:
@@ -0,0 +1,266 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Per-node instrumentation of the update process.
+
+When telemetry is enabled (by "Start telemetry" toggle in the N panel),
+the update system records a sample for each processed node: wall time,
+estimated size of data written to each output socket and, optionally,
+memory allocated by the node (traced by tracemalloc). Samples are kept
+in a rolling history per node, and can be exported to JSON or to Chrome
+trace format (to be viewed in chrome://tracing or Perfetto).
+"""
+
+import json
+import os
+import threading
+import tracemalloc
+from collections import deque
+from typing import NamedTuple
+
+import bpy
+from bpy.props import StringProperty
+
+import sverchok
+from sverchok.core.socket_data import socket_data_cache, sv_data_size
+from sverchok.utils.logging import info
+from sverchok.utils.context_managers import sv_preferences
+
+# Whether the telemetry is enabled by "Start telemetry" toggle
+is_currently_enabled = False
+# Whether tracemalloc was started by us
+_started_tracemalloc = False
+
+# (tree name, node name): deque of SvNodeSample
+node_histories = dict()
+# All samples in order of recording, for trace export
+samples = deque(maxlen=100000)
+_lock = threading.Lock()
+# History size used when addon preferences are not available
+DEFAULT_HISTORY_SIZE = 100
+
+class SvNodeSample(NamedTuple):
+    tree: str
+    node: str
+    bl_idname: str
+    thread: int
+    start: float
+    duration: float
+    # bytes allocated by the node and still alive after process(); None if memory is not traced
+    memory: object
+    # peak of memory allocated during process(); None if not traced or not supported
+    memory_peak: object
+    # output socket name: estimated data size in bytes
+    outputs: dict
+
+def get_history_size():
+    addon = bpy.context.preferences.addons.get(sverchok.__name__)
+    if addon is None:
+        return DEFAULT_HISTORY_SIZE
+    return addon.preferences.telemetry_history_size
+
+def start(trace_memory=False):
+    """Enable recording of samples"""
+    global is_currently_enabled, _started_tracemalloc
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    is_currently_enabled = True
+
+def stop():
+    """Disable recording of samples; recorded samples are kept"""
+    global is_currently_enabled, _started_tracemalloc
+    is_currently_enabled = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+def reset():
+    """Forget all recorded samples"""
+    with _lock:
+        node_histories.clear()
+        samples.clear()
+
+def start_node(node):
+    """
+    Called by the update system before node.process().
+    Returns an opaque value to be passed to finish_node().
+    """
+    if tracemalloc.is_tracing():
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+def get_outputs_size(node):
+    cache = socket_data_cache.get(node.id_data.tree_id, {})
+    sizes = dict()
+    for socket in node.outputs:
+        data = cache.get(socket.socket_id, None)
+        if data is not None:
+            sizes[socket.name] = sv_data_size(data)
+    return sizes
+
+def finish_node(node, start, duration, memory_before, thread=None):
+    """
+    Called by the update system after node.process();
+    records a sample for the node. thread is the id of the thread
+    which did the computations, if it is not the calling thread.
+    """
+    memory = memory_peak = None
+    if memory_before is not None and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        memory = current - memory_before
+        if hasattr(tracemalloc, 'reset_peak'):
+            memory_peak = peak - memory_before
+
+    sample = SvNodeSample(
+                tree = node.id_data.name,
+                node = node.name,
+                bl_idname = node.bl_idname,
+                thread = thread or threading.get_ident(),
+                start = start,
+                duration = duration,
+                memory = memory,
+                memory_peak = memory_peak,
+                outputs = get_outputs_size(node))
+
+    key = (sample.tree, sample.node)
+    with _lock:
+        history = node_histories.get(key)
+        if history is None:
+            history = node_histories[key] = deque(maxlen=get_history_size())
+        history.append(sample)
+        samples.append(sample)
+
+def get_node_history(tree_name, node_name):
+    """Return list of recorded samples for the node, oldest first"""
+    return list(node_histories.get((tree_name, node_name), []))
+
+def get_node_stats(tree_name, node_name):
+    """
+    Return a dictionary with summary of recorded samples for the node:
+    count, mean and max duration, last outputs size and mean memory
+    (None if memory was not traced).
+    """
+    history = get_node_history(tree_name, node_name)
+    if not history:
+        return None
+    durations = [sample.duration for sample in history]
+    memory = [sample.memory for sample in history if sample.memory is not None]
+    return dict(count = len(history),
+                mean_duration = sum(durations) / len(durations),
+                max_duration = max(durations),
+                outputs = history[-1].outputs,
+                mean_memory = sum(memory) / len(memory) if memory else None)
+
+def get_slowest_nodes(count=10):
+    """Return list of ((tree name, node name), stats) for nodes with biggest mean duration"""
+    stats = [(key, get_node_stats(*key)) for key in list(node_histories.keys())]
+    stats.sort(key = lambda item: item[1]['mean_duration'], reverse=True)
+    return stats[:count]
+
+def export_json(path):
+    """Save all recorded samples to JSON file"""
+    data = [sample._asdict() for sample in list(samples)]
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1)
+    info("Telemetry data (%s samples) saved to %s", len(data), path)
+
+def export_chrome_trace(path):
+    """
+    Save all recorded samples to a file in Chrome trace event format,
+    one complete ("X") event per processed node.
+    """
+    pid = os.getpid()
+    events = []
+    for sample in list(samples):
+        args = dict(tree = sample.tree, outputs = sample.outputs)
+        if sample.memory is not None:
+            args['memory'] = sample.memory
+        if sample.memory_peak is not None:
+            args['memory_peak'] = sample.memory_peak
+        events.append(dict(name = sample.node,
+                           cat = sample.bl_idname,
+                           ph = "X",
+                           ts = sample.start * 1e6,
+                           dur = sample.duration * 1e6,
+                           pid = pid,
+                           tid = sample.thread,
+                           args = args))
+    with open(path, 'w') as f:
+        json.dump(dict(traceEvents = events, displayTimeUnit = "ms"), f)
+    info("Telemetry trace (%s events) saved to %s", len(events), path)
+
+class SvTelemetryToggle(bpy.types.Operator):
+    """Toggle recording of per-node telemetry on/off"""
+    bl_idname = "node.sverchok_telemetry_toggle"
+    bl_label = "Toggle telemetry"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        if is_currently_enabled:
+            stop()
+        else:
+            with sv_preferences() as prefs:
+                start(trace_memory = prefs.telemetry_trace_memory)
+        info("Telemetry is set to %s", is_currently_enabled)
+        return {'FINISHED'}
+
+class SvTelemetryExport(bpy.types.Operator):
+    """Save recorded telemetry to JSON or Chrome trace file"""
+    bl_idname = "node.sverchok_telemetry_export"
+    bl_label = "Save telemetry"
+    bl_options = {'INTERNAL'}
+
+    filepath: StringProperty(subtype="FILE_PATH")
+    trace_format: bpy.props.BoolProperty(name = "Chrome trace format", default = True)
+
+    def execute(self, context):
+        if self.trace_format:
+            export_chrome_trace(self.filepath)
+        else:
+            export_json(self.filepath)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+class SvTelemetryReset(bpy.types.Operator):
+    """Forget recorded telemetry"""
+    bl_idname = "node.sverchok_telemetry_reset"
+    bl_label = "Reset telemetry"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        reset()
+        info("Telemetry data cleared.")
+        return {'FINISHED'}
+
+classes = [SvTelemetryToggle, SvTelemetryExport, SvTelemetryReset]
+
+def register():
+    for class_name in classes:
+        bpy.utils.register_class(class_name)
+
+def unregister():
+    stop()
+    for class_name in reversed(classes):
+        bpy.utils.unregister_class(class_name)